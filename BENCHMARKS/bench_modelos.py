@@ -0,0 +1,153 @@
+"""
+Pruebas de rendimiento de controladores y modelos.
+Mide, sobre BDs generadas de tamaño creciente, las consultas que más pesan
+el día del torneo: clasificación, máximos goleadores, plantilla de un equipo,
+listado de partidos y el registro de un gol. De cada una da los percentiles
+de latencia y las sentencias SQL por llamada, en frío (cachés vacías antes
+de cada llamada) y en caliente (con las cachés de la aplicación).
+
+Uso:
+    python -m BENCHMARKS.bench_modelos
+    python -m BENCHMARKS.bench_modelos --tamanos 16 64 256 --repeticiones 50
+    python -m BENCHMARKS.bench_modelos --guardar-base
+    python -m BENCHMARKS.bench_modelos --base BENCHMARKS/baselines/modelos.json
+
+Con una línea base (por defecto BENCHMARKS/baselines/modelos.json si existe)
+termina con código 1 si hay regresiones.
+"""
+
+import argparse
+import os
+import sys
+from BENCHMARKS import entorno
+from PySide6.QtCore import QCoreApplication
+import config
+from MODELS.database import crear_query
+from MODELS.generador_torneo import FORMATO_ELIMINATORIA, FORMATO_LIGA
+from MODELS.partido import Partido
+from CONTROLLERS.partidos_controller import PartidosController
+from CONTROLLERS.participantes_controller import ParticipantesController
+from CONTROLLERS.equipos_controller import EquiposController
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+SALIDA = os.path.join(DIRECTORIO, "resultados", "modelos.json")
+BASE = os.path.join(DIRECTORIO, "baselines", "modelos.json")
+
+
+def _ids(sql: str) -> list:
+    """Primera columna de una consulta, como lista."""
+    query = crear_query()
+    query.exec(sql)
+    valores = []
+    while query.next():
+        valores.append(query.value(0))
+    return valores
+
+
+def casos() -> dict:
+    """
+    Funciones a medir sobre la BD abierta; cada una recibe el número de
+    repetición para ir cambiando de equipo o de partido.
+    """
+    equipos = _ids("SELECT id FROM equipos ORDER BY id")
+    pendientes = _ids("SELECT id FROM partidos WHERE finalizado = 0 ORDER BY id")
+    # Un jugador del equipo local de cada partido pendiente
+    goleadores = {}
+    query = crear_query()
+    query.exec("""
+        SELECT p.id, p.equipo_local_id, MIN(ep.participante_id)
+        FROM partidos p
+        JOIN equipo_participante ep ON ep.equipo_id = p.equipo_local_id
+        WHERE p.finalizado = 0
+        GROUP BY p.id
+    """)
+    while query.next():
+        goleadores[query.value(0)] = (query.value(2), query.value(1))
+    query.finish()
+    
+    def registrar_gol(i):
+        partido_id = pendientes[i % len(pendientes)]
+        participante_id, equipo_id = goleadores[partido_id]
+        PartidosController.registrar_gol(partido_id, participante_id, i % 90 + 1, equipo_id)
+    
+    resultado = {
+        'tabla_posiciones': lambda i: PartidosController.obtener_tabla_posiciones(),
+        'maximos_goleadores': lambda i: ParticipantesController.obtener_maximos_goleadores(
+            config.LIMITE_GOLEADORES),
+        'jugadores_equipo': lambda i: EquiposController.obtener_jugadores_equipo(equipos[i % len(equipos)]),
+        'partidos_todos': lambda i: Partido.obtener_todos(),
+    }
+    if pendientes:
+        resultado['registrar_gol'] = registrar_gol
+    return resultado
+
+
+def ejecutar(tamanos: list, jugadores: int, formato: str, semilla: int, repeticiones: int,
+             directorio: str, regenerar: bool) -> dict:
+    """
+    Ejecuta todos los casos en cada tamaño.
+    
+    Returns:
+        dict: '<equipos>e/<caso>/<frio|caliente>' -> resumen de entorno.medir
+    """
+    resultados = {}
+    for equipos in tamanos:
+        ruta = entorno.generar_bd(equipos, jugadores, formato, semilla, directorio, regenerar)
+        entorno.abrir_bd(ruta)
+        for nombre, funcion in casos().items():
+            resultados[f"{equipos}e/{nombre}/frio"] = entorno.medir(
+                funcion, repeticiones, antes=entorno.vaciar_caches)
+            resultados[f"{equipos}e/{nombre}/caliente"] = entorno.medir(funcion, repeticiones)
+        entorno.cerrar_bd()
+    return resultados
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Pruebas de rendimiento de controladores y modelos")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[16, 64, 256],
+                        help="Número de equipos de cada BD (por defecto 16 64 256)")
+    parser.add_argument("--jugadores", type=int, default=15, help="Jugadores por equipo")
+    parser.add_argument("--formato", choices=[FORMATO_ELIMINATORIA, FORMATO_LIGA], default=FORMATO_LIGA,
+                        help="Calendario de las BDs generadas (por defecto liga: más partidos)")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla de las BDs generadas")
+    parser.add_argument("--repeticiones", type=int, default=30, help="Llamadas medidas por caso")
+    parser.add_argument("--directorio", default=entorno.DIRECTORIO_BDS, help="Carpeta de las BDs generadas")
+    parser.add_argument("--regenerar", action="store_true", help="Vuelve a generar las BDs")
+    parser.add_argument("--salida", default=SALIDA, help="Fichero JSON de resultados")
+    parser.add_argument("--base", default=BASE, help="Línea base con la que comparar")
+    parser.add_argument("--guardar-base", action="store_true",
+                        help="Guarda estos resultados como línea base")
+    parser.add_argument("--tolerancia", type=float, default=entorno.TOLERANCIA,
+                        help="Empeoramiento relativo del p50 permitido (0.25 = 25 %%)")
+    args = parser.parse_args()
+    
+    app = QCoreApplication.instance() or QCoreApplication([])
+    entorno.preparar_entorno()
+    
+    parametros = {'tamanos': args.tamanos, 'jugadores': args.jugadores, 'formato': args.formato,
+                  'semilla': args.semilla, 'repeticiones': args.repeticiones}
+    resultados = ejecutar(args.tamanos, args.jugadores, args.formato, args.semilla,
+                          args.repeticiones, args.directorio, args.regenerar)
+    entorno.imprimir_tabla(resultados)
+    entorno.guardar_resultados(args.salida, "modelos", parametros, resultados)
+    print(f"Resultados guardados en {args.salida}")
+    
+    if args.guardar_base:
+        entorno.guardar_resultados(args.base, "modelos", parametros, resultados)
+        print(f"Línea base guardada en {args.base}")
+        return 0
+    
+    if os.path.exists(args.base):
+        regresiones = entorno.comparar(resultados, entorno.cargar_resultados(args.base)['resultados'],
+                                       args.tolerancia)
+        if regresiones:
+            print(f"Regresiones respecto a {args.base}:")
+            for regresion in regresiones:
+                print(f"  {regresion}")
+            return 1
+        print(f"Sin regresiones respecto a {args.base}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+"""
+Pruebas de rendimiento de las vistas.
+Construye PartidosView, ParticipantesView y EquiposView sin ventanas
+(QT_QPA_PLATFORM=offscreen) sobre BDs generadas de tamaño creciente y mide
+los pasos que nota el usuario:
+
+- construccion: el constructor de la vista (parte síncrona de la carga)
+- primera_carga: desde el constructor hasta que llegan y se pintan los datos
+  del trabajador de BD, con las cachés vacías
+- recarga: cargar_partidos / cargar_participantes / cargar_equipos
+- plantilla: seleccionar un equipo (cargar_jugadores_equipo)
+- idioma: cambio de idioma (refresh_ui), en las vistas que lo tienen
+
+De cada paso da los percentiles de latencia, las sentencias SQL por
+llamada (también las del trabajador de BD) y lo que queda en la vista:
+elementos de árboles, tablas y listas, filas cargadas de las tablas
+virtuales y widgets.
+
+Uso:
+    python -m BENCHMARKS.bench_vistas
+    python -m BENCHMARKS.bench_vistas --tamanos 16 64 --vistas partidos --repeticiones 5
+    python -m BENCHMARKS.bench_vistas --guardar-base
+
+Con una línea base (por defecto BENCHMARKS/baselines/vistas.json si existe)
+termina con código 1 si hay regresiones.
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+from BENCHMARKS import entorno
+from PySide6.QtWidgets import (QApplication, QWidget, QTreeWidget, QTreeWidgetItemIterator,
+                               QTableWidget, QListWidget)
+from PySide6.QtCore import QCoreApplication, QEvent
+from MODELS.db_worker import obtener_trabajador
+from MODELS.generador_torneo import FORMATO_ELIMINATORIA, FORMATO_LIGA
+from MODELS.instrumentacion import total_ejecuciones
+from COMPONENTS.tabla_virtual import TablaVirtual
+from RESOURCES.traduciones.language_manager import language_manager
+from VIEWS.partidos import PartidosView
+from VIEWS.participantes import ParticipantesView
+from VIEWS.equipos import EquiposView
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+SALIDA = os.path.join(DIRECTORIO, "resultados", "vistas.json")
+BASE = os.path.join(DIRECTORIO, "baselines", "vistas.json")
+
+# Contadores de cada medición que no pueden crecer respecto a la línea base
+CAMPOS_CONTEO = ('consultas_por_llamada', 'items', 'filas_virtuales', 'widgets')
+
+# Tamaño de la ventana simulada (las tablas virtuales cargan según lo visible)
+TAMANO_VENTANA = (1280, 800)
+
+# Idiomas entre los que alterna la medición del cambio de idioma
+IDIOMAS = ('en', 'es')
+
+
+def _seleccionar_equipo(vista: EquiposView, i: int):
+    """Selecciona un equipo distinto en cada repetición (carga su plantilla)."""
+    filas = vista.tabla_equipos.model().rowCount()
+    if filas:
+        vista.tabla_equipos.selectRow(i % filas)
+
+
+# Vista -> (clase, pasos medidos sobre una vista ya cargada)
+VISTAS = {
+    'partidos': (PartidosView, {
+        'recarga': lambda vista, i: vista.cargar_partidos(),
+        'idioma': lambda vista, i: language_manager.set_language(IDIOMAS[i % 2]),
+    }),
+    'participantes': (ParticipantesView, {
+        'recarga': lambda vista, i: vista.cargar_participantes(),
+    }),
+    'equipos': (EquiposView, {
+        'recarga': lambda vista, i: vista.cargar_equipos(),
+        'plantilla': _seleccionar_equipo,
+    }),
+}
+
+
+def esperar_datos():
+    """
+    Procesa eventos hasta que el trabajador de BD termina y sus resultados
+    se han entregado a las vistas, y después los repintados pendientes.
+    """
+    app = QCoreApplication.instance()
+    trabajador = obtener_trabajador()
+    app.processEvents()
+    while trabajador.ocupado():
+        time.sleep(0.0002)
+        app.processEvents()
+    app.processEvents()
+
+
+def contar_elementos(vista: QWidget) -> dict:
+    """
+    Lo que contiene una vista: elementos de QTreeWidget, QTableWidget y
+    QListWidget, filas cargadas de las tablas virtuales y widgets hijos.
+    """
+    items = 0
+    for arbol in vista.findChildren(QTreeWidget):
+        iterador = QTreeWidgetItemIterator(arbol)
+        while iterador.value():
+            items += 1
+            iterador += 1
+    for tabla in vista.findChildren(QTableWidget):
+        items += sum(1 for fila in range(tabla.rowCount()) for columna in range(tabla.columnCount())
+                     if tabla.item(fila, columna) is not None)
+    for lista in vista.findChildren(QListWidget):
+        items += lista.count()
+    filas = sum(tabla.modelo.rowCount() for tabla in vista.findChildren(TablaVirtual))
+    return {'items': items, 'filas_virtuales': filas, 'widgets': len(vista.findChildren(QWidget))}
+
+
+def crear_vista(clase) -> QWidget:
+    """Construye y muestra una vista con el tamaño de la ventana simulada."""
+    vista = clase()
+    vista.resize(*TAMANO_VENTANA)
+    vista.show()
+    return vista
+
+
+def cerrar_vista(vista: QWidget):
+    """Cierra y destruye una vista (sus conexiones a señales globales se desconectan)."""
+    vista.close()
+    vista.deleteLater()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    gc.collect()
+
+
+def medir_construccion(clase, repeticiones: int, calentamiento: int = 1) -> dict:
+    """
+    Construye la vista varias veces con las cachés vacías.
+    
+    Returns:
+        dict: 'construccion' y 'primera_carga' -> resumen
+    """
+    construccion, primera_carga = [], []
+    consultas = 0
+    conteo = {}
+    for i in range(calentamiento + repeticiones):
+        entorno.vaciar_caches()
+        gc.collect()
+        ejecuciones = total_ejecuciones()
+        inicio = time.perf_counter()
+        vista = crear_vista(clase)
+        construida = time.perf_counter()
+        esperar_datos()
+        cargada = time.perf_counter()
+        if i >= calentamiento:
+            construccion.append((construida - inicio) * 1000)
+            primera_carga.append((cargada - inicio) * 1000)
+            consultas += total_ejecuciones() - ejecuciones
+        conteo = contar_elementos(vista)
+        cerrar_vista(vista)
+    
+    # Las consultas se cuentan solo con la carga completa: al terminar el constructor
+    # el trabajador de BD puede llevar hechas unas u otras
+    resumen_construccion = entorno.resumir(construccion, 0.0)
+    del resumen_construccion['consultas_por_llamada']
+    return {
+        'construccion': resumen_construccion,
+        'primera_carga': {**entorno.resumir(primera_carga, consultas / repeticiones), **conteo},
+    }
+
+
+def medir_vista(nombre: str, repeticiones: int) -> dict:
+    """
+    Mide todos los pasos de una vista.
+    
+    Returns:
+        dict: paso -> resumen de latencia, consultas y contenido de la vista
+    """
+    clase, pasos = VISTAS[nombre]
+    resultados = medir_construccion(clase, repeticiones)
+    
+    vista = crear_vista(clase)
+    esperar_datos()
+    idioma = language_manager.get_language()
+    try:
+        for paso, funcion in pasos.items():
+            def llamada(i, funcion=funcion):
+                funcion(vista, i)
+                esperar_datos()
+            resultados[paso] = {**entorno.medir(llamada, repeticiones), **contar_elementos(vista)}
+    finally:
+        language_manager.set_language(idioma)
+        cerrar_vista(vista)
+    return resultados
+
+
+def ejecutar(tamanos: list, vistas: list, jugadores: int, formato: str, semilla: int,
+             repeticiones: int, directorio: str, regenerar: bool) -> dict:
+    """
+    Mide las vistas en cada tamaño.
+    
+    Returns:
+        dict: '<equipos>e/<vista>/<paso>' -> resumen
+    """
+    resultados = {}
+    for equipos in tamanos:
+        ruta = entorno.generar_bd(equipos, jugadores, formato, semilla, directorio, regenerar)
+        entorno.abrir_bd(ruta)
+        for nombre in vistas:
+            for paso, resumen in medir_vista(nombre, repeticiones).items():
+                resultados[f"{equipos}e/{nombre}/{paso}"] = resumen
+        entorno.cerrar_bd()
+    return resultados
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Pruebas de rendimiento de las vistas")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[16, 64, 256],
+                        help="Número de equipos de cada BD (por defecto 16 64 256)")
+    parser.add_argument("--vistas", nargs="+", choices=list(VISTAS), default=list(VISTAS),
+                        help="Vistas a medir (por defecto todas)")
+    parser.add_argument("--jugadores", type=int, default=15, help="Jugadores por equipo")
+    parser.add_argument("--formato", choices=[FORMATO_ELIMINATORIA, FORMATO_LIGA], default=FORMATO_LIGA,
+                        help="Calendario de las BDs generadas (por defecto liga: más partidos)")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla de las BDs generadas")
+    parser.add_argument("--repeticiones", type=int, default=10, help="Repeticiones medidas por paso")
+    parser.add_argument("--directorio", default=entorno.DIRECTORIO_BDS, help="Carpeta de las BDs generadas")
+    parser.add_argument("--regenerar", action="store_true", help="Vuelve a generar las BDs")
+    parser.add_argument("--salida", default=SALIDA, help="Fichero JSON de resultados")
+    parser.add_argument("--base", default=BASE, help="Línea base con la que comparar")
+    parser.add_argument("--guardar-base", action="store_true",
+                        help="Guarda estos resultados como línea base")
+    parser.add_argument("--tolerancia", type=float, default=entorno.TOLERANCIA,
+                        help="Empeoramiento relativo del p50 permitido (0.25 = 25 %%)")
+    args = parser.parse_args()
+    
+    app = QApplication.instance() or QApplication([])
+    entorno.preparar_entorno()
+    
+    parametros = {'tamanos': args.tamanos, 'vistas': args.vistas, 'jugadores': args.jugadores,
+                  'formato': args.formato, 'semilla': args.semilla, 'repeticiones': args.repeticiones,
+                  'ventana': list(TAMANO_VENTANA)}
+    resultados = ejecutar(args.tamanos, args.vistas, args.jugadores, args.formato, args.semilla,
+                          args.repeticiones, args.directorio, args.regenerar)
+    entorno.imprimir_tabla(resultados, CAMPOS_CONTEO)
+    entorno.guardar_resultados(args.salida, "vistas", parametros, resultados)
+    print(f"Resultados guardados en {args.salida}")
+    
+    if args.guardar_base:
+        entorno.guardar_resultados(args.base, "vistas", parametros, resultados)
+        print(f"Línea base guardada en {args.base}")
+        return 0
+    
+    if os.path.exists(args.base):
+        regresiones = entorno.comparar(resultados, entorno.cargar_resultados(args.base)['resultados'],
+                                       args.tolerancia, campos_conteo=CAMPOS_CONTEO)
+        if regresiones:
+            print(f"Regresiones respecto a {args.base}:")
+            for regresion in regresiones:
+                print(f"  {regresion}")
+            return 1
+        print(f"Sin regresiones respecto a {args.base}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
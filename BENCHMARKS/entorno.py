@@ -0,0 +1,293 @@
+"""
+Entorno común de las pruebas de rendimiento.
+Prepara las BDs generadas de cada tamaño (se guardan y se reutilizan entre
+ejecuciones: con la misma semilla son idénticas), abre una copia de trabajo
+para que las escrituras no alteren la original, mide funciones (latencia y
+sentencias SQL por llamada) y guarda o compara los resultados en JSON.
+
+Todo se ejecuta sin ventanas: QT_QPA_PLATFORM=offscreen si no se indica otra.
+"""
+
+import gc
+import json
+import math
+import os
+import platform
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, List, Optional
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import PySide6
+from PySide6.QtCore import qInstallMessageHandler
+from PySide6.QtSql import QSqlDatabase
+import config
+from MODELS import database
+from MODELS.database import establecer_ruta_db, abrir_conexion, preparar_esquema
+from MODELS.db_worker import detener_trabajador
+from MODELS.generador_torneo import GeneradorTorneo, FORMATO_LIGA
+from MODELS.cache_consultas import cache_consultas
+from MODELS.cache_entidades import cache_entidades
+from MODELS.instrumentacion import total_ejecuciones
+
+# Versión del formato de los ficheros de resultados
+VERSION_RESULTADOS = 1
+
+# Carpeta por defecto de las BDs generadas
+DIRECTORIO_BDS = os.path.join(tempfile.gettempdir(), "torneo_futbol_benchmarks")
+
+# Por defecto una medición es regresión si su p50 empeora más de un 25 % y al menos 0,5 ms
+TOLERANCIA = 0.25
+MARGEN_MS = 0.5
+
+# Nombre de la conexión por defecto de QtSql (QSqlDatabase::defaultConnection)
+CONEXION_PRINCIPAL = "qt_sql_default_connection"
+
+# Avisos de Qt que no dicen nada sin ventanas (el plugin offscreen los da con cada widget)
+AVISOS_IGNORADOS = ("propagateSizeHints",)
+
+
+def preparar_entorno():
+    """
+    Ajustes para medir: sin avisos de consultas lentas, que además piden
+    el EXPLAIN QUERY PLAN dentro del tiempo medido, ni avisos de Qt que
+    solo aparecen sin ventanas.
+    """
+    config.UMBRAL_CONSULTA_LENTA_MS = float("inf")
+    qInstallMessageHandler(_mensaje_qt)
+
+
+def _mensaje_qt(tipo, contexto, mensaje):
+    """Muestra los mensajes de Qt salvo los de AVISOS_IGNORADOS."""
+    if not any(aviso in mensaje for aviso in AVISOS_IGNORADOS):
+        print(mensaje, file=sys.stderr)
+
+
+def ruta_bd(equipos: int, jugadores: int, formato: str, semilla: int,
+            directorio: str = DIRECTORIO_BDS) -> str:
+    """Fichero de la BD generada con esos parámetros."""
+    return os.path.join(directorio, f"torneo_{formato}_{equipos}e_{jugadores}j_s{semilla}.db")
+
+
+def generar_bd(equipos: int, jugadores: int = 15, formato: str = FORMATO_LIGA, semilla: int = 0,
+               directorio: str = DIRECTORIO_BDS, regenerar: bool = False) -> str:
+    """
+    Genera la BD de un tamaño si no existe ya.
+    
+    Returns:
+        str: Ruta de la BD generada
+    """
+    ruta = ruta_bd(equipos, jugadores, formato, semilla, directorio)
+    if os.path.exists(ruta) and not regenerar:
+        return ruta
+    
+    os.makedirs(directorio, exist_ok=True)
+    _borrar_bd(ruta)
+    cerrar_bd()
+    establecer_ruta_db(ruta)
+    db = abrir_conexion()
+    preparar_esquema(db, datos_ejemplo=False)
+    inicio = time.perf_counter()
+    GeneradorTorneo(equipos=equipos, jugadores_por_equipo=jugadores, formato=formato,
+                    semilla=semilla).generar(db)
+    print(f"BD generada en {time.perf_counter() - inicio:.1f} s: {ruta}")
+    del db
+    cerrar_bd()
+    return ruta
+
+
+def abrir_bd(ruta: str) -> QSqlDatabase:
+    """
+    Abre como conexión principal una copia de trabajo de la BD generada.
+    Las cachés se vacían: sus versiones no distinguen una BD de otra.
+    
+    Returns:
+        QSqlDatabase: Conexión principal abierta sobre la copia
+    """
+    cerrar_bd()
+    trabajo = ruta[:-len(".db")] + ".trabajo.db"
+    _borrar_bd(trabajo)
+    shutil.copyfile(ruta, trabajo)
+    establecer_ruta_db(trabajo)
+    db = abrir_conexion()
+    preparar_esquema(db)
+    cache_consultas.vaciar()
+    cache_entidades.vaciar()
+    return db
+
+
+def cerrar_bd():
+    """Cierra la conexión principal y la del trabajador de BD, si están abiertas."""
+    # El trabajador cierra su conexión al terminar su hilo
+    detener_trabajador()
+    gc.collect()
+    nombre = CONEXION_PRINCIPAL
+    if QSqlDatabase.contains(nombre):
+        db = QSqlDatabase.database(nombre, False)
+        db.close()
+        del db
+        QSqlDatabase.removeDatabase(nombre)
+    database._transacciones_abiertas.pop(nombre, None)
+    database._al_confirmar.pop(nombre, None)
+    establecer_ruta_db(None)
+
+
+def _borrar_bd(ruta: str):
+    """Borra una BD y sus ficheros del modo WAL."""
+    for fichero in (ruta, ruta + "-wal", ruta + "-shm"):
+        if os.path.exists(fichero):
+            os.remove(fichero)
+
+
+def vaciar_caches():
+    """Vacía las cachés de entidades y de consultas (medición en frío)."""
+    cache_consultas.vaciar()
+    cache_entidades.vaciar()
+
+
+def medir(funcion: Callable[[int], object], repeticiones: int, antes: Optional[Callable] = None,
+          calentamiento: int = 1) -> dict:
+    """
+    Ejecuta una función varias veces y resume su latencia y sus consultas.
+    
+    Args:
+        funcion: Recibe el número de repetición (para variar ids)
+        repeticiones: Llamadas medidas
+        antes: Se ejecuta antes de cada llamada, fuera del tiempo medido
+        calentamiento: Llamadas previas sin medir
+    
+    Returns:
+        dict: llamadas, media_ms, p50_ms, p95_ms, p99_ms, max_ms y
+        consultas_por_llamada (sentencias SQL medidas por la instrumentación)
+    """
+    for i in range(calentamiento):
+        if antes:
+            antes()
+        funcion(-1 - i)
+    
+    gc.collect()
+    tiempos = []
+    consultas = 0
+    for i in range(repeticiones):
+        if antes:
+            antes()
+        ejecuciones = total_ejecuciones()
+        inicio = time.perf_counter()
+        funcion(i)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+        consultas += total_ejecuciones() - ejecuciones
+    return resumir(tiempos, consultas / repeticiones if repeticiones else 0.0)
+
+
+def resumir(tiempos: List[float], consultas_por_llamada: float) -> dict:
+    """Percentiles (rango más cercano) de una lista de tiempos en ms."""
+    ordenados = sorted(tiempos)
+    return {
+        'llamadas': len(ordenados),
+        'media_ms': round(sum(ordenados) / len(ordenados), 3) if ordenados else 0.0,
+        'p50_ms': round(percentil(ordenados, 0.50), 3),
+        'p95_ms': round(percentil(ordenados, 0.95), 3),
+        'p99_ms': round(percentil(ordenados, 0.99), 3),
+        'max_ms': round(ordenados[-1], 3) if ordenados else 0.0,
+        'consultas_por_llamada': round(consultas_por_llamada, 2),
+    }
+
+
+def percentil(ordenados: List[float], fraccion: float) -> float:
+    """Percentil por el método del rango más cercano sobre valores ordenados."""
+    if not ordenados:
+        return 0.0
+    indice = min(len(ordenados) - 1, max(0, math.ceil(fraccion * len(ordenados)) - 1))
+    return ordenados[indice]
+
+
+def descripcion_entorno() -> dict:
+    """Versiones y máquina con las que se midió (para no comparar peras con manzanas)."""
+    return {
+        'python': platform.python_version(),
+        'pyside6': PySide6.__version__,
+        'sqlite': sqlite3.sqlite_version,
+        'sistema': platform.platform(),
+        'procesador': platform.processor() or platform.machine(),
+    }
+
+
+def guardar_resultados(ruta: str, suite: str, parametros: dict, resultados: dict):
+    """
+    Guarda los resultados de una ejecución en JSON.
+    
+    Args:
+        ruta: Fichero de salida
+        suite: Nombre de la batería ('modelos', 'vistas')
+        parametros: Parámetros con los que se ejecutó
+        resultados: Clave de la medición -> resumen
+    """
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    os.makedirs(directorio, exist_ok=True)
+    with open(ruta, "w", encoding="utf-8") as fichero:
+        json.dump({
+            'version': VERSION_RESULTADOS,
+            'suite': suite,
+            'fecha': datetime.now().isoformat(timespec="seconds"),
+            'entorno': descripcion_entorno(),
+            'parametros': parametros,
+            'resultados': resultados,
+        }, fichero, indent=2, ensure_ascii=False, sort_keys=True)
+        fichero.write("\n")
+
+
+def cargar_resultados(ruta: str) -> dict:
+    """Lee un fichero de resultados guardado con guardar_resultados()."""
+    with open(ruta, encoding="utf-8") as fichero:
+        return json.load(fichero)
+
+
+def comparar(actuales: dict, base: dict, tolerancia: float = TOLERANCIA,
+             margen_ms: float = MARGEN_MS, campos_conteo: tuple = ('consultas_por_llamada',)) -> List[str]:
+    """
+    Compara los resultados con una línea base.
+    
+    Es regresión que el p50 empeore más de la tolerancia (y del margen en
+    ms, para no saltar por ruido en mediciones muy cortas) o que crezca
+    cualquier contador (consultas por llamada, widgets creados...), que no
+    depende de la máquina.
+    
+    Args:
+        actuales: Resultados de esta ejecución
+        base: Resultados de la línea base
+        tolerancia: Empeoramiento relativo permitido del p50
+        margen_ms: Empeoramiento absoluto permitido del p50
+        campos_conteo: Campos que no pueden crecer
+    
+    Returns:
+        Lista de regresiones descritas en texto (vacía si no hay)
+    """
+    regresiones = []
+    for clave, actual in sorted(actuales.items()):
+        anterior = base.get(clave)
+        if anterior is None:
+            continue
+        p50, p50_base = actual.get('p50_ms', 0.0), anterior.get('p50_ms', 0.0)
+        if p50 > p50_base * (1 + tolerancia) and p50 - p50_base > margen_ms:
+            regresiones.append(f"{clave}: p50 {p50_base:.2f} -> {p50:.2f} ms")
+        for campo in campos_conteo:
+            if campo in actual and campo in anterior and actual[campo] > anterior[campo]:
+                regresiones.append(f"{clave}: {campo} {anterior[campo]} -> {actual[campo]}")
+    return regresiones
+
+
+def imprimir_tabla(resultados: dict, campos: tuple = ('consultas_por_llamada',)):
+    """Muestra los resultados como tabla de texto."""
+    cabecera = f"{'medición':<48} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+    cabecera += "".join(f" {campo[:14]:>14}" for campo in campos)
+    print(cabecera)
+    for clave, resumen in sorted(resultados.items()):
+        linea = (f"{clave:<48} {resumen['p50_ms']:>9.2f} {resumen['p95_ms']:>9.2f} "
+                 f"{resumen['p99_ms']:>9.2f} {resumen['max_ms']:>9.2f}")
+        linea += "".join(f" {resumen.get(campo, ''):>14}" for campo in campos)
+        print(linea)
@@ -0,0 +1,76 @@
+"""
+Motor de Reloj
+Mide el tiempo de cronómetros y temporizadores con un reloj monótono
+(time.monotonic): el tiempo transcurrido se calcula desde el instante de
+inicio descontando las pausas, no contando ticks. Si el bucle de eventos se
+bloquea (un diálogo modal, una consulta lenta) el reloj no pierde tiempo;
+el display simplemente salta al valor correcto en el siguiente refresco.
+"""
+import time
+from typing import Callable
+
+
+class MotorReloj:
+    """
+    Cronómetro con pausa basado en un reloj monótono.
+    
+    No tiene timer propio: quien lo usa refresca el display cuando quiere y
+    pregunta el tiempo transcurrido, que siempre es exacto.
+    """
+    
+    def __init__(self, reloj: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            reloj: Función que devuelve segundos de un reloj monótono
+                (se puede sustituir para simular el paso del tiempo)
+        """
+        self._reloj = reloj
+        self._inicio = None  # Instante del último inicio/reanudación, None si está parado
+        self._acumulado = 0.0  # Segundos transcurridos antes de la última pausa
+    
+    @property
+    def en_marcha(self) -> bool:
+        """True si el cronómetro está contando."""
+        return self._inicio is not None
+    
+    def iniciar(self):
+        """Inicia o reanuda la cuenta (no hace nada si ya está en marcha)."""
+        if self._inicio is None:
+            self._inicio = self._reloj()
+    
+    def pausar(self):
+        """Pausa la cuenta conservando el tiempo transcurrido."""
+        if self._inicio is not None:
+            self._acumulado += self._reloj() - self._inicio
+            self._inicio = None
+    
+    def reiniciar(self):
+        """Detiene la cuenta y la pone a cero."""
+        self._inicio = None
+        self._acumulado = 0.0
+    
+    def transcurrido(self) -> float:
+        """Segundos transcurridos en marcha desde el último reinicio."""
+        if self._inicio is None:
+            return self._acumulado
+        return self._acumulado + self._reloj() - self._inicio
+    
+    def segundos(self) -> int:
+        """Segundos completos transcurridos."""
+        return int(self.transcurrido())
+    
+    def minutos(self) -> int:
+        """Minutos completos transcurridos."""
+        return self.segundos() // 60
+    
+    def restante(self, duracion: int) -> int:
+        """
+        Segundos que faltan para completar una duración (cuenta atrás).
+        
+        Args:
+            duracion: Duración total en segundos
+        
+        Returns:
+            int: Segundos restantes, nunca negativo
+        """
+        return max(duracion - self.segundos(), 0)
@@ -0,0 +1,267 @@
+"""
+Componente de Notificaciones
+Avisos no modales ("toasts") que se apilan en una capa sobre la esquina
+inferior derecha de la ventana y se cierran solos. Sustituyen a los
+QMessageBox informativos del flujo de partidos en juego, que bloqueaban la
+interfaz hasta que alguien pulsaba Aceptar.
+
+- Cola con prioridades: como mucho se ven MAX_VISIBLES avisos; el resto
+  espera y sale primero el de mayor prioridad. Un error desplaza al aviso
+  visible menos importante.
+- Agrupación: los avisos con la misma clave se funden en uno (con un
+  contador) en lugar de apilarse.
+- Cierre automático tras un tiempo que depende del nivel; al pasar el ratón
+  por encima el tiempo se detiene, y un clic lo cierra.
+"""
+import itertools
+from typing import Optional
+from PySide6.QtWidgets import QWidget, QFrame, QVBoxLayout, QHBoxLayout, QLabel, QPushButton
+from PySide6.QtCore import Qt, QTimer, QEvent
+
+# Niveles de aviso
+INFO = "info"
+EXITO = "exito"
+AVISO = "aviso"
+ERROR = "error"
+
+# Prioridad de cada nivel: un número menor se muestra antes
+PRIORIDADES = {ERROR: 0, AVISO: 1, EXITO: 2, INFO: 2}
+
+# Tiempo en pantalla de cada nivel (ms)
+DURACIONES = {INFO: 4000, EXITO: 4000, AVISO: 7000, ERROR: 10000}
+
+# Colores (fondo, borde) de cada nivel
+COLORES = {
+    INFO: ("#e7f1ff", "#007bff"),
+    EXITO: ("#e6f4ea", "#28a745"),
+    AVISO: ("#fff8e1", "#ffc107"),
+    ERROR: ("#fdecea", "#dc3545"),
+}
+
+# Avisos visibles a la vez
+MAX_VISIBLES = 3
+
+
+class Toast(QFrame):
+    """Aviso individual; se cierra solo, con un clic o con su botón."""
+    
+    def __init__(self, capa: "CapaNotificaciones", clave: Optional[str], titulo: str,
+                 mensaje: str, nivel: str, duracion_ms: int, secuencia: int):
+        super().__init__(capa)
+        self.capa = capa
+        self.clave = clave
+        self.nivel = nivel
+        self.duracion_ms = duracion_ms
+        self.secuencia = secuencia  # Orden de llegada, para desempatar prioridades
+        self.repeticiones = 1
+        
+        self.setObjectName("toast")
+        self.setFixedWidth(320)
+        
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(10, 6, 6, 8)
+        cabecera = QHBoxLayout()
+        self.label_titulo = QLabel(self)
+        self.label_titulo.setStyleSheet("font-weight: bold;")
+        cabecera.addWidget(self.label_titulo, 1)
+        btn_cerrar = QPushButton("✕", self)
+        btn_cerrar.setFixedSize(20, 20)
+        btn_cerrar.clicked.connect(self.cerrar)
+        cabecera.addWidget(btn_cerrar)
+        layout.addLayout(cabecera)
+        self.label_mensaje = QLabel(self)
+        self.label_mensaje.setWordWrap(True)
+        layout.addWidget(self.label_mensaje)
+        
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.cerrar)
+        self.actualizar(titulo, mensaje)
+    
+    @property
+    def prioridad(self) -> int:
+        """Prioridad del nivel del aviso."""
+        return PRIORIDADES.get(self.nivel, PRIORIDADES[INFO])
+    
+    def actualizar(self, titulo: str, mensaje: str):
+        """Cambia el texto y el color del aviso (al agruparse con otro de la misma clave)."""
+        fondo, borde = COLORES.get(self.nivel, COLORES[INFO])
+        self.setStyleSheet(f"""
+            QFrame#toast {{
+                background-color: {fondo};
+                border-left: 5px solid {borde};
+                border-radius: 5px;
+            }}
+            QLabel {{
+                color: #212529;
+            }}
+            QPushButton {{
+                border: none;
+                font-weight: bold;
+                color: #6c757d;
+            }}
+        """)
+        texto = f"{titulo} (×{self.repeticiones})" if self.repeticiones > 1 else titulo
+        self.label_titulo.setText(texto)
+        self.label_titulo.setVisible(bool(texto))
+        self.label_mensaje.setText(mensaje)
+    
+    def mostrar(self):
+        """Muestra el aviso y arranca (o reinicia) su cuenta atrás."""
+        self.show()
+        self._timer.start(self.duracion_ms)
+    
+    def cerrar(self):
+        """Cierra el aviso y deja su hueco al siguiente de la cola."""
+        self._timer.stop()
+        self.capa._cerrado(self)
+    
+    def enterEvent(self, event):
+        """Con el ratón encima no se cierra."""
+        self._timer.stop()
+        super().enterEvent(event)
+    
+    def leaveEvent(self, event):
+        """Al salir el ratón vuelve a contar."""
+        if self.isVisible():
+            self._timer.start(self.duracion_ms)
+        super().leaveEvent(event)
+    
+    def mousePressEvent(self, event):
+        """Un clic en el aviso lo cierra."""
+        self.cerrar()
+
+
+class CapaNotificaciones(QWidget):
+    """
+    Capa de avisos de una ventana: se coloca sobre su esquina inferior
+    derecha y solo ocupa el espacio de los avisos visibles.
+    """
+    
+    def __init__(self, ventana: QWidget):
+        super().__init__(ventana)
+        self.ventana = ventana
+        self._secuencia = itertools.count()
+        self._visibles = []  # Toast en pantalla, del más antiguo al más reciente
+        self._pendientes = []  # Toast en espera
+        
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self._layout.setSpacing(6)
+        ventana.installEventFilter(self)
+        self.hide()
+    
+    def notificar(self, mensaje: str, titulo: str = "", nivel: str = INFO,
+                  clave: Optional[str] = None, duracion_ms: Optional[int] = None):
+        """
+        Encola un aviso.
+        
+        Args:
+            mensaje: Texto del aviso
+            titulo: Título (opcional)
+            nivel: INFO, EXITO, AVISO o ERROR (prioridad, color y duración)
+            clave: Los avisos con la misma clave se agrupan en uno
+            duracion_ms: Tiempo en pantalla (por defecto el del nivel)
+        """
+        duracion_ms = duracion_ms or DURACIONES.get(nivel, DURACIONES[INFO])
+        
+        # Agrupar con un aviso de la misma clave, visible o en espera
+        if clave is not None:
+            for toast in self._visibles + self._pendientes:
+                if toast.clave == clave:
+                    toast.repeticiones += 1
+                    if PRIORIDADES.get(nivel, 2) < toast.prioridad:
+                        toast.nivel = nivel
+                    toast.duracion_ms = max(toast.duracion_ms, duracion_ms)
+                    toast.actualizar(titulo, mensaje)
+                    if toast in self._visibles:
+                        toast.mostrar()
+                    return
+        
+        toast = Toast(self, clave, titulo, mensaje, nivel, duracion_ms, next(self._secuencia))
+        toast.hide()
+        self._pendientes.append(toast)
+        
+        # Un aviso más importante que alguno visible lo desplaza a la cola
+        if len(self._visibles) >= MAX_VISIBLES:
+            menos_importante = max(self._visibles, key=lambda t: (t.prioridad, -t.secuencia))
+            if toast.prioridad < menos_importante.prioridad:
+                self._retirar(menos_importante)
+                self._pendientes.append(menos_importante)
+        self._mostrar_siguientes()
+    
+    def limpiar(self):
+        """Cierra todos los avisos, visibles y en espera."""
+        for toast in self._visibles + self._pendientes:
+            toast.deleteLater()
+        self._visibles.clear()
+        self._pendientes.clear()
+        self.hide()
+    
+    def _cerrado(self, toast: Toast):
+        """Quita un aviso cerrado y muestra el siguiente de la cola."""
+        if toast in self._pendientes:
+            self._pendientes.remove(toast)
+        elif toast in self._visibles:
+            self._retirar(toast)
+        toast.deleteLater()
+        self._mostrar_siguientes()
+    
+    def _retirar(self, toast: Toast):
+        """Saca un aviso de la pantalla sin destruirlo."""
+        self._visibles.remove(toast)
+        self._layout.removeWidget(toast)
+        toast.hide()
+    
+    def _mostrar_siguientes(self):
+        """Rellena los huecos libres con los avisos en espera de mayor prioridad."""
+        self._pendientes.sort(key=lambda t: (t.prioridad, t.secuencia))
+        while self._pendientes and len(self._visibles) < MAX_VISIBLES:
+            toast = self._pendientes.pop(0)
+            self._visibles.append(toast)
+            self._layout.addWidget(toast)
+            toast.mostrar()
+        self._recolocar()
+    
+    def _recolocar(self):
+        """Ajusta el tamaño de la capa y la lleva a la esquina inferior derecha."""
+        if not self._visibles:
+            self.hide()
+            return
+        self.adjustSize()
+        margen = 16
+        self.move(max(self.ventana.width() - self.width() - margen, 0),
+                  max(self.ventana.height() - self.height() - margen, 0))
+        self.show()
+        self.raise_()
+    
+    def eventFilter(self, objeto, event):
+        """Sigue a la ventana cuando cambia de tamaño."""
+        if objeto is self.ventana and event.type() == QEvent.Resize:
+            self._recolocar()
+        return super().eventFilter(objeto, event)
+
+
+def capa_notificaciones(widget: QWidget) -> CapaNotificaciones:
+    """Capa de avisos de la ventana de un widget (se crea la primera vez)."""
+    ventana = widget.window()
+    capa = ventana.findChild(CapaNotificaciones, options=Qt.FindDirectChildrenOnly)
+    if capa is None:
+        capa = CapaNotificaciones(ventana)
+    return capa
+
+
+def notificar(widget: QWidget, mensaje: str, titulo: str = "", nivel: str = INFO,
+              clave: Optional[str] = None, duracion_ms: Optional[int] = None):
+    """
+    Muestra un aviso no modal en la ventana de un widget.
+    
+    Args:
+        widget: Cualquier widget de la ventana donde mostrar el aviso
+        mensaje: Texto del aviso
+        titulo: Título (opcional)
+        nivel: INFO, EXITO, AVISO o ERROR
+        clave: Los avisos con la misma clave se agrupan en uno
+        duracion_ms: Tiempo en pantalla (por defecto el del nivel)
+    """
+    capa_notificaciones(widget).notificar(mensaje, titulo, nivel, clave, duracion_ms)
@@ -0,0 +1,261 @@
+"""
+Componente de Panel de Partidos en Juego
+Lista los partidos en juego con su tiempo, marcador y estado, y dirige los
+botones de gol, tarjeta, pausa y final al partido seleccionado. Los tiempos
+se refrescan con el planificador de ticks solo mientras el panel está a la vista.
+"""
+from typing import Optional
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
+                               QTableWidget, QTableWidgetItem, QHeaderView, QListWidget,
+                               QAbstractItemView)
+from PySide6.QtCore import Signal, Qt
+from CONTROLLERS.partidos_en_vivo import partidos_en_vivo, PartidoEnVivo, GOL
+from COMPONENTS.planificador_ticks import planificador_ticks
+from RESOURCES.traduciones.translations import translate, translate_many
+
+
+class PanelEnVivo(QWidget):
+    """
+    Panel con los partidos en juego.
+    
+    No registra nada por sí mismo: emite el partido, el equipo y el minuto
+    que marcaba su reloj al pulsar el botón, y la vista abre el diálogo.
+    """
+    
+    # Señales del componente (id del partido, "local"/"visitante", minuto)
+    golPedido = Signal(int, str, int)
+    tarjetaPedida = Signal(int, str, int)
+    finalizarPedido = Signal(int)
+    
+    # Columnas de la tabla
+    COL_PARTIDO, COL_TIEMPO, COL_MARCADOR, COL_ESTADO = range(4)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.init_ui()
+        
+        partidos_en_vivo.partido_iniciado.connect(self._agregar_partido)
+        partidos_en_vivo.partido_actualizado.connect(self._actualizar_partido)
+        partidos_en_vivo.partido_finalizado.connect(self._quitar_partido)
+        for en_vivo in partidos_en_vivo.partidos():
+            self._agregar_partido(en_vivo.partido_id)
+        self._actualizar_visibilidad()
+    
+    def init_ui(self):
+        """Inicializa la interfaz del panel."""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        
+        self.label_titulo = QLabel("⚽ " + translate("Live Matches"), self)
+        self.label_titulo.setStyleSheet("font-weight: bold; font-size: 12pt; color: #DC143C;")
+        layout.addWidget(self.label_titulo)
+        
+        cuerpo = QHBoxLayout()
+        
+        # Tabla de partidos en juego
+        self.tabla = QTableWidget(0, 4, self)
+        self.tabla.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.tabla.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.tabla.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.tabla.verticalHeader().setVisible(False)
+        self.tabla.horizontalHeader().setSectionResizeMode(self.COL_PARTIDO, QHeaderView.Stretch)
+        self.tabla.setMaximumHeight(180)
+        self.tabla.itemSelectionChanged.connect(self._seleccion_cambiada)
+        cuerpo.addWidget(self.tabla, 3)
+        
+        # Últimos eventos del partido seleccionado
+        eventos_layout = QVBoxLayout()
+        self.label_eventos = QLabel(translate("Last events"), self)
+        eventos_layout.addWidget(self.label_eventos)
+        self.lista_eventos = QListWidget(self)
+        self.lista_eventos.setMaximumHeight(155)
+        eventos_layout.addWidget(self.lista_eventos)
+        cuerpo.addLayout(eventos_layout, 2)
+        
+        layout.addLayout(cuerpo)
+        
+        # Botones que actúan sobre el partido seleccionado
+        botones = QHBoxLayout()
+        self.btn_gol_local = QPushButton(self)
+        self.btn_gol_local.clicked.connect(lambda: self._pedir(self.golPedido, "local"))
+        self.btn_gol_visitante = QPushButton(self)
+        self.btn_gol_visitante.clicked.connect(lambda: self._pedir(self.golPedido, "visitante"))
+        self.btn_tarjeta_local = QPushButton(self)
+        self.btn_tarjeta_local.clicked.connect(lambda: self._pedir(self.tarjetaPedida, "local"))
+        self.btn_tarjeta_visitante = QPushButton(self)
+        self.btn_tarjeta_visitante.clicked.connect(lambda: self._pedir(self.tarjetaPedida, "visitante"))
+        self.btn_pausa = QPushButton(self)
+        self.btn_pausa.clicked.connect(self._alternar_pausa)
+        self.btn_finalizar = QPushButton(self)
+        self.btn_finalizar.setStyleSheet("""
+            QPushButton {
+                background-color: #dc3545;
+                color: white;
+                font-weight: bold;
+            }
+            QPushButton:disabled {
+                background-color: #cccccc;
+            }
+        """)
+        self.btn_finalizar.clicked.connect(self._pedir_final)
+        for boton in (self.btn_gol_local, self.btn_gol_visitante, self.btn_tarjeta_local,
+                      self.btn_tarjeta_visitante, self.btn_pausa, self.btn_finalizar):
+            botones.addWidget(boton)
+        botones.addStretch()
+        layout.addLayout(botones)
+        
+        self.refresh_ui()
+    
+    def partido_seleccionado(self) -> Optional[int]:
+        """ID del partido seleccionado en el panel, o None."""
+        fila = self.tabla.currentRow()
+        if fila < 0:
+            return None
+        return self.tabla.item(fila, self.COL_PARTIDO).data(Qt.UserRole)
+    
+    def seleccionar(self, partido_id: int):
+        """Selecciona un partido del panel."""
+        fila = self._fila(partido_id)
+        if fila >= 0:
+            self.tabla.selectRow(fila)
+    
+    def refresh_ui(self):
+        """Actualiza los textos del panel según el idioma actual."""
+        self.label_titulo.setText("⚽ " + translate("Live Matches"))
+        self.label_eventos.setText(translate("Last events"))
+        self.tabla.setHorizontalHeaderLabels(translate_many(["Match", "Time", "Score", "Status"]))
+        self.btn_gol_local.setText(" " + translate("Goal Local"))
+        self.btn_gol_visitante.setText(" " + translate("Goal Visitor"))
+        self.btn_tarjeta_local.setText("🟨 " + translate("Card Local"))
+        self.btn_tarjeta_visitante.setText("🟨 " + translate("Card Visitor"))
+        self.btn_finalizar.setText(" " + translate("End Match"))
+        for en_vivo in partidos_en_vivo.partidos():
+            self._actualizar_partido(en_vivo.partido_id)
+        self._actualizar_botones()
+    
+    # ============ CAMBIOS DE LOS PARTIDOS EN JUEGO ============
+    def _agregar_partido(self, partido_id: int):
+        """Añade la fila de un partido que empieza y la selecciona."""
+        if self._fila(partido_id) >= 0:
+            return
+        fila = self.tabla.rowCount()
+        self.tabla.insertRow(fila)
+        item = QTableWidgetItem()
+        item.setData(Qt.UserRole, partido_id)
+        self.tabla.setItem(fila, self.COL_PARTIDO, item)
+        for columna in (self.COL_TIEMPO, self.COL_MARCADOR, self.COL_ESTADO):
+            item = QTableWidgetItem()
+            item.setTextAlignment(Qt.AlignCenter)
+            self.tabla.setItem(fila, columna, item)
+        self._actualizar_partido(partido_id)
+        self.tabla.selectRow(fila)
+        self._actualizar_visibilidad()
+    
+    def _actualizar_partido(self, partido_id: int):
+        """Refresca el marcador, el estado y, si está seleccionado, los eventos de un partido."""
+        fila = self._fila(partido_id)
+        en_vivo = partidos_en_vivo.obtener(partido_id)
+        if fila < 0 or en_vivo is None:
+            return
+        self.tabla.item(fila, self.COL_PARTIDO).setText(f"{en_vivo.local} vs {en_vivo.visitante}")
+        self.tabla.item(fila, self.COL_TIEMPO).setText(en_vivo.texto_tiempo())
+        self.tabla.item(fila, self.COL_MARCADOR).setText(f"{en_vivo.goles_local} - {en_vivo.goles_visitante}")
+        self.tabla.item(fila, self.COL_ESTADO).setText(translate("Running" if en_vivo.en_marcha else "Paused"))
+        if partido_id == self.partido_seleccionado():
+            self._mostrar_eventos(en_vivo)
+            self._actualizar_botones()
+    
+    def _quitar_partido(self, partido_id: int):
+        """Quita la fila de un partido que ha terminado."""
+        fila = self._fila(partido_id)
+        if fila >= 0:
+            self.tabla.removeRow(fila)
+        self._actualizar_visibilidad()
+    
+    def _refrescar_tiempos(self):
+        """Tick del planificador: actualiza la columna de tiempo de todos los partidos."""
+        for fila in range(self.tabla.rowCount()):
+            en_vivo = partidos_en_vivo.obtener(self.tabla.item(fila, self.COL_PARTIDO).data(Qt.UserRole))
+            if en_vivo is not None:
+                item = self.tabla.item(fila, self.COL_TIEMPO)
+                texto = en_vivo.texto_tiempo()
+                if item.text() != texto:
+                    item.setText(texto)
+    
+    # ============ BOTONES ============
+    def _pedir(self, senal, equipo: str):
+        """Emite la petición de gol o tarjeta con el minuto actual del partido seleccionado."""
+        en_vivo = self._en_vivo_seleccionado()
+        if en_vivo is not None:
+            senal.emit(en_vivo.partido_id, equipo, en_vivo.minuto_actual())
+    
+    def _pedir_final(self):
+        """Emite la petición de finalizar el partido seleccionado."""
+        partido_id = self.partido_seleccionado()
+        if partido_id is not None:
+            self.finalizarPedido.emit(partido_id)
+    
+    def _alternar_pausa(self):
+        """Pausa o reanuda el reloj del partido seleccionado."""
+        en_vivo = self._en_vivo_seleccionado()
+        if en_vivo is None:
+            return
+        if en_vivo.en_marcha:
+            partidos_en_vivo.pausar(en_vivo.partido_id)
+        else:
+            partidos_en_vivo.reanudar(en_vivo.partido_id)
+    
+    def _seleccion_cambiada(self):
+        """Muestra los eventos del partido seleccionado y actualiza los botones."""
+        en_vivo = self._en_vivo_seleccionado()
+        if en_vivo is not None:
+            self._mostrar_eventos(en_vivo)
+        else:
+            self.lista_eventos.clear()
+        self._actualizar_botones()
+    
+    def _actualizar_botones(self):
+        """Habilita los botones si hay un partido seleccionado y ajusta el de pausa."""
+        en_vivo = self._en_vivo_seleccionado()
+        for boton in (self.btn_gol_local, self.btn_gol_visitante, self.btn_tarjeta_local,
+                      self.btn_tarjeta_visitante, self.btn_pausa, self.btn_finalizar):
+            boton.setEnabled(en_vivo is not None)
+        if en_vivo is not None and not en_vivo.en_marcha:
+            self.btn_pausa.setText(" " + translate("Resume"))
+        else:
+            self.btn_pausa.setText(" " + translate("Pause"))
+    
+    # ============ AUXILIARES ============
+    def _mostrar_eventos(self, en_vivo: PartidoEnVivo):
+        """Rellena la lista con los eventos del búfer del partido, del más reciente al más antiguo."""
+        self.lista_eventos.clear()
+        for evento in reversed(en_vivo.eventos):
+            equipo = en_vivo.local if evento.equipo == "local" else en_vivo.visitante
+            if evento.tipo == GOL:
+                texto = f"{evento.minuto}' ⚽ {evento.nombre} ({equipo})"
+            else:
+                icono = "🟥" if evento.detalle == "roja" else "🟨"
+                texto = f"{evento.minuto}' {icono} {evento.nombre} ({equipo})"
+            self.lista_eventos.addItem(texto)
+    
+    def _en_vivo_seleccionado(self) -> Optional[PartidoEnVivo]:
+        """Partido en juego seleccionado, o None."""
+        partido_id = self.partido_seleccionado()
+        return partidos_en_vivo.obtener(partido_id) if partido_id is not None else None
+    
+    def _fila(self, partido_id: int) -> int:
+        """Fila de un partido en la tabla, o -1."""
+        for fila in range(self.tabla.rowCount()):
+            if self.tabla.item(fila, self.COL_PARTIDO).data(Qt.UserRole) == partido_id:
+                return fila
+        return -1
+    
+    def _actualizar_visibilidad(self):
+        """Muestra el panel y recibe ticks solo mientras haya partidos en juego."""
+        hay_partidos = self.tabla.rowCount() > 0
+        self.setVisible(hay_partidos)
+        if hay_partidos:
+            planificador_ticks.suscribir(self, refrescar=self._refrescar_tiempos, widget=self)
+        else:
+            planificador_ticks.cancelar(self)
+        self._actualizar_botones()
@@ -0,0 +1,148 @@
+"""
+Planificador de Ticks
+Un único QTimer, alineado con el cambio de segundo del reloj del sistema,
+sustituye a los timers de 1 s de cada reloj. En cada tick se hacen primero
+las comprobaciones de todos los relojes (alarmas, fin de temporizador, minuto
+del partido) y después, en la misma pasada, se refrescan los displays de los
+que están a la vista; Qt agrupa esos cambios en un solo repintado. Los relojes
+ocultos o en ventanas minimizadas siguen comprobando pero no formatean ni
+repintan nada.
+"""
+import logging
+from typing import Callable, Optional
+from PySide6.QtCore import QObject, QTimer, QTime, Qt
+from PySide6.QtWidgets import QWidget
+
+logger = logging.getLogger(__name__)
+
+
+class _Suscripcion:
+    """Callbacks de un reloj suscrito al planificador."""
+    
+    __slots__ = ("comprobar", "refrescar", "widget")
+    
+    def __init__(self, comprobar: Optional[Callable], refrescar: Optional[Callable],
+                 widget: Optional[QWidget]):
+        self.comprobar = comprobar
+        self.refrescar = refrescar
+        self.widget = widget
+
+
+class PlanificadorTicks(QObject):
+    """
+    Timer compartido por todos los relojes (singleton).
+    
+    El timer solo está activo mientras haya suscripciones; cada tick se
+    programa para justo después del siguiente cambio de segundo.
+    """
+    
+    _instance = None  # Singleton
+    _initialized = False  # Flag de inicialización
+    
+    def __new__(cls):
+        """Implementar patrón Singleton."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+    
+    def __init__(self):
+        """Inicializar el planificador."""
+        if PlanificadorTicks._initialized:
+            return
+        
+        super().__init__()
+        PlanificadorTicks._initialized = True
+        self._suscripciones = {}  # clave -> _Suscripcion, en orden de suscripción
+        self._timer = None  # Se crea con la primera suscripción
+    
+    def suscribir(self, clave, comprobar: Callable = None, refrescar: Callable = None,
+                  widget: QWidget = None):
+        """
+        Suscribe un reloj a los ticks (o reemplaza su suscripción).
+        
+        Args:
+            clave: Objeto que identifica la suscripción (normalmente el propio reloj)
+            comprobar: Se llama en cada tick aunque el reloj no esté a la vista
+                (alarmas, fin de temporizador...)
+            refrescar: Actualiza el display; solo se llama si el widget es visible
+                y su ventana no está minimizada
+            widget: Widget del display; sin widget, refrescar se llama siempre.
+                Si el widget se destruye, la suscripción se cancela en el siguiente tick
+        """
+        self._suscripciones[clave] = _Suscripcion(comprobar, refrescar, widget)
+        self._programar()
+    
+    def cancelar(self, clave):
+        """Cancela la suscripción de un reloj; el timer se detiene si no queda ninguna."""
+        self._suscripciones.pop(clave, None)
+        if not self._suscripciones and self._timer is not None:
+            self._timer.stop()
+    
+    def suscrito(self, clave) -> bool:
+        """True si el reloj está suscrito."""
+        return clave in self._suscripciones
+    
+    def _programar(self):
+        """Arranca el timer para justo después del próximo cambio de segundo."""
+        if not self._suscripciones:
+            return
+        if self._timer is None:
+            self._timer = QTimer(self)
+            self._timer.setSingleShot(True)
+            # Un solo timer preciso: no dispara antes de tiempo y deja el segundo sin cambiar
+            self._timer.setTimerType(Qt.PreciseTimer)
+            self._timer.timeout.connect(self._on_tick)
+        if not self._timer.isActive():
+            self._timer.start(1000 - QTime.currentTime().msec() + 1)
+    
+    def _on_tick(self):
+        """Ejecuta las comprobaciones de todos los relojes y refresca los visibles."""
+        # Se programa el siguiente tick antes de llamar a nadie: si un callback
+        # abre un diálogo modal, los demás relojes siguen avanzando
+        self._programar()
+        suscripciones = list(self._suscripciones.items())
+        
+        for clave, suscripcion in suscripciones:
+            if not self._vivo(suscripcion.widget):
+                self.cancelar(clave)
+            elif suscripcion.comprobar and self._suscripciones.get(clave) is suscripcion:
+                self._llamar(suscripcion.comprobar)
+        
+        for clave, suscripcion in suscripciones:
+            if (suscripcion.refrescar and self._suscripciones.get(clave) is suscripcion
+                    and self._a_la_vista(suscripcion.widget)):
+                self._llamar(suscripcion.refrescar)
+    
+    @staticmethod
+    def _vivo(widget: Optional[QWidget]) -> bool:
+        """False si el widget ya se ha destruido en C++."""
+        if widget is None:
+            return True
+        try:
+            widget.objectName()
+            return True
+        except RuntimeError:
+            return False
+    
+    @staticmethod
+    def _a_la_vista(widget: Optional[QWidget]) -> bool:
+        """True si el widget se ve: visible y con su ventana sin minimizar."""
+        if widget is None:
+            return True
+        try:
+            return widget.isVisible() and not widget.window().isMinimized()
+        except RuntimeError:
+            # Widget ya destruido en C++
+            return False
+    
+    @staticmethod
+    def _llamar(callback: Callable):
+        """Llama a un callback sin que su error afecte a los demás relojes."""
+        try:
+            callback()
+        except Exception:
+            logger.exception("Error en un tick del reloj")
+
+
+# Instancia global del planificador
+planificador_ticks = PlanificadorTicks()
@@ -3,9 +3,13 @@ Componente de Reloj Digital Reutilizable
 Widget independiente que se puede integrar en cualquier aplicación PySide6
 """
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QComboBox, QTimeEdit, QSpinBox, QLineEdit, QMessageBox
-from PySide6.QtCore import Signal, QTimer, QTime, Qt
+from PySide6.QtCore import Signal, QTime, Qt
 from PySide6.QtGui import QPalette, QColor
 from RESOURCES.traduciones.translations import translate
+from COMPONENTS.motor_reloj import MotorReloj
+from COMPONENTS.planificador_ticks import planificador_ticks
+from COMPONENTS import notificaciones
+from COMPONENTS.notificaciones import notificar
 
 try:
     from PySide6.QtWidgets import QLCDNumber
@@ -21,13 +25,17 @@ class DigitalClockWidget(QWidget):
     - Cronómetro (cuenta hacia arriba)
     - Temporizador (cuenta hacia abajo desde un tiempo)
     - Modo Fútbol (cronómetro especial para partidos)
+    
+    El tiempo lo lleva un MotorReloj (reloj monótono); los ticks del
+    planificador compartido solo refrescan el display y hacen las
+    comprobaciones, así que un bloqueo de la interfaz no retrasa el reloj.
     """
     
     # Señales del componente
     alarmTriggered = Signal(str)      # Emite cuando se activa una alarma
     timerFinished = Signal()          # Emite cuando el temporizador termina
     timeUpdated = Signal(str)         # Emite cada actualización de tiempo
-    matchTimeUpdated = Signal(int)    # Emite minutos transcurridos en modo fútbol
+    matchTimeUpdated = Signal(int)    # Emite el minuto del partido en modo fútbol cuando cambia
     goalScored = Signal(str)          # Emite cuando se marca un gol ("local" o "visitante")
     
     # Modos de funcionamiento
@@ -43,7 +51,9 @@ class DigitalClockWidget(QWidget):
         self.current_mode = mode
         self.is_running = False
         self.is_paused = False
-        self.elapsed_seconds = 0
+        self.motor = MotorReloj()
+        self._ultimo_minuto = 0  # Último minuto emitido en matchTimeUpdated
+        self._ultimo_texto = None  # Último texto mostrado en el display
         self.timer_duration = 0
         self.format_24h = True
         self.alarm_time = None
@@ -52,13 +62,17 @@ class DigitalClockWidget(QWidget):
         self.score_local = 0
         self.score_visitante = 0
         
-        # Timer interno
-        self.internal_timer = QTimer(self)
-        self.internal_timer.timeout.connect(self._on_timer_tick)
         # Control para visibilidad externa del botón start
         self._show_start_button = True
 
         self.init_ui()
+    
+    @property
+    def elapsed_seconds(self):
+        """Segundos mostrados: transcurridos, o restantes en modo temporizador."""
+        if self.current_mode == self.MODE_TIMER:
+            return self.motor.restante(self.timer_duration)
+        return self.motor.segundos()
         
     def init_ui(self):
         """Inicializa la interfaz del usuario."""
@@ -312,9 +326,9 @@ class DigitalClockWidget(QWidget):
         
         # Iniciar timer para modos que lo necesitan
         if mode == self.MODE_CLOCK or mode == self.MODE_ALARM:
-            self.internal_timer.start(1000)
+            self._suscribir_ticks()
         else:
-            self.internal_timer.stop()
+            self._cancelar_ticks()
         
         # Actualizar combo box
         for i in range(self.mode_combo.count()):
@@ -346,7 +360,7 @@ class DigitalClockWidget(QWidget):
         """Actualiza la duración del temporizador."""
         self.timer_duration = value * 60  # Convertir minutos a segundos
         if not self.is_running:
-            self.elapsed_seconds = self.timer_duration
+            self.motor.reiniciar()
             self._update_display()
     
     def set_format_24h(self, is_24h):
@@ -364,7 +378,8 @@ class DigitalClockWidget(QWidget):
             self.btn_start.setEnabled(False)
             self.btn_pause.setEnabled(True)
             self.lbl_status.setText(translate("Running"))
-            self.internal_timer.start(1000)
+            self.motor.iniciar()
+            self._suscribir_ticks()
         else:
             # Iniciar
             if self.current_mode == self.MODE_TIMER and self.timer_duration == 0:
@@ -375,7 +390,8 @@ class DigitalClockWidget(QWidget):
             self.btn_start.setEnabled(False)
             self.btn_pause.setEnabled(True)
             self.lbl_status.setText(translate("Running"))
-            self.internal_timer.start(1000)
+            self.motor.iniciar()
+            self._suscribir_ticks()
     
     def on_pause(self):
         """Maneja la pausa."""
@@ -385,7 +401,9 @@ class DigitalClockWidget(QWidget):
             self.btn_start.setEnabled(True)
             self.btn_pause.setEnabled(False)
             self.lbl_status.setText(translate("Paused"))
-            self.internal_timer.stop()
+            self.motor.pausar()
+            self._cancelar_ticks()
+            self._update_display()
             
             # Mostrar mensaje de tiempo transcurrido en modo cronómetro
             if self.current_mode == self.MODE_CHRONOMETER:
@@ -400,12 +418,9 @@ class DigitalClockWidget(QWidget):
         """Reinicia el cronómetro/temporizador."""
         self.is_running = False
         self.is_paused = False
-        self.internal_timer.stop()
-        
-        if self.current_mode == self.MODE_TIMER:
-            self.elapsed_seconds = self.timer_duration
-        else:
-            self.elapsed_seconds = 0
+        self._cancelar_ticks()
+        self.motor.reiniciar()
+        self._ultimo_minuto = 0
         
         # Resetear marcador en modo fútbol
         if self.current_mode == self.MODE_FOOTBALL:
@@ -418,62 +433,63 @@ class DigitalClockWidget(QWidget):
         self.lbl_status.setText(translate("Ready"))
         self._update_display()
     
+    def _suscribir_ticks(self):
+        """Suscribe el reloj al planificador de ticks compartido."""
+        planificador_ticks.suscribir(self, comprobar=self._on_timer_tick,
+                                     refrescar=self._update_display, widget=self)
+    
+    def _cancelar_ticks(self):
+        """Deja de recibir ticks del planificador."""
+        planificador_ticks.cancelar(self)
+    
+    def showEvent(self, event):
+        """Al volver a mostrarse, el display se pone al día sin esperar al siguiente tick."""
+        super().showEvent(event)
+        self._update_display()
+    
     def _on_timer_tick(self):
-        """Actualización cada segundo."""
+        """
+        Comprobaciones de cada tick (alarma, minuto del partido, fin del
+        temporizador); se hacen aunque el reloj esté oculto. El display lo
+        refresca el planificador solo si el reloj está a la vista. El tiempo
+        se lee del motor, de modo que los ticks perdidos no afectan a la cuenta.
+        """
         current_time = QTime.currentTime()
         
-        if self.current_mode == self.MODE_CLOCK:
-            # Modo reloj: mostrar hora actual
-            self._update_display()
-            
-            # Verificar alarma
+        if self.current_mode == self.MODE_CLOCK or self.current_mode == self.MODE_ALARM:
+            # Modos reloj y alarma: verificar alarma
             if self.alarm_set and self.alarm_time and current_time >= self.alarm_time:
-                self._show_alarm_notification(self.alarm_message)
-                self.alarmTriggered.emit(self.alarm_message)
+                # Se desactiva antes de avisar para no repetir el aviso en el siguiente tick
                 self.alarm_set = False
                 self.lbl_status.setText("¡ALARMA!")
+                self._show_alarm_notification(self.alarm_message)
+                self.alarmTriggered.emit(self.alarm_message)
             
-        elif self.current_mode == self.MODE_CHRONOMETER or self.current_mode == self.MODE_FOOTBALL:
-            # Modo cronómetro: incrementar
-            self.elapsed_seconds += 1
-            self._update_display()
-            
-            # En modo fútbol, emitir minutos
-            if self.current_mode == self.MODE_FOOTBALL:
-                minutes = self.elapsed_seconds // 60
+        elif self.current_mode == self.MODE_FOOTBALL:
+            # En modo fútbol, emitir el minuto solo cuando cambia
+            minutes = self.motor.minutos()
+            if minutes != self._ultimo_minuto:
+                self._ultimo_minuto = minutes
                 self.matchTimeUpdated.emit(minutes)
             
         elif self.current_mode == self.MODE_TIMER:
-            # Modo temporizador: decrementar
-            if self.elapsed_seconds > 0:
-                self.elapsed_seconds -= 1
+            if self.is_running and self.elapsed_seconds == 0:
+                # Temporizador terminado
+                self.motor.pausar()
+                self._cancelar_ticks()
+                self.is_running = False
+                self.btn_start.setEnabled(True)
+                self.btn_pause.setEnabled(False)
+                self.lbl_status.setText(translate("Finished"))
                 self._update_display()
-                
-                if self.elapsed_seconds == 0:
-                    # Temporizador terminado
-                    self.internal_timer.stop()
-                    self.is_running = False
-                    self.btn_start.setEnabled(True)
-                    self.btn_pause.setEnabled(False)
-                    self.lbl_status.setText(translate("Finished"))
-                    # Mostrar mensaje de tiempo finalizado
-                    hours = self.timer_duration // 3600
-                    minutes = (self.timer_duration % 3600) // 60
-                    seconds = self.timer_duration % 60
-                    tiempo_formateado = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-                    mensaje = translate("Time finished") + f": {tiempo_formateado}"
-                    QMessageBox.information(self, translate("Timer Finished"), mensaje)
-                    self.timerFinished.emit()
-        
-        elif self.current_mode == self.MODE_ALARM:
-            # Modo alarma: mostrar hora actual y verificar alarma
-            self._update_display()
-            
-            if self.alarm_set and self.alarm_time and current_time >= self.alarm_time:
-                self._show_alarm_notification(self.alarm_message)
-                self.alarmTriggered.emit(self.alarm_message)
-                self.alarm_set = False
-                self.lbl_status.setText("¡ALARMA!")
+                # Mostrar mensaje de tiempo finalizado
+                hours = self.timer_duration // 3600
+                minutes = (self.timer_duration % 3600) // 60
+                seconds = self.timer_duration % 60
+                tiempo_formateado = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+                mensaje = translate("Time finished") + f": {tiempo_formateado}"
+                notificar(self, mensaje, translate("Timer Finished"), notificaciones.AVISO)
+                self.timerFinished.emit()
     
     def _update_display(self):
         """Actualiza el display con el tiempo actual."""
@@ -491,6 +507,11 @@ class DigitalClockWidget(QWidget):
             seconds = self.elapsed_seconds % 60
             time_text = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
         
+        # Si el texto no cambia no se repinta
+        if time_text == self._ultimo_texto:
+            return
+        self._ultimo_texto = time_text
+        
         # Actualizar display
         if self.lcd_display:
             self.lcd_display.display(time_text)
@@ -501,8 +522,8 @@ class DigitalClockWidget(QWidget):
         self.timeUpdated.emit(time_text)
     
     def _show_alarm_notification(self, message):
-        """Muestra una notificación de alarma."""
-        QMessageBox.information(self, " Alarma", message)
+        """Muestra una notificación de alarma (no modal: el reloj sigue su marcha)."""
+        notificar(self, message, " Alarma", notificaciones.AVISO, clave="alarma")
     
     def _update_score_display(self):
         """Actualiza el display del marcador."""
@@ -512,14 +533,16 @@ class DigitalClockWidget(QWidget):
         """Establece la duración del temporizador en segundos."""
         self.timer_duration = seconds
         if not self.is_running:
-            self.elapsed_seconds = seconds
+            self.motor.reiniciar()
             self._update_display()
+    
+    def get_elapsed_seconds(self):
         """Retorna el tiempo transcurrido en segundos."""
         return self.elapsed_seconds
     
     def get_elapsed_minutes(self):
         """Retorna los minutos transcurridos (útil para modo fútbol)."""
-        return self.elapsed_seconds // 60
+        return self.motor.minutos()
 
     def set_show_start_button(self, show: bool):
         """Permite mostrar u ocultar el botón de inicio desde código externo.
@@ -0,0 +1,369 @@
+"""
+Componente de Tabla Virtual
+Modelo de tabla por columnas (una lista por columna) detrás de un QTableView,
+con ordenación mediante proxy y carga progresiva de filas (canFetchMore/fetchMore).
+Sustituye a QTableWidget en las listas largas: no crea un QTableWidgetItem
+por celda y la vista solo pide los datos de las filas visibles.
+"""
+from typing import Callable, Dict, List, Optional
+from PySide6.QtWidgets import QTableView, QAbstractItemView, QHeaderView
+from PySide6.QtCore import (Qt, Signal, QAbstractTableModel, QModelIndex,
+                            QSortFilterProxyModel)
+import config
+
+# Rol con el valor sin formatear de la celda, usado para ordenar
+ROL_VALOR = Qt.UserRole
+
+
+class ModeloTablaColumnas(QAbstractTableModel):
+    """
+    Modelo de solo lectura que guarda los datos por columnas.
+    
+    Puede guardar más columnas de las que muestra (las que pasan de
+    len(cabeceras) quedan ocultas y sirven a los formatos). Los datos se
+    cargan de una vez, pero la vista los recibe por lotes de
+    config.FILAS_POR_LOTE a medida que se desplaza. La ordenación reordena
+    las columnas completas, así que no obliga a entregar todas las filas.
+    Las filas se pueden actualizar, insertar o quitar una a una por su id.
+    """
+    
+    def __init__(self, cabeceras: List[str],
+                 formatos: Optional[Dict[int, Callable]] = None,
+                 columna_id: int = 0, parent=None):
+        """
+        Args:
+            cabeceras: Títulos de las columnas visibles
+            formatos: {columna: función(valor, fila) -> str} para el texto
+                mostrado; sin formato se muestra str(valor). Se evalúan al
+                pintar, así que pueden traducir claves guardadas en la columna
+            columna_id: Columna con el id de cada fila
+            parent: Objeto padre
+        """
+        super().__init__(parent)
+        self._cabeceras = list(cabeceras)
+        self._formatos = formatos or {}
+        self._columna_id = columna_id
+        self._columnas = [[] for _ in self._cabeceras]
+        self._vacios = [""] * len(self._cabeceras)
+        self._total = 0
+        self._visibles = 0
+        self._orden = (-1, Qt.AscendingOrder)  # Última ordenación pedida
+    
+    def establecer_columnas(self, columnas: List[list]):
+        """
+        Sustituye todos los datos del modelo.
+        
+        Args:
+            columnas: Una lista de valores por columna, todas de la misma longitud
+        """
+        self.beginResetModel()
+        self._columnas = columnas if columnas else [[] for _ in self._cabeceras]
+        self._total = len(self._columnas[0]) if self._columnas else 0
+        self._visibles = min(self._total, config.FILAS_POR_LOTE)
+        self._calcular_vacios()
+        columna, orden = self._orden
+        if columna >= 0:
+            self._columnas = self._reordenar(self._permutacion(columna, orden))
+        self.endResetModel()
+    
+    def establecer_filas(self, filas: List[tuple]):
+        """Sustituye los datos a partir de una lista de filas (se transponen a columnas)."""
+        if filas:
+            self.establecer_columnas([list(columna) for columna in zip(*filas)])
+        else:
+            self.establecer_columnas([])
+    
+    def establecer_cabeceras(self, cabeceras: List[str]):
+        """Cambia los títulos de las columnas visibles (p. ej. al cambiar de idioma)."""
+        self._cabeceras = list(cabeceras)
+        self.headerDataChanged.emit(Qt.Horizontal, 0, len(self._cabeceras) - 1)
+    
+    def repintar(self):
+        """
+        Hace que la vista vuelva a pedir el texto de las filas que muestra,
+        sin tocar los datos (p. ej. al cambiar de idioma).
+        """
+        if self._visibles:
+            self.dataChanged.emit(self.index(0, 0),
+                                  self.index(self._visibles - 1, self.columnCount() - 1),
+                                  [Qt.DisplayRole])
+    
+    def fila_de_id(self, fila_id) -> int:
+        """Fila del modelo con ese id, o -1 si no está."""
+        try:
+            return self._columnas[self._columna_id].index(fila_id)
+        except (IndexError, ValueError):
+            return -1
+    
+    def actualizar_fila(self, fila_id, valores: tuple):
+        """
+        Sustituye la fila con ese id, o la añade si no estaba.
+        
+        Si hay una ordenación activa y el cambio la altera, la fila se mueve
+        a su nueva posición.
+        
+        Args:
+            fila_id: Id de la fila
+            valores: Valores de todas las columnas guardadas
+        """
+        fila = self.fila_de_id(fila_id)
+        if fila >= 0:
+            if self._en_orden(fila, valores):
+                for columna, valor in zip(self._columnas, valores):
+                    columna[fila] = valor
+                if fila < self._visibles:
+                    self.dataChanged.emit(self.index(fila, 0),
+                                          self.index(fila, self.columnCount() - 1))
+                return
+            self._quitar(fila)
+        self._insertar(valores)
+    
+    def eliminar_fila(self, fila_id) -> bool:
+        """
+        Quita la fila con ese id.
+        
+        Returns:
+            bool: True si la fila estaba en el modelo
+        """
+        fila = self.fila_de_id(fila_id)
+        if fila < 0:
+            return False
+        self._quitar(fila)
+        return True
+    
+    def ids_con_valor(self, columnas: List[int], valor) -> list:
+        """Ids de las filas en las que alguna de las columnas indicadas vale `valor`."""
+        if not self._total:
+            return []
+        ids = self._columnas[self._columna_id]
+        return [ids[fila] for fila in range(self._total)
+                if any(self._columnas[c][fila] == valor for c in columnas)]
+    
+    def valor(self, fila: int, columna: int):
+        """Valor sin formatear de una celda (fila del modelo, no de la vista)."""
+        return self._columnas[columna][fila]
+    
+    def total_filas(self) -> int:
+        """Número de filas cargadas, se estén mostrando ya o no."""
+        return self._total
+    
+    def cargar_todo(self):
+        """Entrega a la vista las filas que faltan."""
+        if self._visibles < self._total:
+            self.beginInsertRows(QModelIndex(), self._visibles, self._total - 1)
+            self._visibles = self._total
+            self.endInsertRows()
+    
+    # ---- Interfaz de QAbstractTableModel ----
+    
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._visibles
+    
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._cabeceras)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        fila = index.row()
+        columna = index.column()
+        valor = self._columnas[columna][fila]
+        
+        if role == Qt.DisplayRole:
+            formato = self._formatos.get(columna)
+            if formato is not None:
+                return formato(valor, fila)
+            return "" if valor is None else str(valor)
+        if role == ROL_VALOR:
+            return self._vacios[columna] if valor is None else valor
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal and section < len(self._cabeceras):
+            return self._cabeceras[section]
+        return super().headerData(section, orientation, role)
+    
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self._visibles < self._total
+    
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        hasta = min(self._total, self._visibles + config.FILAS_POR_LOTE)
+        if hasta > self._visibles:
+            self.beginInsertRows(QModelIndex(), self._visibles, hasta - 1)
+            self._visibles = hasta
+            self.endInsertRows()
+    
+    def sort(self, column, order=Qt.AscendingOrder):
+        """
+        Ordena todas las filas por una columna con una sola llamada a sorted().
+        
+        Las filas que ya tenía la vista se sustituyen por las primeras del
+        nuevo orden; el resto se sigue entregando con fetchMore().
+        """
+        self._orden = (column, order)
+        if column < 0 or column >= len(self._columnas) or self._total == 0:
+            return
+        
+        self.layoutAboutToBeChanged.emit()
+        permutacion = self._permutacion(column, order)
+        self._columnas = self._reordenar(permutacion)
+        
+        nueva_fila = [0] * self._total
+        for nueva, antigua in enumerate(permutacion):
+            nueva_fila[antigua] = nueva
+        anteriores = self.persistentIndexList()
+        self.changePersistentIndexList(
+            anteriores, [self.index(nueva_fila[i.row()], i.column()) for i in anteriores])
+        self.layoutChanged.emit()
+    
+    def _calcular_vacios(self):
+        """Valor con el que se ordenan los NULL de cada columna (Qt no compara None)."""
+        self._vacios = [0 if isinstance(next((v for v in columna if v is not None), ""), (int, float))
+                        else "" for columna in self._columnas]
+    
+    def _clave(self, columna: int, valor):
+        """Clave de ordenación de un valor (NULL como vacío, texto sin distinguir mayúsculas)."""
+        if valor is None:
+            return self._vacios[columna]
+        return valor.casefold() if isinstance(valor, str) else valor
+    
+    def _permutacion(self, columna: int, orden) -> List[int]:
+        """Filas actuales en el orden indicado."""
+        claves = [self._clave(columna, v) for v in self._columnas[columna]]
+        return sorted(range(self._total), key=claves.__getitem__,
+                      reverse=orden == Qt.DescendingOrder)
+    
+    def _en_orden(self, fila: int, valores: tuple) -> bool:
+        """Indica si la fila, con los nuevos valores, sigue en su sitio según la ordenación activa."""
+        columna, orden = self._orden
+        if columna < 0 or columna >= len(valores):
+            return True
+        clave = self._clave(columna, valores[columna])
+        anterior = self._clave(columna, self._columnas[columna][fila - 1]) if fila > 0 else None
+        siguiente = (self._clave(columna, self._columnas[columna][fila + 1])
+                     if fila + 1 < self._total else None)
+        if orden == Qt.DescendingOrder:
+            anterior, siguiente = siguiente, anterior
+        return ((anterior is None or anterior <= clave)
+                and (siguiente is None or clave <= siguiente))
+    
+    def _posicion(self, valores: tuple) -> int:
+        """Posición de una fila nueva: según la ordenación activa, o al final si no hay."""
+        columna, orden = self._orden
+        if columna < 0 or columna >= len(valores):
+            return self._total
+        clave = self._clave(columna, valores[columna])
+        descendente = orden == Qt.DescendingOrder
+        inicio, fin = 0, self._total
+        while inicio < fin:
+            medio = (inicio + fin) // 2
+            otra = self._clave(columna, self._columnas[columna][medio])
+            if (clave > otra) if descendente else (clave < otra):
+                fin = medio
+            else:
+                inicio = medio + 1
+        return inicio
+    
+    def _insertar(self, valores: tuple):
+        """Añade una fila; la vista solo se entera si cae entre las filas que ya muestra."""
+        if self._total == 0:
+            self._columnas = [[] for _ in valores]
+            self._vacios = [0 if isinstance(v, (int, float)) else "" for v in valores]
+        fila = self._posicion(valores)
+        visible = fila < self._visibles or self._visibles == self._total
+        if visible:
+            self.beginInsertRows(QModelIndex(), fila, fila)
+        for columna, valor in zip(self._columnas, valores):
+            columna.insert(fila, valor)
+        self._total += 1
+        if visible:
+            self._visibles += 1
+            self.endInsertRows()
+    
+    def _quitar(self, fila: int):
+        """Quita una fila por su posición en el modelo."""
+        visible = fila < self._visibles
+        if visible:
+            self.beginRemoveRows(QModelIndex(), fila, fila)
+        for columna in self._columnas:
+            del columna[fila]
+        self._total -= 1
+        if visible:
+            self._visibles -= 1
+            self.endRemoveRows()
+    
+    def _reordenar(self, permutacion: List[int]) -> List[list]:
+        """Aplica una permutación de filas a todas las columnas."""
+        return [[columna[i] for i in permutacion] for columna in self._columnas]
+
+
+class ProxyOrdenacion(QSortFilterProxyModel):
+    """
+    Proxy de ordenación de la tabla.
+    
+    Con un ModeloTablaColumnas delega la ordenación en el modelo, que ordena
+    las columnas de una vez en lugar de comparar celda a celda a través de
+    data(); con otros modelos ordena por el valor sin formatear.
+    """
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSortRole(ROL_VALOR)
+        self.setSortCaseSensitivity(Qt.CaseInsensitive)
+    
+    def sort(self, column, order=Qt.AscendingOrder):
+        fuente = self.sourceModel()
+        if isinstance(fuente, ModeloTablaColumnas):
+            fuente.sort(column, order)
+        else:
+            super().sort(column, order)
+
+
+class TablaVirtual(QTableView):
+    """
+    QTableView de solo lectura con un ModeloTablaColumnas y un ProxyOrdenacion.
+    
+    Ofrece la parte de la interfaz de QTableWidget que usan las vistas
+    (setHorizontalHeaderLabels, fila seleccionada, señal de selección).
+    """
+    
+    seleccion_cambiada = Signal()  # Emite cuando cambia la fila seleccionada
+    
+    def __init__(self, cabeceras: List[str],
+                 formatos: Optional[Dict[int, Callable]] = None,
+                 columna_id: int = 0, parent=None):
+        super().__init__(parent)
+        self.modelo = ModeloTablaColumnas(cabeceras, formatos, columna_id, self)
+        self.proxy = ProxyOrdenacion(self)
+        self.proxy.setSourceModel(self.modelo)
+        self.setModel(self.proxy)
+        
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        # Filas de altura fija: la vista no mide cada fila
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        # Sin columna de orden inicial: se respeta el orden de la consulta
+        self.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.setSortingEnabled(True)
+        
+        self.selectionModel().selectionChanged.connect(lambda *_: self.seleccion_cambiada.emit())
+        self.modelo.modelReset.connect(self.seleccion_cambiada.emit)
+    
+    def setHorizontalHeaderLabels(self, cabeceras: List[str]):
+        """Cambia los títulos de las columnas, como en QTableWidget."""
+        self.modelo.establecer_cabeceras(cabeceras)
+    
+    def fila_actual(self) -> int:
+        """Fila del modelo seleccionada, o -1 si no hay selección."""
+        filas = self.selectionModel().selectedRows()
+        if not filas:
+            return -1
+        return self.proxy.mapToSource(filas[0]).row()
+    
+    def valor_actual(self, columna: int):
+        """Valor sin formatear de la fila seleccionada, o None si no hay selección."""
+        fila = self.fila_actual()
+        return self.modelo.valor(fila, columna) if fila >= 0 else None
@@ -3,16 +3,20 @@ Controlador para la gestión de equipos.
 Maneja la lógica de negocio de equipos.
 """
 
-from PySide6.QtSql import QSqlQuery
+from PySide6.QtSql import QSqlDatabase
 from MODELS.equipo import Equipo
-from typing import List, Optional
+from MODELS.participante import Participante
+from MODELS.database import crear_query
+from MODELS import eventos
+from typing import Iterable, List, Optional, Tuple
 
 
 class EquiposController:
     """Controlador para operaciones de equipos."""
     
     @staticmethod
-    def crear_equipo(nombre: str, curso: str, color: str, logo: Optional[str] = None) -> Equipo:
+    def crear_equipo(nombre: str, curso: str, color: str, logo: Optional[str] = None,
+                     db: QSqlDatabase = None) -> Equipo:
         """
         Crea un nuevo equipo.
         
@@ -21,6 +25,7 @@ class EquiposController:
             curso: Curso del equipo
             color: Color de la camiseta
             logo: Ruta del logo 
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             Equipo creado
@@ -29,13 +34,37 @@ class EquiposController:
             ValueError: Si los datos no son válidos
         """
         equipo = Equipo(nombre=nombre, curso=curso, color_camiseta=color, logo=logo)
-        if equipo.guardar():
+        if equipo.guardar(db):
             return equipo
         raise ValueError("No se pudo crear el equipo")
     
+    @staticmethod
+    def crear_equipos(datos: Iterable[dict], db: QSqlDatabase = None) -> List[int]:
+        """
+        Crea muchos equipos en una sola transacción (ver Equipo.crear_equipos).
+        
+        Args:
+            datos: Diccionarios con los argumentos de crear_equipo()
+                (nombre, curso, color y, opcional, logo)
+            db: Conexión a usar (por defecto la del hilo actual)
+        
+        Returns:
+            IDs de los equipos creados, en el orden de entrada
+        
+        Raises:
+            ValueError: Si algún equipo no es válido o no se pudieron crear
+        """
+        equipos = [Equipo(nombre=d['nombre'], curso=d['curso'], color_camiseta=d['color'],
+                          logo=d.get('logo')) for d in datos]
+        ids = Equipo.crear_equipos(equipos, db)
+        if ids is None:
+            raise ValueError("No se pudieron crear los equipos")
+        return ids
+    
     @staticmethod
     def actualizar_equipo(equipo_id: int, nombre: str = None, curso: str = None, 
-                         color: str = None, logo: str = None) -> Optional[Equipo]:
+                         color: str = None, logo: str = None,
+                          db: QSqlDatabase = None) -> Optional[Equipo]:
         """
         Actualiza un equipo existente.
         
@@ -45,11 +74,12 @@ class EquiposController:
             curso: Nuevo curso (opcional)
             color: Nuevo color (opcional)
             logo: Nuevo logo (opcional)
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             Equipo actualizado o None
         """
-        equipo = Equipo.obtener_por_id(equipo_id)
+        equipo = Equipo.obtener_por_id(equipo_id, db=db)
         if not equipo:
             return None
         
@@ -62,120 +92,142 @@ class EquiposController:
         if logo is not None:
             equipo.logo = logo
         
-        if equipo.guardar():
+        if equipo.guardar(db):
             return equipo
         return None
     
     @staticmethod
-    def eliminar_equipo(equipo_id: int) -> bool:
+    def eliminar_equipo(equipo_id: int, db: QSqlDatabase = None) -> bool:
         """
         Elimina un equipo.
         
         Args:
             equipo_id: ID del equipo
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             True si se eliminó correctamente
         """
-        equipo = Equipo.obtener_por_id(equipo_id)
+        equipo = Equipo.obtener_por_id(equipo_id, db=db)
         if equipo:
-            return equipo.eliminar()
+            return equipo.eliminar(db)
         return False
     
     @staticmethod
-    def obtener_equipo(equipo_id: int) -> Optional[Equipo]:
+    def obtener_equipo(equipo_id: int, db: QSqlDatabase = None) -> Optional[Equipo]:
         """
         Obtiene un equipo por ID.
         
         Args:
             equipo_id: ID del equipo
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             Equipo o None
         """
-        return Equipo.obtener_por_id(equipo_id)
+        return Equipo.obtener_por_id(equipo_id, db=db)
     
     @staticmethod
-    def obtener_todos_equipos(solo_activos: bool = True) -> List[Equipo]:
+    def obtener_todos_equipos(solo_activos: bool = True, db: QSqlDatabase = None) -> List[Equipo]:
         """
         Obtiene todos los equipos.
         
         Args:
             solo_activos: Si True, solo retorna equipos activos
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             Lista de equipos
         """
-        return Equipo.obtener_todos(solo_activos)
+        return Equipo.obtener_todos(solo_activos, db=db)
     
     @staticmethod
-    def asignar_jugador_a_equipo(equipo_id: int, participante_id: int) -> bool:
+    def asignar_jugador_a_equipo(equipo_id: int, participante_id: int, db: QSqlDatabase = None) -> bool:
         """
         Asigna un jugador a un equipo.
         
         Args:
             equipo_id: ID del equipo
             participante_id: ID del participante
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             True si se asignó correctamente
         """
-        query = QSqlQuery()
+        query = crear_query(db)
         query.prepare("""
             INSERT OR IGNORE INTO equipo_participante (equipo_id, participante_id)
             VALUES (?, ?)
         """)
         query.addBindValue(equipo_id)
         query.addBindValue(participante_id)
-        return query.exec()
+        if not query.exec():
+            return False
+        eventos.publicar(eventos.PLANTILLA, equipo_id, eventos.CREADO, db, participante_id=participante_id)
+        return True
     
     @staticmethod
-    def desasignar_jugador_de_equipo(equipo_id: int, participante_id: int) -> bool:
+    def asignar_jugadores(asignaciones: Iterable[Tuple[int, int]], db: QSqlDatabase = None) -> Optional[int]:
+        """
+        Asigna muchos jugadores a sus equipos en una sola transacción.
+        
+        Args:
+            asignaciones: Pares (equipo_id, participante_id)
+            db: Conexión a usar (por defecto la del hilo actual)
+        
+        Returns:
+            Número de asignaciones nuevas, o None si no se pudieron hacer
+        """
+        return Participante.asignar_jugadores(asignaciones, db)
+    
+    @staticmethod
+    def desasignar_jugador_de_equipo(equipo_id: int, participante_id: int,
+                                     db: QSqlDatabase = None) -> bool:
         """
         Desasigna un jugador de un equipo.
         
         Args:
             equipo_id: ID del equipo
             participante_id: ID del participante
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             True si se desasignó correctamente
         """
-        query = QSqlQuery()
+        query = crear_query(db)
         query.prepare("""
             DELETE FROM equipo_participante 
             WHERE equipo_id = ? AND participante_id = ?
         """)
         query.addBindValue(equipo_id)
         query.addBindValue(participante_id)
-        return query.exec()
+        if not query.exec():
+            return False
+        eventos.publicar(eventos.PLANTILLA, equipo_id, eventos.ELIMINADO, db, participante_id=participante_id)
+        return True
     
     @staticmethod
-    def obtener_jugadores_equipo(equipo_id: int) -> List[dict]:
+    def obtener_jugadores_equipo(equipo_id: int, db: QSqlDatabase = None) -> List[dict]:
         """
         Obtiene todos los jugadores de un equipo.
         
         Args:
             equipo_id: ID del equipo
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             Lista de diccionarios con datos de jugadores
         """
         jugadores = []
-        query = QSqlQuery()
+        query = crear_query(db)
         query.prepare("""
             SELECT p.id, p.nombre, p.posicion, 
-                   COALESCE((SELECT COUNT(*) FROM goles WHERE participante_id = p.id), 0) as goles,
-                   COALESCE((
-                       SELECT SUM(CASE WHEN tipo = 'amarilla' THEN 1 ELSE 0 END) 
-                       FROM tarjetas WHERE participante_id = p.id
-                   ), 0) as amarillas,
-                   COALESCE((
-                       SELECT SUM(CASE WHEN tipo = 'roja' THEN 1 ELSE 0 END) 
-                       FROM tarjetas WHERE participante_id = p.id
-                   ), 0) as rojas
+                   COALESCE(s.goles, 0) as goles,
+                   COALESCE(s.amarillas, 0) as amarillas,
+                   COALESCE(s.rojas, 0) as rojas
             FROM participantes p
             INNER JOIN equipo_participante ep ON p.id = ep.participante_id
+            LEFT JOIN estadisticas_participante s ON p.id = s.participante_id
             WHERE ep.equipo_id = ? AND p.es_jugador = 1 AND p.activo = 1
             ORDER BY p.nombre
         """)
@@ -195,12 +247,13 @@ class EquiposController:
         return jugadores
     
     @staticmethod
-    def obtener_estadisticas_equipo(equipo_id: int) -> dict:
+    def obtener_estadisticas_equipo(equipo_id: int, db: QSqlDatabase = None) -> dict:
         """
         Obtiene estadísticas completas de un equipo.
         
         Args:
             equipo_id: ID del equipo
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             Diccionario con estadísticas
@@ -216,27 +269,12 @@ class EquiposController:
             'puntos': 0
         }
         
-        query = QSqlQuery()
+        query = crear_query(db)
         query.prepare("""
-            SELECT 
-                COUNT(*) as partidos,
-                SUM(CASE WHEN finalizado = 1 AND (
-                    (equipo_local_id = ? AND goles_local > goles_visitante) OR
-                    (equipo_visitante_id = ? AND goles_visitante > goles_local)
-                ) THEN 1 ELSE 0 END) as ganados,
-                SUM(CASE WHEN finalizado = 1 AND goles_local = goles_visitante THEN 1 ELSE 0 END) as empatados,
-                SUM(CASE WHEN finalizado = 1 AND (
-                    (equipo_local_id = ? AND goles_local < goles_visitante) OR
-                    (equipo_visitante_id = ? AND goles_visitante < goles_local)
-                ) THEN 1 ELSE 0 END) as perdidos,
-                SUM(CASE WHEN equipo_local_id = ? THEN goles_local WHEN equipo_visitante_id = ? THEN goles_visitante ELSE 0 END) as goles_favor,
-                SUM(CASE WHEN equipo_local_id = ? THEN goles_visitante WHEN equipo_visitante_id = ? THEN goles_local ELSE 0 END) as goles_contra
-            FROM partidos
-            WHERE (equipo_local_id = ? OR equipo_visitante_id = ?) AND finalizado = 1
+            SELECT pj, pg, pe, pp, gf, gc, dg, pts
+            FROM clasificacion WHERE equipo_id = ?
         """)
-        
-        for _ in range(9):
-            query.addBindValue(equipo_id)
+        query.addBindValue(equipo_id)
         
         if query.exec() and query.next():
             stats['partidos_jugados'] = query.value(0) or 0
@@ -245,8 +283,8 @@ class EquiposController:
             stats['partidos_perdidos'] = query.value(3) or 0
             stats['goles_favor'] = query.value(4) or 0
             stats['goles_contra'] = query.value(5) or 0
-            stats['diferencia_goles'] = stats['goles_favor'] - stats['goles_contra']
-            stats['puntos'] = (stats['partidos_ganados'] * 3) + (stats['partidos_empatados'] * 1)
+            stats['diferencia_goles'] = query.value(6) or 0
+            stats['puntos'] = query.value(7) or 0
         
         return stats
 
@@ -0,0 +1,427 @@
+"""
+Importador de equipos, participantes y plantillas desde CSV.
+Sustituye al alta uno a uno con EquipoDialog, ParticipanteDialog y
+AsignarJugadorDialog cuando hay que dar de alta un colegio entero.
+
+- Lee el fichero por streaming (módulo csv sobre un generador de líneas):
+  la memoria no depende del número de filas, solo del lote en curso y del
+  índice de duplicados.
+- Valida cada fila con RESOURCES/utilidades.Validador y con las mismas
+  reglas de los modelos; las filas rechazadas se cuentan, se guardan las
+  primeras en el resultado y, si se indica, se escriben todas en un CSV
+  de rechazos con su línea y el motivo.
+- Detecta duplicados (en la BD y dentro del propio fichero) con un índice
+  hash en memoria: nombre normalizado (sin tildes, mayúsculas ni espacios
+  repetidos) más fecha de nacimiento para participantes, nombre
+  normalizado para equipos.
+- Escribe por lotes de TAMANO_LOTE filas, cada uno en una transacción, con
+  las altas en lote de los modelos; un lote que falla se deshace entero y
+  sus filas pasan a rechazadas.
+
+Columnas (cabecera obligatoria, sin importar mayúsculas ni tildes; se
+acepta ',' o ';' como separador):
+    equipos:        nombre, curso, [color_camiseta | color], [logo]
+    participantes:  nombre, fecha_nacimiento, curso, [es_jugador], [es_arbitro],
+                    [posicion], [equipo]
+    plantillas:     equipo, nombre, fecha_nacimiento
+
+Las fechas pueden ir como AAAA-MM-DD o DD/MM/AAAA. Sin columnas es_jugador
+ni es_arbitro, los participantes se dan de alta como jugadores; con la
+columna equipo quedan además inscritos en ese equipo, que debe existir.
+
+Uso:
+    importador = ImportadorCSV(TIPO_PARTICIPANTES, ruta_rechazos="rechazos.csv")
+    resultado = importador.importar("alumnos.csv")
+"""
+
+import csv
+import hashlib
+import itertools
+import logging
+import os
+import unicodedata
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Callable, Iterator, List, Optional, Tuple
+from PySide6.QtSql import QSqlDatabase
+from MODELS.database import crear_query, transaccion
+from MODELS.equipo import Equipo
+from MODELS.participante import Participante
+from RESOURCES.utilidades import Validador
+
+logger = logging.getLogger(__name__)
+
+# Tipos de fichero
+TIPO_EQUIPOS = "equipos"
+TIPO_PARTICIPANTES = "participantes"
+TIPO_PLANTILLAS = "plantillas"
+TIPOS = (TIPO_EQUIPOS, TIPO_PARTICIPANTES, TIPO_PLANTILLAS)
+
+# Columnas que debe tener la cabecera de cada tipo (ya normalizadas)
+COLUMNAS_OBLIGATORIAS = {
+    TIPO_EQUIPOS: ("nombre", "curso"),
+    TIPO_PARTICIPANTES: ("nombre", "fecha_nacimiento", "curso"),
+    TIPO_PLANTILLAS: ("equipo", "nombre", "fecha_nacimiento"),
+}
+
+# Otros nombres aceptados en la cabecera
+ALIAS_COLUMNAS = {
+    "color": "color_camiseta",
+    "fecha": "fecha_nacimiento",
+    "fecha_de_nacimiento": "fecha_nacimiento",
+    "nacimiento": "fecha_nacimiento",
+    "jugador": "es_jugador",
+    "arbitro": "es_arbitro",
+}
+
+# Formatos de fecha aceptados (al estilo de Qt, ver Validador.validar_fecha)
+FORMATOS_FECHA = ("yyyy-MM-dd", "dd/MM/yyyy", "dd-MM-yyyy")
+_FORMATOS_STRPTIME = tuple(Validador.formato_strptime(formato) for formato in FORMATOS_FECHA)
+
+# Valores que cuentan como "sí" en es_jugador y es_arbitro (ya normalizados)
+VALORES_SI = {"1", "si", "s", "x", "true", "yes", "y"}
+
+# Filas escritas en cada transacción
+TAMANO_LOTE = 1000
+
+# Rechazos que se guardan en el resultado (todos van al CSV de rechazos)
+MAX_RECHAZOS_EN_MEMORIA = 100
+
+
+def normalizar_texto(texto: str) -> str:
+    """Texto sin tildes, en minúsculas y con los espacios simplificados (para comparar nombres)."""
+    if not texto.isascii():
+        descompuesto = unicodedata.normalize("NFKD", texto)
+        texto = "".join(c for c in descompuesto if not unicodedata.combining(c))
+    return " ".join(texto.casefold().split())
+
+
+def clave_participante(nombre: str, fecha_nacimiento: str) -> bytes:
+    """
+    Clave del índice de duplicados de participantes: hash de 8 bytes del
+    nombre normalizado y la fecha de nacimiento (AAAA-MM-DD).
+    """
+    texto = f"{normalizar_texto(nombre)}|{fecha_nacimiento}"
+    return hashlib.blake2b(texto.encode("utf-8"), digest_size=8).digest()
+
+
+def normalizar_fecha(fecha: str) -> Optional[str]:
+    """Fecha en AAAA-MM-DD a partir de cualquiera de FORMATOS_FECHA, o None si no es válida."""
+    fecha = fecha.strip()
+    # AAAA-MM-DD es el caso habitual y date.fromisoformat es mucho más rápido que strptime
+    if len(fecha) == 10 and fecha[4] == "-":
+        try:
+            return date.fromisoformat(fecha).isoformat()
+        except ValueError:
+            return None
+    for formato in _FORMATOS_STRPTIME:
+        try:
+            return datetime.strptime(fecha, formato).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+@dataclass
+class ResultadoImportacion:
+    """Resumen de una importación."""
+    
+    tipo: str
+    leidas: int = 0  # Filas de datos leídas (sin contar la cabecera ni las vacías)
+    importadas: int = 0  # Equipos o participantes creados, o asignaciones pedidas (plantillas)
+    asignaciones: int = 0  # Asignaciones a equipos nuevas
+    rechazadas: int = 0  # Filas no importadas, incluidas las duplicadas
+    duplicadas: int = 0
+    cancelada: bool = False
+    rechazos: List[Tuple[int, str]] = field(default_factory=list)  # (línea, motivo), los primeros
+    ruta_rechazos: Optional[str] = None  # CSV con todas las filas rechazadas, si hubo
+
+
+class ImportadorCSV:
+    """
+    Importa un CSV de equipos, participantes o plantillas por lotes.
+    
+    Uso:
+        importador = ImportadorCSV(TIPO_EQUIPOS, progreso=mostrar_progreso)
+        resultado = importador.importar("equipos.csv")
+    """
+    
+    def __init__(self, tipo: str, tamano_lote: int = TAMANO_LOTE,
+                 progreso: Optional[Callable[[ResultadoImportacion, float], Optional[bool]]] = None,
+                 ruta_rechazos: Optional[str] = None, codificacion: str = "utf-8-sig",
+                 delimitador: Optional[str] = None):
+        """
+        Args:
+            tipo: TIPO_EQUIPOS, TIPO_PARTICIPANTES o TIPO_PLANTILLAS
+            tamano_lote: Filas escritas en cada transacción
+            progreso: Se llama tras cada lote con el resultado parcial y la
+                fracción del fichero leída (0 a 1); si devuelve False, la
+                importación se detiene (los lotes ya escritos se quedan)
+            ruta_rechazos: CSV donde escribir las filas rechazadas (solo se
+                crea si hay alguna)
+            codificacion: Codificación del fichero (p. ej. 'cp1252' para CSV de Excel antiguos)
+            delimitador: Separador de campos (por defecto se deduce de la cabecera)
+        
+        Raises:
+            ValueError: Si algún parámetro no es válido
+        """
+        if tipo not in TIPOS:
+            raise ValueError(f"Tipo de importación no válido: {tipo}")
+        if tamano_lote < 1:
+            raise ValueError("El tamaño de lote debe ser al menos 1")
+        
+        self.tipo = tipo
+        self.tamano_lote = tamano_lote
+        self.progreso = progreso
+        self.ruta_rechazos = ruta_rechazos
+        self.codificacion = codificacion
+        self.delimitador = delimitador
+        
+        self._equipos = {}  # nombre normalizado -> id (None si está inactivo o pendiente de escribir)
+        self._participantes = {}  # clave_participante -> id (None si está pendiente de escribir)
+        self._bytes_leidos = 0
+        self._fichero_rechazos = None
+        self._escritor_rechazos = None
+        self._cabecera = []
+    
+    def importar(self, ruta: str, db: QSqlDatabase = None) -> ResultadoImportacion:
+        """
+        Importa el fichero.
+        
+        Args:
+            ruta: CSV a importar
+            db: Conexión a usar (por defecto la del hilo actual)
+        
+        Returns:
+            ResultadoImportacion
+        
+        Raises:
+            ValueError: Si el fichero está vacío, no se puede decodificar o
+                le faltan columnas obligatorias
+        """
+        resultado = ResultadoImportacion(self.tipo)
+        total_bytes = max(os.path.getsize(ruta), 1)
+        self._bytes_leidos = 0
+        
+        try:
+            with open(ruta, "rb") as fichero:
+                lineas = self._lineas(fichero)
+                primera = next(lineas, None)
+                if primera is None:
+                    raise ValueError("El fichero está vacío")
+                delimitador = self.delimitador or (";" if primera.count(";") > primera.count(",") else ",")
+                lector = csv.reader(itertools.chain([primera], lineas), delimiter=delimitador)
+                
+                self._cabecera = next(lector)
+                columnas = [self._normalizar_columna(columna) for columna in self._cabecera]
+                faltan = [c for c in COLUMNAS_OBLIGATORIAS[self.tipo] if c not in columnas]
+                if faltan:
+                    raise ValueError(f"Faltan columnas obligatorias: {', '.join(faltan)}")
+                
+                self._cargar_indices(db)
+                lote = []
+                for valores in lector:
+                    if not any(valor.strip() for valor in valores):
+                        continue
+                    resultado.leidas += 1
+                    linea = lector.line_num
+                    registro, motivo = self._validar(dict(zip(columnas, valores)))
+                    if motivo:
+                        self._rechazar(resultado, linea, valores, motivo, duplicada=motivo == "Duplicado")
+                        continue
+                    
+                    lote.append((linea, valores, registro))
+                    if len(lote) >= self.tamano_lote:
+                        self._escribir(lote, resultado, db)
+                        lote = []
+                        if not self._avisar(resultado, self._bytes_leidos / total_bytes):
+                            resultado.cancelada = True
+                            break
+                
+                if lote and not resultado.cancelada:
+                    self._escribir(lote, resultado, db)
+        finally:
+            self._cerrar_rechazos()
+        
+        self._avisar(resultado, 1.0)
+        logger.info(f"Importación de {self.tipo} desde {ruta}: {resultado.leidas} filas, "
+                    f"{resultado.importadas} importadas, {resultado.rechazadas} rechazadas "
+                    f"({resultado.duplicadas} duplicadas)" + (", cancelada" if resultado.cancelada else ""))
+        return resultado
+    
+    def _lineas(self, fichero) -> Iterator[str]:
+        """Líneas decodificadas del fichero, contando los bytes leídos para el progreso."""
+        for numero, linea in enumerate(fichero, 1):
+            self._bytes_leidos += len(linea)
+            try:
+                yield linea.decode(self.codificacion)
+            except UnicodeDecodeError:
+                raise ValueError(f"La línea {numero} no está en {self.codificacion}; "
+                                 "indique la codificación del fichero (p. ej. cp1252)")
+    
+    @staticmethod
+    def _normalizar_columna(columna: str) -> str:
+        """Nombre de columna de la cabecera en la forma de COLUMNAS_OBLIGATORIAS."""
+        nombre = normalizar_texto(columna).replace(" ", "_")
+        return ALIAS_COLUMNAS.get(nombre, nombre)
+    
+    def _cargar_indices(self, db: QSqlDatabase = None):
+        """Carga los equipos y participantes de la BD en los índices de duplicados."""
+        self._equipos.clear()
+        self._participantes.clear()
+        query = crear_query(db)
+        query.setForwardOnly(True)
+        
+        # Todos los equipos: el nombre es único también entre los dados de baja
+        query.exec("SELECT id, nombre, activo FROM equipos")
+        while query.next():
+            self._equipos[normalizar_texto(query.value(1))] = query.value(0) if query.value(2) else None
+        
+        if self.tipo != TIPO_EQUIPOS:
+            query.exec("SELECT id, nombre, fecha_nacimiento FROM participantes WHERE activo = 1")
+            while query.next():
+                self._participantes[clave_participante(query.value(1), query.value(2) or "")] = query.value(0)
+        query.finish()
+    
+    @staticmethod
+    def _si(valor: Optional[str]) -> int:
+        """1 si el valor de una columna sí/no es afirmativo."""
+        return 1 if normalizar_texto(valor or "") in VALORES_SI else 0
+    
+    def _validar(self, fila: dict) -> Tuple[Optional[tuple], Optional[str]]:
+        """
+        Valida una fila y la apunta en el índice de duplicados.
+        
+        Returns:
+            (registro a escribir, None) o (None, motivo del rechazo)
+        """
+        nombre = fila.get("nombre", "").strip()
+        if not Validador.validar_nombre(nombre):
+            return None, "Nombre no válido"
+        
+        if self.tipo == TIPO_EQUIPOS:
+            clave = normalizar_texto(nombre)
+            if clave in self._equipos:
+                return None, "Duplicado"
+            try:
+                equipo = Equipo(nombre=nombre, curso=fila.get("curso", "").strip(),
+                                color_camiseta=fila.get("color_camiseta", "").strip(),
+                                logo=fila.get("logo", "").strip() or None)
+            except ValueError as e:
+                return None, str(e)
+            self._equipos[clave] = None
+            return (clave, equipo), None
+        
+        fecha = normalizar_fecha(fila.get("fecha_nacimiento", ""))
+        if fecha is None:
+            return None, "Fecha de nacimiento no válida"
+        clave = clave_participante(nombre, fecha)
+        
+        equipo_id = None
+        equipo = fila.get("equipo", "").strip()
+        if equipo:
+            equipo_id = self._equipos.get(normalizar_texto(equipo))
+            if equipo_id is None:
+                return None, f"Equipo no encontrado: {equipo}"
+        
+        if self.tipo == TIPO_PLANTILLAS:
+            if equipo_id is None:
+                return None, "Falta el equipo"
+            participante_id = self._participantes.get(clave)
+            if participante_id is None:
+                return None, "Participante no encontrado"
+            return (equipo_id, participante_id), None
+        
+        if clave in self._participantes:
+            return None, "Duplicado"
+        con_tipo = "es_jugador" in fila or "es_arbitro" in fila
+        try:
+            participante = Participante(
+                nombre=nombre,
+                fecha_nacimiento=fecha,
+                curso=fila.get("curso", "").strip(),
+                es_jugador=self._si(fila.get("es_jugador")) if con_tipo else 1,
+                es_arbitro=self._si(fila.get("es_arbitro")),
+                posicion=fila.get("posicion", "").strip() or None
+            )
+        except ValueError as e:
+            return None, str(e)
+        if equipo_id is not None and not participante.es_jugador:
+            return None, "Solo los jugadores pueden estar en un equipo"
+        self._participantes[clave] = None
+        return (clave, participante, equipo_id), None
+    
+    def _escribir(self, lote: list, resultado: ResultadoImportacion, db: QSqlDatabase = None):
+        """Escribe un lote de filas válidas en una transacción; si falla, las rechaza todas."""
+        registros = [registro for _, _, registro in lote]
+        try:
+            with transaccion(db):
+                if self.tipo == TIPO_EQUIPOS:
+                    ids = Equipo.crear_equipos([equipo for _, equipo in registros], db)
+                    if ids is None:
+                        raise Exception("no se pudieron crear los equipos")
+                    asignaciones = []
+                elif self.tipo == TIPO_PARTICIPANTES:
+                    ids = Participante.crear_participantes([p for _, p, _ in registros], db)
+                    if ids is None:
+                        raise Exception("no se pudieron crear los participantes")
+                    asignaciones = [(equipo_id, participante_id)
+                                    for (_, _, equipo_id), participante_id in zip(registros, ids)
+                                    if equipo_id is not None]
+                else:
+                    ids = None
+                    asignaciones = registros
+                
+                nuevas = Participante.asignar_jugadores(asignaciones, db) if asignaciones else 0
+                if nuevas is None:
+                    raise Exception("no se pudieron asignar los jugadores")
+        except Exception as e:
+            for linea, valores, registro in lote:
+                if self.tipo == TIPO_EQUIPOS:
+                    self._equipos.pop(registro[0], None)
+                elif self.tipo == TIPO_PARTICIPANTES:
+                    self._participantes.pop(registro[0], None)
+                self._rechazar(resultado, linea, valores, f"Error al guardar: {e}")
+            return
+        
+        # Los ids generados completan el índice (para las filas siguientes)
+        if self.tipo == TIPO_EQUIPOS:
+            for (clave, _), equipo_id in zip(registros, ids):
+                self._equipos[clave] = equipo_id
+        elif self.tipo == TIPO_PARTICIPANTES:
+            for (clave, _, _), participante_id in zip(registros, ids):
+                self._participantes[clave] = participante_id
+        resultado.importadas += len(lote)
+        resultado.asignaciones += nuevas
+    
+    def _rechazar(self, resultado: ResultadoImportacion, linea: int, valores: list, motivo: str,
+                  duplicada: bool = False):
+        """Cuenta una fila rechazada y la escribe en el CSV de rechazos."""
+        resultado.rechazadas += 1
+        if duplicada:
+            resultado.duplicadas += 1
+        if len(resultado.rechazos) < MAX_RECHAZOS_EN_MEMORIA:
+            resultado.rechazos.append((linea, motivo))
+        
+        if self.ruta_rechazos is None:
+            return
+        if self._escritor_rechazos is None:
+            # utf-8-sig para que Excel reconozca las tildes
+            self._fichero_rechazos = open(self.ruta_rechazos, "w", newline="", encoding="utf-8-sig")
+            self._escritor_rechazos = csv.writer(self._fichero_rechazos)
+            self._escritor_rechazos.writerow(["linea", "motivo"] + self._cabecera)
+            resultado.ruta_rechazos = self.ruta_rechazos
+        self._escritor_rechazos.writerow([linea, motivo] + valores)
+    
+    def _cerrar_rechazos(self):
+        """Cierra el CSV de rechazos si se abrió."""
+        if self._fichero_rechazos is not None:
+            self._fichero_rechazos.close()
+        self._fichero_rechazos = None
+        self._escritor_rechazos = None
+    
+    def _avisar(self, resultado: ResultadoImportacion, fraccion: float) -> bool:
+        """Informa del progreso; devuelve False si hay que cancelar."""
+        if self.progreso is None:
+            return True
+        return self.progreso(resultado, min(fraccion, 1.0)) is not False
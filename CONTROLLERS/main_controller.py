@@ -3,9 +3,10 @@ Controlador principal de la aplicación
 Gestiona la interacción entre la vista principal, el reloj digital y la aplicación
 """
 from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import QTimer, QTime
+from PySide6.QtCore import QTime
 from VIEWS.main_window import MainWindow
 from COMPONENTS.reloj_digital import DigitalClockWidget
+from COMPONENTS.motor_reloj import MotorReloj
 
 
 class MainWindowController:
@@ -20,8 +21,10 @@ class MainWindowController:
         
         # Configurar el reloj en modo reloj por defecto
         self.mode = 'clock'  # 'clock', 'timer', 'stopwatch'
-        self.timer_value = 0
+        self.timer_value = 0  # Duración del temporizador en segundos
         self.is_running = False
+        # El tiempo se mide con el motor; los ticks solo refrescan el display
+        self.motor = MotorReloj()
         
         if self.clock_widget:
             # Conectar el widget del reloj al controlador
@@ -42,8 +45,15 @@ class MainWindowController:
         self.clock_widget.update_status("Reloj activo")
         self.clock_widget.set_controls_enabled(False, False, False)
     
+    def check_time(self):
+        """Comprobación de cada tick, aunque el reloj esté oculto: fin del temporizador"""
+        if self.mode == 'timer' or self.mode == 'football':
+            if self.is_running and self.motor.restante(self.timer_value) == 0:
+                self.clock_widget.update_display(self._formatear(0))
+                self.on_timer_finished()
+    
     def on_timer_tick(self):
-        """Manejador del tick del timer interno"""
+        """Manejador del tick cuando el reloj está a la vista: refresca el display"""
         if self.mode == 'clock':
             current_time = QTime.currentTime()
             time_str = current_time.toString("hh:mm:ss")
@@ -51,32 +61,33 @@ class MainWindowController:
             self.clock_widget.emit_time_updated(time_str)
         elif self.mode == 'stopwatch':
             if self.is_running:
-                self.timer_value += 1
-                hours = self.timer_value // 3600
-                minutes = (self.timer_value % 3600) // 60
-                seconds = self.timer_value % 60
-                time_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-                self.clock_widget.update_display(time_str)
+                self.clock_widget.update_display(self._formatear(self.motor.segundos()))
         elif self.mode == 'timer' or self.mode == 'football':
-            if self.is_running and self.timer_value > 0:
-                self.timer_value -= 1
-                hours = self.timer_value // 3600
-                minutes = (self.timer_value % 3600) // 60
-                seconds = self.timer_value % 60
-                time_str = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-                self.clock_widget.update_display(time_str)
-                if self.timer_value == 0:
-                    self.on_timer_finished()
+            if self.is_running:
+                restante = self.motor.restante(self.timer_value)
+                self.clock_widget.update_display(self._formatear(restante))
+    
+    @staticmethod
+    def _formatear(segundos: int) -> str:
+        """Formatea segundos como hh:mm:ss"""
+        hours = segundos // 3600
+        minutes = (segundos % 3600) // 60
+        seconds = segundos % 60
+        return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
     
     def on_start(self):
         """Manejador del botón Start"""
         if self.mode == 'stopwatch':
             self.is_running = True
+            self.motor.iniciar()
+            self.clock_widget.start_internal_timer()
             self.clock_widget.update_status("Cronómetro en marcha")
             self.clock_widget.set_controls_enabled(False, True, True)
         elif self.mode == 'timer' or self.mode == 'football':
-            if self.timer_value > 0:
+            if self.motor.restante(self.timer_value) > 0:
                 self.is_running = True
+                self.motor.iniciar()
+                self.clock_widget.start_internal_timer()
                 status = "Temporizador activo" if self.mode == 'timer' else "Partido en curso"
                 self.clock_widget.update_status(status)
                 self.clock_widget.set_controls_enabled(False, True, True)
@@ -85,6 +96,7 @@ class MainWindowController:
         """Manejador del botón Pause"""
         if self.is_running:
             self.is_running = False
+            self.motor.pausar()
             self.clock_widget.update_status("Pausado")
             self.clock_widget.set_controls_enabled(True, False, True)
     
@@ -92,6 +104,7 @@ class MainWindowController:
         """Manejador del botón Reset"""
         self.is_running = False
         self.timer_value = 0
+        self.motor.reiniciar()
         self.clock_widget.update_display("00:00:00")
         self.clock_widget.update_status("Listo")
         self.clock_widget.set_controls_enabled(True, False, True)
@@ -99,6 +112,7 @@ class MainWindowController:
     def on_timer_finished(self):
         """Manejador cuando el temporizador llega a cero"""
         self.is_running = False
+        self.motor.pausar()
         self.clock_widget.update_status("¡Temporizador finalizado!")
         self.clock_widget.emit_timer_finished()
         self.clock_widget.set_controls_enabled(True, False, True)
@@ -120,8 +134,5 @@ class MainWindowController:
     def set_timer_value(self, minutes: int):
         """Establece el valor del temporizador en minutos"""
         self.timer_value = minutes * 60
-        hours = self.timer_value // 3600
-        mins = (self.timer_value % 3600) // 60
-        secs = self.timer_value % 60
-        time_str = f"{hours:02d}:{mins:02d}:{secs:02d}"
-        self.clock_widget.update_display(time_str)
\ No newline at end of file
+        self.motor.reiniciar()
+        self.clock_widget.update_display(self._formatear(self.timer_value))
\ No newline at end of file
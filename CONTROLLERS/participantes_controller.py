@@ -3,9 +3,12 @@ Controlador para la gestión de participantes (jugadores y árbitros).
 Maneja la lógica de negocio de participantes.
 """
 
-from PySide6.QtSql import QSqlQuery
+from PySide6.QtSql import QSqlDatabase
 from MODELS.participante import Participante
-from typing import List, Optional
+from MODELS.database import crear_query, transaccion
+from MODELS.cache_consultas import cacheada
+from MODELS.db_worker import obtener_trabajador, PRIORIDAD_BAJA
+from typing import Callable, Iterable, List, Optional
 
 
 class ParticipantesController:
@@ -14,7 +17,7 @@ class ParticipantesController:
     @staticmethod
     def crear_participante(nombre: str, fecha_nacimiento: str, curso: str,
                           es_jugador: bool = False, es_arbitro: bool = False,
-                          posicion: Optional[str] = None) -> Participante:
+                          posicion: Optional[str] = None, db: QSqlDatabase = None) -> Participante:
         """
         Crea un nuevo participante.
         
@@ -25,6 +28,7 @@ class ParticipantesController:
             es_jugador: Si es jugador
             es_arbitro: Si es árbitro
             posicion: Posición del jugador (opcional)
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             Participante creado
@@ -40,15 +44,45 @@ class ParticipantesController:
             es_arbitro=1 if es_arbitro else 0,
             posicion=posicion
         )
-        if participante.guardar():
+        if participante.guardar(db):
             return participante
         raise ValueError("No se pudo crear el participante")
     
+    @staticmethod
+    def crear_participantes(datos: Iterable[dict], db: QSqlDatabase = None) -> List[int]:
+        """
+        Crea muchos participantes en una sola transacción (ver Participante.crear_participantes).
+        
+        Args:
+            datos: Diccionarios con los argumentos de crear_participante()
+                (nombre, fecha_nacimiento, curso y, opcionales, es_jugador,
+                es_arbitro y posicion)
+            db: Conexión a usar (por defecto la del hilo actual)
+        
+        Returns:
+            IDs de los participantes creados, en el orden de entrada
+        
+        Raises:
+            ValueError: Si algún participante no es válido o no se pudieron crear
+        """
+        participantes = [Participante(
+            nombre=d['nombre'],
+            fecha_nacimiento=d['fecha_nacimiento'],
+            curso=d['curso'],
+            es_jugador=1 if d.get('es_jugador') else 0,
+            es_arbitro=1 if d.get('es_arbitro') else 0,
+            posicion=d.get('posicion')
+        ) for d in datos]
+        ids = Participante.crear_participantes(participantes, db)
+        if ids is None:
+            raise ValueError("No se pudieron crear los participantes")
+        return ids
+    
     @staticmethod
     def actualizar_participante(participante_id: int, nombre: str = None,
                                fecha_nacimiento: str = None, curso: str = None,
                                es_jugador: bool = None, es_arbitro: bool = None,
-                               posicion: str = None) -> Optional[Participante]:
+                               posicion: str = None, db: QSqlDatabase = None) -> Optional[Participante]:
         """
         Actualiza un participante existente.
         
@@ -60,11 +94,12 @@ class ParticipantesController:
             es_jugador: Nuevo estado (opcional)
             es_arbitro: Nuevo estado (opcional)
             posicion: Nueva posición (opcional)
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             Participante actualizado o None
         """
-        participante = Participante.obtener_por_id(participante_id)
+        participante = Participante.obtener_por_id(participante_id, db=db)
         if not participante:
             return None
         
@@ -81,77 +116,139 @@ class ParticipantesController:
         if posicion is not None:
             participante.posicion = posicion
         
-        if participante.guardar():
+        if participante.guardar(db):
             return participante
         return None
     
     @staticmethod
-    def eliminar_participante(participante_id: int) -> bool:
+    def guardar_participante(participante_id: Optional[int], nombre: str, fecha_nacimiento: str,
+                             curso: str, es_jugador: bool, es_arbitro: bool,
+                             posicion: Optional[str] = None, goles: Optional[int] = None,
+                             amarillas: Optional[int] = None, rojas: Optional[int] = None,
+                             db: QSqlDatabase = None) -> Participante:
+        """
+        Crea o actualiza un participante con todos sus datos (formulario de
+        ParticipanteDialog) y, si se indican, ajusta sus goles y tarjetas
+        (ver Participante.ajustar_estadisticas). Todo en una transacción.
+        
+        Args:
+            participante_id: ID del participante a actualizar, o None para crearlo
+            nombre: Nombre del participante
+            fecha_nacimiento: Fecha en formato yyyy-MM-dd
+            curso: Curso del participante
+            es_jugador: Si es jugador
+            es_arbitro: Si es árbitro
+            posicion: Posición del jugador (opcional)
+            goles: Total de goles (opcional)
+            amarillas: Total de tarjetas amarillas (con goles)
+            rojas: Total de tarjetas rojas (con goles)
+            db: Conexión a usar (por defecto la del hilo actual)
+        
+        Returns:
+            Participante guardado
+        
+        Raises:
+            ValueError: Si los datos no son válidos o no se pudo guardar
+        """
+        activo = 1
+        if participante_id:
+            actual = Participante.obtener_por_id(participante_id, db=db)
+            if not actual:
+                raise ValueError("El participante no existe")
+            activo = actual.activo
+        
+        participante = Participante(
+            id=participante_id,
+            nombre=nombre,
+            fecha_nacimiento=fecha_nacimiento,
+            curso=curso,
+            es_jugador=1 if es_jugador else 0,
+            es_arbitro=1 if es_arbitro else 0,
+            posicion=posicion,
+            activo=activo
+        )
+        try:
+            with transaccion(db):
+                if not participante.guardar(db):
+                    raise Exception("No se pudo guardar el participante")
+                if goles is not None and not participante.ajustar_estadisticas(goles, amarillas, rojas, db):
+                    raise Exception("No se pudieron ajustar goles y tarjetas")
+        except Exception as e:
+            raise ValueError(str(e))
+        return participante
+    
+    @staticmethod
+    def eliminar_participante(participante_id: int, db: QSqlDatabase = None) -> bool:
         """
         Elimina un participante.
         
         Args:
             participante_id: ID del participante
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             True si se eliminó correctamente
         """
-        participante = Participante.obtener_por_id(participante_id)
+        participante = Participante.obtener_por_id(participante_id, db=db)
         if participante:
-            return participante.eliminar()
+            return participante.eliminar(db)
         return False
     
     @staticmethod
-    def obtener_participante(participante_id: int) -> Optional[Participante]:
+    def obtener_participante(participante_id: int, db: QSqlDatabase = None) -> Optional[Participante]:
         """
         Obtiene un participante por ID.
         
         Args:
             participante_id: ID del participante
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             Participante o None
         """
-        return Participante.obtener_por_id(participante_id)
+        return Participante.obtener_por_id(participante_id, db=db)
     
     @staticmethod
-    def obtener_todos_participantes(filtro: str = "todos", solo_activos: bool = True) -> List[Participante]:
+    def obtener_todos_participantes(filtro: str = "todos", solo_activos: bool = True,
+                                    db: QSqlDatabase = None) -> List[Participante]:
         """
         Obtiene todos los participantes.
         
         Args:
             filtro: 'todos', 'jugadores', 'arbitros'
             solo_activos: Si True, solo retorna participantes activos
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             Lista de participantes
         """
-        return Participante.obtener_todos(filtro, solo_activos)
+        return Participante.obtener_todos(filtro, solo_activos, db=db)
     
     @staticmethod
-    def obtener_estadisticas_participante(participante_id: int) -> dict:
+    def obtener_estadisticas_participante(participante_id: int, db: QSqlDatabase = None) -> dict:
         """
         Obtiene estadísticas de un participante.
         
         Args:
             participante_id: ID del participante
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             Diccionario con estadísticas
         """
-        participante = Participante.obtener_por_id(participante_id)
+        participante = Participante.obtener_por_id(participante_id, db=db)
         if not participante:
             return {}
         
         stats = {
             'id': participante_id,
             'nombre': participante.nombre,
-            'goles': participante.obtener_goles(),
-            'tarjetas': participante.obtener_tarjetas()
+            'goles': participante.obtener_goles(db),
+            'tarjetas': participante.obtener_tarjetas(db)
         }
         
         # Obtener equipos
-        query = QSqlQuery()
+        query = crear_query(db)
         query.prepare("""
             SELECT e.id, e.nombre
             FROM equipos e
@@ -172,26 +269,27 @@ class ParticipantesController:
         return stats
     
     @staticmethod
-    def obtener_maximos_goleadores(limite: int = 10) -> List[dict]:
+    @cacheada("participantes", "equipo_participante", "equipos", "estadisticas_participante")
+    def obtener_maximos_goleadores(limite: int = 10, db: QSqlDatabase = None) -> List[dict]:
         """
         Obtiene los máximos goleadores del torneo.
         
         Args:
             limite: Número máximo de goleadores a retornar
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             Lista de diccionarios con datos de goleadores
         """
         goleadores = []
-        query = QSqlQuery()
+        query = crear_query(db)
         query.prepare("""
-            SELECT p.id, p.nombre, e.nombre, COUNT(g.id) as goles
+            SELECT p.id, p.nombre, e.nombre, COALESCE(s.goles, 0) as goles
             FROM participantes p
             LEFT JOIN equipo_participante ep ON p.id = ep.participante_id
             LEFT JOIN equipos e ON ep.equipo_id = e.id
-            LEFT JOIN goles g ON p.id = g.participante_id
+            LEFT JOIN estadisticas_participante s ON p.id = s.participante_id
             WHERE p.es_jugador = 1 AND p.activo = 1
-            GROUP BY p.id, p.nombre, e.nombre
             ORDER BY goles DESC
             LIMIT ?
         """)
@@ -209,30 +307,30 @@ class ParticipantesController:
         return goleadores
     
     @staticmethod
-    def obtener_mas_tarjetados(limite: int = 10) -> List[dict]:
+    @cacheada("participantes", "equipo_participante", "equipos", "estadisticas_participante")
+    def obtener_mas_tarjetados(limite: int = 10, db: QSqlDatabase = None) -> List[dict]:
         """
         Obtiene los jugadores más tarjetados del torneo.
         
         Args:
             limite: Número máximo de jugadores a retornar
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             Lista de diccionarios con datos de tarjetas
         """
         tarjetados = []
-        query = QSqlQuery()
+        query = crear_query(db)
         query.prepare("""
             SELECT p.id, p.nombre, e.nombre,
-                   SUM(CASE WHEN t.tipo = 'amarilla' THEN 1 ELSE 0 END) as amarillas,
-                   SUM(CASE WHEN t.tipo = 'roja' THEN 1 ELSE 0 END) as rojas
+                   s.amarillas, s.rojas
             FROM participantes p
             LEFT JOIN equipo_participante ep ON p.id = ep.participante_id
             LEFT JOIN equipos e ON ep.equipo_id = e.id
-            LEFT JOIN tarjetas t ON p.id = t.participante_id
+            INNER JOIN estadisticas_participante s ON p.id = s.participante_id
             WHERE p.es_jugador = 1 AND p.activo = 1
-            GROUP BY p.id, p.nombre, e.nombre
-            HAVING (amarillas > 0 OR rojas > 0)
-            ORDER BY rojas DESC, amarillas DESC
+              AND (s.amarillas > 0 OR s.rojas > 0)
+            ORDER BY s.rojas DESC, s.amarillas DESC
             LIMIT ?
         """)
         query.addBindValue(limite)
@@ -250,35 +348,78 @@ class ParticipantesController:
         return tarjetados
     
     @staticmethod
-    def asignar_jugador_a_equipo(participante_id: int, equipo_id: int) -> bool:
+    def obtener_maximos_goleadores_async(limite: int, al_terminar: Callable,
+                                         al_fallar: Callable = None) -> int:
+        """
+        Versión en segundo plano de obtener_maximos_goleadores.
+        
+        Args:
+            limite: Número máximo de goleadores a retornar
+            al_terminar: Recibe la lista de goleadores en el hilo de la interfaz
+            al_fallar: Recibe el mensaje de error (opcional)
+        
+        Returns:
+            int: ID del trabajo (para cancelarlo)
+        """
+        return obtener_trabajador().encolar(
+            ParticipantesController.obtener_maximos_goleadores, limite,
+            prioridad=PRIORIDAD_BAJA, clave="maximos_goleadores",
+            al_terminar=al_terminar, al_fallar=al_fallar
+        )
+    
+    @staticmethod
+    def obtener_mas_tarjetados_async(limite: int, al_terminar: Callable,
+                                     al_fallar: Callable = None) -> int:
+        """
+        Versión en segundo plano de obtener_mas_tarjetados.
+        
+        Args:
+            limite: Número máximo de jugadores a retornar
+            al_terminar: Recibe la lista de tarjetados en el hilo de la interfaz
+            al_fallar: Recibe el mensaje de error (opcional)
+        
+        Returns:
+            int: ID del trabajo (para cancelarlo)
+        """
+        return obtener_trabajador().encolar(
+            ParticipantesController.obtener_mas_tarjetados, limite,
+            prioridad=PRIORIDAD_BAJA, clave="mas_tarjetados",
+            al_terminar=al_terminar, al_fallar=al_fallar
+        )
+    
+    @staticmethod
+    def asignar_jugador_a_equipo(participante_id: int, equipo_id: int, db: QSqlDatabase = None) -> bool:
         """
         Asigna un jugador a un equipo.
         
         Args:
             participante_id: ID del participante
             equipo_id: ID del equipo
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             True si se asignó correctamente
         """
-        participante = Participante.obtener_por_id(participante_id)
+        participante = Participante.obtener_por_id(participante_id, db=db)
         if participante:
-            return participante.asignar_equipo(equipo_id)
+            return participante.asignar_equipo(equipo_id, db)
         return False
     
     @staticmethod
-    def desasignar_jugador_de_equipo(participante_id: int, equipo_id: int) -> bool:
+    def desasignar_jugador_de_equipo(participante_id: int, equipo_id: int,
+                                     db: QSqlDatabase = None) -> bool:
         """
         Desasigna un jugador de un equipo.
         
         Args:
             participante_id: ID del participante
             equipo_id: ID del equipo
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             True si se desasignó correctamente
         """
-        participante = Participante.obtener_por_id(participante_id)
+        participante = Participante.obtener_por_id(participante_id, db=db)
         if participante:
-            return participante.desasignar_equipo(equipo_id)
+            return participante.desasignar_equipo(equipo_id, db)
         return False
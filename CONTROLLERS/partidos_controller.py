@@ -3,9 +3,13 @@ Controlador para la gestión de partidos.
 Maneja la lógica de negocio de partidos y eliminatorias.
 """
 
-from PySide6.QtSql import QSqlQuery
+from PySide6.QtSql import QSqlDatabase
 from MODELS.partido import Partido
-from typing import List, Optional, Tuple
+from MODELS.database import crear_query
+from MODELS.cache_consultas import cacheada
+from MODELS.db_worker import obtener_trabajador, PRIORIDAD_NORMAL, PRIORIDAD_BAJA
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import csv
 
 
 class PartidosController:
@@ -14,7 +18,7 @@ class PartidosController:
     @staticmethod
     def crear_partido(equipo_local_id: int, equipo_visitante_id: int,
                      fecha_hora: str, eliminatoria: str,
-                     arbitro_id: Optional[int] = None) -> Partido:
+                     arbitro_id: Optional[int] = None, db: QSqlDatabase = None) -> Partido:
         """
         Crea un nuevo partido.
         
@@ -24,6 +28,7 @@ class PartidosController:
             fecha_hora: Fecha y hora del partido (yyyy-MM-dd HH:mm)
             eliminatoria: Tipo de eliminatoria (Octavos, Cuartos, Semifinal, Final)
             arbitro_id: ID del árbitro (opcional)
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             Partido creado
@@ -38,7 +43,7 @@ class PartidosController:
             eliminatoria=eliminatoria,
             arbitro_id=arbitro_id
         )
-        if partido.guardar():
+        if partido.guardar(db):
             return partido
         raise ValueError("No se pudo crear el partido")
     
@@ -46,7 +51,7 @@ class PartidosController:
     def actualizar_partido(partido_id: int, equipo_local_id: int = None,
                           equipo_visitante_id: int = None,
                           fecha_hora: str = None,
-                          arbitro_id: int = None) -> Optional[Partido]:
+                          arbitro_id: int = None, db: QSqlDatabase = None) -> Optional[Partido]:
         """
         Actualiza un partido existente.
         
@@ -56,11 +61,12 @@ class PartidosController:
             equipo_visitante_id: Nuevo equipo visitante (opcional)
             fecha_hora: Nueva fecha/hora (opcional)
             arbitro_id: Nuevo árbitro (opcional)
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             Partido actualizado o None
         """
-        partido = Partido.obtener_por_id(partido_id)
+        partido = Partido.obtener_por_id(partido_id, db=db)
         if not partido:
             return None
         
@@ -73,55 +79,61 @@ class PartidosController:
         if arbitro_id is not None:
             partido.arbitro_id = arbitro_id
         
-        if partido.guardar():
+        if partido.guardar(db):
             return partido
         return None
     
     @staticmethod
-    def eliminar_partido(partido_id: int) -> bool:
+    def eliminar_partido(partido_id: int, db: QSqlDatabase = None) -> bool:
         """
         Elimina un partido.
         
         Args:
             partido_id: ID del partido
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             True si se eliminó correctamente
         """
-        partido = Partido.obtener_por_id(partido_id)
+        partido = Partido.obtener_por_id(partido_id, db=db)
         if partido:
-            return partido.eliminar()
+            return partido.eliminar(db)
         return False
     
     @staticmethod
-    def obtener_partido(partido_id: int) -> Optional[Partido]:
+    def obtener_partido(partido_id: int, db: QSqlDatabase = None) -> Optional[Partido]:
         """
         Obtiene un partido por ID.
         
         Args:
             partido_id: ID del partido
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             Partido o None
         """
-        return Partido.obtener_por_id(partido_id)
+        return Partido.obtener_por_id(partido_id, db=db)
     
     @staticmethod
-    def obtener_todos_partidos(eliminatoria: str = "", solo_pendientes: bool = False) -> List[Partido]:
+    def obtener_todos_partidos(eliminatoria: str = "", solo_pendientes: bool = False,
+                               db: QSqlDatabase = None) -> List[Partido]:
         """
         Obtiene todos los partidos.
         
         Args:
             eliminatoria: Filtrar por eliminatoria ('', 'Octavos', 'Cuartos', 'Semifinal', 'Final')
             solo_pendientes: Si True, solo retorna partidos no finalizados
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             Lista de partidos
         """
-        return Partido.obtener_todos(eliminatoria, solo_pendientes)
+        return Partido.obtener_todos(eliminatoria, solo_pendientes, db=db)
     
     @staticmethod
-    def registrar_gol(partido_id: int, participante_id: int, minuto: int) -> bool:
+    def registrar_gol(partido_id: int, participante_id: int, minuto: int,
+                      equipo_id: Optional[int] = None,
+                      db: QSqlDatabase = None) -> Optional[Tuple[int, int]]:
         """
         Registra un gol en un partido.
         
@@ -129,17 +141,21 @@ class PartidosController:
             partido_id: ID del partido
             participante_id: ID del jugador
             minuto: Minuto del gol
+            equipo_id: Equipo con el que marcó (opcional)
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
-            True si se registró correctamente
+            Tupla (goles_local, goles_visitante) con el nuevo marcador,
+            o None si no se pudo registrar
         """
-        partido = Partido.obtener_por_id(partido_id)
+        partido = Partido.obtener_por_id(partido_id, db=db)
         if partido and not partido.finalizado:
-            return partido.registrar_gol(participante_id, minuto)
-        return False
+            return partido.registrar_gol(participante_id, minuto, equipo_id, db=db)
+        return None
     
     @staticmethod
-    def registrar_tarjeta(partido_id: int, participante_id: int, tipo: str, minuto: int) -> bool:
+    def registrar_tarjeta(partido_id: int, participante_id: int, tipo: str, minuto: int,
+                          equipo_id: Optional[int] = None, db: QSqlDatabase = None) -> bool:
         """
         Registra una tarjeta en un partido.
         
@@ -148,17 +164,36 @@ class PartidosController:
             participante_id: ID del jugador
             tipo: 'amarilla' o 'roja'
             minuto: Minuto de la tarjeta
+            equipo_id: Equipo con el que jugaba (opcional)
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             True si se registró correctamente
         """
-        partido = Partido.obtener_por_id(partido_id)
+        partido = Partido.obtener_por_id(partido_id, db=db)
         if partido and not partido.finalizado:
-            return partido.registrar_tarjeta(participante_id, tipo, minuto)
+            return partido.registrar_tarjeta(participante_id, tipo, minuto, equipo_id, db=db)
         return False
     
     @staticmethod
-    def finalizar_partido(partido_id: int, goles_local: int, goles_visitante: int) -> bool:
+    def registrar_eventos(incidencias: Iterable[tuple], db: QSqlDatabase = None) -> Optional[List[int]]:
+        """
+        Registra muchos goles y tarjetas en una sola transacción (ver Partido.registrar_eventos).
+        
+        Args:
+            incidencias: Tuplas (partido_id, participante_id, tipo, minuto, equipo_id),
+                con tipo 'gol', 'amarilla' o 'roja' y equipo_id opcional (None)
+            db: Conexión a usar (por defecto la del hilo actual)
+        
+        Returns:
+            IDs de los goles y tarjetas creados, en el orden de entrada,
+            o None si alguna incidencia no era válida (no se registra ninguna)
+        """
+        return Partido.registrar_eventos(incidencias, db=db)
+    
+    @staticmethod
+    def finalizar_partido(partido_id: int, goles_local: int, goles_visitante: int,
+                          db: QSqlDatabase = None) -> bool:
         """
         Finaliza un partido con el resultado.
         
@@ -166,67 +201,69 @@ class PartidosController:
             partido_id: ID del partido
             goles_local: Goles del equipo local
             goles_visitante: Goles del equipo visitante
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             True si se finalizó correctamente
         """
-        partido = Partido.obtener_por_id(partido_id)
+        partido = Partido.obtener_por_id(partido_id, db=db)
         if partido:
-            return partido.finalizar(goles_local, goles_visitante)
+            return partido.finalizar(goles_local, goles_visitante, db)
         return False
     
     @staticmethod
-    def obtener_goles_partido(partido_id: int) -> Tuple[int, int]:
+    def obtener_goles_partido(partido_id: int, db: QSqlDatabase = None) -> Tuple[int, int]:
         """
         Obtiene los goles de un partido.
         
         Args:
             partido_id: ID del partido
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             Tupla: (goles_local, goles_visitante)
         """
-        partido = Partido.obtener_por_id(partido_id)
+        partido = Partido.obtener_por_id(partido_id, db=db)
         if partido:
-            return partido.obtener_goles_por_equipo()
+            return partido.obtener_goles_por_equipo(db)
         return (0, 0)
     
     @staticmethod
-    def obtener_ganador(partido_id: int) -> Optional[int]:
+    def obtener_ganador(partido_id: int, db: QSqlDatabase = None) -> Optional[int]:
         """
         Obtiene el ganador de un partido.
         
         Args:
             partido_id: ID del partido
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             ID del equipo ganador, None si empate o no finalizado
         """
-        partido = Partido.obtener_por_id(partido_id)
+        partido = Partido.obtener_por_id(partido_id, db=db)
         if partido:
             return partido.obtener_ganador()
         return None
     
     @staticmethod
-    def obtener_goles_partido_detallado(partido_id: int) -> List[dict]:
+    def obtener_goles_partido_detallado(partido_id: int, db: QSqlDatabase = None) -> List[dict]:
         """
         Obtiene los goles detallados de un partido.
         
         Args:
             partido_id: ID del partido
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             Lista de diccionarios con datos de goles
         """
         goles = []
-        query = QSqlQuery()
+        query = crear_query(db)
         query.prepare("""
             SELECT g.id, p.nombre, g.minuto, e.nombre as equipo
             FROM goles g
             INNER JOIN participantes p ON g.participante_id = p.id
-            INNER JOIN equipo_participante ep ON p.id = ep.participante_id
-            INNER JOIN equipos e ON ep.equipo_id = e.id
-            INNER JOIN partidos par ON g.partido_id = par.id
+            LEFT JOIN equipos e ON g.equipo_id = e.id
             WHERE g.partido_id = ?
             ORDER BY g.minuto ASC
         """)
@@ -244,24 +281,24 @@ class PartidosController:
         return goles
     
     @staticmethod
-    def obtener_tarjetas_partido_detallado(partido_id: int) -> List[dict]:
+    def obtener_tarjetas_partido_detallado(partido_id: int, db: QSqlDatabase = None) -> List[dict]:
         """
         Obtiene las tarjetas detalladas de un partido.
         
         Args:
             partido_id: ID del partido
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             Lista de diccionarios con datos de tarjetas
         """
         tarjetas = []
-        query = QSqlQuery()
+        query = crear_query(db)
         query.prepare("""
             SELECT t.id, p.nombre, t.tipo, t.minuto, e.nombre as equipo
             FROM tarjetas t
             INNER JOIN participantes p ON t.participante_id = p.id
-            INNER JOIN equipo_participante ep ON p.id = ep.participante_id
-            INNER JOIN equipos e ON ep.equipo_id = e.id
+            LEFT JOIN equipos e ON t.equipo_id = e.id
             WHERE t.partido_id = ?
             ORDER BY t.minuto ASC
         """)
@@ -280,18 +317,20 @@ class PartidosController:
         return tarjetas
     
     @staticmethod
-    def obtener_proximos_partidos(limite: int = 5) -> List[dict]:
+    @cacheada("partidos", "equipos")
+    def obtener_proximos_partidos(limite: int = 5, db: QSqlDatabase = None) -> List[dict]:
         """
         Obtiene los próximos partidos a jugarse.
         
         Args:
             limite: Número máximo de partidos a retornar
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             Lista de diccionarios con datos de partidos
         """
         partidos = []
-        query = QSqlQuery()
+        query = crear_query(db)
         query.prepare("""
             SELECT p.id, p.fecha_hora, el.nombre, ev.nombre, p.eliminatoria
             FROM partidos p
@@ -316,66 +355,317 @@ class PartidosController:
         return partidos
     
     @staticmethod
-    def obtener_tabla_posiciones() -> List[dict]:
+    @cacheada("clasificacion", "equipos")
+    def obtener_tabla_posiciones(db: QSqlDatabase = None) -> List[dict]:
         """
         Obtiene la tabla de posiciones del torneo.
         
+        Args:
+            db: Conexión a usar (por defecto la del hilo actual)
+        
         Returns:
             Lista de diccionarios con posiciones ordenadas por puntos
         """
         posiciones = []
-        query = QSqlQuery()
-        query.exec("""
-            SELECT e.id, e.nombre,
-                   COUNT(CASE WHEN p.finalizado = 1 THEN 1 END) as pj,
-                   SUM(CASE WHEN p.finalizado = 1 AND (
-                       (p.equipo_local_id = e.id AND p.goles_local > p.goles_visitante) OR
-                       (p.equipo_visitante_id = e.id AND p.goles_visitante > p.goles_local)
-                   ) THEN 1 ELSE 0 END) as pg,
-                   SUM(CASE WHEN p.finalizado = 1 AND p.goles_local = p.goles_visitante THEN 1 ELSE 0 END) as pe,
-                   SUM(CASE WHEN p.finalizado = 1 AND (
-                       (p.equipo_local_id = e.id AND p.goles_local < p.goles_visitante) OR
-                       (p.equipo_visitante_id = e.id AND p.goles_visitante < p.goles_local)
-                   ) THEN 1 ELSE 0 END) as pp,
-                   SUM(CASE WHEN p.equipo_local_id = e.id THEN p.goles_local WHEN p.equipo_visitante_id = e.id THEN p.goles_visitante ELSE 0 END) as gf,
-                   SUM(CASE WHEN p.equipo_local_id = e.id THEN p.goles_visitante WHEN p.equipo_visitante_id = e.id THEN p.goles_local ELSE 0 END) as gc
-            FROM equipos e
-            LEFT JOIN partidos p ON (p.equipo_local_id = e.id OR p.equipo_visitante_id = e.id)
-            WHERE e.activo = 1
-            GROUP BY e.id, e.nombre
-            ORDER BY 
-                (SUM(CASE WHEN p.finalizado = 1 AND (
-                    (p.equipo_local_id = e.id AND p.goles_local > p.goles_visitante) OR
-                    (p.equipo_visitante_id = e.id AND p.goles_visitante > p.goles_local)
-                ) THEN 1 ELSE 0 END) * 3 +
-                SUM(CASE WHEN p.finalizado = 1 AND p.goles_local = p.goles_visitante THEN 1 ELSE 0 END)) DESC,
-                (SUM(CASE WHEN p.equipo_local_id = e.id THEN p.goles_local WHEN p.equipo_visitante_id = e.id THEN p.goles_visitante ELSE 0 END) - 
-                 SUM(CASE WHEN p.equipo_local_id = e.id THEN p.goles_visitante WHEN p.equipo_visitante_id = e.id THEN p.goles_local ELSE 0 END)) DESC
-        """)
+        query = crear_query(db)
         
-        if query.exec():
+        # La tabla clasificacion se mantiene al guardar/eliminar partidos:
+        # basta con recorrer su índice de orden. CROSS JOIN fija ese recorrido
+        # y "+e.activo" evita que SQLite escanee idx_equipos_activos por cada fila
+        if query.exec("""
+            SELECT c.equipo_id, e.nombre, c.pj, c.pg, c.pe, c.pp, c.gf, c.gc, c.dg, c.pts
+            FROM clasificacion c
+            CROSS JOIN equipos e ON e.id = c.equipo_id
+            WHERE +e.activo = 1
+            ORDER BY c.pts DESC, c.dg DESC, c.gf DESC
+        """):
             posicion = 1
             while query.next():
-                pj = query.value(2) or 0
-                pg = query.value(3) or 0
-                pe = query.value(4) or 0
-                pp = query.value(5) or 0
-                gf = query.value(6) or 0
-                gc = query.value(7) or 0
-                
                 posiciones.append({
                     'posicion': posicion,
                     'equipo_id': query.value(0),
                     'equipo': query.value(1),
-                    'pj': pj,
-                    'pg': pg,
-                    'pe': pe,
-                    'pp': pp,
-                    'gf': gf,
-                    'gc': gc,
-                    'dg': gf - gc,
-                    'pts': (pg * 3) + pe
+                    'pj': query.value(2),
+                    'pg': query.value(3),
+                    'pe': query.value(4),
+                    'pp': query.value(5),
+                    'gf': query.value(6),
+                    'gc': query.value(7),
+                    'dg': query.value(8),
+                    'pts': query.value(9)
                 })
                 posicion += 1
         
         return posiciones
+
+    @staticmethod
+    def obtener_listado_partidos(eliminatoria: str = "", db: QSqlDatabase = None,
+                                 partido_id: Optional[int] = None) -> List[dict]:
+        """
+        Obtiene el calendario de partidos con nombres de equipos y árbitro
+        (None si no tiene; la vista muestra el texto traducido).
+        
+        Args:
+            eliminatoria: Filtrar por eliminatoria ('' para todas)
+            db: Conexión a usar (por defecto la del hilo actual)
+            partido_id: Si se indica, solo ese partido (para refrescar una fila)
+        
+        Returns:
+            Lista de diccionarios ordenada por fecha
+        """
+        partidos = []
+        query = crear_query(db)
+        sql = """
+            SELECT p.id, p.fecha_hora, 
+                   el.nombre as local, ev.nombre as visitante,
+                   a.nombre as arbitro,
+                   p.eliminatoria, p.finalizado,
+                   p.goles_local, p.goles_visitante
+            FROM partidos p
+            INNER JOIN equipos el ON p.equipo_local_id = el.id
+            INNER JOIN equipos ev ON p.equipo_visitante_id = ev.id
+            LEFT JOIN participantes a ON p.arbitro_id = a.id
+            WHERE 1=1
+        """
+        bind_values = []
+        if eliminatoria:
+            sql += " AND p.eliminatoria = ?"
+            bind_values.append(eliminatoria)
+        if partido_id is not None:
+            sql += " AND p.id = ?"
+            bind_values.append(partido_id)
+        sql += " ORDER BY p.fecha_hora ASC"
+        
+        query.prepare(sql)
+        for value in bind_values:
+            query.addBindValue(value)
+        
+        if query.exec():
+            while query.next():
+                partidos.append({
+                    'id': query.value(0),
+                    'fecha_hora': query.value(1),
+                    'local': query.value(2),
+                    'visitante': query.value(3),
+                    'arbitro': query.value(4),
+                    'eliminatoria': query.value(5),
+                    'finalizado': query.value(6),
+                    'goles_local': query.value(7),
+                    'goles_visitante': query.value(8)
+                })
+        
+        return partidos
+    
+    @staticmethod
+    def obtener_partidos_por_eliminatoria(db: QSqlDatabase = None) -> Dict[str, List[dict]]:
+        """
+        Obtiene los partidos agrupados por eliminatoria con una sola consulta.
+        
+        Args:
+            db: Conexión a usar (por defecto la del hilo actual)
+        
+        Returns:
+            Diccionario eliminatoria -> lista de partidos ordenados por fecha
+        """
+        por_eliminatoria = {}
+        query = crear_query(db)
+        
+        if query.exec("""
+            SELECT p.eliminatoria, el.nombre, ev.nombre,
+                   p.goles_local, p.goles_visitante, p.finalizado,
+                   p.id, p.fecha_hora
+            FROM partidos p
+            INNER JOIN equipos el ON p.equipo_local_id = el.id
+            INNER JOIN equipos ev ON p.equipo_visitante_id = ev.id
+            ORDER BY p.eliminatoria, p.fecha_hora
+        """):
+            while query.next():
+                por_eliminatoria.setdefault(query.value(0), []).append({
+                    'local': query.value(1),
+                    'visitante': query.value(2),
+                    'goles_local': query.value(3),
+                    'goles_visitante': query.value(4),
+                    'finalizado': query.value(5),
+                    'id': query.value(6),
+                    'fecha_hora': query.value(7)
+                })
+        
+        return por_eliminatoria
+    
+    @staticmethod
+    def obtener_resultados(db: QSqlDatabase = None) -> List[dict]:
+        """
+        Obtiene los partidos finalizados, del más reciente al más antiguo.
+        
+        Args:
+            db: Conexión a usar (por defecto la del hilo actual)
+        
+        Returns:
+            Lista de diccionarios con los resultados
+        """
+        resultados = []
+        query = crear_query(db)
+        
+        if query.exec("""
+            SELECT p.fecha_hora, el.nombre, p.goles_local, p.goles_visitante,
+                   ev.nombre, p.eliminatoria, a.nombre, p.id
+            FROM partidos p
+            INNER JOIN equipos el ON p.equipo_local_id = el.id
+            INNER JOIN equipos ev ON p.equipo_visitante_id = ev.id
+            LEFT JOIN participantes a ON p.arbitro_id = a.id
+            WHERE p.finalizado = 1
+            ORDER BY p.fecha_hora DESC
+        """):
+            while query.next():
+                resultados.append({
+                    'fecha_hora': query.value(0),
+                    'local': query.value(1),
+                    'goles_local': query.value(2),
+                    'goles_visitante': query.value(3),
+                    'visitante': query.value(4),
+                    'eliminatoria': query.value(5),
+                    'arbitro': query.value(6),
+                    'id': query.value(7)
+                })
+        
+        return resultados
+    
+    @staticmethod
+    def obtener_ids_partidos(equipo_id: Optional[int] = None, arbitro_id: Optional[int] = None,
+                             db: QSqlDatabase = None) -> List[int]:
+        """
+        Obtiene los partidos en los que aparece un equipo o un árbitro,
+        para refrescar sus filas cuando cambia su nombre.
+        
+        Args:
+            equipo_id: Equipo local o visitante
+            arbitro_id: Árbitro del partido
+            db: Conexión a usar (por defecto la del hilo actual)
+        
+        Returns:
+            Lista de IDs de partido
+        """
+        query = crear_query(db)
+        if equipo_id is not None:
+            query.prepare("SELECT id FROM partidos WHERE equipo_local_id = ? OR equipo_visitante_id = ?")
+            query.addBindValue(equipo_id)
+            query.addBindValue(equipo_id)
+        else:
+            query.prepare("SELECT id FROM partidos WHERE arbitro_id = ?")
+            query.addBindValue(arbitro_id)
+        
+        ids = []
+        if query.exec():
+            while query.next():
+                ids.append(query.value(0))
+        return ids
+    
+    @staticmethod
+    def exportar_resultados_csv(ruta: str, db: QSqlDatabase = None) -> int:
+        """
+        Exporta todos los partidos a un archivo CSV.
+        
+        Args:
+            ruta: Ruta del archivo CSV
+            db: Conexión a usar (por defecto la del hilo actual)
+        
+        Returns:
+            int: Número de partidos exportados
+        
+        Raises:
+            Exception: Si la consulta o la escritura fallan
+        """
+        query = crear_query(db)
+        if not query.exec("""
+            SELECT 
+                p.id,
+                e1.nombre as equipo_local,
+                e2.nombre as equipo_visitante,
+                p.goles_local,
+                p.goles_visitante,
+                p.eliminatoria,
+                p.fecha_hora,
+                CASE WHEN p.finalizado = 1 THEN 'Finalizado' ELSE 'Pendiente' END as estado
+            FROM partidos p
+            INNER JOIN equipos e1 ON p.equipo_local_id = e1.id
+            INNER JOIN equipos e2 ON p.equipo_visitante_id = e2.id
+            ORDER BY p.fecha_hora DESC
+        """):
+            raise Exception(query.lastError().text())
+        
+        filas = 0
+        with open(ruta, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow([
+                "ID", "Equipo Local", "Equipo Visitante", 
+                "Goles Local", "Goles Visitante", "Eliminatoria", 
+                "Fecha/Hora", "Estado"
+            ])
+            
+            while query.next():
+                writer.writerow([query.value(i) for i in range(8)])
+                filas += 1
+        
+        return filas
+    
+    # --- Variantes en segundo plano (resultados en el hilo de la interfaz) ---
+    
+    @staticmethod
+    def obtener_listado_partidos_async(eliminatoria: str, al_terminar: Callable,
+                                       al_fallar: Callable = None) -> int:
+        """
+        Versión en segundo plano de obtener_listado_partidos.
+        Una recarga nueva cancela la anterior si aún no había empezado.
+        
+        Returns:
+            int: ID del trabajo (para cancelarlo)
+        """
+        return obtener_trabajador().encolar(
+            PartidosController.obtener_listado_partidos, eliminatoria,
+            prioridad=PRIORIDAD_NORMAL, clave="listado_partidos",
+            al_terminar=al_terminar, al_fallar=al_fallar
+        )
+    
+    @staticmethod
+    def obtener_partidos_por_eliminatoria_async(al_terminar: Callable,
+                                                al_fallar: Callable = None) -> int:
+        """
+        Versión en segundo plano de obtener_partidos_por_eliminatoria.
+        
+        Returns:
+            int: ID del trabajo (para cancelarlo)
+        """
+        return obtener_trabajador().encolar(
+            PartidosController.obtener_partidos_por_eliminatoria,
+            prioridad=PRIORIDAD_NORMAL, clave="partidos_por_eliminatoria",
+            al_terminar=al_terminar, al_fallar=al_fallar
+        )
+    
+    @staticmethod
+    def obtener_resultados_async(al_terminar: Callable, al_fallar: Callable = None) -> int:
+        """
+        Versión en segundo plano de obtener_resultados.
+        
+        Returns:
+            int: ID del trabajo (para cancelarlo)
+        """
+        return obtener_trabajador().encolar(
+            PartidosController.obtener_resultados,
+            prioridad=PRIORIDAD_NORMAL, clave="resultados",
+            al_terminar=al_terminar, al_fallar=al_fallar
+        )
+    
+    @staticmethod
+    def exportar_resultados_csv_async(ruta: str, al_terminar: Callable,
+                                      al_fallar: Callable = None) -> int:
+        """
+        Versión en segundo plano de exportar_resultados_csv (prioridad baja).
+        
+        Returns:
+            int: ID del trabajo (para cancelarlo)
+        """
+        return obtener_trabajador().encolar(
+            PartidosController.exportar_resultados_csv, ruta,
+            prioridad=PRIORIDAD_BAJA,
+            al_terminar=al_terminar, al_fallar=al_fallar
+        )
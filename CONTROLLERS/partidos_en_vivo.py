@@ -0,0 +1,279 @@
+"""
+Controlador de los partidos en juego.
+Mantiene en memoria los partidos que se juegan a la vez (uno por campo):
+cada uno con su reloj, su marcador y un búfer con sus últimos eventos. Un
+único suscriptor del planificador de ticks vigila el minuto de todos ellos.
+Los goles y tarjetas se guardan en la BD al registrarlos, con el minuto que
+marcaba el reloj del partido cuando se pulsó el botón.
+"""
+
+from collections import deque
+from typing import List, Optional, Tuple
+from PySide6.QtCore import QObject, Signal
+from COMPONENTS.motor_reloj import MotorReloj
+from COMPONENTS.planificador_ticks import planificador_ticks
+from CONTROLLERS.partidos_controller import PartidosController
+from CONTROLLERS.equipos_controller import EquiposController
+from MODELS import eventos
+from MODELS.eventos import bus_cambios
+
+# Tipos de evento del búfer
+GOL = "gol"
+TARJETA = "tarjeta"
+
+# Eventos que se guardan por partido (los más antiguos se descartan)
+EVENTOS_POR_PARTIDO = 20
+
+
+class EventoEnVivo:
+    """Gol o tarjeta registrado en un partido en juego."""
+    
+    __slots__ = ("tipo", "minuto", "equipo", "nombre", "detalle")
+    
+    def __init__(self, tipo: str, minuto: int, equipo: str, nombre: str, detalle: str = ""):
+        self.tipo = tipo
+        self.minuto = minuto
+        self.equipo = equipo  # "local" o "visitante"
+        self.nombre = nombre  # Jugador
+        self.detalle = detalle  # Tipo de tarjeta
+
+
+class PartidoEnVivo:
+    """Estado en memoria de un partido en juego."""
+    
+    __slots__ = ("partido_id", "local", "visitante", "equipo_local_id", "equipo_visitante_id",
+                 "motor", "goles_local", "goles_visitante", "minuto", "eventos")
+    
+    def __init__(self, partido_id: int, local: str, visitante: str,
+                 equipo_local_id: int, equipo_visitante_id: int,
+                 goles_local: int = 0, goles_visitante: int = 0):
+        self.partido_id = partido_id
+        self.local = local
+        self.visitante = visitante
+        self.equipo_local_id = equipo_local_id
+        self.equipo_visitante_id = equipo_visitante_id
+        self.motor = MotorReloj()
+        self.goles_local = goles_local
+        self.goles_visitante = goles_visitante
+        self.minuto = 0  # Último minuto avisado
+        self.eventos = deque(maxlen=EVENTOS_POR_PARTIDO)
+    
+    @property
+    def en_marcha(self) -> bool:
+        """True si el reloj del partido está corriendo (False si está pausado)."""
+        return self.motor.en_marcha
+    
+    def minuto_actual(self) -> int:
+        """Minuto que marca el reloj del partido."""
+        return self.motor.minutos()
+    
+    def texto_tiempo(self) -> str:
+        """Tiempo de juego como mm:ss."""
+        segundos = self.motor.segundos()
+        return f"{segundos // 60:02d}:{segundos % 60:02d}"
+    
+    def equipo(self, equipo_id: int) -> str:
+        """'local' o 'visitante' según el id del equipo."""
+        return "local" if equipo_id == self.equipo_local_id else "visitante"
+
+
+class PartidosEnVivo(QObject):
+    """
+    Partidos en juego (singleton).
+    
+    Las señales se emiten en el hilo de la interfaz con el id del partido.
+    """
+    
+    partido_iniciado = Signal(int)
+    partido_actualizado = Signal(int)  # Marcador, eventos o pausa
+    minuto_cambiado = Signal(int, int)  # id del partido, minuto
+    partido_finalizado = Signal(int)
+    
+    _instance = None  # Singleton
+    _initialized = False  # Flag de inicialización
+    
+    def __new__(cls):
+        """Implementar patrón Singleton."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+    
+    def __init__(self):
+        """Inicializar el controlador."""
+        if PartidosEnVivo._initialized:
+            return
+        
+        super().__init__()
+        PartidosEnVivo._initialized = True
+        self._partidos = {}  # partido_id -> PartidoEnVivo, en orden de inicio
+        bus_cambios.datos_cambiados.connect(self._aplicar_cambio)
+    
+    def iniciar(self, partido_id: int) -> Optional[PartidoEnVivo]:
+        """
+        Pone un partido en juego y arranca su reloj.
+        
+        Args:
+            partido_id: ID del partido
+        
+        Returns:
+            El partido en juego (el mismo si ya lo estaba), o None si no
+            existe o ya está finalizado
+        """
+        if partido_id in self._partidos:
+            return self._partidos[partido_id]
+        
+        partido = PartidosController.obtener_partido(partido_id)
+        if not partido or partido.finalizado:
+            return None
+        
+        local = EquiposController.obtener_equipo(partido.equipo_local_id)
+        visitante = EquiposController.obtener_equipo(partido.equipo_visitante_id)
+        en_vivo = PartidoEnVivo(
+            partido_id,
+            local.nombre if local else "",
+            visitante.nombre if visitante else "",
+            partido.equipo_local_id, partido.equipo_visitante_id,
+            partido.goles_local or 0, partido.goles_visitante or 0
+        )
+        en_vivo.motor.iniciar()
+        self._partidos[partido_id] = en_vivo
+        planificador_ticks.suscribir(self, comprobar=self._comprobar_minutos)
+        self.partido_iniciado.emit(partido_id)
+        return en_vivo
+    
+    def obtener(self, partido_id: int) -> Optional[PartidoEnVivo]:
+        """Partido en juego con ese id, o None."""
+        return self._partidos.get(partido_id)
+    
+    def partidos(self) -> List[PartidoEnVivo]:
+        """Partidos en juego, en orden de inicio."""
+        return list(self._partidos.values())
+    
+    def en_juego(self, partido_id: int) -> bool:
+        """True si el partido está en juego."""
+        return partido_id in self._partidos
+    
+    def pausar(self, partido_id: int):
+        """Detiene el reloj de un partido (p. ej. en el descanso)."""
+        en_vivo = self._partidos.get(partido_id)
+        if en_vivo and en_vivo.en_marcha:
+            en_vivo.motor.pausar()
+            self.partido_actualizado.emit(partido_id)
+    
+    def reanudar(self, partido_id: int):
+        """Vuelve a poner en marcha el reloj de un partido."""
+        en_vivo = self._partidos.get(partido_id)
+        if en_vivo and not en_vivo.en_marcha:
+            en_vivo.motor.iniciar()
+            self.partido_actualizado.emit(partido_id)
+    
+    def registrar_gol(self, partido_id: int, participante_id: int, minuto: int,
+                      equipo_id: Optional[int] = None, nombre: str = "") -> Optional[Tuple[int, int]]:
+        """
+        Guarda un gol de un partido en juego y actualiza su marcador.
+        
+        Args:
+            partido_id: ID del partido
+            participante_id: ID del goleador
+            minuto: Minuto del gol (el del reloj cuando se pidió registrarlo)
+            equipo_id: Equipo con el que marcó
+            nombre: Nombre del goleador, para el búfer de eventos
+        
+        Returns:
+            Tupla (goles_local, goles_visitante) con el nuevo marcador,
+            o None si no se pudo registrar
+        """
+        en_vivo = self._partidos.get(partido_id)
+        if en_vivo is None:
+            return None
+        
+        marcador = PartidosController.registrar_gol(partido_id, participante_id, minuto, equipo_id)
+        if marcador:
+            equipo = en_vivo.equipo(equipo_id) if equipo_id else "local"
+            en_vivo.goles_local, en_vivo.goles_visitante = marcador
+            en_vivo.eventos.append(EventoEnVivo(GOL, minuto, equipo, nombre))
+            self.partido_actualizado.emit(partido_id)
+        return marcador
+    
+    def registrar_tarjeta(self, partido_id: int, participante_id: int, tipo: str, minuto: int,
+                          equipo_id: Optional[int] = None, nombre: str = "") -> bool:
+        """
+        Guarda una tarjeta de un partido en juego.
+        
+        Args:
+            partido_id: ID del partido
+            participante_id: ID del jugador
+            tipo: 'amarilla' o 'roja'
+            minuto: Minuto de la tarjeta (el del reloj cuando se pidió registrarla)
+            equipo_id: Equipo con el que jugaba
+            nombre: Nombre del jugador, para el búfer de eventos
+        
+        Returns:
+            True si se registró correctamente
+        """
+        en_vivo = self._partidos.get(partido_id)
+        if en_vivo is None:
+            return False
+        
+        if PartidosController.registrar_tarjeta(partido_id, participante_id, tipo, minuto, equipo_id):
+            equipo = en_vivo.equipo(equipo_id) if equipo_id else "local"
+            en_vivo.eventos.append(EventoEnVivo(TARJETA, minuto, equipo, nombre, tipo))
+            self.partido_actualizado.emit(partido_id)
+            return True
+        return False
+    
+    def finalizar(self, partido_id: int) -> Optional[Tuple[int, int]]:
+        """
+        Finaliza un partido en juego con los goles registrados y lo saca del controlador.
+        
+        Args:
+            partido_id: ID del partido
+        
+        Returns:
+            Tupla (goles_local, goles_visitante) con el resultado final,
+            o None si no se pudo finalizar
+        """
+        if partido_id not in self._partidos:
+            return None
+        
+        goles_local, goles_visitante = PartidosController.obtener_goles_partido(partido_id)
+        if not PartidosController.finalizar_partido(partido_id, goles_local, goles_visitante):
+            return None
+        self._quitar(partido_id)
+        return (goles_local, goles_visitante)
+    
+    def _quitar(self, partido_id: int):
+        """Saca un partido del controlador y avisa de que ha terminado."""
+        en_vivo = self._partidos.pop(partido_id, None)
+        if en_vivo is None:
+            return
+        en_vivo.motor.pausar()
+        if not self._partidos:
+            planificador_ticks.cancelar(self)
+        self.partido_finalizado.emit(partido_id)
+    
+    def _comprobar_minutos(self):
+        """Tick del planificador: avisa de los partidos cuyo minuto ha cambiado."""
+        for en_vivo in list(self._partidos.values()):
+            minuto = en_vivo.minuto_actual()
+            if minuto != en_vivo.minuto:
+                en_vivo.minuto = minuto
+                self.minuto_cambiado.emit(en_vivo.partido_id, minuto)
+    
+    def _aplicar_cambio(self, cambio):
+        """Deja de seguir los partidos borrados o finalizados desde otra parte de la aplicación."""
+        if cambio.entidad != eventos.PARTIDO:
+            return
+        for partido_id in cambio.ids:
+            if partido_id not in self._partidos:
+                continue
+            if cambio.tipo == eventos.ELIMINADO:
+                self._quitar(partido_id)
+            elif cambio.tipo == eventos.MODIFICADO:
+                partido = PartidosController.obtener_partido(partido_id)
+                if partido is None or partido.finalizado:
+                    self._quitar(partido_id)
+
+
+# Instancia global de los partidos en juego
+partidos_en_vivo = PartidosEnVivo()
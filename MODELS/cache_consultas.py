@@ -0,0 +1,172 @@
+"""
+Caché de resultados de consultas.
+Las funciones de consulta marcadas con @cacheada(tablas...) guardan su
+resultado por argumentos. Cada resultado se etiqueta con la versión de las
+tablas que lee y con PRAGMA data_version de la conexión: si desde entonces se
+ha escrito en alguna de esas tablas (los modelos lo avisan a través del bus
+de cambios) u otra conexión o proceso ha confirmado cambios en la BD, la
+siguiente llamada vuelve a ejecutar la consulta. Se activa con config.USAR_CACHE.
+"""
+
+import copy
+import functools
+import inspect
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterable
+from PySide6.QtSql import QSqlDatabase
+from MODELS.database import obtener_conexion, crear_query, al_confirmar, en_transaccion
+import config
+
+
+class _Entrada:
+    """Resultado guardado y el estado de la BD con el que se calculó."""
+    
+    __slots__ = ("resultado", "versiones", "conexion", "version_datos")
+    
+    def __init__(self, resultado, versiones: tuple, conexion: str, version_datos: int):
+        self.resultado = resultado
+        self.versiones = versiones
+        self.conexion = conexion
+        self.version_datos = version_datos
+
+
+class CacheConsultas:
+    """Resultados de consultas por función y argumentos, con descarte LRU, seguro entre hilos."""
+    
+    def __init__(self):
+        self._resultados = OrderedDict()  # (función, argumentos) -> _Entrada
+        self._versiones = {}  # tabla -> número de escrituras
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+    
+    def obtener(self, funcion: Callable, tablas: tuple, argumentos: tuple,
+                calcular: Callable[[], object], db: QSqlDatabase = None):
+        """
+        Devuelve el resultado guardado si sigue siendo válido, o lo calcula y lo guarda.
+        
+        Args:
+            funcion: Función de consulta (parte de la clave)
+            tablas: Tablas que lee la consulta
+            argumentos: Argumentos de la llamada (parte de la clave)
+            calcular: Ejecuta la consulta
+            db: Conexión con la que se consulta (por defecto la del hilo actual)
+        
+        Returns:
+            Una copia del resultado
+        """
+        db = obtener_conexion(db)
+        # Dentro de una transacción la consulta puede ver cambios sin confirmar
+        if en_transaccion(db):
+            return calcular()
+        
+        clave = (funcion, argumentos)
+        conexion = db.connectionName()
+        version_datos = self._version_datos(db)
+        with self._lock:
+            versiones = tuple(self._versiones.get(tabla, 0) for tabla in tablas)
+            entrada = self._resultados.get(clave)
+            if (entrada is not None and entrada.versiones == versiones
+                    and entrada.conexion == conexion and entrada.version_datos == version_datos):
+                self._resultados.move_to_end(clave)
+                self.aciertos += 1
+                return copy.deepcopy(entrada.resultado)
+            self.fallos += 1
+        
+        # Las versiones se toman antes de consultar: una escritura durante la
+        # consulta deja la entrada caducada para la siguiente llamada
+        resultado = calcular()
+        with self._lock:
+            self._resultados[clave] = _Entrada(copy.deepcopy(resultado), versiones,
+                                               conexion, version_datos)
+            self._resultados.move_to_end(clave)
+            while len(self._resultados) > max(config.MAX_RESULTADOS_QUERY, 0):
+                self._resultados.popitem(last=False)
+        return resultado
+    
+    def marcar_escritura(self, tablas: Iterable[str], db: QSqlDatabase = None):
+        """
+        Avisa de que se ha escrito en unas tablas: caducan los resultados que las leen.
+        Si hay una transacción abierta, se vuelven a marcar al confirmarla.
+        
+        Args:
+            tablas: Tablas escritas
+            db: Conexión en la que se escribió (por defecto la del hilo actual)
+        """
+        tablas = tuple(tablas)
+        if not tablas:
+            return
+        self._incrementar(tablas)
+        if en_transaccion(db):
+            al_confirmar(lambda: self._incrementar(tablas), db)
+    
+    def vaciar(self):
+        """Descarta todos los resultados y pone a cero los contadores."""
+        with self._lock:
+            self._resultados.clear()
+            self.aciertos = 0
+            self.fallos = 0
+    
+    def estadisticas(self) -> dict:
+        """
+        Returns:
+            dict: resultados guardados, aciertos, fallos, tasa de aciertos y versión de cada tabla
+        """
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                'resultados': len(self._resultados),
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+                'versiones': dict(self._versiones),
+            }
+    
+    def _incrementar(self, tablas: tuple):
+        """Sube la versión de las tablas."""
+        with self._lock:
+            for tabla in tablas:
+                self._versiones[tabla] = self._versiones.get(tabla, 0) + 1
+    
+    @staticmethod
+    def _version_datos(db: QSqlDatabase) -> int:
+        """PRAGMA data_version: cambia cuando otra conexión confirma cambios en la BD."""
+        query = crear_query(db)
+        if query.exec("PRAGMA data_version") and query.next():
+            version = query.value(0)
+            query.finish()
+            return version
+        return -1
+
+
+# Instancia global de la caché
+cache_consultas = CacheConsultas()
+
+
+def cacheada(*tablas: str):
+    """
+    Decorador para funciones de consulta con parámetro `db`: guarda su
+    resultado por argumentos mientras no cambien las tablas indicadas.
+    
+    Args:
+        *tablas: Tablas que lee la consulta
+    """
+    def decorador(funcion):
+        firma = inspect.signature(funcion)
+        
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not config.USAR_CACHE:
+                return funcion(*args, **kwargs)
+            
+            llamada = firma.bind(*args, **kwargs)
+            llamada.apply_defaults()
+            db = llamada.arguments.pop('db', None)
+            argumentos = tuple(llamada.arguments.items())
+            return cache_consultas.obtener(
+                funcion, tablas, argumentos,
+                lambda: funcion(*args, **kwargs), db
+            )
+        return envoltura
+    return decorador
@@ -0,0 +1,145 @@
+"""
+Caché de entidades (mapa de identidad).
+Guarda los Equipo, Participante y Partido leídos con obtener_por_id, de modo
+que pedir dos veces el mismo id no vuelve a la BD. Cada llamada recibe una
+copia: modificar la entidad devuelta no altera la guardada ni la de otros.
+Tiene un máximo de config.MAX_RESULTADOS_QUERY entidades (se descartan las
+menos usadas) y se activa con config.USAR_CACHE.
+
+Los métodos de escritura de los modelos mantienen la caché al día: al
+escribir sacan la entidad de la caché y, cuando la transacción se confirma,
+vuelven a guardar el objeto escrito; si se deshace, la próxima lectura va a
+la BD. Las escrituras hechas por otros procesos no se detectan.
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+from PySide6.QtSql import QSqlDatabase
+from MODELS.database import al_confirmar, en_transaccion
+import config
+
+
+class CacheEntidades:
+    """Mapa de identidad con descarte LRU, seguro entre hilos."""
+    
+    def __init__(self):
+        self._entidades = OrderedDict()  # (clase, id) -> entidad, de la menos a la más usada
+        self._versiones = {}  # (clase, id) -> número de cambios, para no guardar lecturas viejas
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+    
+    def obtener(self, clase: type, entidad_id: int, cargar: Callable[[], Optional[object]],
+                db: QSqlDatabase = None):
+        """
+        Devuelve la entidad de la caché, o la carga con `cargar` y la guarda.
+        
+        Args:
+            clase: Clase de la entidad
+            entidad_id: ID de la entidad
+            cargar: Función que lee la entidad de la BD (o devuelve None)
+            db: Conexión con la que se lee (por defecto la del hilo actual)
+        
+        Returns:
+            La entidad (una copia propia) o None si no existe
+        """
+        if not config.USAR_CACHE:
+            return cargar()
+        
+        clave = (clase, entidad_id)
+        with self._lock:
+            entidad = self._entidades.get(clave)
+            if entidad is not None:
+                self._entidades.move_to_end(clave)
+                self.aciertos += 1
+                return copy.copy(entidad)
+            self.fallos += 1
+            version = self._versiones.get(clave, 0)
+        
+        entidad = cargar()
+        # Dentro de una transacción se pueden leer cambios aún sin confirmar: no se guardan
+        if entidad is not None and not en_transaccion(db):
+            with self._lock:
+                # Si la entidad cambió mientras se leía, la lectura ya no vale
+                if self._versiones.get(clave, 0) == version:
+                    self._guardar(clave, copy.copy(entidad))
+        return entidad
+    
+    def escrita(self, entidad, db: QSqlDatabase = None):
+        """
+        Avisa de que una entidad se acaba de escribir en la BD.
+        Sale de la caché en el acto y vuelve a entrar cuando se confirme la transacción.
+        
+        Args:
+            entidad: Entidad escrita (con su id)
+            db: Conexión en la que se escribió (por defecto la del hilo actual)
+        """
+        clave = (type(entidad), entidad.id)
+        self._descartar(clave)
+        if config.USAR_CACHE:
+            # Se guarda tal como se escribió, aunque quien la escribió la siga modificando
+            escrita = copy.copy(entidad)
+            al_confirmar(lambda: self._confirmar(clave, escrita), db)
+    
+    def descartar(self, clase: type, entidad_id: int, db: QSqlDatabase = None):
+        """
+        Saca una entidad de la caché (p. ej. tras borrarla o si la escritura falló).
+        Si hay una transacción abierta se vuelve a sacar al confirmarla.
+        
+        Args:
+            clase: Clase de la entidad
+            entidad_id: ID de la entidad
+            db: Conexión en la que se escribió (por defecto la del hilo actual)
+        """
+        clave = (clase, entidad_id)
+        self._descartar(clave)
+        if en_transaccion(db):
+            al_confirmar(lambda: self._descartar(clave), db)
+    
+    def vaciar(self):
+        """Vacía la caché y pone a cero los contadores."""
+        with self._lock:
+            self._entidades.clear()
+            self._versiones.clear()
+            self.aciertos = 0
+            self.fallos = 0
+    
+    def estadisticas(self) -> dict:
+        """
+        Returns:
+            dict: entidades guardadas, capacidad, aciertos, fallos y tasa de aciertos
+        """
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                'entidades': len(self._entidades),
+                'capacidad': config.MAX_RESULTADOS_QUERY,
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+            }
+    
+    def _guardar(self, clave: tuple, entidad):
+        """Guarda una entidad y descarta las menos usadas si se supera la capacidad (con el lock tomado)."""
+        self._entidades[clave] = entidad
+        self._entidades.move_to_end(clave)
+        while len(self._entidades) > max(config.MAX_RESULTADOS_QUERY, 0):
+            self._entidades.popitem(last=False)
+    
+    def _confirmar(self, clave: tuple, entidad):
+        """Vuelve a guardar una entidad escrita cuando su transacción se confirma."""
+        with self._lock:
+            self._versiones[clave] = self._versiones.get(clave, 0) + 1
+            self._guardar(clave, entidad)
+    
+    def _descartar(self, clave: tuple):
+        """Saca una entidad de la caché e invalida las lecturas en curso."""
+        with self._lock:
+            self._entidades.pop(clave, None)
+            self._versiones[clave] = self._versiones.get(clave, 0) + 1
+
+
+# Instancia global de la caché
+cache_entidades = CacheEntidades()
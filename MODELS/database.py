@@ -1,18 +1,61 @@
 """
 Módulo de gestión de base de datos SQLite para el torneo de fútbol.
-Gestiona la conexión y creación de tablas.
+Gestiona la conexión, la creación de tablas, las migraciones y los datos iniciales.
+Es el único punto de arranque del esquema: tanto main.py como
+inicializar_db.py pasan por aquí.
 """
 
 from PySide6.QtSql import QSqlDatabase, QSqlQuery
+from MODELS.migraciones import aplicar_migraciones, obtener_version, VERSION_ESQUEMA
+from MODELS.instrumentacion import ConsultaInstrumentada
+from contextlib import contextmanager
+from typing import Callable
+import config
+import logging
 import os
 import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Profundidad de transacciones abiertas con transaccion(), por nombre de conexión
+_transacciones_abiertas = {}
+
+# Funciones a ejecutar tras el commit de la transacción abierta, por nombre de conexión
+_al_confirmar = {}
+
+# Conexiones de los hilos secundarios: cada hilo guarda aquí el nombre de la suya
+PREFIJO_CONEXION_HILO = "hilo_"
+_conexion_del_hilo = threading.local()
+
+# Ruta de la BD elegida con establecer_ruta_db() (None = la de DATA)
+_ruta_db = None
+
+# Variable de entorno que permite abrir otra BD (p. ej. una generada con generar_torneo.py)
+VARIABLE_RUTA_DB = "TORNEO_FUTBOL_DB"
+
+def establecer_ruta_db(ruta: str = None):
+    """
+    Cambia la base de datos que abren las conexiones siguientes.
+    
+    Args:
+        ruta: Ruta del fichero SQLite (None vuelve a la de por defecto)
+    """
+    global _ruta_db
+    _ruta_db = os.path.abspath(ruta) if ruta else None
 
 def obtener_ruta_db():
     """
     Obtiene la ruta absoluta de la base de datos.
     Compatible con PyInstaller.
-    La BD se encuentra en la carpeta DATA.
+    La BD se encuentra en la carpeta DATA, salvo que se haya elegido otra
+    con establecer_ruta_db() o con la variable de entorno TORNEO_FUTBOL_DB.
     """
+    if _ruta_db:
+        return _ruta_db
+    if os.environ.get(VARIABLE_RUTA_DB):
+        return os.path.abspath(os.environ[VARIABLE_RUTA_DB])
     if getattr(sys, 'frozen', False):
         # Ejecutable empaquetado
         base_path = sys._MEIPASS
@@ -26,7 +69,8 @@ def obtener_ruta_db():
 def conectar():
     """
     Establece la conexión con la base de datos SQLite.
-    Activa las foreign keys y crea las tablas necesarias.
+    Activa las foreign keys y deja el esquema preparado
+    (tablas, migraciones y datos iniciales si la BD está vacía).
     
     Returns:
         QSqlDatabase: Objeto de conexión a la base de datos
@@ -34,24 +78,270 @@ def conectar():
     Raises:
         Exception: Si no se puede abrir la base de datos
     """
-    db = QSqlDatabase.addDatabase("QSQLITE")
+    inicio = time.perf_counter()
+    
+    db = abrir_conexion()
+    preparar_esquema(db)
+    comprobar_perfil(db)
+    
+    logger.info(f"Base de datos lista en {(time.perf_counter() - inicio) * 1000:.1f} ms")
+    return db
+
+def abrir_conexion(nombre: str = None) -> QSqlDatabase:
+    """
+    Abre una conexión SQLite a la base de datos del torneo con foreign keys activas.
+    
+    Cada hilo necesita su propia conexión: QtSql no permite usar una
+    conexión desde un hilo distinto del que la creó.
+    
+    Args:
+        nombre: Nombre de la conexión (por defecto la conexión principal)
+    
+    Returns:
+        QSqlDatabase: Conexión abierta
+    
+    Raises:
+        Exception: Si no se puede abrir la base de datos
+    """
+    if nombre:
+        db = QSqlDatabase.addDatabase("QSQLITE", nombre)
+    else:
+        db = QSqlDatabase.addDatabase("QSQLITE")
     db_path = obtener_ruta_db()
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
     db.setDatabaseName(db_path)
+    # Con varias conexiones, esperar al bloqueo de otra en lugar de fallar
+    db.setConnectOptions(f"QSQLITE_BUSY_TIMEOUT={config.TIMEOUT_DB}")
     
     if not db.open():
         raise Exception(f"No se pudo abrir la BD en {db_path}")
     
-    query = QSqlQuery()
-    query.exec("PRAGMA foreign_keys = ON;")
+    query = QSqlQuery(db)
+    for pragma in _pragmas_conexion():
+        if not query.exec(f"PRAGMA {pragma}"):
+            logger.warning(f"No se pudo aplicar PRAGMA {pragma}: {query.lastError().text()}")
+    return db
+
+def _pragmas_conexion() -> list:
+    """PRAGMAs que se aplican a cada conexión, según el perfil de rendimiento de config.py."""
+    return [
+        "foreign_keys = ON",
+        f"journal_mode = {config.SQLITE_JOURNAL_MODE}",
+        f"synchronous = {config.SQLITE_SYNCHRONOUS}",
+        f"cache_size = {int(config.SQLITE_CACHE_SIZE)}",
+        f"mmap_size = {int(config.SQLITE_MMAP_SIZE)}",
+        f"temp_store = {config.SQLITE_TEMP_STORE}",
+    ]
+
+def comprobar_perfil(db: QSqlDatabase = None) -> dict:
+    """
+    Lee los ajustes de SQLite en vigor en una conexión y los registra en el log.
     
-    crear_tablas(query)
+    Avisa de los que no coinciden con config.py; por ejemplo, SQLite no
+    puede usar WAL en algunos sistemas de archivos de red y se queda en
+    el modo de journal anterior.
     
+    Args:
+        db: Conexión a comprobar (por defecto la del hilo actual)
+    
+    Returns:
+        dict: Valor en vigor de cada ajuste
+    """
+    niveles_synchronous = {"OFF": 0, "NORMAL": 1, "FULL": 2, "EXTRA": 3}
+    niveles_temp_store = {"DEFAULT": 0, "FILE": 1, "MEMORY": 2}
+    esperado = {
+        'foreign_keys': 1,
+        'journal_mode': config.SQLITE_JOURNAL_MODE.lower(),
+        'synchronous': niveles_synchronous.get(config.SQLITE_SYNCHRONOUS.upper()),
+        'cache_size': int(config.SQLITE_CACHE_SIZE),
+        'mmap_size': int(config.SQLITE_MMAP_SIZE),
+        'temp_store': niveles_temp_store.get(config.SQLITE_TEMP_STORE.upper()),
+        'busy_timeout': int(config.TIMEOUT_DB),
+    }
+    
+    query = crear_query(db)
+    en_vigor = {}
+    for ajuste in esperado:
+        if query.exec(f"PRAGMA {ajuste}") and query.next():
+            en_vigor[ajuste] = query.value(0)
+        else:
+            en_vigor[ajuste] = None
+    query.finish()
+    
+    logger.info("Perfil de SQLite: " + ", ".join(f"{k}={v}" for k, v in en_vigor.items()))
+    for ajuste, valor in esperado.items():
+        if en_vigor[ajuste] != valor:
+            logger.warning(f"PRAGMA {ajuste} = {en_vigor[ajuste]} (config.py pide {valor})")
+    return en_vigor
+    
+class _LiberadorConexion:
+    """
+    Cierra la conexión de un hilo cuando el hilo termina.
+    Vive en los datos locales del hilo, que Python destruye desde el propio
+    hilo al acabar (tanto en threading.Thread como en QThread).
+    """
+    
+    def __init__(self, nombre: str):
+        self.nombre = nombre
+    
+    def __del__(self):
+        _cerrar_conexion_nombrada(self.nombre)
+
+def obtener_conexion(db: QSqlDatabase = None) -> QSqlDatabase:
+    """
+    Devuelve la conexión que corresponde al hilo actual.
+    
+    En el hilo principal es la conexión por defecto que abre conectar().
+    En cualquier otro hilo se abre la primera vez una conexión con nombre
+    propio y las mismas opciones (abrir_conexion), que se reutiliza en las
+    siguientes llamadas y se cierra sola cuando el hilo termina.
+    
+    Args:
+        db: Conexión explícita; si se indica, se devuelve tal cual
+    
+    Returns:
+        QSqlDatabase: Conexión abierta utilizable desde el hilo actual
+    
+    Raises:
+        Exception: Si no se puede abrir la conexión del hilo
+    """
+    if db is not None:
+        return db
+    if threading.current_thread() is threading.main_thread():
+        return QSqlDatabase.database()
+    
+    nombre = getattr(_conexion_del_hilo, "nombre", None)
+    if nombre is not None:
+        return QSqlDatabase.database(nombre)
+    
+    nombre = f"{PREFIJO_CONEXION_HILO}{threading.get_ident()}"
+    db = abrir_conexion(nombre)
+    _conexion_del_hilo.nombre = nombre
+    _conexion_del_hilo.liberador = _LiberadorConexion(nombre)
+    logger.debug(f"Conexión {nombre} abierta")
     return db
 
+def cerrar_conexion_hilo():
+    """
+    Cierra ya la conexión del hilo actual, sin esperar a que termine.
+    No hace nada en el hilo principal ni si el hilo no abrió conexión.
+    """
+    liberador = getattr(_conexion_del_hilo, "liberador", None)
+    if liberador is None:
+        return
+    _conexion_del_hilo.nombre = None
+    _conexion_del_hilo.liberador = None
+    # Al perder la última referencia, __del__ cierra la conexión
+    del liberador
+
+def _cerrar_conexion_nombrada(nombre: str):
+    """Cierra y da de baja una conexión con nombre."""
+    if QSqlDatabase.contains(nombre):
+        db = QSqlDatabase.database(nombre, False)
+        db.close()
+        del db
+        QSqlDatabase.removeDatabase(nombre)
+        logger.debug(f"Conexión {nombre} cerrada")
+    _transacciones_abiertas.pop(nombre, None)
+    _al_confirmar.pop(nombre, None)
+
+def crear_query(db: QSqlDatabase = None) -> QSqlQuery:
+    """
+    Crea una QSqlQuery ligada a la conexión indicada.
+    
+    Con config.INSTRUMENTAR_CONSULTAS cada ejecución se mide y las consultas
+    lentas se registran en el log (ver MODELS/instrumentacion.py).
+    
+    Args:
+        db: Conexión a usar (por defecto la del hilo actual, ver obtener_conexion)
+    
+    Returns:
+        QSqlQuery: Consulta lista para preparar o ejecutar
+    """
+    if config.INSTRUMENTAR_CONSULTAS:
+        return ConsultaInstrumentada(obtener_conexion(db))
+    return QSqlQuery(obtener_conexion(db))
+
+def ejecutar_lote(sql: str, filas, db: QSqlDatabase = None, ids: list = None) -> int:
+    """
+    Ejecuta una sentencia una vez por cada fila de valores (el executemany de QtSql).
+    
+    La sentencia se prepara una sola vez y se reutiliza en todas las filas.
+    No usa QSqlQuery.execBatch: QSQLITE no tiene ejecución por lotes nativa
+    y la emulación de Qt copia las listas de valores en cada fila, con un
+    coste cuadrático en el número de filas. Conviene llamarla dentro de
+    transaccion() para que todas las filas se confirmen en un único commit.
+    
+    Args:
+        sql: Sentencia con marcadores ?
+        filas: Iterable de tuplas de valores, en el orden de los marcadores
+        db: Conexión a usar (por defecto la del hilo actual)
+        ids: Si se indica, se le añade el id generado por cada fila (INSERT)
+    
+    Returns:
+        int: Número de filas ejecutadas
+    
+    Raises:
+        Exception: Si la sentencia no se puede preparar o alguna fila falla
+    """
+    query = crear_query(db)
+    if not query.prepare(sql):
+        raise Exception(f"No se pudo preparar la sentencia: {query.lastError().text()}")
+    
+    inicio = time.perf_counter()
+    total = 0
+    try:
+        for fila in filas:
+            for valor in fila:
+                query.addBindValue(valor)
+            # Sin medir cada fila: el lote se registra entero al terminar
+            if not QSqlQuery.exec(query):
+                raise Exception(f"Error en la fila {total + 1}: {query.lastError().text()}")
+            if ids is not None:
+                ids.append(query.lastInsertId())
+            total += 1
+    finally:
+        if isinstance(query, ConsultaInstrumentada):
+            query.registrar_lote(total, time.perf_counter() - inicio)
+        query.finish()
+    return total
+
+def preparar_esquema(db: QSqlDatabase, datos_ejemplo: bool = True):
+    """
+    Deja el esquema de la base de datos en la última versión.
+    
+    Consulta la versión una sola vez: si ya es la última no ejecuta nada más.
+    Si la base de datos no tenía tablas, las crea e inserta los datos de ejemplo.
+    
+    Args:
+        db: Conexión abierta a la base de datos
+        datos_ejemplo: Si False, una BD nueva se queda sin datos de ejemplo
+    
+    Raises:
+        Exception: Si alguna migración falla
+    """
+    version = obtener_version(db)
+    if version >= VERSION_ESQUEMA:
+        return
+    
+    query = QSqlQuery(db)
+    query.exec("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'equipos'")
+    bd_vacia = query.next() and query.value(0) == 0
+    
+    crear_tablas(query)
+    version = aplicar_migraciones(db, version)
+    logger.info(f"Esquema de la base de datos en la versión {version}")
+    
+    if bd_vacia and datos_ejemplo:
+        insertar_datos_iniciales(db)
+
 def crear_tablas(query):
     """
     Crea todas las tablas necesarias para el torneo si no existen.
     
+    Es el esquema base (versión 0); cualquier cambio posterior
+    se hace con una migración en MODELS/migraciones.py.
+    
     Tablas:
         - equipos: Datos de los equipos
         - participantes: Jugadores y árbitros
@@ -66,8 +356,8 @@ def crear_tablas(query):
         CREATE TABLE IF NOT EXISTS equipos (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             nombre TEXT NOT NULL UNIQUE,
-            curso TEXT NOT NULL,
-            color_camiseta TEXT NOT NULL,
+            curso TEXT,
+            color_camiseta TEXT,
             logo TEXT,
             activo INTEGER DEFAULT 1
         )
@@ -78,8 +368,8 @@ def crear_tablas(query):
         CREATE TABLE IF NOT EXISTS participantes (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             nombre TEXT NOT NULL,
-            fecha_nacimiento TEXT NOT NULL,
-            curso TEXT NOT NULL,
+            fecha_nacimiento DATE,
+            curso TEXT,
             es_jugador INTEGER DEFAULT 0,
             es_arbitro INTEGER DEFAULT 0,
             posicion TEXT,
@@ -93,9 +383,9 @@ def crear_tablas(query):
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             equipo_id INTEGER NOT NULL,
             participante_id INTEGER NOT NULL,
+            UNIQUE(equipo_id, participante_id),
             FOREIGN KEY (equipo_id) REFERENCES equipos(id) ON DELETE CASCADE,
-            FOREIGN KEY (participante_id) REFERENCES participantes(id) ON DELETE CASCADE,
-            UNIQUE(equipo_id, participante_id)
+            FOREIGN KEY (participante_id) REFERENCES participantes(id) ON DELETE CASCADE
         )
     """)
     
@@ -111,8 +401,8 @@ def crear_tablas(query):
             goles_local INTEGER DEFAULT 0,
             goles_visitante INTEGER DEFAULT 0,
             finalizado INTEGER DEFAULT 0,
-            FOREIGN KEY (equipo_local_id) REFERENCES equipos(id),
-            FOREIGN KEY (equipo_visitante_id) REFERENCES equipos(id),
+            FOREIGN KEY (equipo_local_id) REFERENCES equipos(id) ON DELETE CASCADE,
+            FOREIGN KEY (equipo_visitante_id) REFERENCES equipos(id) ON DELETE CASCADE,
             FOREIGN KEY (arbitro_id) REFERENCES participantes(id)
         )
     """)
@@ -121,11 +411,11 @@ def crear_tablas(query):
     query.exec("""
         CREATE TABLE IF NOT EXISTS goles (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
-            partido_id INTEGER NOT NULL,
+            partido_id INTEGER,
             participante_id INTEGER NOT NULL,
             minuto INTEGER,
             FOREIGN KEY (partido_id) REFERENCES partidos(id) ON DELETE CASCADE,
-            FOREIGN KEY (participante_id) REFERENCES participantes(id)
+            FOREIGN KEY (participante_id) REFERENCES participantes(id) ON DELETE CASCADE
         )
     """)
     
@@ -133,139 +423,182 @@ def crear_tablas(query):
     query.exec("""
         CREATE TABLE IF NOT EXISTS tarjetas (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
-            partido_id INTEGER NOT NULL,
+            partido_id INTEGER,
             participante_id INTEGER NOT NULL,
             tipo TEXT NOT NULL CHECK(tipo IN ('amarilla', 'roja')),
             minuto INTEGER,
             FOREIGN KEY (partido_id) REFERENCES partidos(id) ON DELETE CASCADE,
-            FOREIGN KEY (participante_id) REFERENCES participantes(id)
+            FOREIGN KEY (participante_id) REFERENCES participantes(id) ON DELETE CASCADE
         )
     """)
     
-    print("Tablas creadas correctamente")
     
-    # Insertar datos de ejemplo si las tablas están vacías
-    insertar_datos_iniciales(query)
-
-
-def insertar_datos_iniciales(query):
+def insertar_datos_iniciales(db: QSqlDatabase):
     """
     Inserta datos de ejemplo iniciales en la base de datos.
-    Solo se ejecuta si las tablas están vacías.
+    Solo se llama al crear una base de datos nueva; todo va en una transacción.
     """
-    # Verificar si ya hay equipos
-    query.exec("SELECT COUNT(*) FROM equipos")
-    if query.next() and query.value(0) > 0:
-        return  # Ya hay datos, no hacer nada
-    
-    print("Insertando datos iniciales de ejemplo...")
+    logger.info("Insertando datos iniciales de ejemplo...")
     
-    # Insertar equipos
+    # Equipos
     equipos = [
-        ("Vipers", "1º ESO A", "Rojo"),
-        ("Sharks", "1º ESO B", "Azul"),
-        ("Tigers", "2º ESO A", "Verde"),
-        ("Eagles", "2º ESO B", "Amarillo"),
+        ("Real Suciedad", "1º ESO A", "Rojo"),
+        ("Aston Birras", "1º ESO B", "Azul"),
+        ("Supernenas", "2º ESO A", "Verde"),
+        ("Union de casados", "2º ESO B", "Amarillo"),
     ]
     
-    for nombre, curso, color in equipos:
-        query.prepare("""
-            INSERT INTO equipos (nombre, curso, color_camiseta)
-            VALUES (?, ?, ?)
-        """)
-        query.addBindValue(nombre)
-        query.addBindValue(curso)
-        query.addBindValue(color)
-        if not query.exec():
-            print(f"Error inserting equipo: {query.lastError().text()}")
-    
-    # Insertar participantes (jugadores)
+    # Participantes agrupados por equipo (None = árbitros)
     participantes = [
-        # VIPERS
-        ("Carlos González", "2010-03-15", "1º ESO A", 1, 0, "Portero"),
-        ("Miguel López", "2010-05-20", "1º ESO A", 1, 0, "Defensa"),
-        ("Juan Martínez", "2010-07-10", "1º ESO A", 1, 0, "Centrocampista"),
-        ("David Sánchez", "2010-04-25", "1º ESO A", 1, 0, "Delantero"),
-        ("Pedro García", "2010-06-30", "1º ESO A", 1, 0, "Delantero"),
-        
-        # SHARKS
-        ("Roberto Fernández", "2010-02-12", "1º ESO B", 1, 0, "Portero"),
-        ("Antonio Rodríguez", "2010-08-18", "1º ESO B", 1, 0, "Defensa"),
-        ("Fernando Romero", "2010-09-22", "1º ESO B", 1, 0, "Centrocampista"),
-        ("Luis Torres", "2010-01-05", "1º ESO B", 1, 0, "Delantero"),
-        ("Ricardo Pérez", "2010-11-14", "1º ESO B", 1, 0, "Defensa"),
-        
-        # TIGERS
-        ("Arturo Silva", "2009-03-10", "2º ESO A", 1, 0, "Portero"),
-        ("Javier Vargas", "2009-05-20", "2º ESO A", 1, 0, "Defensa"),
-        ("Sergio Castro", "2009-07-15", "2º ESO A", 1, 0, "Centrocampista"),
-        ("Oscar Álvarez", "2009-04-28", "2º ESO A", 1, 0, "Delantero"),
-        ("Manuel Díaz", "2009-06-12", "2º ESO A", 1, 0, "Delantero"),
-        
-        # EAGLES
-        ("Enrique Moreno", "2009-02-08", "2º ESO B", 1, 0, "Portero"),
-        ("Gonzalo Ruiz", "2009-08-19", "2º ESO B", 1, 0, "Defensa"),
-        ("Jesús Soto", "2009-09-24", "2º ESO B", 1, 0, "Centrocampista"),
-        ("Vicente Herrera", "2009-01-11", "2º ESO B", 1, 0, "Delantero"),
-        ("Mariano Navarro", "2009-10-30", "2º ESO B", 1, 0, "Defensa"),
-        
-        # ÁRBITROS
-        ("Profesor Antonio", "1970-05-15", "Profesorado", 0, 1, None),
-        ("Profesor Juan", "1975-08-22", "Profesorado", 0, 1, None),
+        ("Real Suciedad", [
+            ("Carlos González", "2010-03-15", "1º ESO A", 1, 0, "Portero"),
+            ("Miguel López", "2010-05-20", "1º ESO A", 1, 0, "Defensa"),
+            ("Juan Martínez", "2010-07-10", "1º ESO A", 1, 0, "Centrocampista"),
+            ("David Sánchez", "2010-04-25", "1º ESO A", 1, 0, "Delantero"),
+            ("Pedro García", "2010-06-30", "1º ESO A", 1, 0, "Delantero"),
+        ]),
+        ("Aston Birras", [
+            ("Roberto Fernández", "2010-02-12", "1º ESO B", 1, 0, "Portero"),
+            ("Antonio Rodríguez", "2010-08-18", "1º ESO B", 1, 0, "Defensa"),
+            ("Fernando Romero", "2010-09-22", "1º ESO B", 1, 0, "Centrocampista"),
+            ("Luis Torres", "2010-01-05", "1º ESO B", 1, 0, "Delantero"),
+            ("Ricardo Pérez", "2010-11-14", "1º ESO B", 1, 0, "Defensa"),
+        ]),
+        ("Supernenas", [
+            ("Arturo Silva", "2009-03-10", "2º ESO A", 1, 0, "Portero"),
+            ("Javier Vargas", "2009-05-20", "2º ESO A", 1, 0, "Defensa"),
+            ("Sergio Castro", "2009-07-15", "2º ESO A", 1, 0, "Centrocampista"),
+            ("Oscar Álvarez", "2009-04-28", "2º ESO A", 1, 0, "Delantero"),
+            ("Manuel Díaz", "2009-06-12", "2º ESO A", 1, 0, "Delantero"),
+        ]),
+        ("Union de casados", [
+            ("Enrique Moreno", "2009-02-08", "2º ESO B", 1, 0, "Portero"),
+            ("Gonzalo Ruiz", "2009-08-19", "2º ESO B", 1, 0, "Defensa"),
+            ("Jesús Soto", "2009-09-24", "2º ESO B", 1, 0, "Centrocampista"),
+            ("Vicente Herrera", "2009-01-11", "2º ESO B", 1, 0, "Delantero"),
+            ("Mariano Navarro", "2009-10-30", "2º ESO B", 1, 0, "Defensa"),
+        ]),
+        (None, [
+            ("Profesor Antonio", "1970-05-15", "Profesorado", 0, 1, None),
+            ("Profesor Juan", "1975-08-22", "Profesorado", 0, 1, None),
+        ]),
     ]
     
-    for nombre, fecha_nac, curso, es_jugador, es_arbitro, posicion in participantes:
-        query.prepare("""
-            INSERT INTO participantes (nombre, fecha_nacimiento, curso, es_jugador, es_arbitro, posicion)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """)
-        query.addBindValue(nombre)
-        query.addBindValue(fecha_nac)
-        query.addBindValue(curso)
-        query.addBindValue(es_jugador)
-        query.addBindValue(es_arbitro)
-        query.addBindValue(posicion)
-        if not query.exec():
-            print(f"Error inserting participante: {query.lastError().text()}")
-    
-    # Asignar jugadores a equipos
-    # Obtener IDs de equipos
-    query.exec("SELECT id, nombre FROM equipos ORDER BY nombre")
-    equipos_dict = {}
-    while query.next():
-        equipos_dict[query.value(1)] = query.value(0)
-    
-    # Definir asignaciones
-    asignaciones = [
-        ("ASIR", ["Carlos González", "Miguel López", "Juan Martínez", "David Sánchez", "Pedro García"]),
-        ("DAM", ["Roberto Fernández", "Antonio Rodríguez", "Fernando Romero", "Luis Torres", "Ricardo Pérez"]),
-        ("SMR", ["Arturo Silva", "Javier Vargas", "Sergio Castro", "Oscar Álvarez", "Manuel Díaz"]),
-        ("DAW", ["Enrique Moreno", "Gonzalo Ruiz", "Jesús Soto", "Vicente Herrera", "Mariano Navarro"]),
-    ]
+    try:
+        with transaccion(db):
+            equipos_ids = []
+            ejecutar_lote("""
+                INSERT INTO equipos (nombre, curso, color_camiseta)
+                VALUES (?, ?, ?)
+            """, equipos, db, ids=equipos_ids)
+            ids_por_nombre = {equipo[0]: equipo_id for equipo, equipo_id in zip(equipos, equipos_ids)}
     
-    for equipo_nombre, jugadores in asignaciones:
-        equipo_id = equipos_dict.get(equipo_nombre)
-        if not equipo_id:
-            continue
-        
-        for jugador_nombre in jugadores:
-            query.prepare("""
-                SELECT id FROM participantes WHERE nombre = ? AND es_jugador = 1
-            """)
-            query.addBindValue(jugador_nombre)
-            
-            if query.exec() and query.next():
-                participante_id = query.value(0)
-                query.prepare("""
-                    INSERT OR IGNORE INTO equipo_participante (equipo_id, participante_id)
-                    VALUES (?, ?)
-                """)
-                query.addBindValue(equipo_id)
-                query.addBindValue(participante_id)
-                if not query.exec():
-                    print(f"Error assigning player: {query.lastError().text()}")
-    
-    print("Datos iniciales insertados correctamente")
+            filas = [fila for _, lista in participantes for fila in lista]
+            participantes_ids = []
+            ejecutar_lote("""
+                INSERT INTO participantes (nombre, fecha_nacimiento, curso, es_jugador, es_arbitro, posicion)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, filas, db, ids=participantes_ids)
+    
+            # Asignar jugadores a su equipo (los ids siguen el orden de filas)
+            equipo_de_fila = [equipo_nombre for equipo_nombre, lista in participantes for _ in lista]
+            ejecutar_lote("""
+                INSERT OR IGNORE INTO equipo_participante (equipo_id, participante_id)
+                VALUES (?, ?)
+            """, [(ids_por_nombre[equipo_nombre], participante_id)
+                  for equipo_nombre, participante_id in zip(equipo_de_fila, participantes_ids)
+                  if equipo_nombre], db)
+    except Exception as e:
+        logger.error(f"No se pudieron insertar los datos iniciales: {e}")
+        return
+    
+    logger.info("Datos iniciales insertados correctamente")
+
+
+@contextmanager
+def transaccion(db: QSqlDatabase = None):
+    """
+    Ejecuta un bloque dentro de una transacción.
+    
+    Es reentrante: si la conexión ya tiene una transacción abierta con
+    transaccion(), el bloque se ejecuta dentro de un SAVEPOINT y solo la
+    más externa hace commit. Una excepción deshace lo escrito en su bloque
+    (y las funciones de al_confirmar registradas en él) y se propaga; si
+    llega a la transacción más externa, la deshace completa.
+    
+    Args:
+        db: Conexión a usar (por defecto la del hilo actual)
+    
+    Yields:
+        QSqlDatabase: La conexión en la que se ejecuta la transacción
+    
+    Raises:
+        Exception: Si no se puede abrir o confirmar la transacción
+    """
+    db = obtener_conexion(db)
+    nombre = db.connectionName()
+    profundidad = _transacciones_abiertas.get(nombre, 0)
+    
+    # Los bloques anidados usan SAVEPOINT (sin instrumentar, como db.transaction())
+    punto = f"transaccion_{profundidad}"
+    control = QSqlQuery(db) if profundidad else None
+    if profundidad == 0:
+        if not db.transaction():
+            raise Exception(f"No se pudo iniciar la transacción: {db.lastError().text()}")
+    elif not control.exec(f"SAVEPOINT {punto}"):
+        raise Exception(f"No se pudo iniciar la transacción anidada: {control.lastError().text()}")
+    pendientes_previos = len(_al_confirmar.get(nombre, ()))
+    _transacciones_abiertas[nombre] = profundidad + 1
+    
+    try:
+        yield db
+    except Exception:
+        if profundidad == 0:
+            db.rollback()
+            _al_confirmar.pop(nombre, None)
+        else:
+            # Si SQLite ya deshizo la transacción entera, la externa fallará al confirmar
+            if not (control.exec(f"ROLLBACK TO {punto}") and control.exec(f"RELEASE {punto}")):
+                logger.error(f"No se pudo deshacer la transacción anidada: {control.lastError().text()}")
+            del _al_confirmar.get(nombre, [])[pendientes_previos:]
+        raise
+    finally:
+        _transacciones_abiertas[nombre] = profundidad
+    
+    if profundidad > 0:
+        if not control.exec(f"RELEASE {punto}"):
+            raise Exception(f"No se pudo confirmar la transacción anidada: {control.lastError().text()}")
+    else:
+        pendientes = _al_confirmar.pop(nombre, ())
+        if not db.commit():
+            error = db.lastError().text()
+            db.rollback()
+            raise Exception(f"No se pudo confirmar la transacción: {error}")
+        for funcion in pendientes:
+            funcion()
+
+
+def en_transaccion(db: QSqlDatabase = None) -> bool:
+    """Indica si la conexión tiene abierta una transacción con transaccion()."""
+    return bool(_transacciones_abiertas.get(obtener_conexion(db).connectionName(), 0))
+
+
+def al_confirmar(funcion: Callable[[], None], db: QSqlDatabase = None):
+    """
+    Ejecuta una función cuando los cambios hechos en la conexión sean definitivos.
+    
+    Dentro de una transacción abierta con transaccion() se aplaza hasta su
+    commit y se descarta si se deshace; fuera de ella se ejecuta en el acto.
+    
+    Args:
+        funcion: Función sin argumentos
+        db: Conexión a usar (por defecto la del hilo actual)
+    """
+    nombre = obtener_conexion(db).connectionName()
+    if _transacciones_abiertas.get(nombre, 0):
+        _al_confirmar.setdefault(nombre, []).append(funcion)
+    else:
+        funcion()
 
 
 def cerrar_conexion():
@@ -273,4 +606,4 @@ def cerrar_conexion():
     db = QSqlDatabase.database()
     if db.isOpen():
         db.close()
-        print("Conexión cerrada")
\ No newline at end of file
+        print("Conexión cerrada")
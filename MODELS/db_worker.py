@@ -0,0 +1,223 @@
+"""
+Trabajador de base de datos en segundo plano.
+Un QThread con su propia conexión QtSql que ejecuta trabajos de una cola con
+prioridades y devuelve los resultados al hilo de la interfaz mediante señales,
+para que las consultas pesadas no congelen el reloj ni los botones de gol.
+"""
+
+import itertools
+import logging
+import queue
+import threading
+from typing import Callable, Optional
+from PySide6.QtCore import QCoreApplication, QThread, Signal
+from MODELS.database import obtener_conexion, cerrar_conexion_hilo
+
+logger = logging.getLogger(__name__)
+
+# Prioridades: un número menor se atiende antes
+PRIORIDAD_ALTA = 0
+PRIORIDAD_NORMAL = 1
+PRIORIDAD_BAJA = 2
+
+
+class _Trabajo:
+    """Trabajo pendiente en la cola del trabajador."""
+    
+    __slots__ = ("id", "funcion", "args", "kwargs", "clave", "cancelado")
+    
+    def __init__(self, trabajo_id: int, funcion: Callable, args: tuple, kwargs: dict, clave: Optional[str]):
+        self.id = trabajo_id
+        self.funcion = funcion
+        self.args = args
+        self.kwargs = kwargs
+        self.clave = clave
+        self.cancelado = False
+
+
+class TrabajadorBD(QThread):
+    """
+    Hilo que ejecuta funciones de acceso a datos con su propia conexión.
+    
+    Cada trabajo es una función que acepta el argumento `db` (la conexión del
+    trabajador); los métodos de los controladores con parámetro `db` sirven
+    directamente. Los resultados se emiten con señales y, si se indicaron,
+    se entregan a los callbacks en el hilo de la interfaz.
+    """
+    
+    # Señales (se emiten desde el hilo del trabajador)
+    resultado_listo = Signal(int, object)  # id del trabajo, resultado
+    error_trabajo = Signal(int, str)  # id del trabajo, mensaje de error
+    trabajo_cancelado = Signal(int)  # id del trabajo
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._cola = queue.PriorityQueue()
+        self._secuencia = itertools.count(1)
+        self._lock = threading.Lock()
+        self._pendientes = {}  # id -> _Trabajo (en cola o en ejecución)
+        self._callbacks = {}  # id -> (al_terminar, al_fallar); solo hilo de la interfaz
+        
+        # El trabajador vive en el hilo de la interfaz: estas conexiones
+        # se ejecutan allí aunque las señales se emitan desde run()
+        self.resultado_listo.connect(self._entregar_resultado)
+        self.error_trabajo.connect(self._entregar_error)
+        self.trabajo_cancelado.connect(self._descartar_callbacks)
+    
+    def encolar(self, funcion: Callable, *args, prioridad: int = PRIORIDAD_NORMAL,
+                clave: Optional[str] = None, al_terminar: Callable = None,
+                al_fallar: Callable = None, **kwargs) -> int:
+        """
+        Añade un trabajo a la cola.
+        
+        Args:
+            funcion: Función a ejecutar; recibe `db=` con la conexión del trabajador
+            *args: Argumentos posicionales de la función
+            prioridad: PRIORIDAD_ALTA, PRIORIDAD_NORMAL o PRIORIDAD_BAJA
+            clave: Si se indica, cancela los trabajos anteriores con la misma clave
+                (p. ej. recargas de una tabla que ya no interesan)
+            al_terminar: Callback con el resultado, en el hilo de la interfaz
+            al_fallar: Callback con el mensaje de error, en el hilo de la interfaz
+            **kwargs: Argumentos con nombre de la función
+        
+        Returns:
+            int: ID del trabajo, para cancelarlo
+        """
+        if clave is not None:
+            self.cancelar_clave(clave)
+        
+        trabajo_id = next(self._secuencia)
+        trabajo = _Trabajo(trabajo_id, funcion, args, kwargs, clave)
+        if al_terminar or al_fallar:
+            self._callbacks[trabajo_id] = (al_terminar, al_fallar)
+        
+        with self._lock:
+            self._pendientes[trabajo_id] = trabajo
+        self._cola.put((prioridad, trabajo_id, trabajo))
+        return trabajo_id
+    
+    def cancelar(self, trabajo_id: int) -> bool:
+        """
+        Cancela un trabajo. Si ya se está ejecutando, su resultado se descarta.
+        
+        Args:
+            trabajo_id: ID devuelto por encolar()
+        
+        Returns:
+            bool: True si el trabajo seguía pendiente
+        """
+        self._callbacks.pop(trabajo_id, None)
+        with self._lock:
+            trabajo = self._pendientes.get(trabajo_id)
+            if trabajo is None:
+                return False
+            trabajo.cancelado = True
+        return True
+    
+    def cancelar_clave(self, clave: str):
+        """Cancela todos los trabajos pendientes con la clave indicada."""
+        with self._lock:
+            ids = [t.id for t in self._pendientes.values() if t.clave == clave]
+        for trabajo_id in ids:
+            self.cancelar(trabajo_id)
+    
+    def ocupado(self) -> bool:
+        """True mientras queden trabajos en cola o resultados sin entregar a su callback."""
+        with self._lock:
+            if self._pendientes:
+                return True
+        return bool(self._callbacks)
+    
+    def detener(self):
+        """Cancela lo pendiente, termina el hilo y espera a que cierre su conexión."""
+        with self._lock:
+            for trabajo in self._pendientes.values():
+                trabajo.cancelado = True
+        self._callbacks.clear()
+        # Prioridad -1: la orden de salida se atiende antes que lo que quede en cola
+        self._cola.put((-1, 0, None))
+        self.wait()
+    
+    def run(self):
+        """Bucle del hilo: abre la conexión propia y atiende la cola."""
+        try:
+            db = obtener_conexion()
+        except Exception as e:
+            logger.error(f"El trabajador de BD no pudo abrir su conexión: {e}")
+            return
+        
+        while True:
+            _, _, trabajo = self._cola.get()
+            if trabajo is None:
+                break
+            
+            if not trabajo.cancelado:
+                try:
+                    resultado = trabajo.funcion(*trabajo.args, db=db, **trabajo.kwargs)
+                except Exception as e:
+                    logger.error(f"Error en el trabajo de BD {trabajo.id}: {e}", exc_info=True)
+                    if not trabajo.cancelado:
+                        self.error_trabajo.emit(trabajo.id, str(e))
+                else:
+                    if not trabajo.cancelado:
+                        self.resultado_listo.emit(trabajo.id, resultado)
+            
+            with self._lock:
+                self._pendientes.pop(trabajo.id, None)
+            if trabajo.cancelado:
+                self.trabajo_cancelado.emit(trabajo.id)
+        
+        del db
+        cerrar_conexion_hilo()
+    
+    def _entregar_resultado(self, trabajo_id: int, resultado):
+        """Llama al callback de resultado (hilo de la interfaz)."""
+        al_terminar, _ = self._callbacks.pop(trabajo_id, (None, None))
+        if al_terminar:
+            try:
+                al_terminar(resultado)
+            except RuntimeError as e:
+                # La vista que pidió los datos ya se ha cerrado
+                logger.debug(f"Resultado del trabajo {trabajo_id} sin destinatario: {e}")
+    
+    def _entregar_error(self, trabajo_id: int, mensaje: str):
+        """Llama al callback de error (hilo de la interfaz)."""
+        _, al_fallar = self._callbacks.pop(trabajo_id, (None, None))
+        if al_fallar:
+            try:
+                al_fallar(mensaje)
+            except RuntimeError as e:
+                logger.debug(f"Error del trabajo {trabajo_id} sin destinatario: {e}")
+    
+    def _descartar_callbacks(self, trabajo_id: int):
+        """Olvida los callbacks de un trabajo cancelado."""
+        self._callbacks.pop(trabajo_id, None)
+
+
+_trabajador = None
+
+
+def obtener_trabajador() -> TrabajadorBD:
+    """
+    Devuelve el trabajador global, arrancándolo la primera vez.
+    Debe llamarse desde el hilo de la interfaz después de conectar().
+    
+    Returns:
+        TrabajadorBD: Trabajador en marcha
+    """
+    global _trabajador
+    if _trabajador is None:
+        _trabajador = TrabajadorBD()
+        _trabajador.start()
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(detener_trabajador)
+    return _trabajador
+
+
+def detener_trabajador():
+    """Detiene el trabajador global si está en marcha."""
+    global _trabajador
+    if _trabajador is not None:
+        _trabajador.detener()
+        _trabajador = None
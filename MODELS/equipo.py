@@ -4,8 +4,11 @@ Define la estructura de un equipo en el torneo.
 """
 
 from dataclasses import dataclass
-from typing import Optional
-from PySide6.QtSql import QSqlQuery
+from typing import Iterable, List, Optional
+from PySide6.QtSql import QSqlDatabase
+from MODELS.database import crear_query, ejecutar_lote, transaccion
+from MODELS import eventos
+from MODELS.cache_entidades import cache_entidades
 
 
 @dataclass
@@ -24,14 +27,17 @@ class Equipo:
         if not self.nombre or not self.curso:
             raise ValueError("El nombre y curso son obligatorios")
     
-    def guardar(self) -> bool:
+    def guardar(self, db: QSqlDatabase = None) -> bool:
         """
         Guarda el equipo en la base de datos.
         
+        Args:
+            db: Conexión a usar (por defecto la del hilo actual)
+        
         Returns:
             bool: True si se guardó correctamente, False en caso contrario
         """
-        query = QSqlQuery()
+        query = crear_query(db)
         
         try:
             if self.id:
@@ -58,41 +64,97 @@ class Equipo:
                 query.addBindValue(self.logo)
             
             if query.exec():
+                tipo = eventos.MODIFICADO if self.id else eventos.CREADO
                 if not self.id:
                     self.id = query.lastInsertId()
+                cache_entidades.escrita(self, db)
+                eventos.publicar(eventos.EQUIPO, self.id, tipo, db)
                 return True
+            if self.id:
+                cache_entidades.descartar(Equipo, self.id, db)
             return False
         except Exception as e:
             print(f"Error al guardar equipo: {e}")
+            if self.id:
+                cache_entidades.descartar(Equipo, self.id, db)
             return False
     
-    def eliminar(self) -> bool:
+    def eliminar(self, db: QSqlDatabase = None) -> bool:
         """
         Elimina el equipo (soft delete).
         
+        Args:
+            db: Conexión a usar (por defecto la del hilo actual)
+        
         Returns:
             bool: True si se eliminó correctamente
         """
         if not self.id:
             return False
         
-        query = QSqlQuery()
+        query = crear_query(db)
         query.prepare("UPDATE equipos SET activo = 0 WHERE id = ?")
         query.addBindValue(self.id)
-        return query.exec()
+        if not query.exec():
+            return False
+        self.activo = 0
+        cache_entidades.escrita(self, db)
+        eventos.publicar(eventos.EQUIPO, self.id, eventos.ELIMINADO, db)
+        return True
     
     @staticmethod
-    def obtener_por_id(equipo_id: int) -> Optional['Equipo']:
+    def crear_equipos(equipos: Iterable['Equipo'], db: QSqlDatabase = None) -> Optional[List[int]]:
         """
-        Obtiene un equipo por su ID.
+        Crea muchos equipos en una sola transacción.
+        
+        La sentencia se prepara una vez para todo el lote (database.ejecutar_lote)
+        y se publica un único cambio en el bus.
+        
+        Args:
+            equipos: Equipos nuevos (sin id); al crearse se les asigna el suyo
+            db: Conexión a usar (por defecto la del hilo actual)
+        
+        Returns:
+            Lista de IDs generados, en el orden de entrada, o None si falló
+            (en ese caso no se crea ninguno; dentro de una transacción abierta
+            se deshace solo lo escrito por este método)
+        """
+        equipos = list(equipos)
+        ids = []
+        try:
+            with transaccion(db):
+                ejecutar_lote("""
+                    INSERT INTO equipos (nombre, curso, color_camiseta, logo)
+                    VALUES (?, ?, ?, ?)
+                """, ((e.nombre, e.curso, e.color_camiseta, e.logo) for e in equipos), db, ids=ids)
+                eventos.publicar_lote(eventos.EQUIPO, ids, eventos.CREADO, db)
+        except Exception as e:
+            print(f"Error al crear equipos: {e}")
+            return None
+        
+        for equipo, equipo_id in zip(equipos, ids):
+            equipo.id = equipo_id
+        return ids
+    
+    @staticmethod
+    def obtener_por_id(equipo_id: int, db: QSqlDatabase = None) -> Optional['Equipo']:
+        """
+        Obtiene un equipo por su ID (de la caché de entidades si está activa).
         
         Args:
             equipo_id: ID del equipo
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             Equipo o None
         """
-        query = QSqlQuery()
+        return cache_entidades.obtener(Equipo, equipo_id,
+                                       lambda: Equipo._leer_por_id(equipo_id, db), db)
+    
+    @staticmethod
+    def _leer_por_id(equipo_id: int, db: QSqlDatabase = None) -> Optional['Equipo']:
+        """Lee un equipo de la base de datos."""
+        query = crear_query(db)
         query.prepare("""
             SELECT id, nombre, curso, color_camiseta, logo, activo
             FROM equipos WHERE id = ?
@@ -111,18 +173,19 @@ class Equipo:
         return None
     
     @staticmethod
-    def obtener_todos(solo_activos: bool = True) -> list['Equipo']:
+    def obtener_todos(solo_activos: bool = True, db: QSqlDatabase = None) -> list['Equipo']:
         """
         Obtiene todos los equipos.
         
         Args:
             solo_activos: Si True, solo retorna equipos activos
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             Lista de Equipo
         """
         equipos = []
-        query = QSqlQuery()
+        query = crear_query(db)
         
         sql = "SELECT id, nombre, curso, color_camiseta, logo, activo FROM equipos"
         if solo_activos:
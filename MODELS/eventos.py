@@ -0,0 +1,139 @@
+"""
+Bus de cambios de datos.
+Los modelos publican un Cambio (entidad, id, tipo) cada vez que escriben en la
+base de datos, y las vistas abiertas se suscriben a bus_cambios.datos_cambiados
+para actualizar solo las filas afectadas en lugar de recargar tablas enteras.
+Al publicar, la caché de consultas da por escritas las tablas de la entidad.
+Las escrituras en lote publican un solo Cambio con todas las filas
+(publicar_lote), para que las vistas recarguen una vez y no fila a fila.
+"""
+
+from dataclasses import dataclass, field
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtSql import QSqlDatabase
+from MODELS.database import al_confirmar
+from MODELS.cache_consultas import cache_consultas
+
+# Entidades
+EQUIPO = "equipo"
+PARTICIPANTE = "participante"
+PARTIDO = "partido"
+GOL = "gol"
+TARJETA = "tarjeta"
+PLANTILLA = "plantilla"  # Asignación de un jugador a un equipo; el id es el del equipo
+
+# Tipos de cambio
+CREADO = "creado"
+MODIFICADO = "modificado"
+ELIMINADO = "eliminado"
+
+# Tablas que puede escribir un cambio de cada entidad (incluidos triggers y borrados en cascada)
+TABLAS_POR_ENTIDAD = {
+    EQUIPO: ("equipos", "clasificacion"),
+    PARTICIPANTE: ("participantes",),
+    PARTIDO: ("partidos", "clasificacion", "goles", "tarjetas", "estadisticas_participante"),
+    GOL: ("goles", "partidos", "estadisticas_participante"),
+    TARJETA: ("tarjetas", "estadisticas_participante"),
+    PLANTILLA: ("equipo_participante",),
+}
+
+
+@dataclass
+class Cambio:
+    """Cambio en una fila de la base de datos."""
+    
+    entidad: str
+    id: int
+    tipo: str
+    datos: dict = field(default_factory=dict)  # Contexto (p. ej. partido_id de un gol)
+    
+    @property
+    def en_lote(self) -> bool:
+        """True si es un cambio de muchas filas (publicar_lote): id es None y las filas van en ids."""
+        return self.id is None
+    
+    @property
+    def ids(self) -> list:
+        """IDs de las filas cambiadas."""
+        return self.datos.get('ids', []) if self.en_lote else [self.id]
+
+
+class BusCambios(QObject):
+    """
+    Bus global de cambios de datos (singleton).
+    
+    Los cambios se pueden publicar desde cualquier hilo; datos_cambiados se
+    emite siempre en el hilo de la interfaz, cuando la transacción que los
+    produjo ya se ha confirmado.
+    """
+    
+    # Señal con el Cambio, en el hilo de la interfaz
+    datos_cambiados = Signal(object)
+    
+    # Señal interna para pasar el cambio al hilo del bus
+    _cambio_publicado = Signal(object)
+    
+    _instance = None  # Singleton
+    _initialized = False  # Flag de inicialización
+    
+    def __new__(cls):
+        """Implementar patrón Singleton."""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+    
+    def __init__(self):
+        """Inicializar el bus."""
+        if BusCambios._initialized:
+            return
+        
+        super().__init__()
+        BusCambios._initialized = True
+        # El bus vive en el hilo de la interfaz: si se publica desde el
+        # trabajador de BD, la conexión entrega el cambio en cola
+        self._cambio_publicado.connect(self.datos_cambiados)
+    
+    def publicar(self, cambio: Cambio, db: QSqlDatabase = None):
+        """
+        Publica un cambio cuando la escritura sea definitiva.
+        
+        Args:
+            cambio: Cambio a notificar
+            db: Conexión en la que se hizo el cambio (por defecto la del hilo actual);
+                si tiene una transacción abierta, se notifica tras su commit
+        """
+        cache_consultas.marcar_escritura(TABLAS_POR_ENTIDAD.get(cambio.entidad, ()), db)
+        al_confirmar(lambda: self._cambio_publicado.emit(cambio), db)
+
+
+# Instancia global del bus
+bus_cambios = BusCambios()
+
+
+def publicar(entidad: str, entidad_id: int, tipo: str, db: QSqlDatabase = None, **datos):
+    """
+    Atajo para publicar un Cambio en el bus global.
+    
+    Args:
+        entidad: EQUIPO, PARTICIPANTE, PARTIDO, GOL, TARJETA o PLANTILLA
+        entidad_id: ID de la fila cambiada
+        tipo: CREADO, MODIFICADO o ELIMINADO
+        db: Conexión en la que se hizo el cambio (por defecto la del hilo actual)
+        **datos: Contexto del cambio
+    """
+    bus_cambios.publicar(Cambio(entidad, entidad_id, tipo, datos), db)
+
+
+def publicar_lote(entidad: str, ids: list, tipo: str, db: QSqlDatabase = None, **datos):
+    """
+    Publica un único Cambio para muchas filas de la misma entidad.
+    
+    Args:
+        entidad: EQUIPO, PARTICIPANTE, PARTIDO, GOL, TARJETA o PLANTILLA
+        ids: IDs de las filas cambiadas
+        tipo: CREADO, MODIFICADO o ELIMINADO
+        db: Conexión en la que se hizo el cambio (por defecto la del hilo actual)
+        **datos: Contexto del cambio
+    """
+    if ids:
+        bus_cambios.publicar(Cambio(entidad, None, tipo, {**datos, 'ids': list(ids)}), db)
@@ -0,0 +1,401 @@
+"""
+Generador de torneos sintéticos para pruebas de escala.
+Rellena una base de datos vacía con N equipos, M jugadores por equipo,
+árbitros, el calendario completo de una eliminatoria o de una liga y los
+goles y tarjetas de los partidos jugados, con distribuciones realistas.
+
+Todo sale de un random.Random con semilla: la misma semilla y los mismos
+parámetros producen exactamente la misma base de datos. Cada tabla se
+inserta con una única sentencia preparada (ejecutar_lote, el executemany de
+la aplicación) dentro de una transacción grande, así que cientos de equipos
+se generan en segundos.
+
+Escribe directamente en las tablas, sin pasar por los modelos ni publicar
+cambios: está pensado para BDs nuevas, no para la BD abierta por la aplicación.
+"""
+
+import logging
+import math
+import random
+import time
+from datetime import datetime, timedelta
+from PySide6.QtSql import QSqlDatabase
+from MODELS.database import crear_query, ejecutar_lote, transaccion
+from MODELS.partido import Partido
+
+logger = logging.getLogger(__name__)
+
+# Formatos de competición
+FORMATO_ELIMINATORIA = "eliminatoria"
+FORMATO_LIGA = "liga"
+
+# Fase de cada ronda de la eliminatoria según los partidos que tiene
+FASES_POR_PARTIDOS = {1: "Final", 2: "Semifinal", 4: "Cuartos", 8: "Octavos"}
+FASE_PREVIA = "Previa"
+FASE_LIGA = "Liga"
+
+# Goles esperados por partido (distribución de Poisson)
+MEDIA_GOLES_LOCAL = 1.5
+MEDIA_GOLES_VISITANTE = 1.2
+
+# Tarjetas esperadas por partido, entre los dos equipos
+MEDIA_AMARILLAS = 3.4
+MEDIA_ROJAS = 0.15
+
+# Probabilidad relativa de marcar según la posición
+PESO_GOL = {"Portero": 0.02, "Defensa": 1, "Centrocampista": 3, "Delantero": 6}
+
+# Probabilidad relativa de ver tarjeta según la posición
+PESO_TARJETA = {"Portero": 0.3, "Defensa": 3, "Centrocampista": 2, "Delantero": 1}
+
+# Franjas horarias de los partidos (hora de inicio)
+HORAS_PARTIDO = range(9, 21)
+
+NOMBRES = [
+    "Adrián", "Alberto", "Alejandro", "Álvaro", "Andrés", "Ángel", "Antonio", "Carlos",
+    "Daniel", "David", "Diego", "Eduardo", "Enrique", "Fernando", "Francisco", "Gonzalo",
+    "Hugo", "Iván", "Javier", "Jesús", "Jorge", "José", "Juan", "Luis", "Manuel", "Marcos",
+    "Mario", "Martín", "Miguel", "Nicolás", "Óscar", "Pablo", "Pedro", "Rafael", "Raúl",
+    "Roberto", "Rubén", "Samuel", "Sergio", "Víctor", "Ana", "Carmen", "Elena", "Laura",
+    "Lucía", "María", "Marta", "Paula", "Sara", "Sofía",
+]
+
+APELLIDOS = [
+    "García", "Rodríguez", "González", "Fernández", "López", "Martínez", "Sánchez", "Pérez",
+    "Gómez", "Martín", "Jiménez", "Ruiz", "Hernández", "Díaz", "Moreno", "Muñoz", "Álvarez",
+    "Romero", "Alonso", "Gutiérrez", "Navarro", "Torres", "Domínguez", "Vázquez", "Ramos",
+    "Gil", "Ramírez", "Serrano", "Blanco", "Molina", "Morales", "Suárez", "Ortega", "Delgado",
+    "Castro", "Ortiz", "Rubio", "Marín", "Sanz", "Núñez", "Iglesias", "Medina", "Garrido",
+    "Cortés", "Castillo", "Santos", "Lozano", "Guerrero", "Cano", "Prieto",
+]
+
+PREFIJOS_EQUIPO = [
+    "Atlético", "Real", "Deportivo", "Unión", "Racing", "Sporting", "Club", "Inter",
+    "Juventud", "Estrella", "Rayo", "Celta", "Olímpico", "Ciudad", "Academia", "Peña",
+]
+
+SUFIJOS_EQUIPO = [
+    "del Norte", "del Sur", "de la Sierra", "del Valle", "del Río", "del Puerto",
+    "de la Vega", "del Campo", "de Levante", "de Poniente", "del Barrio", "de la Costa",
+    "Imperial", "Central", "Alto", "Bajo", "Nueva Era", "Relámpago", "Dorado", "Azul",
+]
+
+COLORES_CAMISETA = ["Rojo", "Azul", "Verde", "Amarillo", "Blanco", "Negro", "Naranja", "Morado"]
+
+
+class GeneradorTorneo:
+    """
+    Genera un torneo sintético completo en una BD vacía.
+    
+    Uso:
+        generador = GeneradorTorneo(equipos=256, jugadores_por_equipo=18, semilla=1)
+        totales = generador.generar(db)
+    """
+    
+    def __init__(self, equipos: int = 64, jugadores_por_equipo: int = 15, arbitros: int = None,
+                 formato: str = FORMATO_ELIMINATORIA, jugados: float = 0.8, campos: int = 4,
+                 inicio: str = "2025-03-01", semilla: int = 0):
+        """
+        Args:
+            equipos: Número de equipos (al menos 2)
+            jugadores_por_equipo: Jugadores de cada plantilla (al menos 1)
+            arbitros: Número de árbitros (por defecto uno por cada 8 equipos, mínimo 2)
+            formato: FORMATO_ELIMINATORIA o FORMATO_LIGA
+            jugados: Fracción de partidos ya jugados (0 a 1); el resto queda pendiente
+            campos: Partidos que se juegan a la vez en cada franja horaria
+            inicio: Fecha del primer partido (AAAA-MM-DD)
+            semilla: Semilla del generador aleatorio
+        
+        Raises:
+            ValueError: Si algún parámetro no es válido
+        """
+        if equipos < 2:
+            raise ValueError("Hacen falta al menos 2 equipos")
+        if jugadores_por_equipo < 1:
+            raise ValueError("Cada equipo necesita al menos un jugador")
+        if formato not in (FORMATO_ELIMINATORIA, FORMATO_LIGA):
+            raise ValueError(f"Formato no válido: {formato}")
+        if not 0 <= jugados <= 1:
+            raise ValueError("La fracción de partidos jugados debe estar entre 0 y 1")
+        if campos < 1:
+            raise ValueError("Hace falta al menos un campo")
+        
+        self.num_equipos = equipos
+        self.jugadores_por_equipo = jugadores_por_equipo
+        self.num_arbitros = arbitros if arbitros is not None else max(2, equipos // 8)
+        self.formato = formato
+        self.jugados = jugados
+        self.campos = campos
+        self.inicio = datetime.strptime(inicio, "%Y-%m-%d")
+        self.rng = random.Random(semilla)
+        
+        # Datos generados (se insertan en bloque al final de cada fase)
+        self.equipos = []  # (id, nombre, curso, color)
+        self.participantes = []  # (id, nombre, fecha_nacimiento, curso, es_jugador, es_arbitro, posicion)
+        self.plantillas = {}  # equipo_id -> [(participante_id, posicion)]
+        self.arbitros = []  # ids
+        self.partidos = []  # (id, local, visitante, arbitro, fecha_hora, fase, gl, gv, finalizado)
+        self.goles = []  # (partido_id, participante_id, minuto, equipo_id)
+        self.tarjetas = []  # (partido_id, participante_id, tipo, minuto, equipo_id)
+    
+    def generar(self, db: QSqlDatabase = None) -> dict:
+        """
+        Genera el torneo y lo guarda en la BD.
+        
+        Args:
+            db: Conexión a una BD con el esquema creado y sin equipos
+        
+        Returns:
+            dict: Número de filas generadas de cada tipo
+        
+        Raises:
+            ValueError: Si la BD ya tiene equipos
+            Exception: Si falla alguna inserción (no se guarda nada de esa fase)
+        """
+        query = crear_query(db)
+        query.exec("SELECT COUNT(*) FROM equipos")
+        hay_equipos = query.next() and query.value(0) > 0
+        query.finish()
+        if hay_equipos:
+            raise ValueError("La base de datos ya tiene equipos; el generador necesita una BD vacía")
+        
+        inicio = time.perf_counter()
+        self._generar_equipos()
+        self._generar_arbitros()
+        with transaccion(db):
+            ejecutar_lote("INSERT INTO equipos (id, nombre, curso, color_camiseta) VALUES (?, ?, ?, ?)",
+                          self.equipos, db)
+            ejecutar_lote("""
+                INSERT INTO participantes (id, nombre, fecha_nacimiento, curso, es_jugador, es_arbitro, posicion)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, self.participantes, db)
+            ejecutar_lote("INSERT INTO equipo_participante (equipo_id, participante_id) VALUES (?, ?)",
+                          [(equipo_id, participante_id)
+                           for equipo_id, plantilla in self.plantillas.items()
+                           for participante_id, _ in plantilla], db)
+        logger.info(f"Equipos y participantes generados en {time.perf_counter() - inicio:.2f} s")
+        
+        inicio = time.perf_counter()
+        if self.formato == FORMATO_LIGA:
+            self._generar_liga()
+        else:
+            self._generar_eliminatoria()
+        with transaccion(db):
+            ejecutar_lote("""
+                INSERT INTO partidos (id, equipo_local_id, equipo_visitante_id, arbitro_id, fecha_hora,
+                                      eliminatoria, goles_local, goles_visitante, finalizado)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, self.partidos, db)
+            ejecutar_lote("INSERT INTO goles (partido_id, participante_id, minuto, equipo_id) VALUES (?, ?, ?, ?)",
+                          self.goles, db)
+            ejecutar_lote("""
+                INSERT INTO tarjetas (partido_id, participante_id, tipo, minuto, equipo_id)
+                VALUES (?, ?, ?, ?, ?)
+            """, self.tarjetas, db)
+            # La clasificación la mantiene Partido.guardar; aquí se calcula de una vez
+            if not Partido.reconstruir_clasificacion(db):
+                raise Exception("No se pudo calcular la clasificación")
+        logger.info(f"Partidos y eventos generados en {time.perf_counter() - inicio:.2f} s")
+        
+        # Estadísticas del optimizador de consultas con los volúmenes reales
+        query = crear_query(db)
+        query.exec("ANALYZE")
+        query.finish()
+        
+        return {
+            'equipos': len(self.equipos),
+            'jugadores': len(self.participantes) - len(self.arbitros),
+            'arbitros': len(self.arbitros),
+            'partidos': len(self.partidos),
+            'finalizados': sum(1 for partido in self.partidos if partido[8]),
+            'goles': len(self.goles),
+            'tarjetas': len(self.tarjetas),
+        }
+    
+    # ============ EQUIPOS Y PARTICIPANTES ============
+    def _generar_equipos(self):
+        """Equipos con nombre único y plantillas con su reparto de posiciones."""
+        combinaciones = [f"{prefijo} {sufijo}" for prefijo in PREFIJOS_EQUIPO for sufijo in SUFIJOS_EQUIPO]
+        self.rng.shuffle(combinaciones)
+        
+        for i in range(self.num_equipos):
+            equipo_id = i + 1
+            nombre = combinaciones[i % len(combinaciones)]
+            if i >= len(combinaciones):
+                nombre = f"{nombre} {i // len(combinaciones) + 1}"
+            nivel = 1 + i % 4
+            curso = f"{nivel}º ESO {chr(ord('A') + (i // 4) % 26)}"
+            self.equipos.append((equipo_id, nombre, curso, self.rng.choice(COLORES_CAMISETA)))
+            
+            # Nacidos el año que corresponde al curso
+            anio = 2011 - nivel
+            plantilla = []
+            for posicion in self._posiciones_plantilla():
+                participante_id = len(self.participantes) + 1
+                nacimiento = datetime(anio, 1, 1) + timedelta(days=self.rng.randrange(365))
+                self.participantes.append((participante_id, self._nombre_persona(),
+                                           nacimiento.strftime("%Y-%m-%d"), curso, 1, 0, posicion))
+                plantilla.append((participante_id, posicion))
+            self.plantillas[equipo_id] = plantilla
+    
+    def _posiciones_plantilla(self) -> list:
+        """Posiciones de una plantilla: uno o dos porteros y el resto repartido."""
+        total = self.jugadores_por_equipo
+        porteros = 2 if total >= 14 else 1
+        resto = total - porteros
+        defensas = round(resto * 0.35)
+        centrocampistas = round(resto * 0.35)
+        delanteros = resto - defensas - centrocampistas
+        return (["Portero"] * porteros + ["Defensa"] * defensas
+                + ["Centrocampista"] * centrocampistas + ["Delantero"] * delanteros)[:total]
+    
+    def _generar_arbitros(self):
+        """Árbitros: profesorado sin equipo."""
+        for _ in range(self.num_arbitros):
+            participante_id = len(self.participantes) + 1
+            nacimiento = datetime(1965, 1, 1) + timedelta(days=self.rng.randrange(30 * 365))
+            self.participantes.append((participante_id, f"Profesor {self._nombre_persona()}",
+                                       nacimiento.strftime("%Y-%m-%d"), "Profesorado", 0, 1, None))
+            self.arbitros.append(participante_id)
+    
+    def _nombre_persona(self) -> str:
+        """Nombre y dos apellidos."""
+        return f"{self.rng.choice(NOMBRES)} {self.rng.choice(APELLIDOS)} {self.rng.choice(APELLIDOS)}"
+    
+    # ============ CALENDARIO ============
+    def _generar_liga(self):
+        """Liga a una vuelta (todos contra todos, método del círculo); una jornada por día."""
+        equipos = [equipo[0] for equipo in self.equipos]
+        self.rng.shuffle(equipos)
+        if len(equipos) % 2:
+            equipos.append(None)  # Descansa quien juega contra None
+        
+        jornadas = []
+        n = len(equipos)
+        for jornada in range(n - 1):
+            cruces = []
+            for i in range(n // 2):
+                local, visitante = equipos[i], equipos[n - 1 - i]
+                if local is not None and visitante is not None:
+                    # Alternar campo para que nadie juegue siempre en casa
+                    cruces.append((local, visitante) if jornada % 2 == 0 else (visitante, local))
+            jornadas.append(cruces)
+            equipos.insert(1, equipos.pop())
+        
+        por_jugar = round(self.jugados * sum(len(cruces) for cruces in jornadas))
+        dia = self.inicio
+        for cruces in jornadas:
+            for (local, visitante), fecha_hora in zip(cruces, self._horarios(dia, len(cruces))):
+                self._agregar_partido(local, visitante, fecha_hora, FASE_LIGA, jugar=por_jugar > 0)
+                por_jugar -= 1
+            dia = fecha_hora + timedelta(days=1)
+    
+    def _generar_eliminatoria(self):
+        """
+        Eliminatoria a partido único. Si el número de equipos no es potencia
+        de 2, una ronda previa deja los que faltan para la siguiente potencia
+        (el resto pasa directamente). Solo se sortea una ronda cuando la
+        anterior se ha jugado entera.
+        """
+        equipos = [equipo[0] for equipo in self.equipos]
+        self.rng.shuffle(equipos)
+        potencia = 2 ** int(math.log2(len(equipos)))
+        en_previa = 2 * (len(equipos) - potencia)
+        
+        por_jugar = round(self.jugados * (len(equipos) - 1))
+        dia = self.inicio
+        ronda = equipos[:en_previa] if en_previa else equipos
+        exentos = equipos[en_previa:] if en_previa else []
+        
+        while len(ronda) >= 2:
+            num_partidos = len(ronda) // 2
+            fase = FASES_POR_PARTIDOS.get(num_partidos, FASE_PREVIA) if not exentos else FASE_PREVIA
+            ganadores = []
+            cruces = [(ronda[2 * i], ronda[2 * i + 1]) for i in range(num_partidos)]
+            for (local, visitante), fecha_hora in zip(cruces, self._horarios(dia, num_partidos)):
+                ganador = self._agregar_partido(local, visitante, fecha_hora, fase,
+                                               jugar=por_jugar > 0, desempatar=True)
+                por_jugar -= 1
+                ganadores.append(ganador)
+            dia = fecha_hora + timedelta(days=1)
+            
+            if None in ganadores:
+                break  # Ronda sin terminar: la siguiente aún no se puede sortear
+            ronda = ganadores + exentos
+            exentos = []
+    
+    def _horarios(self, dia: datetime, num_partidos: int):
+        """Fechas y horas de una jornada: tantos partidos a la vez como campos, por franjas y días."""
+        por_dia = self.campos * len(HORAS_PARTIDO)
+        for i in range(num_partidos):
+            fecha = dia + timedelta(days=i // por_dia)
+            hora = HORAS_PARTIDO[(i % por_dia) // self.campos]
+            yield fecha.replace(hour=hora, minute=0)
+    
+    # ============ PARTIDOS Y EVENTOS ============
+    def _agregar_partido(self, local: int, visitante: int, fecha_hora: datetime, fase: str,
+                        jugar: bool, desempatar: bool = False):
+        """
+        Añade un partido y, si se juega, su resultado, goles y tarjetas.
+        
+        Args:
+            desempatar: En eliminatoria no hay empates: se deshacen con un gol más (prórroga)
+        
+        Returns:
+            Id del ganador (None si no se juega o acaba en empate)
+        """
+        partido_id = len(self.partidos) + 1
+        arbitro = self.rng.choice(self.arbitros) if self.arbitros else None
+        goles_local = goles_visitante = 0
+        if jugar:
+            goles_local = self._poisson(MEDIA_GOLES_LOCAL)
+            goles_visitante = self._poisson(MEDIA_GOLES_VISITANTE)
+            prorroga = desempatar and goles_local == goles_visitante
+            if prorroga:
+                if self.rng.random() < 0.5:
+                    goles_local += 1
+                else:
+                    goles_visitante += 1
+            self._agregar_goles(partido_id, local, goles_local, prorroga)
+            self._agregar_goles(partido_id, visitante, goles_visitante, prorroga)
+            self._agregar_tarjetas(partido_id, local, visitante)
+        
+        self.partidos.append((partido_id, local, visitante, arbitro, fecha_hora.strftime("%Y-%m-%d %H:%M"),
+                              fase, goles_local, goles_visitante, 1 if jugar else 0))
+        if not jugar or goles_local == goles_visitante:
+            return None
+        return local if goles_local > goles_visitante else visitante
+    
+    def _agregar_goles(self, partido_id: int, equipo_id: int, goles: int, prorroga: bool):
+        """Goles de un equipo, repartidos por posición; con prórroga pueden caer hasta el 120."""
+        plantilla = self.plantillas[equipo_id]
+        pesos = [PESO_GOL.get(posicion, 1) for _, posicion in plantilla]
+        goleadores = self.rng.choices(plantilla, weights=pesos, k=goles)
+        ultimo_minuto = 120 if prorroga else 90
+        for (participante_id, _), minuto in zip(goleadores, self._minutos(goles, ultimo_minuto)):
+            self.goles.append((partido_id, participante_id, minuto, equipo_id))
+    
+    def _agregar_tarjetas(self, partido_id: int, local: int, visitante: int):
+        """Amarillas y rojas del partido, repartidas entre los dos equipos por posición."""
+        for tipo, media in (("amarilla", MEDIA_AMARILLAS), ("roja", MEDIA_ROJAS)):
+            cantidad = self._poisson(media)
+            for minuto in self._minutos(cantidad, 90):
+                equipo_id = local if self.rng.random() < 0.5 else visitante
+                plantilla = self.plantillas[equipo_id]
+                pesos = [PESO_TARJETA.get(posicion, 1) for _, posicion in plantilla]
+                participante_id = self.rng.choices(plantilla, weights=pesos)[0][0]
+                self.tarjetas.append((partido_id, participante_id, tipo, minuto, equipo_id))
+    
+    def _minutos(self, cantidad: int, ultimo_minuto: int) -> list:
+        """Minutos ordenados de los eventos de un partido."""
+        return sorted(self.rng.randint(1, ultimo_minuto) for _ in range(cantidad))
+    
+    def _poisson(self, media: float) -> int:
+        """Número aleatorio con distribución de Poisson (algoritmo de Knuth)."""
+        limite = math.exp(-media)
+        k = 0
+        p = self.rng.random()
+        while p > limite:
+            k += 1
+            p *= self.rng.random()
+        return k
@@ -0,0 +1,283 @@
+"""
+Instrumentación de las consultas SQL.
+ConsultaInstrumentada es una QSqlQuery que mide cada ejecución: tiempo dentro
+de SQLite (exec más la lectura de filas), filas devueltas o modificadas, sitio
+de la llamada y número de parámetros. Las consultas que superan
+config.UMBRAL_CONSULTA_LENTA_MS se registran en el log con su EXPLAIN QUERY
+PLAN, e informe_consultas() agrega las mediciones por sentencia.
+"""
+
+import logging
+import math
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from typing import List
+from PySide6.QtSql import QSqlDatabase, QSqlQuery
+import config
+
+logger = logging.getLogger(__name__)
+
+# Tiempos que se guardan por sentencia para calcular los percentiles
+MAX_MUESTRAS = 1000
+
+# Sentencias a las que no se les pide plan
+_SIN_PLAN = ("PRAGMA", "CREATE", "DROP", "ALTER", "BEGIN", "COMMIT", "ROLLBACK",
+             "SAVEPOINT", "RELEASE", "EXPLAIN", "VACUUM", "ANALYZE")
+
+_ESPACIOS = re.compile(r"\s+")
+_RAIZ_PROYECTO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_lock = threading.Lock()
+_estadisticas = {}  # sql normalizado -> _EstadisticaSentencia
+_rutas_cortas = {}  # ruta de archivo -> ruta relativa al proyecto
+
+
+class _EstadisticaSentencia:
+    """Mediciones acumuladas de una sentencia."""
+    
+    __slots__ = ("sql", "ejecuciones", "filas", "total_ms", "max_ms", "muestras", "sitios")
+    
+    def __init__(self, sql: str):
+        self.sql = sql
+        self.ejecuciones = 0
+        self.filas = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.muestras = deque(maxlen=MAX_MUESTRAS)
+        self.sitios = set()
+
+
+class _Medicion:
+    """Ejecución en curso de una ConsultaInstrumentada."""
+    
+    __slots__ = ("sql", "sitio", "parametros", "segundos", "filas")
+    
+    def __init__(self, sql: str, sitio: str, parametros: int, segundos: float):
+        self.sql = sql
+        self.sitio = sitio
+        self.parametros = parametros
+        self.segundos = segundos
+        self.filas = 0
+
+
+class ConsultaInstrumentada(QSqlQuery):
+    """
+    QSqlQuery que registra cada ejecución en las estadísticas de consultas.
+    
+    La medición de una SELECT termina cuando se agotan las filas, al volver
+    a ejecutar la consulta, con finish() o cuando se destruye el objeto;
+    solo cuenta el tiempo pasado dentro de exec() y next(), no el que el
+    código que la usa dedica a procesar cada fila.
+    """
+    
+    def __init__(self, db: QSqlDatabase = None):
+        if db is None:
+            super().__init__()
+            db = QSqlDatabase.database()
+        else:
+            super().__init__(db)
+        self._db = db
+        self._medicion = None
+    
+    def exec(self, *args) -> bool:
+        """Ejecuta la consulta (preparada o el SQL indicado) y empieza a medirla."""
+        self._cerrar_medicion()
+        sitio = _sitio_llamada(sys._getframe(1))
+        inicio = time.perf_counter()
+        ok = super().exec(*args)
+        segundos = time.perf_counter() - inicio
+        
+        sql = args[0] if args else self.lastQuery()
+        parametros = 0 if args else len(self.boundValues())
+        self._medicion = _Medicion(sql, sitio, parametros, segundos)
+        if not ok or not self.isSelect():
+            self._medicion.filas = max(self.numRowsAffected(), 0) if ok else 0
+            self._cerrar_medicion()
+        return ok
+    
+    def execBatch(self, *args) -> bool:
+        """Ejecuta la consulta preparada con listas de valores y la mide."""
+        self._cerrar_medicion()
+        sitio = _sitio_llamada(sys._getframe(1))
+        parametros = len(self.boundValues())
+        inicio = time.perf_counter()
+        ok = super().execBatch(*args)
+        self._medicion = _Medicion(self.lastQuery(), sitio, parametros,
+                                   time.perf_counter() - inicio)
+        self._medicion.filas = max(self.numRowsAffected(), 0) if ok else 0
+        self._cerrar_medicion()
+        return ok
+    
+    def registrar_lote(self, filas: int, segundos: float):
+        """
+        Registra como una sola ejecución un lote de filas ejecutado sin medir
+        cada una (ver database.ejecutar_lote). El sitio es el del código que
+        pidió el lote, dos niveles por encima.
+        """
+        self._cerrar_medicion()
+        sitio = _sitio_llamada(sys._getframe(2))
+        self._medicion = _Medicion(self.lastQuery(), sitio, len(self.boundValues()), segundos)
+        self._medicion.filas = filas
+        self._cerrar_medicion()
+    
+    def next(self) -> bool:
+        """Avanza a la siguiente fila; al agotarse, cierra la medición."""
+        medicion = self._medicion
+        if medicion is None:
+            return super().next()
+        
+        inicio = time.perf_counter()
+        hay_fila = super().next()
+        medicion.segundos += time.perf_counter() - inicio
+        if hay_fila:
+            medicion.filas += 1
+        else:
+            self._cerrar_medicion()
+        return hay_fila
+    
+    def finish(self):
+        """Libera el resultado y cierra la medición en curso."""
+        self._cerrar_medicion()
+        super().finish()
+    
+    def __del__(self):
+        try:
+            self._cerrar_medicion()
+        except Exception:
+            pass
+    
+    def _cerrar_medicion(self):
+        """Añade la medición en curso a las estadísticas y avisa si fue lenta."""
+        medicion = self._medicion
+        if medicion is None:
+            return
+        self._medicion = None
+        
+        ms = medicion.segundos * 1000
+        clave = _normalizar(medicion.sql)
+        with _lock:
+            estadistica = _estadisticas.get(clave)
+            if estadistica is None:
+                estadistica = _estadisticas[clave] = _EstadisticaSentencia(clave)
+            estadistica.ejecuciones += 1
+            estadistica.filas += medicion.filas
+            estadistica.total_ms += ms
+            estadistica.max_ms = max(estadistica.max_ms, ms)
+            estadistica.muestras.append(ms)
+            estadistica.sitios.add(medicion.sitio)
+        
+        if ms >= config.UMBRAL_CONSULTA_LENTA_MS:
+            plan = self._plan(medicion.sql)
+            logger.warning(
+                f"Consulta lenta: {ms:.1f} ms, {medicion.filas} filas, "
+                f"{medicion.parametros} parámetros, en {medicion.sitio}\n"
+                f"    {clave}\n"
+                + "\n".join(f"    PLAN: {linea}" for linea in plan)
+            )
+    
+    def _plan(self, sql: str) -> List[str]:
+        """Devuelve las líneas de EXPLAIN QUERY PLAN de la sentencia."""
+        if sql.lstrip().upper().startswith(_SIN_PLAN) or not self._db.isOpen():
+            return []
+        
+        query = QSqlQuery(self._db)
+        if not query.prepare(f"EXPLAIN QUERY PLAN {sql}"):
+            return []
+        for valor in self.boundValues():
+            query.addBindValue(valor)
+        if not query.exec():
+            return []
+        
+        lineas = []
+        while query.next():
+            lineas.append(str(query.value(3)))
+        return lineas
+
+
+def _normalizar(sql: str) -> str:
+    """Deja la sentencia en una sola línea para agrupar sus mediciones."""
+    return _ESPACIOS.sub(" ", sql).strip()
+
+
+def _sitio_llamada(frame) -> str:
+    """Devuelve 'archivo:línea (función)' del código que ejecuta la consulta."""
+    ruta = frame.f_code.co_filename
+    corta = _rutas_cortas.get(ruta)
+    if corta is None:
+        corta = os.path.relpath(ruta, _RAIZ_PROYECTO) if ruta.startswith(_RAIZ_PROYECTO) else ruta
+        _rutas_cortas[ruta] = corta
+    return f"{corta}:{frame.f_lineno} ({frame.f_code.co_name})"
+
+
+def _percentil(valores: List[float], fraccion: float) -> float:
+    """Percentil por el método del rango más cercano sobre valores ordenados."""
+    if not valores:
+        return 0.0
+    indice = min(len(valores) - 1, max(0, math.ceil(fraccion * len(valores)) - 1))
+    return valores[indice]
+
+
+def informe_consultas(ordenar_por: str = "total_ms") -> List[dict]:
+    """
+    Agrega las mediciones por sentencia.
+    
+    Args:
+        ordenar_por: Campo por el que ordenar de mayor a menor
+            ('total_ms', 'p95_ms', 'max_ms', 'ejecuciones'...)
+    
+    Returns:
+        Lista de diccionarios con sql, ejecuciones, filas, p50_ms, p95_ms,
+        max_ms, total_ms y sitios
+    """
+    with _lock:
+        estadisticas = [(e, sorted(e.muestras)) for e in _estadisticas.values()]
+    
+    informe = []
+    for estadistica, muestras in estadisticas:
+        informe.append({
+            'sql': estadistica.sql,
+            'ejecuciones': estadistica.ejecuciones,
+            'filas': estadistica.filas,
+            'p50_ms': _percentil(muestras, 0.50),
+            'p95_ms': _percentil(muestras, 0.95),
+            'max_ms': estadistica.max_ms,
+            'total_ms': estadistica.total_ms,
+            'sitios': sorted(estadistica.sitios),
+        })
+    informe.sort(key=lambda fila: fila[ordenar_por], reverse=True)
+    return informe
+
+
+def registrar_informe(limite: int = 20):
+    """
+    Escribe en el log las sentencias con más tiempo acumulado.
+    
+    Args:
+        limite: Número máximo de sentencias a incluir
+    """
+    informe = informe_consultas()
+    if not informe:
+        return
+    
+    lineas = [f"{'n':>6} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'total ms':>9}  sentencia"]
+    for fila in informe[:limite]:
+        sql = fila['sql'] if len(fila['sql']) <= 100 else fila['sql'][:97] + "..."
+        lineas.append(f"{fila['ejecuciones']:>6} {fila['p50_ms']:>8.2f} {fila['p95_ms']:>8.2f} "
+                      f"{fila['max_ms']:>8.2f} {fila['total_ms']:>9.1f}  {sql}")
+    logger.info("Informe de consultas:\n" + "\n".join(lineas))
+
+
+def reiniciar_estadisticas():
+    """Descarta las mediciones acumuladas."""
+    with _lock:
+        _estadisticas.clear()
+
+
+def total_ejecuciones() -> int:
+    """Número de ejecuciones medidas desde el arranque o el último reinicio (todas las sentencias)."""
+    with _lock:
+        return sum(estadistica.ejecuciones for estadistica in _estadisticas.values())
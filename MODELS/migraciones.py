@@ -0,0 +1,357 @@
+"""
+Motor de migraciones del esquema de la base de datos.
+Lleva la versión del esquema en PRAGMA user_version y aplica, en orden,
+las migraciones numeradas que todavía no se hayan ejecutado.
+"""
+
+import logging
+from PySide6.QtSql import QSqlDatabase, QSqlQuery
+import config
+
+logger = logging.getLogger(__name__)
+
+
+def _ejecutar(query: QSqlQuery, sentencias: list):
+    """
+    Ejecuta una lista de sentencias SQL y falla en la primera que dé error.
+
+    Args:
+        query: QSqlQuery ligada a la conexión que se está migrando
+        sentencias: Lista de sentencias SQL
+
+    Raises:
+        Exception: Si alguna sentencia falla
+    """
+    for sql in sentencias:
+        if not query.exec(sql):
+            raise Exception(f"{query.lastError().text()}\n{sql.strip()}")
+
+
+def _migracion_001_indices(query: QSqlQuery):
+    """Índices secundarios que necesitan las consultas más frecuentes."""
+    _ejecutar(query, [
+        # Goles y tarjetas por jugador (estadísticas, goleadores) y por partido (detalle)
+        "CREATE INDEX IF NOT EXISTS idx_goles_participante ON goles(participante_id)",
+        "CREATE INDEX IF NOT EXISTS idx_goles_partido ON goles(partido_id)",
+        "CREATE INDEX IF NOT EXISTS idx_tarjetas_participante ON tarjetas(participante_id, tipo)",
+        "CREATE INDEX IF NOT EXISTS idx_tarjetas_partido ON tarjetas(partido_id)",
+
+        # Plantillas: UNIQUE(equipo_id, participante_id) ya cubre la búsqueda por equipo
+        "CREATE INDEX IF NOT EXISTS idx_equipo_participante_participante ON equipo_participante(participante_id)",
+
+        # Calendario, eliminatorias, próximos partidos y resultados
+        "CREATE INDEX IF NOT EXISTS idx_partidos_fecha ON partidos(fecha_hora)",
+        "CREATE INDEX IF NOT EXISTS idx_partidos_eliminatoria ON partidos(eliminatoria, fecha_hora)",
+        "CREATE INDEX IF NOT EXISTS idx_partidos_pendientes ON partidos(fecha_hora) WHERE finalizado = 0",
+        "CREATE INDEX IF NOT EXISTS idx_partidos_local ON partidos(equipo_local_id)",
+        "CREATE INDEX IF NOT EXISTS idx_partidos_visitante ON partidos(equipo_visitante_id)",
+
+        # Listados de elementos activos ordenados por nombre
+        "CREATE INDEX IF NOT EXISTS idx_equipos_activos ON equipos(nombre) WHERE activo = 1",
+        "CREATE INDEX IF NOT EXISTS idx_participantes_activos ON participantes(nombre) WHERE activo = 1",
+        "CREATE INDEX IF NOT EXISTS idx_jugadores_activos ON participantes(nombre) WHERE activo = 1 AND es_jugador = 1",
+        "CREATE INDEX IF NOT EXISTS idx_arbitros_activos ON participantes(nombre) WHERE activo = 1 AND es_arbitro = 1",
+
+        "ANALYZE",
+    ])
+
+
+def _migracion_002_unificar_esquema(query: QSqlQuery):
+    """
+    Alinea las BDs creadas por el antiguo inicializar_db.py con el esquema base:
+    añade equipos.logo y la restricción CHECK de tarjetas.tipo.
+    """
+    query.exec("PRAGMA table_info(equipos)")
+    columnas = set()
+    while query.next():
+        columnas.add(query.value(1))
+    if "logo" not in columnas:
+        _ejecutar(query, ["ALTER TABLE equipos ADD COLUMN logo TEXT"])
+    
+    query.exec("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'tarjetas'")
+    sql_tarjetas = query.value(0) if query.next() else ""
+    if "CHECK" in (sql_tarjetas or "").upper():
+        return
+    
+    # SQLite no permite añadir un CHECK con ALTER TABLE: se reconstruye la tabla
+    query.exec("SELECT COUNT(*) FROM tarjetas WHERE tipo IS NULL OR tipo NOT IN ('amarilla', 'roja')")
+    descartadas = query.value(0) if query.next() else 0
+    if descartadas:
+        logger.warning(f"Se descartan {descartadas} tarjetas con un tipo no válido")
+    
+    _ejecutar(query, [
+        """
+        CREATE TABLE tarjetas_nueva (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            partido_id INTEGER,
+            participante_id INTEGER NOT NULL,
+            tipo TEXT NOT NULL CHECK(tipo IN ('amarilla', 'roja')),
+            minuto INTEGER,
+            FOREIGN KEY (partido_id) REFERENCES partidos(id) ON DELETE CASCADE,
+            FOREIGN KEY (participante_id) REFERENCES participantes(id) ON DELETE CASCADE
+        )
+        """,
+        """
+        INSERT INTO tarjetas_nueva (id, partido_id, participante_id, tipo, minuto)
+        SELECT id, partido_id, participante_id, tipo, minuto
+        FROM tarjetas WHERE tipo IN ('amarilla', 'roja')
+        """,
+        "DROP TABLE tarjetas",
+        "ALTER TABLE tarjetas_nueva RENAME TO tarjetas",
+        # Los índices de la migración 1 desaparecen con la tabla antigua
+        "CREATE INDEX IF NOT EXISTS idx_tarjetas_participante ON tarjetas(participante_id, tipo)",
+        "CREATE INDEX IF NOT EXISTS idx_tarjetas_partido ON tarjetas(partido_id)",
+    ])
+
+
+def _migracion_003_estadisticas_participante(query: QSqlQuery):
+    """
+    Tabla desnormalizada con los goles y tarjetas de cada participante.
+    La mantienen al día los triggers de goles y tarjetas, así que los listados
+    la leen con un JOIN por clave primaria en lugar de contar eventos por fila.
+    """
+    _ejecutar(query, [
+        """
+        CREATE TABLE IF NOT EXISTS estadisticas_participante (
+            participante_id INTEGER PRIMARY KEY,
+            goles INTEGER NOT NULL DEFAULT 0,
+            amarillas INTEGER NOT NULL DEFAULT 0,
+            rojas INTEGER NOT NULL DEFAULT 0,
+            FOREIGN KEY (participante_id) REFERENCES participantes(id) ON DELETE CASCADE
+        )
+        """,
+        
+        # Goles
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_goles_insert AFTER INSERT ON goles
+        BEGIN
+            INSERT INTO estadisticas_participante (participante_id, goles)
+            VALUES (NEW.participante_id, 1)
+            ON CONFLICT(participante_id) DO UPDATE SET goles = goles + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_goles_delete AFTER DELETE ON goles
+        BEGIN
+            UPDATE estadisticas_participante SET goles = goles - 1
+            WHERE participante_id = OLD.participante_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_goles_update AFTER UPDATE OF participante_id ON goles
+        WHEN NEW.participante_id IS NOT OLD.participante_id
+        BEGIN
+            UPDATE estadisticas_participante SET goles = goles - 1
+            WHERE participante_id = OLD.participante_id;
+            INSERT INTO estadisticas_participante (participante_id, goles)
+            VALUES (NEW.participante_id, 1)
+            ON CONFLICT(participante_id) DO UPDATE SET goles = goles + 1;
+        END
+        """,
+        
+        # Tarjetas
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_tarjetas_insert AFTER INSERT ON tarjetas
+        BEGIN
+            INSERT INTO estadisticas_participante (participante_id, amarillas, rojas)
+            VALUES (NEW.participante_id, NEW.tipo = 'amarilla', NEW.tipo = 'roja')
+            ON CONFLICT(participante_id) DO UPDATE SET
+                amarillas = amarillas + (NEW.tipo = 'amarilla'),
+                rojas = rojas + (NEW.tipo = 'roja');
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_tarjetas_delete AFTER DELETE ON tarjetas
+        BEGIN
+            UPDATE estadisticas_participante SET
+                amarillas = amarillas - (OLD.tipo = 'amarilla'),
+                rojas = rojas - (OLD.tipo = 'roja')
+            WHERE participante_id = OLD.participante_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_tarjetas_update AFTER UPDATE OF participante_id, tipo ON tarjetas
+        WHEN NEW.participante_id IS NOT OLD.participante_id OR NEW.tipo IS NOT OLD.tipo
+        BEGIN
+            UPDATE estadisticas_participante SET
+                amarillas = amarillas - (OLD.tipo = 'amarilla'),
+                rojas = rojas - (OLD.tipo = 'roja')
+            WHERE participante_id = OLD.participante_id;
+            INSERT INTO estadisticas_participante (participante_id, amarillas, rojas)
+            VALUES (NEW.participante_id, NEW.tipo = 'amarilla', NEW.tipo = 'roja')
+            ON CONFLICT(participante_id) DO UPDATE SET
+                amarillas = amarillas + (NEW.tipo = 'amarilla'),
+                rojas = rojas + (NEW.tipo = 'roja');
+        END
+        """,
+        
+        # Carga inicial con los eventos que ya existen
+        "DELETE FROM estadisticas_participante",
+        """
+        INSERT INTO estadisticas_participante (participante_id, goles, amarillas, rojas)
+        SELECT participante_id, SUM(goles), SUM(amarillas), SUM(rojas)
+        FROM (
+            SELECT participante_id, 1 AS goles, 0 AS amarillas, 0 AS rojas FROM goles
+            UNION ALL
+            SELECT participante_id, 0, tipo = 'amarilla', tipo = 'roja' FROM tarjetas
+        )
+        GROUP BY participante_id
+        """,
+    ])
+
+
+def _migracion_004_clasificacion(query: QSqlQuery):
+    """
+    Tabla de clasificación materializada: una fila por equipo con los partidos
+    finalizados ya acumulados. Partido.guardar/eliminar la actualizan por
+    diferencias, así que leerla es un recorrido del índice de orden.
+    """
+    _ejecutar(query, [
+        """
+        CREATE TABLE IF NOT EXISTS clasificacion (
+            equipo_id INTEGER PRIMARY KEY,
+            pj INTEGER NOT NULL DEFAULT 0,
+            pg INTEGER NOT NULL DEFAULT 0,
+            pe INTEGER NOT NULL DEFAULT 0,
+            pp INTEGER NOT NULL DEFAULT 0,
+            gf INTEGER NOT NULL DEFAULT 0,
+            gc INTEGER NOT NULL DEFAULT 0,
+            dg INTEGER NOT NULL DEFAULT 0,
+            pts INTEGER NOT NULL DEFAULT 0,
+            FOREIGN KEY (equipo_id) REFERENCES equipos(id) ON DELETE CASCADE
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_clasificacion_orden ON clasificacion(pts DESC, dg DESC, gf DESC)",
+        
+        # Todo equipo nuevo aparece en la clasificación con cero puntos
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_equipos_clasificacion AFTER INSERT ON equipos
+        BEGIN
+            INSERT OR IGNORE INTO clasificacion (equipo_id) VALUES (NEW.id);
+        END
+        """,
+        
+        # Carga inicial con los partidos ya finalizados
+        "DELETE FROM clasificacion",
+        f"""
+        INSERT INTO clasificacion (equipo_id, pj, pg, pe, pp, gf, gc, dg, pts)
+        SELECT equipo_id, COUNT(*), SUM(gf > gc), SUM(gf = gc), SUM(gf < gc),
+               SUM(gf), SUM(gc), SUM(gf) - SUM(gc),
+               SUM(CASE WHEN gf > gc THEN {int(config.PUNTOS_VICTORIA)}
+                        WHEN gf = gc THEN {int(config.PUNTOS_EMPATE)}
+                        ELSE {int(config.PUNTOS_DERROTA)} END)
+        FROM (
+            SELECT equipo_local_id AS equipo_id, goles_local AS gf, goles_visitante AS gc
+            FROM partidos WHERE finalizado = 1
+            UNION ALL
+            SELECT equipo_visitante_id, goles_visitante, goles_local
+            FROM partidos WHERE finalizado = 1
+        )
+        GROUP BY equipo_id
+        """,
+        "INSERT OR IGNORE INTO clasificacion (equipo_id) SELECT id FROM equipos",
+    ])
+
+
+def _migracion_005_equipo_en_eventos(query: QSqlQuery):
+    """
+    Guarda en goles y tarjetas el equipo con el que se produjo el evento,
+    para no deducirlo a través de las plantillas (un jugador inscrito en dos
+    equipos contaba para ambos).
+    """
+    for tabla in ("goles", "tarjetas"):
+        query.exec(f"PRAGMA table_info({tabla})")
+        columnas = set()
+        while query.next():
+            columnas.add(query.value(1))
+        if "equipo_id" not in columnas:
+            _ejecutar(query, [f"ALTER TABLE {tabla} ADD COLUMN equipo_id INTEGER REFERENCES equipos(id)"])
+        
+        # Relleno: el equipo del jugador que juega ese partido (el local si está en los dos);
+        # los eventos sin partido toman el primer equipo del jugador
+        _ejecutar(query, [
+            f"""
+            UPDATE {tabla} SET equipo_id = (
+                SELECT ep.equipo_id
+                FROM equipo_participante ep
+                LEFT JOIN partidos p ON p.id = {tabla}.partido_id
+                WHERE ep.participante_id = {tabla}.participante_id
+                  AND ({tabla}.partido_id IS NULL
+                       OR ep.equipo_id IN (p.equipo_local_id, p.equipo_visitante_id))
+                ORDER BY ep.equipo_id = p.equipo_local_id DESC, ep.equipo_id
+                LIMIT 1
+            )
+            WHERE equipo_id IS NULL
+            """,
+            # El índice compuesto sustituye al de la migración 1 y cubre el marcador por equipo
+            f"DROP INDEX IF EXISTS idx_{tabla}_partido",
+            f"CREATE INDEX IF NOT EXISTS idx_{tabla}_partido_equipo ON {tabla}(partido_id, equipo_id)",
+        ])
+
+
+# Migraciones numeradas: (versión, descripción, función que recibe una QSqlQuery).
+# Nunca se modifica una migración ya publicada; los cambios van en una nueva.
+MIGRACIONES = [
+    (1, "Índices secundarios para consultas frecuentes", _migracion_001_indices),
+    (2, "Unificar el esquema (equipos.logo, CHECK en tarjetas.tipo)", _migracion_002_unificar_esquema),
+    (3, "Estadísticas por participante mantenidas con triggers", _migracion_003_estadisticas_participante),
+    (4, "Clasificación materializada por equipo", _migracion_004_clasificacion),
+    (5, "Equipo del evento en goles y tarjetas", _migracion_005_equipo_en_eventos),
+]
+
+VERSION_ESQUEMA = MIGRACIONES[-1][0]
+
+
+def obtener_version(db: QSqlDatabase = None) -> int:
+    """
+    Obtiene la versión del esquema guardada en PRAGMA user_version.
+
+    Args:
+        db: Conexión a consultar (por defecto la conexión principal)
+
+    Returns:
+        int: Versión actual del esquema (0 si nunca se ha migrado)
+    """
+    query = QSqlQuery(db) if db is not None else QSqlQuery()
+    if query.exec("PRAGMA user_version") and query.next():
+        return query.value(0) or 0
+    return 0
+
+
+def aplicar_migraciones(db: QSqlDatabase = None, version: int = None) -> int:
+    """
+    Aplica las migraciones pendientes, cada una en su propia transacción.
+
+    Args:
+        db: Conexión a migrar (por defecto la conexión principal)
+        version: Versión actual si el llamador ya la ha consultado
+
+    Returns:
+        int: Versión del esquema tras aplicar las migraciones
+
+    Raises:
+        Exception: Si alguna migración falla (se deshace esa migración)
+    """
+    if db is None:
+        db = QSqlDatabase.database()
+
+    if version is None:
+        version = obtener_version(db)
+    pendientes = [m for m in MIGRACIONES if m[0] > version]
+    if not pendientes:
+        return version
+
+    query = QSqlQuery(db)
+    for numero, descripcion, migrar in pendientes:
+        logger.info(f"Aplicando migración {numero}: {descripcion}")
+        db.transaction()
+        try:
+            migrar(query)
+            _ejecutar(query, [f"PRAGMA user_version = {numero}"])
+        except Exception as e:
+            db.rollback()
+            raise Exception(f"Error en la migración {numero} ({descripcion}): {e}")
+        db.commit()
+        version = numero
+
+    return version
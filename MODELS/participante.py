@@ -1,9 +1,13 @@
 """Clase que representa un participante (jugador o árbitro) y sus operaciones relacionadas con la base de datos."""
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterable, List, Optional, Tuple
 from datetime import date
-from PySide6.QtSql import QSqlQuery
+from PySide6.QtSql import QSqlDatabase
+from MODELS.database import crear_query, ejecutar_lote, transaccion
+from MODELS import eventos
+from MODELS.cache_entidades import cache_entidades
+from MODELS.cache_consultas import cache_consultas
 
 
 @dataclass
@@ -26,14 +30,17 @@ class Participante:
         if not (self.es_jugador or self.es_arbitro):
             raise ValueError("Un participante debe ser jugador, árbitro o ambos")
     
-    def guardar(self) -> bool:
+    def guardar(self, db: QSqlDatabase = None) -> bool:
         """
         Guarda el participante en la base de datos.
         
+        Args:
+            db: Conexión a usar (por defecto la del hilo actual)
+        
         Returns:
             bool: True si se guardó correctamente
         """
-        query = QSqlQuery()
+        query = crear_query(db)
         
         try:
             if self.id:
@@ -66,35 +73,51 @@ class Participante:
                 query.addBindValue(self.posicion)
             
             if query.exec():
+                tipo = eventos.MODIFICADO if self.id else eventos.CREADO
                 if not self.id:
                     self.id = query.lastInsertId()
+                cache_entidades.escrita(self, db)
+                eventos.publicar(eventos.PARTICIPANTE, self.id, tipo, db)
                 return True
+            if self.id:
+                cache_entidades.descartar(Participante, self.id, db)
             return False
         except Exception as e:
             print(f"Error al guardar participante: {e}")
+            if self.id:
+                cache_entidades.descartar(Participante, self.id, db)
             return False
     
-    def eliminar(self) -> bool:
+    def eliminar(self, db: QSqlDatabase = None) -> bool:
         """
         Elimina el participante (soft delete).
         
+        Args:
+            db: Conexión a usar (por defecto la del hilo actual)
+        
         Returns:
             bool: True si se eliminó correctamente
         """
         if not self.id:
             return False
         
-        query = QSqlQuery()
+        query = crear_query(db)
         query.prepare("UPDATE participantes SET activo = 0 WHERE id = ?")
         query.addBindValue(self.id)
-        return query.exec()
+        if not query.exec():
+            return False
+        self.activo = 0
+        cache_entidades.escrita(self, db)
+        eventos.publicar(eventos.PARTICIPANTE, self.id, eventos.ELIMINADO, db)
+        return True
     
-    def asignar_equipo(self, equipo_id: int) -> bool:
+    def asignar_equipo(self, equipo_id: int, db: QSqlDatabase = None) -> bool:
         """
         Asigna el participante a un equipo.
         
         Args:
             equipo_id: ID del equipo
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             bool: True si se asignó correctamente
@@ -102,21 +125,25 @@ class Participante:
         if not self.id or not self.es_jugador:
             return False
         
-        query = QSqlQuery()
+        query = crear_query(db)
         query.prepare("""
             INSERT OR IGNORE INTO equipo_participante (equipo_id, participante_id)
             VALUES (?, ?)
         """)
         query.addBindValue(equipo_id)
         query.addBindValue(self.id)
-        return query.exec()
+        if not query.exec():
+            return False
+        eventos.publicar(eventos.PLANTILLA, equipo_id, eventos.CREADO, db, participante_id=self.id)
+        return True
     
-    def desasignar_equipo(self, equipo_id: int) -> bool:
+    def desasignar_equipo(self, equipo_id: int, db: QSqlDatabase = None) -> bool:
         """
         Desasigna el participante de un equipo.
         
         Args:
             equipo_id: ID del equipo
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             bool: True si se desasignó correctamente
@@ -124,69 +151,241 @@ class Participante:
         if not self.id:
             return False
         
-        query = QSqlQuery()
+        query = crear_query(db)
         query.prepare("""
             DELETE FROM equipo_participante 
             WHERE equipo_id = ? AND participante_id = ?
         """)
         query.addBindValue(equipo_id)
         query.addBindValue(self.id)
-        return query.exec()
+        if not query.exec():
+            return False
+        eventos.publicar(eventos.PLANTILLA, equipo_id, eventos.ELIMINADO, db, participante_id=self.id)
+        return True
+    
+    @staticmethod
+    def crear_participantes(participantes: Iterable['Participante'],
+                            db: QSqlDatabase = None) -> Optional[List[int]]:
+        """
+        Crea muchos participantes en una sola transacción.
+        
+        La sentencia se prepara una vez para todo el lote (database.ejecutar_lote)
+        y se publica un único cambio en el bus.
+        
+        Args:
+            participantes: Participantes nuevos (sin id); al crearse se les asigna el suyo
+            db: Conexión a usar (por defecto la del hilo actual)
+        
+        Returns:
+            Lista de IDs generados, en el orden de entrada, o None si falló
+            (en ese caso no se crea ninguno; dentro de una transacción abierta
+            se deshace solo lo escrito por este método)
+        """
+        participantes = list(participantes)
+        ids = []
+        try:
+            with transaccion(db):
+                ejecutar_lote("""
+                    INSERT INTO participantes 
+                    (nombre, fecha_nacimiento, curso, es_jugador, es_arbitro, posicion)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, ((p.nombre, p.fecha_nacimiento, p.curso, p.es_jugador, p.es_arbitro, p.posicion)
+                      for p in participantes), db, ids=ids)
+                eventos.publicar_lote(eventos.PARTICIPANTE, ids, eventos.CREADO, db)
+        except Exception as e:
+            print(f"Error al crear participantes: {e}")
+            return None
+        
+        for participante, participante_id in zip(participantes, ids):
+            participante.id = participante_id
+        return ids
+    
+    @staticmethod
+    def asignar_jugadores(asignaciones: Iterable[Tuple[int, int]], db: QSqlDatabase = None) -> Optional[int]:
+        """
+        Asigna muchos jugadores a sus equipos en una sola transacción.
+        
+        Como asignar_equipo(), solo se asignan participantes que son jugadores
+        y las asignaciones que ya existían se ignoran.
+        
+        Args:
+            asignaciones: Pares (equipo_id, participante_id)
+            db: Conexión a usar (por defecto la del hilo actual)
+        
+        Returns:
+            Número de asignaciones nuevas, o None si falló (en ese caso no se
+            asigna ninguna; dentro de una transacción abierta se deshace solo
+            lo escrito por este método)
+        """
+        asignaciones = list(asignaciones)
+        query = crear_query(db)
+        try:
+            with transaccion(db):
+                query.exec("SELECT total_changes()")
+                query.next()
+                cambios_antes = query.value(0)
+                query.finish()
+                
+                ejecutar_lote("""
+                    INSERT OR IGNORE INTO equipo_participante (equipo_id, participante_id)
+                    SELECT ?, id FROM participantes WHERE id = ? AND es_jugador = 1
+                """, asignaciones, db)
+                
+                query.exec("SELECT total_changes()")
+                query.next()
+                nuevas = query.value(0) - cambios_antes
+                query.finish()
+                
+                equipos = sorted({equipo_id for equipo_id, _ in asignaciones})
+                eventos.publicar_lote(eventos.PLANTILLA, equipos, eventos.CREADO, db)
+        except Exception as e:
+            print(f"Error al asignar jugadores: {e}")
+            return None
+        return nuevas
     
-    def obtener_goles(self) -> int:
+    def obtener_goles(self, db: QSqlDatabase = None) -> int:
         """
         Obtiene el total de goles marcados.
         
+        Args:
+            db: Conexión a usar (por defecto la del hilo actual)
+        
         Returns:
             int: Número de goles
         """
-        query = QSqlQuery()
-        query.prepare("SELECT COUNT(*) FROM goles WHERE participante_id = ?")
+        query = crear_query(db)
+        query.prepare("SELECT goles FROM estadisticas_participante WHERE participante_id = ?")
         query.addBindValue(self.id)
         
         if query.exec() and query.next():
             return query.value(0) or 0
         return 0
     
-    def obtener_tarjetas(self) -> dict:
+    def obtener_tarjetas(self, db: QSqlDatabase = None) -> dict:
         """
         Obtiene el conteo de tarjetas (amarillas y rojas).
         
+        Args:
+            db: Conexión a usar (por defecto la del hilo actual)
+        
         Returns:
             dict: {'amarillas': count, 'rojas': count}
         """
-        query = QSqlQuery()
+        query = crear_query(db)
         query.prepare("""
-            SELECT tipo, COUNT(*) FROM tarjetas 
+            SELECT amarillas, rojas FROM estadisticas_participante
             WHERE participante_id = ?
-            GROUP BY tipo
         """)
         query.addBindValue(self.id)
         
         resultado = {'amarillas': 0, 'rojas': 0}
-        if query.exec():
-            while query.next():
-                tipo = query.value(0)
-                count = query.value(1) or 0
-                if tipo == 'amarilla':
-                    resultado['amarillas'] = count
-                elif tipo == 'roja':
-                    resultado['rojas'] = count
+        if query.exec() and query.next():
+            resultado['amarillas'] = query.value(0) or 0
+            resultado['rojas'] = query.value(1) or 0
         
         return resultado
     
+    def ajustar_estadisticas(self, goles: int, amarillas: int, rojas: int, db: QSqlDatabase = None) -> bool:
+        """
+        Corrige a mano los goles y tarjetas del participante: añade registros
+        sin partido o borra los que sobran hasta llegar a los totales indicados.
+        Solo se borran registros sin partido (añadidos a mano): los de un
+        partido cuentan en su resultado y en la clasificación, así que el
+        total no puede bajar de ellos. Todo en una transacción.
+        
+        Args:
+            goles: Total de goles
+            amarillas: Total de tarjetas amarillas
+            rojas: Total de tarjetas rojas
+            db: Conexión a usar (por defecto la del hilo actual)
+        
+        Returns:
+            bool: True si se ajustaron correctamente
+        
+        Raises:
+            ValueError: Si algún total es negativo o menor que los registrados en partidos
+        """
+        if min(goles, amarillas, rojas) < 0:
+            raise ValueError("Goles y tarjetas no pueden ser negativos")
+        if not self.id:
+            return False
+        
+        # (entidad, tabla, tipo de tarjeta, total pedido, nombre para los mensajes)
+        ajustes = [
+            (eventos.GOL, "goles", None, goles, "goles"),
+            (eventos.TARJETA, "tarjetas", "amarilla", amarillas, "tarjetas amarillas"),
+            (eventos.TARJETA, "tarjetas", "roja", rojas, "tarjetas rojas"),
+        ]
+        creados = {eventos.GOL: [], eventos.TARJETA: []}
+        eliminados = {eventos.GOL: [], eventos.TARJETA: []}
+        try:
+            with transaccion(db):
+                tarjetas = self.obtener_tarjetas(db)
+                actuales = {"goles": self.obtener_goles(db), "amarilla": tarjetas['amarillas'],
+                            "roja": tarjetas['rojas']}
+                
+                for entidad, tabla, tipo, total, nombre in ajustes:
+                    diferencia = total - actuales[tipo or tabla]
+                    filtro_tipo = " AND tipo = ?" if tipo else ""
+                    valores = (self.id, tipo) if tipo else (self.id,)
+                    if diferencia > 0:
+                        columnas = "participante_id, tipo" if tipo else "participante_id"
+                        marcadores = "?, ?" if tipo else "?"
+                        ejecutar_lote(f"INSERT INTO {tabla} ({columnas}) VALUES ({marcadores})",
+                                      [valores] * diferencia, db, ids=creados[entidad])
+                    elif diferencia < 0:
+                        query = crear_query(db)
+                        query.prepare(f"""
+                            SELECT id FROM {tabla}
+                            WHERE participante_id = ?{filtro_tipo} AND partido_id IS NULL
+                            ORDER BY id DESC
+                            LIMIT ?
+                        """)
+                        for valor in valores + (-diferencia,):
+                            query.addBindValue(valor)
+                        if not query.exec():
+                            raise Exception(query.lastError().text())
+                        ids = []
+                        while query.next():
+                            ids.append(query.value(0))
+                        if len(ids) < -diferencia:
+                            en_partidos = actuales[tipo or tabla] - len(ids)
+                            raise ValueError(f"Hay {en_partidos} {nombre} de partidos, que no se pueden "
+                                             f"quitar aquí: el mínimo es {en_partidos}")
+                        ejecutar_lote(f"DELETE FROM {tabla} WHERE id = ?", [(i,) for i in ids], db)
+                        eliminados[entidad].extend(ids)
+                
+                for entidad in (eventos.GOL, eventos.TARJETA):
+                    eventos.publicar_lote(entidad, creados[entidad], eventos.CREADO, db,
+                                          participante_id=self.id)
+                    eventos.publicar_lote(entidad, eliminados[entidad], eventos.ELIMINADO, db,
+                                          participante_id=self.id)
+            return True
+        except ValueError:
+            raise
+        except Exception as e:
+            print(f"Error al ajustar estadísticas: {e}")
+            return False
+    
     @staticmethod
-    def obtener_por_id(participante_id: int) -> Optional['Participante']:
+    def obtener_por_id(participante_id: int, db: QSqlDatabase = None) -> Optional['Participante']:
         """
-        Obtiene un participante por su ID.
+        Obtiene un participante por su ID (de la caché de entidades si está activa).
         
         Args:
             participante_id: ID del participante
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             Participante o None
         """
-        query = QSqlQuery()
+        return cache_entidades.obtener(Participante, participante_id,
+                                       lambda: Participante._leer_por_id(participante_id, db), db)
+    
+    @staticmethod
+    def _leer_por_id(participante_id: int, db: QSqlDatabase = None) -> Optional['Participante']:
+        """Lee un participante de la base de datos."""
+        query = crear_query(db)
         query.prepare("""
             SELECT id, nombre, fecha_nacimiento, curso, es_jugador, es_arbitro, posicion, activo
             FROM participantes WHERE id = ?
@@ -207,19 +406,21 @@ class Participante:
         return None
     
     @staticmethod
-    def obtener_todos(filtro: str = "todos", solo_activos: bool = True) -> list['Participante']:
+    def obtener_todos(filtro: str = "todos", solo_activos: bool = True,
+                      db: QSqlDatabase = None) -> list['Participante']:
         """
         Obtiene todos los participantes con filtro opcional.
         
         Args:
             filtro: 'todos', 'jugadores', 'arbitros'
             solo_activos: Si True, solo retorna participantes activos
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             Lista de Participante
         """
         participantes = []
-        query = QSqlQuery()
+        query = crear_query(db)
         
         sql = "SELECT id, nombre, fecha_nacimiento, curso, es_jugador, es_arbitro, posicion, activo FROM participantes WHERE 1=1"
         
@@ -247,3 +448,41 @@ class Participante:
                 ))
         
         return participantes
+
+    @staticmethod
+    def reconstruir_estadisticas(db: QSqlDatabase = None) -> bool:
+        """
+        Recalcula desde cero la tabla estadisticas_participante a partir de goles y tarjetas.
+        
+        Los triggers la mantienen al día; esto solo hace falta para reparar
+        datos modificados fuera de la aplicación.
+        
+        Args:
+            db: Conexión a usar (por defecto la del hilo actual)
+        
+        Returns:
+            bool: True si se reconstruyó correctamente
+        """
+        query = crear_query(db)
+        try:
+            with transaccion(db):
+                if not query.exec("DELETE FROM estadisticas_participante"):
+                    raise Exception(query.lastError().text())
+        
+                if not query.exec("""
+                    INSERT INTO estadisticas_participante (participante_id, goles, amarillas, rojas)
+                    SELECT participante_id, SUM(goles), SUM(amarillas), SUM(rojas)
+                    FROM (
+                        SELECT participante_id, 1 AS goles, 0 AS amarillas, 0 AS rojas FROM goles
+                        UNION ALL
+                        SELECT participante_id, 0, tipo = 'amarilla', tipo = 'roja' FROM tarjetas
+                    )
+                    GROUP BY participante_id
+                """):
+                    raise Exception(query.lastError().text())
+                cache_consultas.marcar_escritura(("estadisticas_participante",), db)
+            return True
+        except Exception as e:
+            print(f"Error reconstruyendo estadísticas: {e}")
+            return False
+        
\ No newline at end of file
@@ -4,8 +4,17 @@ Define la estructura de un partido en el torneo.
 """
 
 from dataclasses import dataclass
-from typing import Optional, List, Tuple
-from PySide6.QtSql import QSqlQuery
+from typing import Iterable, Optional, List, Tuple
+from PySide6.QtSql import QSqlDatabase, QSqlQuery
+from MODELS.database import crear_query, ejecutar_lote, transaccion
+from MODELS import eventos
+from MODELS.cache_entidades import cache_entidades
+from MODELS.cache_consultas import cache_consultas
+import config
+
+# Tipos de incidencia de registrar_eventos()
+INCIDENCIA_GOL = "gol"
+TIPOS_INCIDENCIA = (INCIDENCIA_GOL, "amarilla", "roja")
 
 
 @dataclass
@@ -28,62 +37,98 @@ class Partido:
             raise ValueError("Fecha/hora y eliminatoria son obligatorios")
         if self.equipo_local_id == self.equipo_visitante_id:
             raise ValueError("Los equipos deben ser diferentes")
-        if self.eliminatoria not in ["Octavos", "Cuartos", "Semifinal", "Final"]:
+        if self.eliminatoria not in config.ELIMINATORIAS:
             raise ValueError("Eliminatoria no válida")
     
-    def guardar(self) -> bool:
+    def guardar(self, db: QSqlDatabase = None) -> bool:
         """
         Guarda el partido en la base de datos.
         
+        Si el partido estaba o queda finalizado, la tabla de clasificación
+        se actualiza en la misma transacción.
+        
+        Args:
+            db: Conexión a usar (por defecto la del hilo actual)
+        
         Returns:
             bool: True si se guardó correctamente
         """
-        query = QSqlQuery()
+        query = crear_query(db)
         
         try:
-            if self.id:
-                # Actualizar
-                query.prepare("""
-                    UPDATE partidos 
-                    SET equipo_local_id = ?, equipo_visitante_id = ?, arbitro_id = ?, 
-                        fecha_hora = ?, eliminatoria = ?, goles_local = ?, 
-                        goles_visitante = ?, finalizado = ?
-                    WHERE id = ?
-                """)
-                query.addBindValue(self.equipo_local_id)
-                query.addBindValue(self.equipo_visitante_id)
-                query.addBindValue(self.arbitro_id)
-                query.addBindValue(self.fecha_hora)
-                query.addBindValue(self.eliminatoria)
-                query.addBindValue(self.goles_local)
-                query.addBindValue(self.goles_visitante)
-                query.addBindValue(self.finalizado)
-                query.addBindValue(self.id)
-            else:
-                # Crear
-                query.prepare("""
-                    INSERT INTO partidos 
-                    (equipo_local_id, equipo_visitante_id, arbitro_id, fecha_hora, eliminatoria)
-                    VALUES (?, ?, ?, ?, ?)
-                """)
-                query.addBindValue(self.equipo_local_id)
-                query.addBindValue(self.equipo_visitante_id)
-                query.addBindValue(self.arbitro_id)
-                query.addBindValue(self.fecha_hora)
-                query.addBindValue(self.eliminatoria)
-            
-            if query.exec():
-                if not self.id:
-                    self.id = query.lastInsertId()
-                return True
-            return False
+            with transaccion(db):
+                tipo = eventos.MODIFICADO if self.id else eventos.CREADO
+                self._guardar(query)
+                cache_entidades.escrita(self, db)
+                eventos.publicar(eventos.PARTIDO, self.id, tipo, db, eliminatoria=self.eliminatoria)
+            return True
         except Exception as e:
             print(f"Error al guardar partido: {e}")
+            if self.id:
+                cache_entidades.descartar(Partido, self.id, db)
             return False
     
-    def eliminar(self) -> bool:
+    def _guardar(self, query: QSqlQuery):
+        """
+        Escribe el partido y ajusta la clasificación. Debe llamarse dentro de una transacción.
+        
+        Raises:
+            Exception: Si alguna sentencia falla
+        """
+        anterior = None
+        if self.id:
+            # Resultado que ya contaba en la clasificación, para descontarlo
+            anterior = Partido._resultado_finalizado(query, self.id)
+            
+            # Actualizar
+            query.prepare("""
+                UPDATE partidos 
+                SET equipo_local_id = ?, equipo_visitante_id = ?, arbitro_id = ?, 
+                    fecha_hora = ?, eliminatoria = ?, goles_local = ?, 
+                    goles_visitante = ?, finalizado = ?
+                WHERE id = ?
+            """)
+            query.addBindValue(self.equipo_local_id)
+            query.addBindValue(self.equipo_visitante_id)
+            # QtSql devuelve '' para un árbitro NULL; se vuelve a guardar como NULL
+            query.addBindValue(self.arbitro_id or None)
+            query.addBindValue(self.fecha_hora)
+            query.addBindValue(self.eliminatoria)
+            query.addBindValue(self.goles_local)
+            query.addBindValue(self.goles_visitante)
+            query.addBindValue(self.finalizado)
+            query.addBindValue(self.id)
+        else:
+            # Crear
+            query.prepare("""
+                INSERT INTO partidos 
+                (equipo_local_id, equipo_visitante_id, arbitro_id, fecha_hora, eliminatoria)
+                VALUES (?, ?, ?, ?, ?)
+            """)
+            query.addBindValue(self.equipo_local_id)
+            query.addBindValue(self.equipo_visitante_id)
+            query.addBindValue(self.arbitro_id)
+            query.addBindValue(self.fecha_hora)
+            query.addBindValue(self.eliminatoria)
+        
+        if not query.exec():
+            raise Exception(query.lastError().text())
+        if not self.id:
+            self.id = query.lastInsertId()
+        
+        if anterior:
+            Partido._sumar_a_clasificacion(query, *anterior, signo=-1)
+        if self.finalizado:
+            Partido._sumar_a_clasificacion(query, self.equipo_local_id, self.equipo_visitante_id,
+                                           self.goles_local, self.goles_visitante, signo=1)
+    
+    def eliminar(self, db: QSqlDatabase = None) -> bool:
         """
         Elimina el partido de la base de datos.
+        Si estaba finalizado, su resultado se descuenta de la clasificación.
+        
+        Args:
+            db: Conexión a usar (por defecto la del hilo actual)
         
         Returns:
             bool: True si se eliminó correctamente
@@ -91,46 +136,99 @@ class Partido:
         if not self.id:
             return False
         
-        query = QSqlQuery()
-        query.prepare("DELETE FROM partidos WHERE id = ?")
-        query.addBindValue(self.id)
-        return query.exec()
+        query = crear_query(db)
+        try:
+            with transaccion(db):
+                anterior = Partido._resultado_finalizado(query, self.id)
+                
+                query.prepare("DELETE FROM partidos WHERE id = ?")
+                query.addBindValue(self.id)
+                if not query.exec():
+                    raise Exception(query.lastError().text())
+                
+                if anterior:
+                    Partido._sumar_a_clasificacion(query, *anterior, signo=-1)
+                cache_entidades.descartar(Partido, self.id, db)
+                eventos.publicar(eventos.PARTIDO, self.id, eventos.ELIMINADO, db,
+                                 eliminatoria=self.eliminatoria)
+            return True
+        except Exception as e:
+            print(f"Error al eliminar partido: {e}")
+            cache_entidades.descartar(Partido, self.id, db)
+            return False
     
-    def registrar_gol(self, participante_id: int, minuto: int) -> bool:
+    def registrar_gol(self, participante_id: int, minuto: int,
+                      equipo_id: Optional[int] = None,
+                      db: QSqlDatabase = None) -> Optional[Tuple[int, int]]:
         """
         Registra un gol en el partido.
         
+        Comprobación del jugador, inserción del gol y suma en el marcador van
+        en una sola transacción; el marcador se incrementa en la fila del
+        partido sin recontar los goles.
+        
         Args:
             participante_id: ID del jugador que marcó
             minuto: Minuto del gol
+            equipo_id: Equipo con el que marcó; necesario si el jugador está
+                inscrito en los dos equipos (si no se indica, cuenta para el local)
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
-            bool: True si se registró correctamente
+            Tupla (goles_local, goles_visitante) con el nuevo marcador,
+            o None si no se pudo registrar
         """
         if not self.id:
-            return False
-        
-        # Verificar que el participante pertenece a uno de los equipos del partido
-        if not self._participante_en_partido(participante_id):
-            return False
+            return None
         
-        query = QSqlQuery()
-        query.prepare("""
-            INSERT INTO goles (partido_id, participante_id, minuto)
-            VALUES (?, ?, ?)
-        """)
-        query.addBindValue(self.id)
-        query.addBindValue(participante_id)
-        query.addBindValue(minuto)
+        query = crear_query(db)
+        try:
+            with transaccion(db):
+                # Verificar que el participante pertenece a uno de los equipos del partido
+                equipo_id = self._equipo_del_participante(query, participante_id, equipo_id)
+                if equipo_id is None:
+                    raise Exception("el participante no juega en este partido")
         
-        if query.exec():
-            # Actualizar conteo de goles
-            self._actualizar_goles()
-            # Persistir los cambios en la base de datos
-            return self.guardar()
-        return False
+                query.prepare("""
+                    INSERT INTO goles (partido_id, participante_id, equipo_id, minuto)
+                    VALUES (?, ?, ?, ?)
+                """)
+                query.addBindValue(self.id)
+                query.addBindValue(participante_id)
+                query.addBindValue(equipo_id)
+                query.addBindValue(minuto)
+                if not query.exec():
+                    raise Exception(query.lastError().text())
+                gol_id = query.lastInsertId()
+                
+                columna = "goles_local" if equipo_id == self.equipo_local_id else "goles_visitante"
+                query.prepare(f"""
+                    UPDATE partidos SET {columna} = {columna} + 1
+                    WHERE id = ? AND finalizado = 0
+                    RETURNING goles_local, goles_visitante
+                """)
+                query.addBindValue(self.id)
+                if not query.exec() or not query.next():
+                    raise Exception("el partido no existe o ya está finalizado")
+                
+                self.goles_local = query.value(0)
+                self.goles_visitante = query.value(1)
+                query.finish()
+                cache_entidades.escrita(self, db)
+                
+                eventos.publicar(eventos.GOL, gol_id, eventos.CREADO, db, partido_id=self.id,
+                                 participante_id=participante_id, equipo_id=equipo_id)
+                eventos.publicar(eventos.PARTIDO, self.id, eventos.MODIFICADO, db,
+                                 eliminatoria=self.eliminatoria)
+            return (self.goles_local, self.goles_visitante)
+        except Exception as e:
+            print(f"Error al registrar gol: {e}")
+            cache_entidades.descartar(Partido, self.id, db)
+            return None
     
-    def registrar_tarjeta(self, participante_id: int, tipo: str, minuto: int) -> bool:
+    def registrar_tarjeta(self, participante_id: int, tipo: str, minuto: int,
+                          equipo_id: Optional[int] = None,
+                          db: QSqlDatabase = None) -> bool:
         """
         Registra una tarjeta en el partido.
         
@@ -138,6 +236,8 @@ class Partido:
             participante_id: ID del jugador
             tipo: 'amarilla' o 'roja'
             minuto: Minuto de la tarjeta
+            equipo_id: Equipo con el que jugaba (si no se indica, se deduce de la plantilla)
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             bool: True si se registró correctamente
@@ -145,29 +245,137 @@ class Partido:
         if not self.id or tipo not in ['amarilla', 'roja']:
             return False
         
-        # Verificar que el participante pertenece a uno de los equipos del partido
-        if not self._participante_en_partido(participante_id):
+        query = crear_query(db)
+        try:
+            with transaccion(db):
+                # Verificar que el participante pertenece a uno de los equipos del partido
+                equipo_id = self._equipo_del_participante(query, participante_id, equipo_id)
+                if equipo_id is None:
+                    raise Exception("el participante no juega en este partido")
+                
+                query.prepare("""
+                    INSERT INTO tarjetas (partido_id, participante_id, equipo_id, tipo, minuto)
+                    VALUES (?, ?, ?, ?, ?)
+                """)
+                query.addBindValue(self.id)
+                query.addBindValue(participante_id)
+                query.addBindValue(equipo_id)
+                query.addBindValue(tipo)
+                query.addBindValue(minuto)
+                if not query.exec():
+                    raise Exception(query.lastError().text())
+                eventos.publicar(eventos.TARJETA, query.lastInsertId(), eventos.CREADO, db,
+                                 partido_id=self.id, participante_id=participante_id,
+                                 equipo_id=equipo_id, tipo_tarjeta=tipo)
+            return True
+        except Exception as e:
+            print(f"Error al registrar tarjeta: {e}")
             return False
+    
+    @staticmethod
+    def registrar_eventos(incidencias: Iterable[tuple], db: QSqlDatabase = None) -> Optional[List[int]]:
+        """
+        Registra muchos goles y tarjetas, de uno o varios partidos, en una sola transacción.
         
-        query = QSqlQuery()
-        query.prepare("""
-            INSERT INTO tarjetas (partido_id, participante_id, tipo, minuto)
-            VALUES (?, ?, ?, ?)
-        """)
-        query.addBindValue(self.id)
-        query.addBindValue(participante_id)
-        query.addBindValue(tipo)
-        query.addBindValue(minuto)
+        Se comprueba lo mismo que en registrar_gol() y registrar_tarjeta() (el
+        partido no está finalizado y el jugador está en uno de sus equipos),
+        pero leyendo cada partido y cada plantilla una sola vez. Los goles y
+        las tarjetas se insertan con una sentencia preparada por tabla
+        (database.ejecutar_lote) y el marcador de cada partido se suma una vez.
+        Si una incidencia no es válida no se registra ninguna.
+        
+        Args:
+            incidencias: Tuplas (partido_id, participante_id, tipo, minuto, equipo_id),
+                con tipo 'gol', 'amarilla' o 'roja' y equipo_id opcional (None)
+            db: Conexión a usar (por defecto la del hilo actual)
+        
+        Returns:
+            Lista con el ID del gol o de la tarjeta creada por cada incidencia,
+            en el orden de entrada, o None si no se pudieron registrar
+        """
+        incidencias = list(incidencias)
+        query = crear_query(db)
+        try:
+            with transaccion(db):
+                # Equipos de cada partido pendiente y plantilla de cada equipo, una vez
+                partidos = {}
+                query.prepare("SELECT equipo_local_id, equipo_visitante_id FROM partidos "
+                              "WHERE id = ? AND finalizado = 0")
+                for partido_id in {incidencia[0] for incidencia in incidencias}:
+                    query.addBindValue(partido_id)
+                    if query.exec() and query.next():
+                        partidos[partido_id] = (query.value(0), query.value(1))
+                
+                plantillas = {}
+                query.prepare("SELECT participante_id FROM equipo_participante WHERE equipo_id = ?")
+                for equipo_id in {equipo for equipos in partidos.values() for equipo in equipos}:
+                    query.addBindValue(equipo_id)
+                    if not query.exec():
+                        raise Exception(query.lastError().text())
+                    jugadores = set()
+                    while query.next():
+                        jugadores.add(query.value(0))
+                    plantillas[equipo_id] = jugadores
+                query.finish()
+                
+                goles, tarjetas = [], []
+                posiciones = []  # (es_gol, índice en su lista) de cada incidencia
+                marcadores = {}  # partido_id -> [goles local, goles visitante] a sumar
+                for numero, (partido_id, participante_id, tipo, minuto, equipo_id) in enumerate(incidencias, 1):
+                    if tipo not in TIPOS_INCIDENCIA:
+                        raise Exception(f"incidencia {numero}: tipo '{tipo}' no válido")
+                    if partido_id not in partidos:
+                        raise Exception(f"incidencia {numero}: el partido {partido_id} no existe "
+                                        "o ya está finalizado")
+                    candidatos = partidos[partido_id] if equipo_id is None else (equipo_id,)
+                    equipo_id = next((equipo for equipo in candidatos
+                                      if participante_id in plantillas.get(equipo, ())), None)
+                    if equipo_id is None:
+                        raise Exception(f"incidencia {numero}: el participante {participante_id} "
+                                        f"no juega el partido {partido_id}")
+                    
+                    if tipo == INCIDENCIA_GOL:
+                        posiciones.append((True, len(goles)))
+                        goles.append((partido_id, participante_id, equipo_id, minuto))
+                        lado = 0 if equipo_id == partidos[partido_id][0] else 1
+                        marcadores.setdefault(partido_id, [0, 0])[lado] += 1
+                    else:
+                        posiciones.append((False, len(tarjetas)))
+                        tarjetas.append((partido_id, participante_id, equipo_id, tipo, minuto))
+                
+                ids_goles, ids_tarjetas = [], []
+                ejecutar_lote("""
+                    INSERT INTO goles (partido_id, participante_id, equipo_id, minuto)
+                    VALUES (?, ?, ?, ?)
+                """, goles, db, ids=ids_goles)
+                ejecutar_lote("""
+                    INSERT INTO tarjetas (partido_id, participante_id, equipo_id, tipo, minuto)
+                    VALUES (?, ?, ?, ?, ?)
+                """, tarjetas, db, ids=ids_tarjetas)
+                ejecutar_lote("""
+                    UPDATE partidos SET goles_local = goles_local + ?, goles_visitante = goles_visitante + ?
+                    WHERE id = ?
+                """, [(local, visitante, partido_id) for partido_id, (local, visitante) in marcadores.items()], db)
+                
+                for partido_id in marcadores:
+                    cache_entidades.descartar(Partido, partido_id, db)
+                eventos.publicar_lote(eventos.GOL, ids_goles, eventos.CREADO, db)
+                eventos.publicar_lote(eventos.TARJETA, ids_tarjetas, eventos.CREADO, db)
+                eventos.publicar_lote(eventos.PARTIDO, list(marcadores), eventos.MODIFICADO, db)
+        except Exception as e:
+            print(f"Error al registrar incidencias: {e}")
+            return None
         
-        return query.exec()
+        return [ids_goles[i] if es_gol else ids_tarjetas[i] for es_gol, i in posiciones]
     
-    def finalizar(self, goles_local: int, goles_visitante: int) -> bool:
+    def finalizar(self, goles_local: int, goles_visitante: int, db: QSqlDatabase = None) -> bool:
         """
         Finaliza el partido con el resultado.
         
         Args:
             goles_local: Goles del equipo local
             goles_visitante: Goles del equipo visitante
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             bool: True si se finalizó correctamente
@@ -179,89 +387,131 @@ class Partido:
         self.goles_visitante = goles_visitante
         self.finalizado = 1
         
-        return self.guardar()
+        return self.guardar(db)
     
-    def _participante_en_partido(self, participante_id: int) -> bool:
+    @staticmethod
+    def _resultado_finalizado(query: QSqlQuery, partido_id: int) -> Optional[Tuple[int, int, int, int]]:
         """
-        Verifica si un participante pertenece a uno de los equipos del partido.
+        Lee el resultado guardado de un partido si está finalizado.
         
         Args:
-            participante_id: ID del participante
-            
+            query: QSqlQuery a reutilizar
+            partido_id: ID del partido
+        
         Returns:
-            bool: True si pertenece
+            Tupla (local_id, visitante_id, goles_local, goles_visitante) o None
         """
-        query = QSqlQuery()
         query.prepare("""
-            SELECT COUNT(*) FROM equipo_participante 
-            WHERE participante_id = ? AND (equipo_id = ? OR equipo_id = ?)
+            SELECT equipo_local_id, equipo_visitante_id, goles_local, goles_visitante
+            FROM partidos WHERE id = ? AND finalizado = 1
         """)
-        query.addBindValue(participante_id)
-        query.addBindValue(self.equipo_local_id)
-        query.addBindValue(self.equipo_visitante_id)
+        query.addBindValue(partido_id)
         
         if query.exec() and query.next():
-            return query.value(0) > 0
-        return False
-        """Actualiza el conteo de goles del partido."""
-        if not self.id:
-            return
+            return (query.value(0), query.value(1), query.value(2) or 0, query.value(3) or 0)
+        return None
+    
+    @staticmethod
+    def _sumar_a_clasificacion(query: QSqlQuery, local_id: int, visitante_id: int,
+                               goles_local: int, goles_visitante: int, signo: int):
+        """
+        Suma (signo=1) o resta (signo=-1) un resultado a la clasificación de ambos equipos.
         
-        query = QSqlQuery()
+        Raises:
+            Exception: Si la actualización falla
+        """
         query.prepare("""
-            SELECT ep.equipo_id, COUNT(g.id)
-            FROM goles g
-            INNER JOIN equipo_participante ep ON g.participante_id = ep.participante_id
-            WHERE g.partido_id = ? 
-            GROUP BY ep.equipo_id
+            INSERT INTO clasificacion (equipo_id, pj, pg, pe, pp, gf, gc, dg, pts)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(equipo_id) DO UPDATE SET
+                pj = pj + excluded.pj, pg = pg + excluded.pg,
+                pe = pe + excluded.pe, pp = pp + excluded.pp,
+                gf = gf + excluded.gf, gc = gc + excluded.gc,
+                dg = dg + excluded.dg, pts = pts + excluded.pts
         """)
-        query.addBindValue(self.id)
         
-        if query.exec():
-            while query.next():
-                equipo_id = query.value(0)
-                count = query.value(1) or 0
-                
-                # Determinar si es local o visitante
-                if equipo_id == self.equipo_local_id:
-                    self.goles_local = count
-                elif equipo_id == self.equipo_visitante_id:
-                    self.goles_visitante = count
+        for equipo_id, gf, gc in ((local_id, goles_local, goles_visitante),
+                                  (visitante_id, goles_visitante, goles_local)):
+            if gf > gc:
+                pts = config.PUNTOS_VICTORIA
+            elif gf == gc:
+                pts = config.PUNTOS_EMPATE
+            else:
+                pts = config.PUNTOS_DERROTA
+            
+            query.addBindValue(equipo_id)
+            for valor in (1, int(gf > gc), int(gf == gc), int(gf < gc), gf, gc, gf - gc, pts):
+                query.addBindValue(valor * signo)
+            if not query.exec():
+                raise Exception(f"Error actualizando la clasificación: {query.lastError().text()}")
     
-    def obtener_goles_por_equipo(self) -> Tuple[int, int]:
+    def _equipo_del_participante(self, query: QSqlQuery, participante_id: int,
+                                 equipo_id: Optional[int] = None) -> Optional[int]:
         """
-        Obtiene los goles de cada equipo.
+        Obtiene el equipo del partido con el que juega un participante.
         
+        Args:
+            query: QSqlQuery a reutilizar
+            participante_id: ID del participante
+            equipo_id: Equipo indicado por el usuario, que solo se comprueba
+            
         Returns:
-            Tupla: (goles_local, goles_visitante)
+            ID del equipo (el local si está en ambos y no se indica) o None si no juega el partido
         """
-        self._actualizar_goles()
-        return (self.goles_local, self.goles_visitante)
+        if equipo_id is not None:
+            if equipo_id not in (self.equipo_local_id, self.equipo_visitante_id):
+                return None
+            candidatos = (equipo_id, equipo_id)
+        else:
+            candidatos = (self.equipo_local_id, self.equipo_visitante_id)
+        
+        query.prepare("""
+            SELECT equipo_id FROM equipo_participante 
+            WHERE participante_id = ? AND equipo_id IN (?, ?)
+            ORDER BY equipo_id = ? DESC
+            LIMIT 1
+        """)
+        query.addBindValue(participante_id)
+        query.addBindValue(candidatos[0])
+        query.addBindValue(candidatos[1])
+        query.addBindValue(self.equipo_local_id)
+        
+        if query.exec() and query.next():
+            return query.value(0)
+        return None
     
-    def _actualizar_goles(self):
+    def obtener_goles_por_equipo(self, db: QSqlDatabase = None) -> Tuple[int, int]:
         """
-        Actualiza el conteo de goles desde la base de datos.
+        Cuenta los goles registrados de cada equipo.
+        No modifica el partido: el resultado guardado (goles_local,
+        goles_visitante) puede no coincidir con los goles registrados, p. ej.
+        si se finalizó introduciendo el resultado a mano.
+        
+        Args:
+            db: Conexión a usar (por defecto la del hilo actual)
+        
+        Returns:
+            Tupla: (goles_local, goles_visitante)
         """
         if not self.id:
-            return
+            return (self.goles_local, self.goles_visitante)
             
-        query = QSqlQuery()
+        # Cada gol guarda su equipo: basta con el índice (partido_id, equipo_id)
+        query = crear_query(db)
         query.prepare("""
             SELECT 
-                COUNT(CASE WHEN ep.equipo_id = ? THEN 1 END) as goles_local,
-                COUNT(CASE WHEN ep.equipo_id = ? THEN 1 END) as goles_visitante
-            FROM goles g
-            JOIN participantes p ON g.participante_id = p.id
-            JOIN equipo_participante ep ON ep.participante_id = p.id
-            WHERE g.partido_id = ? AND g.partido_id IS NOT NULL
+                COUNT(CASE WHEN equipo_id = ? THEN 1 END) as goles_local,
+                COUNT(CASE WHEN equipo_id = ? THEN 1 END) as goles_visitante
+            FROM goles
+            WHERE partido_id = ?
         """)
         query.addBindValue(self.equipo_local_id)
         query.addBindValue(self.equipo_visitante_id)
         query.addBindValue(self.id)
         
         if query.exec() and query.next():
-            self.goles_local = query.value(0) or 0
-            self.goles_visitante = query.value(1) or 0
+            return (query.value(0) or 0, query.value(1) or 0)
+        return (0, 0)
     
     def obtener_ganador(self) -> Optional[int]:
         """
@@ -281,17 +531,24 @@ class Partido:
         return None  # Empate
     
     @staticmethod
-    def obtener_por_id(partido_id: int) -> Optional['Partido']:
+    def obtener_por_id(partido_id: int, db: QSqlDatabase = None) -> Optional['Partido']:
         """
-        Obtiene un partido por su ID.
+        Obtiene un partido por su ID (de la caché de entidades si está activa).
         
         Args:
             partido_id: ID del partido
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             Partido o None
         """
-        query = QSqlQuery()
+        return cache_entidades.obtener(Partido, partido_id,
+                                       lambda: Partido._leer_por_id(partido_id, db), db)
+    
+    @staticmethod
+    def _leer_por_id(partido_id: int, db: QSqlDatabase = None) -> Optional['Partido']:
+        """Lee un partido de la base de datos."""
+        query = crear_query(db)
         query.prepare("""
             SELECT id, equipo_local_id, equipo_visitante_id, arbitro_id, 
                    fecha_hora, eliminatoria, goles_local, goles_visitante, finalizado
@@ -314,19 +571,21 @@ class Partido:
         return None
     
     @staticmethod
-    def obtener_todos(eliminatoria: str = "", solo_pendientes: bool = False) -> list['Partido']:
+    def obtener_todos(eliminatoria: str = "", solo_pendientes: bool = False,
+                      db: QSqlDatabase = None) -> list['Partido']:
         """
         Obtiene todos los partidos con filtros opcionales.
         
         Args:
             eliminatoria: Filtrar por eliminatoria ('', 'Octavos', 'Cuartos', 'Semifinal', 'Final')
             solo_pendientes: Si True, solo retorna partidos no finalizados
+            db: Conexión a usar (por defecto la del hilo actual)
             
         Returns:
             Lista de Partido
         """
         partidos = []
-        query = QSqlQuery()
+        query = crear_query(db)
         
         sql = """
             SELECT id, equipo_local_id, equipo_visitante_id, arbitro_id, 
@@ -363,3 +622,52 @@ class Partido:
                 ))
         
         return partidos
+
+    @staticmethod
+    def reconstruir_clasificacion(db: QSqlDatabase = None) -> bool:
+        """
+        Recalcula desde cero la tabla de clasificación a partir de los partidos finalizados.
+        
+        Partido.guardar/eliminar la mantienen al día; esto solo hace falta para
+        reparar datos modificados fuera de la aplicación o tras cambiar los
+        puntos por resultado en config.py.
+        
+        Args:
+            db: Conexión a usar (por defecto la del hilo actual)
+        
+        Returns:
+            bool: True si se reconstruyó correctamente
+        """
+        query = crear_query(db)
+        try:
+            with transaccion(db):
+                if not query.exec("DELETE FROM clasificacion"):
+                    raise Exception(query.lastError().text())
+                
+                query.prepare("""
+                    INSERT INTO clasificacion (equipo_id, pj, pg, pe, pp, gf, gc, dg, pts)
+                    SELECT equipo_id, COUNT(*), SUM(gf > gc), SUM(gf = gc), SUM(gf < gc),
+                           SUM(gf), SUM(gc), SUM(gf) - SUM(gc),
+                           SUM(CASE WHEN gf > gc THEN ? WHEN gf = gc THEN ? ELSE ? END)
+                    FROM (
+                        SELECT equipo_local_id AS equipo_id, goles_local AS gf, goles_visitante AS gc
+                        FROM partidos WHERE finalizado = 1
+                        UNION ALL
+                        SELECT equipo_visitante_id, goles_visitante, goles_local
+                        FROM partidos WHERE finalizado = 1
+                    )
+                    GROUP BY equipo_id
+                """)
+                query.addBindValue(config.PUNTOS_VICTORIA)
+                query.addBindValue(config.PUNTOS_EMPATE)
+                query.addBindValue(config.PUNTOS_DERROTA)
+                if not query.exec():
+                    raise Exception(query.lastError().text())
+                
+                if not query.exec("INSERT OR IGNORE INTO clasificacion (equipo_id) SELECT id FROM equipos"):
+                    raise Exception(query.lastError().text())
+                cache_consultas.marcar_escritura(("clasificacion",), db)
+            return True
+        except Exception as e:
+            print(f"Error reconstruyendo la clasificación: {e}")
+            return False
@@ -3,6 +3,12 @@ Configuración de idioma para la aplicación
 Archivo centralizado para gestionar el idioma de toda la app
 """
 
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
 # Idioma actual de la aplicación ('es' para español, 'en' para inglés)
 CURRENT_LANGUAGE = 'es'
 
@@ -12,6 +18,15 @@ AVAILABLE_LANGUAGES = {
     'en': 'English'
 }
 
+# Carpeta de catálogos externos: un archivo <código>.json por idioma, con
+# {"name": "Français", "translations": {"Start": "Démarrer", ...}}.
+# Un idioma nuevo solo necesita su archivo; uno existente puede completar
+# o corregir las traducciones del código
+CATALOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'catalogs')
+
+_catalog_files = None  # código -> ruta del catálogo externo (se busca una vez)
+_external_languages = {}  # código -> nombre de los idiomas que solo tienen catálogo externo
+
 def set_language(language_code: str):
     """
     Cambia el idioma actual de la aplicación.
@@ -20,7 +35,7 @@ def set_language(language_code: str):
         language_code: Código de idioma ('es' o 'en')
     """
     global CURRENT_LANGUAGE
-    if language_code in AVAILABLE_LANGUAGES:
+    if language_code in AVAILABLE_LANGUAGES or language_code in _find_catalogs():
         CURRENT_LANGUAGE = language_code
         return True
     return False
@@ -41,4 +56,52 @@ def get_available_languages() -> dict:
     Returns:
         dict: Diccionario con códigos y nombres de idiomas
     """
-    return AVAILABLE_LANGUAGES.copy()
+    _find_catalogs()
+    languages = AVAILABLE_LANGUAGES.copy()
+    for code, name in _external_languages.items():
+        languages.setdefault(code, name)
+    return languages
+
+def catalog_path(language_code: str):
+    """
+    Retorna la ruta del catálogo externo de un idioma.
+    
+    Args:
+        language_code: Código de idioma
+    
+    Returns:
+        str: Ruta del archivo .json, o None si el idioma no tiene catálogo externo
+    """
+    return _find_catalogs().get(language_code)
+
+def _find_catalogs() -> dict:
+    """Busca los catálogos externos la primera vez que se necesitan."""
+    global _catalog_files
+    if _catalog_files is None:
+        _catalog_files = {}
+        try:
+            names = sorted(os.listdir(CATALOG_DIR))
+        except OSError:
+            names = []
+        for file_name in names:
+            code, extension = os.path.splitext(file_name)
+            if extension != '.json':
+                continue
+            path = os.path.join(CATALOG_DIR, file_name)
+            if code not in AVAILABLE_LANGUAGES:
+                # Idioma nuevo: se lee su nombre para el selector (y se descarta si no es válido)
+                name = _read_language_name(path)
+                if name is None:
+                    continue
+                _external_languages[code] = name or code
+            _catalog_files[code] = path
+    return _catalog_files
+
+def _read_language_name(path: str):
+    """Lee el nombre del idioma de un catálogo externo ('' si no lo indica, None si no es válido)."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f).get('name') or ''
+    except (OSError, ValueError, AttributeError) as e:
+        logger.warning(f"Catálogo de idioma no válido {path}: {e}")
+        return None
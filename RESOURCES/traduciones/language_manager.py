@@ -5,6 +5,7 @@ Proporciona un sistema de señales para notificar a todas las vistas cuando camb
 
 from PySide6.QtCore import QObject, Signal
 from .config_idioma import set_language, get_language
+from .translations import invalidate_translator
 
 
 class LanguageManager(QObject):
@@ -39,6 +40,8 @@ class LanguageManager(QObject):
             language_code: Código de idioma ('es' o 'en')
         """
         if set_language(language_code):
+            # Las vistas traducen al recibir la señal: el catálogo activo ya debe ser el nuevo
+            invalidate_translator()
             self.language_changed.emit(language_code)
     
     def get_language(self) -> str:
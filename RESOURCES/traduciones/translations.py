@@ -1,7 +1,22 @@
 """
 Sistema de traducciones manual para la aplicación
+Cada idioma se compila la primera vez que se usa en un catálogo (las
+traducciones de TRANSLATIONS más las de su archivo externo, si lo tiene) que
+queda en caché; translate() consulta directamente el catálogo del idioma
+activo hasta que LanguageManager.set_language lo invalida.
 """
 
+import json
+import logging
+from typing import Iterable, List
+
+try:
+    from . import config_idioma
+except ImportError:  # Importado como módulo suelto, fuera del paquete
+    config_idioma = None
+
+logger = logging.getLogger(__name__)
+
 TRANSLATIONS = {
     'es': {
         # Tournament Window
@@ -93,6 +108,8 @@ TRANSLATIONS = {
         'Results': 'Resultados',
         'Filter by': 'Filtrar por',
         'All': 'Todas',
+        'Liga': 'Liga',
+        'Previa': 'Previa',
         'Octavos': 'Octavos',
         'Cuartos': 'Cuartos',
         'Semifinal': 'Semifinal',
@@ -149,6 +166,17 @@ TRANSLATIONS = {
         'Knockouts': 'Eliminatorias',
         'Winner': 'Ganador',
         'vs': 'vs',
+        
+        # Live Matches
+        'Live Matches': 'Partidos en Juego',
+        'Last events': 'Últimos eventos',
+        'Match': 'Partido',
+        'Time': 'Tiempo',
+        'Score': 'Marcador',
+        'Card Local': 'Tarjeta Local',
+        'Card Visitor': 'Tarjeta Visitante',
+        'Yellow': 'Amarilla',
+        'Red': 'Roja',
     },
     'en': {
         # Tournament Window
@@ -242,6 +270,8 @@ TRANSLATIONS = {
         'Results': 'Results',
         'Filter by': 'Filter by',
         'All': 'All',
+        'Liga': 'League',
+        'Previa': 'Qualifying Round',
         'Octavos': 'Round of 16',
         'Cuartos': 'Quarterfinals',
         'Semifinal': 'Semifinals',
@@ -298,9 +328,62 @@ TRANSLATIONS = {
         'Knockouts': 'Knockouts',
         'Winner': 'Winner',
         'vs': 'vs',
+        
+        # Live Matches
+        'Live Matches': 'Live Matches',
+        'Last events': 'Last events',
+        'Match': 'Match',
+        'Time': 'Time',
+        'Score': 'Score',
+        'Card Local': 'Card Local',
+        'Card Visitor': 'Card Visitor',
+        'Yellow': 'Yellow',
+        'Red': 'Red',
     }
 }
 
+_catalogs = {}  # Código de idioma -> catálogo compilado
+_active_catalog = None  # Catálogo del idioma actual (None: hay que resolverlo)
+
+
+def load_catalog(language: str) -> dict:
+    """
+    Devuelve el catálogo compilado de un idioma, cargándolo la primera vez.
+    
+    Args:
+        language: Código de idioma
+    
+    Returns:
+        Diccionario texto -> traducción (vacío si el idioma no existe)
+    """
+    catalog = _catalogs.get(language)
+    if catalog is None:
+        catalog = dict(TRANSLATIONS.get(language, {}))
+        path = config_idioma.catalog_path(language) if config_idioma else None
+        if path:
+            try:
+                with open(path, encoding='utf-8') as f:
+                    catalog.update(json.load(f).get('translations', {}))
+            except (OSError, ValueError, AttributeError, TypeError) as e:
+                logger.warning(f"No se pudo cargar el catálogo {path}: {e}")
+        _catalogs[language] = catalog
+    return catalog
+
+
+def invalidate_translator():
+    """Olvida el catálogo activo; el próximo translate() usa el idioma configurado."""
+    global _active_catalog
+    _active_catalog = None
+
+
+def _current_catalog() -> dict:
+    """Catálogo del idioma configurado en config_idioma.py."""
+    global _active_catalog
+    if _active_catalog is None:
+        _active_catalog = load_catalog(config_idioma.get_language() if config_idioma else 'es')
+    return _active_catalog
+
+
 def translate(text: str, language: str = None) -> str:
     """
     Traduce un texto al idioma especificado.
@@ -313,15 +396,25 @@ def translate(text: str, language: str = None) -> str:
     Returns:
         Texto traducido o el original si no se encuentra la traducción
     """
-    # Si no se especifica idioma, usar el configurado globalmente
     if language is None:
-        try:
-            from .config_idioma import get_language
-            language = get_language()
-        except ImportError:
-            language = 'es'  # Idioma por defecto
+        catalog = _active_catalog
+        if catalog is None:
+            catalog = _current_catalog()
+    else:
+        catalog = load_catalog(language)
+    return catalog.get(text, text)
     
-    if language not in TRANSLATIONS:
-        return text
     
-    return TRANSLATIONS[language].get(text, text)
+def translate_many(texts: Iterable[str], language: str = None) -> List[str]:
+    """
+    Traduce una lista de textos de una vez (p. ej. las cabeceras de una tabla).
+
+    Args:
+        texts: Textos a traducir
+        language: Idioma. Si es None, usa el idioma configurado.
+    
+    Returns:
+        Lista con las traducciones, en el mismo orden
+    """
+    get = (_current_catalog() if language is None else load_catalog(language)).get
+    return [get(text, text) for text in texts]
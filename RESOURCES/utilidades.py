@@ -2,7 +2,7 @@
 Utilidades y funciones auxiliares para la aplicación.
 """
 
-from PySide6.QtSql import QSqlQuery
+from MODELS.database import crear_query
 from datetime import datetime, date
 from typing import Optional
 
@@ -17,13 +17,18 @@ class Validador:
     
     @staticmethod
     def validar_fecha(fecha_str: str, formato: str = "yyyy-MM-dd") -> bool:
-        """Valida que la fecha sea válida."""
+        """Valida que la fecha sea válida (formato al estilo de Qt: yyyy, MM, dd)."""
         try:
-            datetime.strptime(fecha_str, formato.replace("y", "%Y").replace("M", "%m").replace("d", "%d"))
+            datetime.strptime(fecha_str, Validador.formato_strptime(formato))
             return True
-        except ValueError:
+        except (TypeError, ValueError):
             return False
     
+    @staticmethod
+    def formato_strptime(formato: str) -> str:
+        """Convierte un formato de fecha de Qt (yyyy-MM-dd) al de strptime (%Y-%m-%d)."""
+        return formato.replace("yyyy", "%Y").replace("MM", "%m").replace("dd", "%d")
+    
     @staticmethod
     def validar_email(email: str) -> bool:
         """Valida formato de email (básico)."""
@@ -49,7 +54,7 @@ class EstadisticasAuxiliar:
     @staticmethod
     def obtener_promedio_goles_equipo(equipo_id: int) -> float:
         """Calcula el promedio de goles por partido de un equipo."""
-        query = QSqlQuery()
+        query = crear_query()
         query.prepare("""
             SELECT 
                 SUM(CASE WHEN equipo_local_id = ? THEN goles_local WHEN equipo_visitante_id = ? THEN goles_visitante ELSE 0 END) as goles,
@@ -70,7 +75,7 @@ class EstadisticasAuxiliar:
     @staticmethod
     def obtener_promedio_goles_recibidos(equipo_id: int) -> float:
         """Calcula el promedio de goles recibidos por partido de un equipo."""
-        query = QSqlQuery()
+        query = crear_query()
         query.prepare("""
             SELECT 
                 SUM(CASE WHEN equipo_local_id = ? THEN goles_visitante WHEN equipo_visitante_id = ? THEN goles_local ELSE 0 END) as goles,
@@ -91,7 +96,7 @@ class EstadisticasAuxiliar:
     @staticmethod
     def obtener_efectividad_goleador(participante_id: int) -> float:
         """Calcula la efectividad de un goleador (goles por partido)."""
-        query = QSqlQuery()
+        query = crear_query()
         query.prepare("""
             SELECT COUNT(*) as goles FROM goles
             WHERE participante_id = ?
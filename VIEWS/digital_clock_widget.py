@@ -3,10 +3,11 @@ Vista del componente de Reloj Digital
 Widget reutilizable que carga su interfaz desde un archivo .ui
 """
 from PySide6.QtWidgets import QWidget, QVBoxLayout
-from PySide6.QtCore import Signal, QTimer, QTime, Qt
+from PySide6.QtCore import Signal, QTime, Qt
 from PySide6.QtUiTools import QUiLoader
 from PySide6.QtCore import QFile, QIODevice
 from RESOURCES.traduciones.translations import translate
+from COMPONENTS.planificador_ticks import planificador_ticks
 import os
 
 
@@ -27,10 +28,6 @@ class DigitalClockWidget(QWidget):
         # Cargar la interfaz desde el archivo .ui
         self.load_ui()
         
-        # Timer interno para actualizar el reloj
-        self.internal_timer = QTimer(self)
-        self.internal_timer.timeout.connect(self._on_timer_tick)
-        
         # Referencias a los widgets del UI
         self.setup_widget_references()
         
@@ -117,17 +114,22 @@ class DigitalClockWidget(QWidget):
             self.btnReset.setEnabled(reset)
     
     def start_internal_timer(self):
-        """Inicia el timer interno (actualización cada segundo)"""
-        if not self.internal_timer.isActive():
-            self.internal_timer.start(1000)  # 1 segundo
+        """Suscribe el widget a los ticks del planificador compartido (cada segundo)"""
+        if not planificador_ticks.suscrito(self):
+            planificador_ticks.suscribir(self, comprobar=self._on_check_tick,
+                                         refrescar=self._on_timer_tick, widget=self)
     
     def stop_internal_timer(self):
-        """Detiene el timer interno"""
-        if self.internal_timer.isActive():
-            self.internal_timer.stop()
+        """Cancela la suscripción a los ticks"""
+        planificador_ticks.cancelar(self)
+    
+    def _on_check_tick(self):
+        """Callback de cada tick, aunque el widget esté oculto (fin del temporizador)"""
+        if hasattr(self, 'controller'):
+            self.controller.check_time()
     
     def _on_timer_tick(self):
-        """Callback interno cuando el timer hace tick"""
+        """Callback del tick cuando el widget está a la vista: refresca el display"""
         if hasattr(self, 'controller'):
             self.controller.on_timer_tick()
     
@@ -2,10 +2,14 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                                QTableWidget, QTableWidgetItem, QHeaderView,
                                QLabel, QLineEdit, QComboBox, QMessageBox,
                                QDialog, QFormLayout, QDialogButtonBox, QGroupBox,
-                               QListWidget, QSplitter)
+                               QListWidget, QSplitter, QFileDialog, QInputDialog, QProgressDialog)
 from PySide6.QtCore import Qt
-from PySide6.QtSql import QSqlQuery
+from MODELS.database import crear_query
+from MODELS import eventos
+from MODELS.eventos import bus_cambios
+from COMPONENTS.tabla_virtual import TablaVirtual
 from CONTROLLERS.equipos_controller import EquiposController
+from CONTROLLERS.importador_csv import ImportadorCSV, TIPOS
 
 class EquiposView(QWidget):
     """Vista principal para gestión de equipos."""
@@ -13,6 +17,7 @@ class EquiposView(QWidget):
     def __init__(self):
         super().__init__()
         self.init_ui()
+        bus_cambios.datos_cambiados.connect(self.aplicar_cambio)
         self.cargar_equipos()
         
     def init_ui(self):
@@ -47,10 +52,15 @@ class EquiposView(QWidget):
         self.btn_refrescar.setToolTip("Recargar lista de equipos")
         self.btn_refrescar.clicked.connect(self.cargar_equipos)
         
+        self.btn_importar = QPushButton("📥 Importar CSV")
+        self.btn_importar.setToolTip("Importar equipos, participantes o plantillas desde un fichero CSV")
+        self.btn_importar.clicked.connect(self.importar_csv)
+        
         toolbar_layout.addWidget(self.btn_nuevo)
         toolbar_layout.addWidget(self.btn_editar)
         toolbar_layout.addWidget(self.btn_eliminar)
         toolbar_layout.addWidget(self.btn_refrescar)
+        toolbar_layout.addWidget(self.btn_importar)
         toolbar_layout.addStretch()
         
         layout.addLayout(toolbar_layout)
@@ -67,15 +77,11 @@ class EquiposView(QWidget):
         equipos_label.setStyleSheet("font-weight: bold; font-size: 11pt;")
         equipos_layout.addWidget(equipos_label)
         
-        self.tabla_equipos = QTableWidget()
-        self.tabla_equipos.setColumnCount(4)
-        self.tabla_equipos.setHorizontalHeaderLabels(["ID", "Nombre", "Curso", "Color"])
+        self.tabla_equipos = TablaVirtual(["ID", "Nombre", "Curso", "Color"])
         self.tabla_equipos.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
-        self.tabla_equipos.setSelectionBehavior(QTableWidget.SelectRows)
-        self.tabla_equipos.setSelectionMode(QTableWidget.SingleSelection)
-        self.tabla_equipos.setEditTriggers(QTableWidget.NoEditTriggers)
         self.tabla_equipos.hideColumn(0)  # Ocultar ID
-        self.tabla_equipos.itemSelectionChanged.connect(self.equipo_seleccionado)
+        self.tabla_equipos.sortByColumn(1, Qt.AscendingOrder)
+        self.tabla_equipos.seleccion_cambiada.connect(self.equipo_seleccionado)
         equipos_layout.addWidget(self.tabla_equipos)
         
         splitter.addWidget(equipos_widget)
@@ -109,29 +115,56 @@ class EquiposView(QWidget):
         
     def cargar_equipos(self):
         """Carga los equipos desde la base de datos."""
-        self.tabla_equipos.setRowCount(0)
-        
-        query = QSqlQuery()
+        query = crear_query()
         query.exec("""
             SELECT id, nombre, curso, color_camiseta 
             FROM equipos 
             ORDER BY nombre
         """)
         
-        row = 0
+        columnas = ([], [], [], [])
         while query.next():
-            self.tabla_equipos.insertRow(row)
-            self.tabla_equipos.setItem(row, 0, QTableWidgetItem(str(query.value(0))))
-            self.tabla_equipos.setItem(row, 1, QTableWidgetItem(query.value(1)))
-            self.tabla_equipos.setItem(row, 2, QTableWidgetItem(query.value(2)))
-            self.tabla_equipos.setItem(row, 3, QTableWidgetItem(query.value(3)))
-            row += 1
+            for i, columna in enumerate(columnas):
+                columna.append(query.value(i))
+        self.tabla_equipos.modelo.establecer_columnas(list(columnas))
             
         self.lista_jugadores.clear()
         
+    def aplicar_cambio(self, cambio):
+        """
+        Actualiza solo lo afectado por un cambio publicado en el bus.
+        
+        Args:
+            cambio: eventos.Cambio
+        """
+        if cambio.entidad == eventos.EQUIPO:
+            if cambio.en_lote:
+                self.cargar_equipos()
+            else:
+                self.actualizar_equipo(cambio.id)
+        elif cambio.entidad == eventos.PLANTILLA:
+            if self.tabla_equipos.valor_actual(0) in cambio.ids:
+                self.cargar_jugadores_equipo()
+        elif cambio.entidad in (eventos.PARTICIPANTE, eventos.GOL):
+            # Nombre, posición o goles de un jugador: solo se ve en la plantilla abierta
+            if self.tabla_equipos.fila_actual() >= 0:
+                self.cargar_jugadores_equipo()
+    
+    def actualizar_equipo(self, equipo_id):
+        """Vuelve a leer un equipo y actualiza, añade o quita su fila."""
+        query = crear_query()
+        query.prepare("SELECT id, nombre, curso, color_camiseta FROM equipos WHERE id = ?")
+        query.addBindValue(equipo_id)
+        
+        modelo = self.tabla_equipos.modelo
+        if query.exec() and query.next():
+            modelo.actualizar_fila(equipo_id, tuple(query.value(i) for i in range(4)))
+        else:
+            modelo.eliminar_fila(equipo_id)
+    
     def equipo_seleccionado(self):
         """Maneja la selección de un equipo."""
-        has_selection = self.tabla_equipos.currentRow() >= 0
+        has_selection = self.tabla_equipos.fila_actual() >= 0
         self.btn_editar.setEnabled(has_selection)
         self.btn_eliminar.setEnabled(has_selection)
         
@@ -142,18 +175,17 @@ class EquiposView(QWidget):
         """Carga los jugadores del equipo seleccionado."""
         self.lista_jugadores.clear()
         
-        selected_row = self.tabla_equipos.currentRow()
-        if selected_row < 0:
+        equipo_id = self.tabla_equipos.valor_actual(0)
+        if equipo_id is None:
             return
-            
-        equipo_id = self.tabla_equipos.item(selected_row, 0).text()
         
-        query = QSqlQuery()
+        query = crear_query()
         query.prepare("""
             SELECT p.nombre, p.posicion, 
-                   COALESCE((SELECT COUNT(*) FROM goles WHERE participante_id = p.id), 0) as goles
+                   COALESCE(s.goles, 0) as goles
             FROM participantes p
             INNER JOIN equipo_participante ep ON p.id = ep.participante_id
+            LEFT JOIN estadisticas_participante s ON p.id = s.participante_id
             WHERE ep.equipo_id = ? AND p.es_jugador = 1 AND p.activo = 1
             ORDER BY p.nombre
         """)
@@ -177,30 +209,26 @@ class EquiposView(QWidget):
         """Abre el diálogo para crear un nuevo equipo."""
         dialog = EquipoDialog(self)
         if dialog.exec() == QDialog.Accepted:
-            self.cargar_equipos()
             QMessageBox.information(self, "Éxito", "Equipo creado correctamente")
             
     def editar_equipo(self):
         """Abre el diálogo para editar el equipo seleccionado."""
-        selected_row = self.tabla_equipos.currentRow()
-        if selected_row < 0:
+        equipo_id = self.tabla_equipos.valor_actual(0)
+        if equipo_id is None:
             return
-            
-        equipo_id = int(self.tabla_equipos.item(selected_row, 0).text())
         
         dialog = EquipoDialog(self, equipo_id)
         if dialog.exec() == QDialog.Accepted:
-            self.cargar_equipos()
             QMessageBox.information(self, "Éxito", "Equipo actualizado correctamente")
             
     def eliminar_equipo(self):
         """Elimina el equipo seleccionado."""
-        selected_row = self.tabla_equipos.currentRow()
+        selected_row = self.tabla_equipos.fila_actual()
         if selected_row < 0:
             return
             
-        equipo_id = self.tabla_equipos.item(selected_row, 0).text()
-        equipo_nombre = self.tabla_equipos.item(selected_row, 1).text()
+        equipo_id = self.tabla_equipos.modelo.valor(selected_row, 0)
+        equipo_nombre = self.tabla_equipos.modelo.valor(selected_row, 1)
         
         reply = QMessageBox.question(
             self,
@@ -211,28 +239,59 @@ class EquiposView(QWidget):
         )
         
         if reply == QMessageBox.Yes:
-            query = QSqlQuery()
-            query.prepare("UPDATE equipos SET activo = 0 WHERE id = ?")
-            query.addBindValue(equipo_id)
-            
-            if query.exec():
-                self.cargar_equipos()
+            if EquiposController.eliminar_equipo(equipo_id):
                 QMessageBox.information(self, "Éxito", "Equipo eliminado correctamente")
             else:
-                QMessageBox.warning(self, "Error", f"No se pudo eliminar el equipo: {query.lastError().text()}")
+                QMessageBox.warning(self, "Error", "No se pudo eliminar el equipo")
                 
     def asignar_jugador(self):
         """Asigna un jugador al equipo seleccionado."""
-        selected_row = self.tabla_equipos.currentRow()
-        if selected_row < 0:
+        equipo_id = self.tabla_equipos.valor_actual(0)
+        if equipo_id is None:
             QMessageBox.warning(self, "Advertencia", "Seleccione un equipo primero")
             return
-            
-        equipo_id = self.tabla_equipos.item(selected_row, 0).text()
         
+        # La plantilla se recarga con el cambio que publica el controlador
         dialog = AsignarJugadorDialog(self, equipo_id)
-        if dialog.exec() == QDialog.Accepted:
-            self.cargar_jugadores_equipo()
+        dialog.exec()
+
+    def importar_csv(self):
+        """Importa equipos, participantes o plantillas desde un CSV (ver CONTROLLERS/importador_csv.py)."""
+        ruta, _ = QFileDialog.getOpenFileName(self, "Importar CSV", "", "Ficheros CSV (*.csv);;Todos (*)")
+        if not ruta:
+            return
+        tipo, ok = QInputDialog.getItem(self, "Importar CSV", "Contenido del fichero:", list(TIPOS), 0, False)
+        if not ok:
+            return
+        
+        progreso = QProgressDialog("Importando...", "Cancelar", 0, 100, self)
+        progreso.setWindowModality(Qt.WindowModal)
+        progreso.setMinimumDuration(500)
+        
+        def avisar(resultado, fraccion):
+            progreso.setLabelText(f"{resultado.importadas} importadas, {resultado.rechazadas} rechazadas")
+            progreso.setValue(int(fraccion * 100))
+            return not progreso.wasCanceled()
+        
+        # Las vistas se actualizan con los cambios en lote que publican los modelos
+        try:
+            resultado = ImportadorCSV(tipo, progreso=avisar, ruta_rechazos=ruta + ".rechazos.csv").importar(ruta)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Error", f"No se pudo importar el fichero:\n{e}")
+            return
+        finally:
+            progreso.close()
+        
+        mensaje = (f"Filas leídas: {resultado.leidas}\n"
+                   f"Importadas: {resultado.importadas}\n"
+                   f"Rechazadas: {resultado.rechazadas} ({resultado.duplicadas} duplicadas)")
+        if resultado.asignaciones:
+            mensaje += f"\nAsignaciones a equipos: {resultado.asignaciones}"
+        if resultado.cancelada:
+            mensaje += "\n\nImportación cancelada (los lotes ya guardados se mantienen)"
+        if resultado.ruta_rechazos:
+            mensaje += f"\n\nFilas rechazadas guardadas en:\n{resultado.ruta_rechazos}"
+        QMessageBox.information(self, "Importación terminada", mensaje)
 
 
 class EquipoDialog(QDialog):
@@ -277,7 +336,7 @@ class EquipoDialog(QDialog):
         
     def cargar_datos(self):
         """Carga los datos del equipo a editar."""
-        query = QSqlQuery()
+        query = crear_query()
         query.prepare("SELECT nombre, curso, color_camiseta FROM equipos WHERE id = ?")
         query.addBindValue(self.equipo_id)
         query.exec()
@@ -299,31 +358,20 @@ class EquipoDialog(QDialog):
             QMessageBox.warning(self, "Error", "Todos los campos son obligatorios")
             return
             
-        query = QSqlQuery()
-        
+        # Se guarda a través del modelo, que publica el cambio para las vistas abiertas
         if self.equipo_id:
-            query.prepare("""
-                UPDATE equipos 
-                SET nombre = ?, curso = ?, color_camiseta = ?
-                WHERE id = ?
-            """)
-            query.addBindValue(nombre)
-            query.addBindValue(curso)
-            query.addBindValue(color)
-            query.addBindValue(self.equipo_id)
+            guardado = EquiposController.actualizar_equipo(self.equipo_id, nombre, curso, color) is not None
         else:
-            query.prepare("""
-                INSERT INTO equipos (nombre, curso, color_camiseta)
-                VALUES (?, ?, ?)
-            """)
-            query.addBindValue(nombre)
-            query.addBindValue(curso)
-            query.addBindValue(color)
-            
-        if query.exec():
+            try:
+                EquiposController.crear_equipo(nombre, curso, color)
+                guardado = True
+            except ValueError:
+                guardado = False
+        
+        if guardado:
             self.accept()
         else:
-            QMessageBox.warning(self, "Error", f"No se pudo guardar: {query.lastError().text()}")
+            QMessageBox.warning(self, "Error", "No se pudo guardar el equipo")
 
 
 class AsignarJugadorDialog(QDialog):
@@ -356,7 +404,7 @@ class AsignarJugadorDialog(QDialog):
         
     def cargar_jugadores_disponibles(self):
         """Carga jugadores que no están en el equipo."""
-        query = QSqlQuery()
+        query = crear_query()
         query.prepare("""
             SELECT id, nombre, posicion
             FROM participantes
@@ -391,15 +439,7 @@ class AsignarJugadorDialog(QDialog):
             
         jugador_id = current_item.data(Qt.UserRole)
         
-        query = QSqlQuery()
-        query.prepare("""
-            INSERT INTO equipo_participante (equipo_id, participante_id)
-            VALUES (?, ?)
-        """)
-        query.addBindValue(self.equipo_id)
-        query.addBindValue(jugador_id)
-        
-        if query.exec():
+        if EquiposController.asignar_jugador_a_equipo(self.equipo_id, jugador_id):
             self.accept()
         else:
-            QMessageBox.warning(self, "Error", f"No se pudo asignar: {query.lastError().text()}")
\ No newline at end of file
+            QMessageBox.warning(self, "Error", "No se pudo asignar el jugador")
\ No newline at end of file
@@ -90,8 +90,8 @@ class MainWindow(QMainWindow):
         """Abre la ventana de gestión de equipos."""
         if self.vista_equipos is None:
             self.vista_equipos = EquiposView()
+        # La vista se carga al crearla y después la mantiene al día el bus de cambios
         self.vista_equipos.show()
-        self.vista_equipos.cargar_equipos()
         self.ui.statusbar.showMessage("Gestión de Equipos abierta")
         
     def abrir_participantes(self):
@@ -99,7 +99,6 @@ class MainWindow(QMainWindow):
         if self.vista_participantes is None:
             self.vista_participantes = ParticipantesView()
         self.vista_participantes.show()
-        self.vista_participantes.cargar_participantes()
         self.ui.statusbar.showMessage("Gestión de Participantes abierta")
         
     def abrir_partidos(self):
@@ -107,7 +106,6 @@ class MainWindow(QMainWindow):
         if self.vista_partidos is None:
             self.vista_partidos = PartidosView()
         self.vista_partidos.show()
-        self.vista_partidos.cargar_partidos()
         self.ui.statusbar.showMessage("Gestión de Partidos abierta")
         
     def mostrar_creditos(self):
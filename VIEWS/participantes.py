@@ -4,7 +4,10 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                                QDialog, QFormLayout, QDialogButtonBox,
                                QCheckBox, QDateEdit, QTabWidget, QGroupBox)
 from PySide6.QtCore import Qt, QDate
-from PySide6.QtSql import QSqlQuery
+from MODELS.database import crear_query
+from MODELS import eventos
+from MODELS.eventos import bus_cambios
+from COMPONENTS.tabla_virtual import TablaVirtual
 from CONTROLLERS.participantes_controller import ParticipantesController
 
 class ParticipantesView(QWidget):
@@ -13,6 +16,7 @@ class ParticipantesView(QWidget):
     def __init__(self):
         super().__init__()
         self.init_ui()
+        bus_cambios.datos_cambiados.connect(self.aplicar_cambio)
         self.cargar_participantes()
         
     def init_ui(self):
@@ -70,17 +74,16 @@ class ParticipantesView(QWidget):
         tab_lista_layout = QVBoxLayout(tab_lista)
         tab_lista_layout.setContentsMargins(0, 10, 0, 0)
         
-        self.tabla_participantes = QTableWidget()
-        self.tabla_participantes.setColumnCount(6)
-        self.tabla_participantes.setHorizontalHeaderLabels([
-            "ID", "Nombre", "Curso", "Tipo", "Posición", "Estadísticas"
-        ])
+        # Columnas guardadas: id, nombre, curso, tipo, posición, goles, amarillas, rojas
+        # (las dos últimas solo se usan para el texto de "Estadísticas")
+        self.tabla_participantes = TablaVirtual(
+            ["ID", "Nombre", "Curso", "Tipo", "Posición", "Estadísticas"],
+            formatos={3: self.formato_tipo, 5: self.formato_estadisticas}
+        )
         self.tabla_participantes.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
-        self.tabla_participantes.setSelectionBehavior(QTableWidget.SelectRows)
-        self.tabla_participantes.setSelectionMode(QTableWidget.SingleSelection)
-        self.tabla_participantes.setEditTriggers(QTableWidget.NoEditTriggers)
         self.tabla_participantes.hideColumn(0)
-        self.tabla_participantes.itemSelectionChanged.connect(self.participante_seleccionado)
+        self.tabla_participantes.sortByColumn(1, Qt.AscendingOrder)
+        self.tabla_participantes.seleccion_cambiada.connect(self.participante_seleccionado)
         tab_lista_layout.addWidget(self.tabla_participantes)
         
         self.tabs.addTab(tab_lista, "📋 Lista General")
@@ -129,17 +132,39 @@ class ParticipantesView(QWidget):
         
     def cargar_participantes(self):
         """Carga los participantes desde la base de datos."""
-        self.tabla_participantes.setRowCount(0)
+        query = self._consulta_participantes()
+        
+        # Una lista por columna; el texto de cada celda se genera al pintarla
+        columnas = ([], [], [], [], [], [], [], [])
+        while query.next():
+            for i, columna in enumerate(columnas):
+                columna.append(query.value(i))
+        self.tabla_participantes.modelo.establecer_columnas(list(columnas))
+        
+        self.cargar_estadisticas()
+    
+    def _consulta_participantes(self, participante_id=None):
+        """
+        Ejecuta la consulta de la lista con el filtro actual.
         
+        Args:
+            participante_id: Si se indica, solo ese participante (para refrescar una fila)
+        
+        Returns:
+            QSqlQuery ejecutada, con las 8 columnas de la tabla
+        """
         filtro = self.combo_filtro.currentText()
         
-        query = QSqlQuery()
+        query = crear_query()
         sql = """
-            SELECT p.id, p.nombre, p.curso, p.posicion, p.es_jugador, p.es_arbitro,
-                   COALESCE((SELECT COUNT(*) FROM goles WHERE participante_id = p.id), 0) as goles,
-                   COALESCE((SELECT COUNT(*) FROM tarjetas WHERE participante_id = p.id AND tipo = 'amarilla'), 0) as amarillas,
-                   COALESCE((SELECT COUNT(*) FROM tarjetas WHERE participante_id = p.id AND tipo = 'roja'), 0) as rojas
+            SELECT p.id, p.nombre, p.curso,
+                   (p.es_jugador != 0) + 2 * (p.es_arbitro != 0) as tipo,
+                   COALESCE(NULLIF(p.posicion, ''), 'N/A') as posicion,
+                   COALESCE(s.goles, 0) as goles,
+                   COALESCE(s.amarillas, 0) as amarillas,
+                   COALESCE(s.rojas, 0) as rojas
             FROM participantes p
+            LEFT JOIN estadisticas_participante s ON p.id = s.participante_id
             WHERE p.activo = 1
         """
         
@@ -147,107 +172,92 @@ class ParticipantesView(QWidget):
             sql += " AND p.es_jugador = 1"
         elif filtro == "Solo Árbitros":
             sql += " AND p.es_arbitro = 1"
+        if participante_id is not None:
+            sql += " AND p.id = ?"
             
         sql += " ORDER BY p.nombre"
         
-        query.exec(sql)
+        query.prepare(sql)
+        if participante_id is not None:
+            query.addBindValue(participante_id)
+        query.exec()
+        return query
         
-        row = 0
-        while query.next():
-            self.tabla_participantes.insertRow(row)
-            
-            # ID
-            self.tabla_participantes.setItem(row, 0, QTableWidgetItem(str(query.value(0))))
-            
-            # Nombre
-            self.tabla_participantes.setItem(row, 1, QTableWidgetItem(query.value(1)))
-            
-            # Curso
-            self.tabla_participantes.setItem(row, 2, QTableWidgetItem(query.value(2)))
-            
-            # Tipo
-            es_jugador = query.value(4)
-            es_arbitro = query.value(5)
-            tipos = []
-            if es_jugador:
-                tipos.append("Jugador")
-            if es_arbitro:
-                tipos.append("Árbitro")
-            tipo_texto = ", ".join(tipos) if tipos else "N/A"
-            self.tabla_participantes.setItem(row, 3, QTableWidgetItem(tipo_texto))
-            
-            # Posición
-            posicion = query.value(3) or "N/A"
-            self.tabla_participantes.setItem(row, 4, QTableWidgetItem(posicion))
-            
-            # Estadísticas
-            goles = query.value(6)
-            amarillas = query.value(7)
-            rojas = query.value(8)
-            stats = f"⚽ {goles} | 🟨 {amarillas} | 🟥 {rojas}"
-            self.tabla_participantes.setItem(row, 5, QTableWidgetItem(stats))
-            
-            row += 1
+    def aplicar_cambio(self, cambio):
+        """
+        Actualiza solo las filas afectadas por un cambio publicado en el bus.
             
+        Args:
+            cambio: eventos.Cambio
+        """
+        if cambio.en_lote and cambio.entidad in (eventos.PARTICIPANTE, eventos.GOL, eventos.TARJETA):
+            # Escritura en lote: se recarga la lista una vez (con las estadísticas)
+            self.cargar_participantes()
+            return
+        if cambio.entidad == eventos.PARTICIPANTE:
+            participante_id = cambio.id
+        elif cambio.entidad in (eventos.GOL, eventos.TARJETA):
+            participante_id = cambio.datos['participante_id']
+        else:
+            return
+        
+        self.actualizar_participante(participante_id)
+        # Goleadores y tarjetas son un top 10: se vuelven a pedir en segundo plano
         self.cargar_estadisticas()
+    
+    def actualizar_participante(self, participante_id):
+        """Vuelve a leer un participante y actualiza, añade o quita su fila."""
+        query = self._consulta_participantes(participante_id)
+        modelo = self.tabla_participantes.modelo
+        if query.next():
+            modelo.actualizar_fila(participante_id, tuple(query.value(i) for i in range(8)))
+        else:
+            modelo.eliminar_fila(participante_id)
+    
+    def formato_tipo(self, tipo, fila):
+        """Texto de la columna Tipo (1 = jugador, 2 = árbitro, 3 = ambos)."""
+        tipos = []
+        if tipo & 1:
+            tipos.append("Jugador")
+        if tipo & 2:
+            tipos.append("Árbitro")
+        return ", ".join(tipos) if tipos else "N/A"
+    
+    def formato_estadisticas(self, goles, fila):
+        """Texto de la columna Estadísticas; ordena por goles."""
+        modelo = self.tabla_participantes.modelo
+        return f"⚽ {goles} | 🟨 {modelo.valor(fila, 6)} | 🟥 {modelo.valor(fila, 7)}"
         
     def cargar_estadisticas(self):
-        """Carga las estadísticas en las tablas correspondientes."""
-        # Goleadores
+        """
+        Carga las estadísticas en las tablas correspondientes.
+        Las consultas se hacen en el trabajador de BD.
+        """
+        ParticipantesController.obtener_maximos_goleadores_async(10, self.mostrar_goleadores)
+        ParticipantesController.obtener_mas_tarjetados_async(10, self.mostrar_tarjetados)
+    
+    def mostrar_goleadores(self, goleadores):
+        """Rellena la tabla de goleadores."""
         self.tabla_goleadores.setRowCount(0)
-        query = QSqlQuery()
-        query.exec("""
-            SELECT p.nombre, 
-                   COALESCE(e.nombre, 'Sin equipo') as equipo,
-                   COUNT(g.id) as total_goles
-            FROM participantes p
-            LEFT JOIN goles g ON p.id = g.participante_id
-            LEFT JOIN equipo_participante ep ON p.id = ep.participante_id
-            LEFT JOIN equipos e ON ep.equipo_id = e.id
-            WHERE p.activo = 1 AND p.es_jugador = 1
-            GROUP BY p.id, p.nombre, e.nombre
-            ORDER BY COUNT(g.id) DESC
-            LIMIT 10
-        """)
-        
-        row = 0
-        while query.next():
+        for row, jugador in enumerate(goleadores):
             self.tabla_goleadores.insertRow(row)
-            self.tabla_goleadores.setItem(row, 0, QTableWidgetItem(query.value(0)))
-            self.tabla_goleadores.setItem(row, 1, QTableWidgetItem(query.value(1)))
-            self.tabla_goleadores.setItem(row, 2, QTableWidgetItem(str(query.value(2))))
-            row += 1
-            
-        # Tarjetas
+            self.tabla_goleadores.setItem(row, 0, QTableWidgetItem(jugador['nombre']))
+            self.tabla_goleadores.setItem(row, 1, QTableWidgetItem(jugador['equipo']))
+            self.tabla_goleadores.setItem(row, 2, QTableWidgetItem(str(jugador['goles'])))
+        
+    def mostrar_tarjetados(self, tarjetados):
+        """Rellena la tabla de tarjetas."""
         self.tabla_tarjetas.setRowCount(0)
-        query.exec("""
-            SELECT p.nombre,
-                   COALESCE(e.nombre, 'Sin equipo') as equipo,
-                   SUM(CASE WHEN t.tipo = 'amarilla' THEN 1 ELSE 0 END) as amarillas,
-                   SUM(CASE WHEN t.tipo = 'roja' THEN 1 ELSE 0 END) as rojas
-            FROM participantes p
-            LEFT JOIN tarjetas t ON p.id = t.participante_id
-            LEFT JOIN equipo_participante ep ON p.id = ep.participante_id
-            LEFT JOIN equipos e ON ep.equipo_id = e.id
-            WHERE p.activo = 1 AND p.es_jugador = 1
-            GROUP BY p.id, p.nombre, e.nombre
-            ORDER BY SUM(CASE WHEN t.tipo = 'roja' THEN 1 ELSE 0 END) DESC, 
-                     SUM(CASE WHEN t.tipo = 'amarilla' THEN 1 ELSE 0 END) DESC
-            LIMIT 10
-        """)
-        
-        row = 0
-        while query.next():
+        for row, jugador in enumerate(tarjetados):
             self.tabla_tarjetas.insertRow(row)
-            self.tabla_tarjetas.setItem(row, 0, QTableWidgetItem(query.value(0)))
-            self.tabla_tarjetas.setItem(row, 1, QTableWidgetItem(query.value(1)))
-            self.tabla_tarjetas.setItem(row, 2, QTableWidgetItem(str(query.value(2))))
-            self.tabla_tarjetas.setItem(row, 3, QTableWidgetItem(str(query.value(3))))
-            row += 1
+            self.tabla_tarjetas.setItem(row, 0, QTableWidgetItem(jugador['nombre']))
+            self.tabla_tarjetas.setItem(row, 1, QTableWidgetItem(jugador['equipo']))
+            self.tabla_tarjetas.setItem(row, 2, QTableWidgetItem(str(jugador['amarillas'])))
+            self.tabla_tarjetas.setItem(row, 3, QTableWidgetItem(str(jugador['rojas'])))
             
     def participante_seleccionado(self):
         """Maneja la selección de un participante."""
-        has_selection = self.tabla_participantes.currentRow() >= 0
+        has_selection = self.tabla_participantes.fila_actual() >= 0
         self.btn_editar.setEnabled(has_selection)
         self.btn_eliminar.setEnabled(has_selection)
         
@@ -255,30 +265,26 @@ class ParticipantesView(QWidget):
         """Abre el diálogo para crear un nuevo participante."""
         dialog = ParticipanteDialog(self)
         if dialog.exec() == QDialog.Accepted:
-            self.cargar_participantes()
             QMessageBox.information(self, "Éxito", "Participante creado correctamente")
             
     def editar_participante(self):
         """Abre el diálogo para editar el participante seleccionado."""
-        selected_row = self.tabla_participantes.currentRow()
-        if selected_row < 0:
+        participante_id = self.tabla_participantes.valor_actual(0)
+        if participante_id is None:
             return
-            
-        participante_id = int(self.tabla_participantes.item(selected_row, 0).text())
         
         dialog = ParticipanteDialog(self, participante_id)
         if dialog.exec() == QDialog.Accepted:
-            self.cargar_participantes()
             QMessageBox.information(self, "Éxito", "Participante actualizado correctamente")
             
     def eliminar_participante(self):
         """Elimina el participante seleccionado."""
-        selected_row = self.tabla_participantes.currentRow()
+        selected_row = self.tabla_participantes.fila_actual()
         if selected_row < 0:
             return
             
-        participante_id = self.tabla_participantes.item(selected_row, 0).text()
-        participante_nombre = self.tabla_participantes.item(selected_row, 1).text()
+        participante_id = self.tabla_participantes.modelo.valor(selected_row, 0)
+        participante_nombre = self.tabla_participantes.modelo.valor(selected_row, 1)
         
         reply = QMessageBox.question(
             self,
@@ -289,15 +295,10 @@ class ParticipantesView(QWidget):
         )
         
         if reply == QMessageBox.Yes:
-            query = QSqlQuery()
-            query.prepare("UPDATE participantes SET activo = 0 WHERE id = ?")
-            query.addBindValue(participante_id)
-            
-            if query.exec():
-                self.cargar_participantes()
+            if ParticipantesController.eliminar_participante(participante_id):
                 QMessageBox.information(self, "Éxito", "Participante eliminado correctamente")
             else:
-                QMessageBox.warning(self, "Error", f"No se pudo eliminar: {query.lastError().text()}")
+                QMessageBox.warning(self, "Error", "No se pudo eliminar el participante")
 
 
 class ParticipanteDialog(QDialog):
@@ -382,55 +383,35 @@ class ParticipanteDialog(QDialog):
         
     def cargar_datos(self):
         """Carga los datos del participante a editar."""
-        query = QSqlQuery()
-        query.prepare("""
-            SELECT nombre, fecha_nacimiento, curso, es_jugador, es_arbitro, posicion
-            FROM participantes WHERE id = ?
-        """)
-        query.addBindValue(self.participante_id)
-        query.exec()
-        
-        if query.next():
-            self.txt_nombre.setText(query.value(0))
-            fecha_str = query.value(1)
-            if fecha_str:
-                fecha = QDate.fromString(fecha_str, "yyyy-MM-dd")
+        participante = ParticipantesController.obtener_participante(self.participante_id)
+        if participante:
+            self.txt_nombre.setText(participante.nombre)
+            if participante.fecha_nacimiento:
+                fecha = QDate.fromString(participante.fecha_nacimiento, "yyyy-MM-dd")
                 self.date_nacimiento.setDate(fecha)
-            self.txt_curso.setText(query.value(2))
-            self.check_jugador.setChecked(bool(query.value(3)))
-            self.check_arbitro.setChecked(bool(query.value(4)))
-            
-            posicion = query.value(5)
-            if posicion:
-                index = self.combo_posicion.findText(posicion)
+            self.txt_curso.setText(participante.curso)
+            self.check_jugador.setChecked(bool(participante.es_jugador))
+            self.check_arbitro.setChecked(bool(participante.es_arbitro))
+        
+            if participante.posicion:
+                index = self.combo_posicion.findText(participante.posicion)
                 if index >= 0:
                     self.combo_posicion.setCurrentIndex(index)
         
         # Cargar estadísticas de goles y tarjetas
-        query_stats = QSqlQuery()
-        query_stats.prepare("""
-            SELECT 
-                COALESCE((SELECT COUNT(*) FROM goles WHERE participante_id = ?), 0) as total_goles,
-                COALESCE((SELECT COUNT(*) FROM tarjetas WHERE participante_id = ? AND tipo = 'amarilla'), 0) as amarillas,
-                COALESCE((SELECT COUNT(*) FROM tarjetas WHERE participante_id = ? AND tipo = 'roja'), 0) as rojas
-        """)
-        query_stats.addBindValue(self.participante_id)
-        query_stats.addBindValue(self.participante_id)
-        query_stats.addBindValue(self.participante_id)
-        query_stats.exec()
-        
-        if query_stats.next():
-            self.spin_goles.setText(str(query_stats.value(0)))
-            self.spin_amarillas.setText(str(query_stats.value(1)))
-            self.spin_rojas.setText(str(query_stats.value(2)))
+        stats = ParticipantesController.obtener_estadisticas_participante(self.participante_id)
+        if stats:
+            self.spin_goles.setText(str(stats['goles']))
+            self.spin_amarillas.setText(str(stats['tarjetas']['amarillas']))
+            self.spin_rojas.setText(str(stats['tarjetas']['rojas']))
                     
     def aceptar(self):
         """Valida y guarda los datos."""
         nombre = self.txt_nombre.text().strip()
         fecha_nacimiento = self.date_nacimiento.date().toString("yyyy-MM-dd")
         curso = self.txt_curso.text().strip()
-        es_jugador = 1 if self.check_jugador.isChecked() else 0
-        es_arbitro = 1 if self.check_arbitro.isChecked() else 0
+        es_jugador = self.check_jugador.isChecked()
+        es_arbitro = self.check_arbitro.isChecked()
         posicion = self.combo_posicion.currentText() if es_jugador else None
         
         if not nombre or not curso:
@@ -453,120 +434,16 @@ class ParticipanteDialog(QDialog):
             QMessageBox.warning(self, "Error", f"Goles y tarjetas deben ser números positivos: {e}")
             return
             
-        query = QSqlQuery()
-        
-        if self.participante_id:
-            query.prepare("""
-                UPDATE participantes 
-                SET nombre = ?, fecha_nacimiento = ?, curso = ?, 
-                    es_jugador = ?, es_arbitro = ?, posicion = ?
-                WHERE id = ?
-            """)
-            query.addBindValue(nombre)
-            query.addBindValue(fecha_nacimiento)
-            query.addBindValue(curso)
-            query.addBindValue(es_jugador)
-            query.addBindValue(es_arbitro)
-            query.addBindValue(posicion)
-            query.addBindValue(self.participante_id)
-            
-            if query.exec():
-                # Actualizar goles y tarjetas si es jugador
-                if es_jugador:
-                    self.actualizar_estadisticas(self.participante_id, goles, amarillas, rojas)
-                self.accept()
-            else:
-                QMessageBox.warning(self, "Error", f"No se pudo guardar: {query.lastError().text()}")
-        else:
-            query.prepare("""
-                INSERT INTO participantes (nombre, fecha_nacimiento, curso, es_jugador, es_arbitro, posicion)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """)
-            query.addBindValue(nombre)
-            query.addBindValue(fecha_nacimiento)
-            query.addBindValue(curso)
-            query.addBindValue(es_jugador)
-            query.addBindValue(es_arbitro)
-            query.addBindValue(posicion)
-            
-            if query.exec():
-                self.accept()
-            else:
-                QMessageBox.warning(self, "Error", f"No se pudo guardar: {query.lastError().text()}")
-    
-    def actualizar_estadisticas(self, participante_id, goles_target, amarillas_target, rojas_target):
-        """Actualiza goles y tarjetas para que coincidan con los valores ingresados."""
-        
-        # Obtener goles actuales
-        query_goles = QSqlQuery()
-        query_goles.prepare("SELECT COUNT(*) FROM goles WHERE participante_id = ?")
-        query_goles.addBindValue(participante_id)
-        query_goles.exec()
-        goles_actuales = 0
-        if query_goles.next():
-            goles_actuales = query_goles.value(0)
-        
-        # Agregar o eliminar goles
-        if goles_target > goles_actuales:
-            # Agregar goles
-            for _ in range(goles_target - goles_actuales):
-                insert_query = QSqlQuery()
-                insert_query.prepare("INSERT INTO goles (participante_id) VALUES (?)")
-                insert_query.addBindValue(participante_id)
-                insert_query.exec()
-        elif goles_target < goles_actuales:
-            # Eliminar goles (desde el final)
-            cantidad_a_eliminar = goles_actuales - goles_target
-            delete_query = QSqlQuery()
-            delete_query.prepare(f"DELETE FROM goles WHERE participante_id = ? LIMIT ?")
-            delete_query.addBindValue(participante_id)
-            delete_query.addBindValue(cantidad_a_eliminar)
-            delete_query.exec()
-        
-        # Obtener tarjetas amarillas actuales
-        query_amarillas = QSqlQuery()
-        query_amarillas.prepare("SELECT COUNT(*) FROM tarjetas WHERE participante_id = ? AND tipo = 'amarilla'")
-        query_amarillas.addBindValue(participante_id)
-        query_amarillas.exec()
-        amarillas_actuales = 0
-        if query_amarillas.next():
-            amarillas_actuales = query_amarillas.value(0)
-        
-        # Actualizar tarjetas amarillas
-        if amarillas_target > amarillas_actuales:
-            for _ in range(amarillas_target - amarillas_actuales):
-                insert_query = QSqlQuery()
-                insert_query.prepare("INSERT INTO tarjetas (participante_id, tipo) VALUES (?, 'amarilla')")
-                insert_query.addBindValue(participante_id)
-                insert_query.exec()
-        elif amarillas_target < amarillas_actuales:
-            cantidad_a_eliminar = amarillas_actuales - amarillas_target
-            delete_query = QSqlQuery()
-            delete_query.prepare("DELETE FROM tarjetas WHERE participante_id = ? AND tipo = 'amarilla' LIMIT ?")
-            delete_query.addBindValue(participante_id)
-            delete_query.addBindValue(cantidad_a_eliminar)
-            delete_query.exec()
-        
-        # Obtener tarjetas rojas actuales
-        query_rojas = QSqlQuery()
-        query_rojas.prepare("SELECT COUNT(*) FROM tarjetas WHERE participante_id = ? AND tipo = 'roja'")
-        query_rojas.addBindValue(participante_id)
-        query_rojas.exec()
-        rojas_actuales = 0
-        if query_rojas.next():
-            rojas_actuales = query_rojas.value(0)
-        
-        # Actualizar tarjetas rojas
-        if rojas_target > rojas_actuales:
-            for _ in range(rojas_target - rojas_actuales):
-                insert_query = QSqlQuery()
-                insert_query.prepare("INSERT INTO tarjetas (participante_id, tipo) VALUES (?, 'roja')")
-                insert_query.addBindValue(participante_id)
-                insert_query.exec()
-        elif rojas_target < rojas_actuales:
-            cantidad_a_eliminar = rojas_actuales - rojas_target
-            delete_query = QSqlQuery()
-            delete_query.prepare("DELETE FROM tarjetas WHERE participante_id = ? AND tipo = 'roja' LIMIT ?")
-            delete_query.addBindValue(participante_id)
-            delete_query.addBindValue(cantidad_a_eliminar)
-            delete_query.exec()
\ No newline at end of file
+        # Goles y tarjetas solo se ajustan en los jugadores; las vistas se
+        # actualizan con los cambios que publica el modelo
+        if not es_jugador:
+            goles = amarillas = rojas = None
+        try:
+            ParticipantesController.guardar_participante(
+                self.participante_id, nombre, fecha_nacimiento, curso, es_jugador, es_arbitro,
+                posicion, goles, amarillas, rojas
+            )
+        except ValueError as e:
+            QMessageBox.warning(self, "Error", f"No se pudo guardar: {e}")
+            return
+        self.accept()
\ No newline at end of file
@@ -5,24 +5,47 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                                QTabWidget, QTreeWidget, QTreeWidgetItem,
                                QSpinBox, QGroupBox, QListWidget, QFileDialog)
 from PySide6.QtCore import Qt, QDateTime
-from PySide6.QtSql import QSqlQuery
+from MODELS.database import crear_query
+from MODELS import eventos
+from MODELS.eventos import bus_cambios
 from CONTROLLERS.partidos_controller import PartidosController
-from COMPONENTS.reloj_digital import DigitalClockWidget  # ← NUEVO IMPORT
-from RESOURCES.traduciones.translations import translate
+from CONTROLLERS.partidos_en_vivo import partidos_en_vivo
+from COMPONENTS.panel_en_vivo import PanelEnVivo
+from COMPONENTS import notificaciones
+from COMPONENTS.notificaciones import notificar
+from COMPONENTS.tabla_virtual import TablaVirtual
+from RESOURCES.traduciones.translations import translate, translate_many
 from RESOURCES.traduciones.language_selector import LanguageSelector
 from RESOURCES.traduciones.language_manager import language_manager
-import csv
+import config
 import os
 
 class PartidosView(QWidget):
     """Vista principal para gestión de partidos."""
     
+    # Claves de obtener_listado_partidos en el orden de las columnas de tabla_partidos
+    COLUMNAS_PARTIDOS = ('id', 'fecha_hora', 'local', 'visitante', 'arbitro', 'eliminatoria',
+                         'finalizado', 'goles_local', 'goles_visitante')
+    # Claves de obtener_resultados en el orden de las columnas de tabla_resultados
+    COLUMNAS_RESULTADOS = ('fecha_hora', 'local', 'goles_local', 'visitante', 'eliminatoria',
+                           'arbitro', 'goles_visitante', 'id')
+    # Eliminatorias tal como se guardan en la BD (y claves de traducción)
+    ELIMINATORIAS = tuple(config.ELIMINATORIAS)
+    
     def __init__(self):
         super().__init__()
-        self.partido_actual_id = None  # ← Para tracking del partido en curso
+        # Partidos cambiados mientras se recargaba cada tabla: se refrescan al llegar los datos
+        self._cambios_durante_carga = {}
+        # Confirmaciones de finalizar abiertas, por partido (no modales: los demás siguen en juego)
+        self._confirmaciones_fin = {}
         # Conectar a cambios de idioma global
         language_manager.language_changed.connect(self.refresh_ui)
         self.init_ui()
+        bus_cambios.datos_cambiados.connect(self.aplicar_cambio)
+        # Los botones de iniciar y finalizar dependen de los partidos en juego
+        partidos_en_vivo.partido_iniciado.connect(lambda _: self.partido_seleccionado())
+        partidos_en_vivo.partido_finalizado.connect(lambda _: self.partido_seleccionado())
+        partidos_en_vivo.minuto_cambiado.connect(self.actualizar_minuto_partido)
         self.cargar_partidos()
     
     def refresh_ui(self):
@@ -51,40 +74,42 @@ class PartidosView(QWidget):
             text = translate("Export to CSV")
             self.btn_exportar.setText("📥 " + text)
         
-        # Actualizar reloj digital
-        if hasattr(self, 'reloj'):
-            self.reloj.refresh_ui()
+        # Actualizar panel de partidos en juego
+        if hasattr(self, 'panel_en_vivo'):
+            self.panel_en_vivo.refresh_ui()
         
         # Actualizar pestaña de calendario
         if hasattr(self, 'combo_filtro_eliminatoria'):
-            # Guardar índice actual antes de actualizar
-            current_index = self.combo_filtro_eliminatoria.currentIndex()
-            self.combo_filtro_eliminatoria.clear()
-            self.combo_filtro_eliminatoria.addItems([
-                translate("All"), translate("Octavos"), translate("Cuartos"), 
-                translate("Semifinal"), translate("Final")
-            ])
-            # Restaurar el índice después de actualizar
-            if current_index >= 0:
-                self.combo_filtro_eliminatoria.setCurrentIndex(current_index)
+            self.label_filtro.setText(translate("Filter by") + ":")
+            # Solo cambia el texto: la eliminatoria de cada opción va en su dato
+            for i in range(self.combo_filtro_eliminatoria.count()):
+                clave = self.combo_filtro_eliminatoria.itemData(i) or "All"
+                self.combo_filtro_eliminatoria.setItemText(i, translate(clave))
         
         # Actualizar encabezados de tabla
         if hasattr(self, 'tabla_partidos'):
-            headers = [
-                "ID", translate("Date/Time"), translate("Local Team"), 
-                translate("Visiting Team"), translate("Referee"), 
-                translate("Eliminatory"), translate("Status")
-            ]
+            headers = ["ID"] + translate_many([
+                "Date/Time", "Local Team", "Visiting Team", "Referee",
+                "Eliminatory", "Status"
+            ])
             self.tabla_partidos.setHorizontalHeaderLabels(headers)
+            self.tabla_partidos.modelo.repintar()
         
         # Actualizar encabezados de tabla de resultados
         if hasattr(self, 'tabla_resultados'):
-            headers = [
-                translate("Date"), translate("Local Team"), translate("Result"), 
-                translate("Visiting Team"), translate("Eliminatory"), 
-                translate("Referee")
-            ]
+            headers = translate_many([
+                "Date", "Local Team", "Result", "Visiting Team",
+                "Eliminatory", "Referee"
+            ])
             self.tabla_resultados.setHorizontalHeaderLabels(headers)
+            self.tabla_resultados.modelo.repintar()
+            self.label_resultados.setText("📊 " + translate("Match Finished Matches"))
+        
+        # Actualizar árbol de eliminatorias
+        if hasattr(self, 'tree_eliminatorias'):
+            self.label_eliminatorias.setText("🏆 " + translate("Knockout Bracket"))
+            self.tree_eliminatorias.setHeaderLabels(translate_many(["Eliminatory", "Knockouts"]))
+            self.traducir_eliminatorias()
         
         # Actualizar pestañas
         if hasattr(self, 'tabs'):
@@ -92,9 +117,7 @@ class PartidosView(QWidget):
             self.tabs.setTabText(1, "🏆 " + translate("Knockout Bracket"))
             self.tabs.setTabText(2, "📊 " + translate("Results"))
         
-        # Recargar datos de partidos (para mostrar datos con textos traducidos)
-        if hasattr(self, 'tabla_partidos'):
-            self.cargar_partidos()
+        # Las celdas guardan claves y se traducen al pintar: no hace falta recargar datos
         
     def init_ui(self):
         """Inicializa la interfaz de usuario."""
@@ -107,20 +130,16 @@ class PartidosView(QWidget):
         self.title_label.setStyleSheet("font-size: 18pt; font-weight: bold; color: #DC143C;")
         layout.addWidget(self.title_label)
         
-        # ============ NUEVO: Reloj Digital ============
-        self.reloj = DigitalClockWidget(self, mode=DigitalClockWidget.MODE_FOOTBALL)
-        self.reloj.setVisible(True)  # Visible por defecto
-        # El widget `DigitalClockWidget` controla la visibilidad del botón
-        # `btn_start` según el modo (solo muestra en Cronómetro/Temporizador).
+        # ============ Partidos en juego ============
+        # Cada partido iniciado lleva su propio reloj; el panel (oculto si no
+        # hay ninguno) dirige goles, tarjetas y final al partido seleccionado
+        self.panel_en_vivo = PanelEnVivo(self)
+        self.panel_en_vivo.golPedido.connect(self.registrar_gol_en_partido)
+        self.panel_en_vivo.tarjetaPedida.connect(self.registrar_tarjeta_en_partido)
+        self.panel_en_vivo.finalizarPedido.connect(self.finalizar_partido)
         
-        # Conectar señales del reloj
-        self.reloj.matchTimeUpdated.connect(self.actualizar_minuto_partido)
-        # timerFinished desconectado: el reloj ya muestra su propio mensaje de finalización
-        self.reloj.btn_start.clicked.connect(self.iniciar_partido_desde_reloj)
-        self.reloj.goalScored.connect(self.registrar_gol_en_partido)
-        
-        layout.addWidget(self.reloj)
-        # ==============================================
+        layout.addWidget(self.panel_en_vivo)
+        # ===========================================
         
         # Barra de herramientas
         toolbar_layout = QHBoxLayout()
@@ -165,7 +184,7 @@ class PartidosView(QWidget):
             }
         """)
         
-        # Botón de registrar resultado eliminado (se gestiona vía reloj)
+        # Botón de registrar resultado eliminado (se gestiona desde los partidos en juego)
         
         self.btn_eliminar = QPushButton("🗑️ " + translate("Delete"))
         self.btn_eliminar.setToolTip(translate("Delete"))
@@ -219,31 +238,33 @@ class PartidosView(QWidget):
         
         # Filtro por eliminatoria
         filtro_layout = QHBoxLayout()
-        filtro_layout.addWidget(QLabel("Filtrar por:"))
+        self.label_filtro = QLabel(translate("Filter by") + ":")
+        filtro_layout.addWidget(self.label_filtro)
         
+        # Cada opción guarda la eliminatoria ('' para todas); el texto es su traducción
         self.combo_filtro_eliminatoria = QComboBox()
-        self.combo_filtro_eliminatoria.addItems([
-            "Todas", "Octavos", "Cuartos", "Semifinal", "Final"
-        ])
-        self.combo_filtro_eliminatoria.currentTextChanged.connect(self.cargar_partidos)
+        self.combo_filtro_eliminatoria.addItem(translate("All"), "")
+        for eliminatoria in self.ELIMINATORIAS:
+            self.combo_filtro_eliminatoria.addItem(translate(eliminatoria), eliminatoria)
+        self.combo_filtro_eliminatoria.currentIndexChanged.connect(self.cargar_partidos)
         filtro_layout.addWidget(self.combo_filtro_eliminatoria)
         filtro_layout.addStretch()
         layout.addLayout(filtro_layout)
         
         # Tabla de partidos
-        self.tabla_partidos = QTableWidget()
-        self.tabla_partidos.setColumnCount(7)
-        self.tabla_partidos.setHorizontalHeaderLabels([
-            "ID", "Fecha/Hora", "Equipo Local", "Equipo Visitante", 
-            "Árbitro", "Eliminatoria", "Estado"
-        ])
+        # Columnas guardadas: las 7 visibles más goles_local y goles_visitante para el estado.
+        # Árbitro, Eliminatoria y Estado guardan el dato de la BD y se traducen al pintar
+        self.tabla_partidos = TablaVirtual(
+            ["ID", "Fecha/Hora", "Equipo Local", "Equipo Visitante",
+             "Árbitro", "Eliminatoria", "Estado"],
+            formatos={1: self.formato_fecha_hora, 4: self.formato_arbitro,
+                      5: self.formato_traducido, 6: self.formato_estado}
+        )
         self.tabla_partidos.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
         self.tabla_partidos.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
-        self.tabla_partidos.setSelectionBehavior(QTableWidget.SelectRows)
-        self.tabla_partidos.setSelectionMode(QTableWidget.SingleSelection)
-        self.tabla_partidos.setEditTriggers(QTableWidget.NoEditTriggers)
         self.tabla_partidos.hideColumn(0)
-        self.tabla_partidos.itemSelectionChanged.connect(self.partido_seleccionado)
+        self.tabla_partidos.sortByColumn(1, Qt.AscendingOrder)
+        self.tabla_partidos.seleccion_cambiada.connect(self.partido_seleccionado)
         layout.addWidget(self.tabla_partidos)
         
         return widget
@@ -254,13 +275,13 @@ class PartidosView(QWidget):
         layout = QVBoxLayout(widget)
         layout.setContentsMargins(0, 10, 0, 0)
         
-        info_label = QLabel("🏆 Cuadro de Eliminatorias del Torneo")
-        info_label.setStyleSheet("font-weight: bold; font-size: 12pt; margin-bottom: 10px; color: #DC143C;")
-        layout.addWidget(info_label)
+        self.label_eliminatorias = QLabel("🏆 " + translate("Knockout Bracket"))
+        self.label_eliminatorias.setStyleSheet("font-weight: bold; font-size: 12pt; margin-bottom: 10px; color: #DC143C;")
+        layout.addWidget(self.label_eliminatorias)
         
         # Árbol de eliminatorias
         self.tree_eliminatorias = QTreeWidget()
-        self.tree_eliminatorias.setHeaderLabels(["Eliminatoria", "Enfrentamientos"])
+        self.tree_eliminatorias.setHeaderLabels([translate("Eliminatory"), translate("Knockouts")])
         self.tree_eliminatorias.setColumnWidth(0, 200)
         layout.addWidget(self.tree_eliminatorias)
         
@@ -272,393 +293,425 @@ class PartidosView(QWidget):
         layout = QVBoxLayout(widget)
         layout.setContentsMargins(0, 10, 0, 0)
         
-        info_label = QLabel("📊 Partidos Finalizados")
-        info_label.setStyleSheet("font-weight: bold; font-size: 12pt; margin-bottom: 10px; color: #DC143C;")
-        layout.addWidget(info_label)
+        self.label_resultados = QLabel("📊 " + translate("Match Finished Matches"))
+        self.label_resultados.setStyleSheet("font-weight: bold; font-size: 12pt; margin-bottom: 10px; color: #DC143C;")
+        layout.addWidget(self.label_resultados)
         
         # Tabla de resultados
-        self.tabla_resultados = QTableWidget()
-        self.tabla_resultados.setColumnCount(6)
-        self.tabla_resultados.setHorizontalHeaderLabels([
-            "Fecha", "Equipo Local", "Resultado", "Equipo Visitante", 
-            "Eliminatoria", "Árbitro"
-        ])
+        # Columnas guardadas: las 6 visibles (Resultado guarda goles_local),
+        # más goles_visitante y el id del partido
+        self.tabla_resultados = TablaVirtual(
+            ["Fecha", "Equipo Local", "Resultado", "Equipo Visitante",
+             "Eliminatoria", "Árbitro"],
+            formatos={0: self.formato_fecha, 2: self.formato_resultado,
+                      4: self.formato_traducido, 5: self.formato_arbitro},
+            columna_id=7
+        )
         self.tabla_resultados.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
         self.tabla_resultados.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
-        self.tabla_resultados.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.tabla_resultados.sortByColumn(0, Qt.DescendingOrder)
         layout.addWidget(self.tabla_resultados)
         
         return widget
         
-    # ============ NUEVAS FUNCIONES DEL RELOJ ============
+    # ============ PARTIDOS EN JUEGO ============
     def iniciar_partido_cronometro(self):
-        """Inicia el cronómetro del partido seleccionado."""
-        selected_row = self.tabla_partidos.currentRow()
+        """
+        Pone en juego el partido seleccionado; puede haber varios a la vez.
+        Sin confirmación: un partido iniciado por error se pausa desde el panel.
+        """
+        selected_row = self.tabla_partidos.fila_actual()
         if selected_row < 0:
-            QMessageBox.warning(self, "Advertencia", "Seleccione un partido primero")
+            notificar(self, "Seleccione un partido primero", "Advertencia", notificaciones.AVISO)
             return
         
         # Obtener datos del partido
-        partido_id = int(self.tabla_partidos.item(selected_row, 0).text())
-        local = self.tabla_partidos.item(selected_row, 2).text()
-        visitante = self.tabla_partidos.item(selected_row, 3).text()
+        partido_id = self.tabla_partidos.modelo.valor(selected_row, 0)
+        local = self.tabla_partidos.modelo.valor(selected_row, 2)
+        visitante = self.tabla_partidos.modelo.valor(selected_row, 3)
         
-        # Confirmar inicio
-        reply = QMessageBox.question(
-            self,
-            "Iniciar Partido",
-            f"¿Iniciar cronómetro para el partido?\n\n{local} vs {visitante}",
-            QMessageBox.Yes | QMessageBox.No
-        )
+        if partidos_en_vivo.en_juego(partido_id):
+            self.panel_en_vivo.seleccionar(partido_id)
+            return
         
-        if reply == QMessageBox.Yes:
-            self.partido_actual_id = partido_id
-
-            # Verificar que el partido no esté finalizado antes de iniciar
-            partido = PartidosController.obtener_partido(partido_id)
-            if partido and getattr(partido, 'finalizado', 0):
-                QMessageBox.information(self, "Partido Finalizado", "Partido ya finalizado")
-                return
-            
-            # Para modo fútbol, no necesitamos configurar duración de timer
-            # El cronómetro cuenta hacia arriba desde 0
-            duracion_minutos = 90
-            # self.reloj.set_timer_duration(duracion_minutos * 60)
-            
-            # Cambiar reloj al modo Fútbol
-            self.reloj.set_mode(DigitalClockWidget.MODE_FOOTBALL)
-            
-            # Mostrar y resetear reloj
-            self.reloj.setVisible(True)
-            self.reloj.on_reset()
-            self.reloj.on_start()
-            
-            # Deshabilitar botón de iniciar y habilitar finalizar
-            self.btn_iniciar.setEnabled(False)
-            self.btn_finalizar.setEnabled(True)
-            
-            QMessageBox.information(
-                self,
-                "Partido Iniciado",
-                f"Cronómetro iniciado para:\n{local} vs {visitante}\n\nDuración: {duracion_minutos} minutos"
-            )
-    
-    def iniciar_partido_desde_reloj(self):
-        """Inicia el partido cuando se hace clic en el botón iniciar del reloj."""
-        # Si hay un partido seleccionado, iniciar ese partido
-        selected_row = self.tabla_partidos.currentRow()
-        if selected_row >= 0 and self.partido_actual_id is None:
-            self.iniciar_partido_cronometro()
-    
-    def finalizar_partido(self):
-        """Finaliza el partido en curso y registra el resultado."""
-        if self.partido_actual_id is None:
-            QMessageBox.warning(self, "Error", "No hay partido en curso")
+        # No se puede iniciar un partido que no existe o ya está finalizado;
+        # si se inicia, el panel lo añade y lo selecciona
+        if partidos_en_vivo.iniciar(partido_id) is None:
+            notificar(self, "Partido ya finalizado", "Partido Finalizado", notificaciones.AVISO)
             return
         
-        # Confirmar finalización
-        reply = QMessageBox.question(
+        notificar(
             self,
-            "Finalizar Partido",
-            "¿Está seguro de finalizar el partido?\n\nSe detendrá el cronómetro y se registrará el resultado final.",
-            QMessageBox.Yes | QMessageBox.No
+            f"{local} vs {visitante}",
+            "Partido Iniciado",
+            notificaciones.EXITO
         )
-        
-        if reply == QMessageBox.Yes:
-            # Calcular los goles actuales desde la tabla de goles
-            query = QSqlQuery()
-            query.prepare("""
-                SELECT 
-                    COUNT(CASE WHEN ep.equipo_id = p.equipo_local_id THEN 1 END) as goles_local,
-                    COUNT(CASE WHEN ep.equipo_id = p.equipo_visitante_id THEN 1 END) as goles_visitante
-                FROM partidos p
-                LEFT JOIN goles g ON g.partido_id = p.id AND g.partido_id IS NOT NULL
-                LEFT JOIN participantes par ON par.id = g.participante_id
-                LEFT JOIN equipo_participante ep ON ep.participante_id = par.id
-                WHERE p.id = ?
-            """)
-            query.addBindValue(self.partido_actual_id)
-            
-            goles_local = 0
-            goles_visitante = 0
-            
-            if query.exec() and query.next():
-                goles_local = query.value(0) or 0
-                goles_visitante = query.value(1) or 0
-            
-            # Finalizar el partido usando el controlador
-            from CONTROLLERS.partidos_controller import PartidosController
-            if PartidosController.finalizar_partido(self.partido_actual_id, goles_local, goles_visitante):
-                # Detener el reloj
-                self.reloj.on_pause()
-                
-                # Limpiar estado del partido
-                partido_actual_id = self.partido_actual_id
-                self.partido_actual_id = None
-                
-                # Actualizar botones
-                self.btn_iniciar.setEnabled(True)
-                self.btn_finalizar.setEnabled(False)
-                
-                # Ocultar reloj
-                self.reloj.setVisible(False)
-                self.reloj.on_reset()
-                
-                # Recargar la tabla para mostrar el estado actualizado
-                self.cargar_partidos()
-                
-                # Mostrar mensaje
-                QMessageBox.information(
-                    self,
-                    "Partido Finalizado",
-                    f"El partido ha sido finalizado.\n\nResultado final: {goles_local}-{goles_visitante}"
-                )
-            else:
-                QMessageBox.warning(self, "Error", "No se pudo finalizar el partido")
     
-    def registrar_gol_en_partido(self, equipo):
-        """Registra un gol en el partido actual."""
-        if self.partido_actual_id is None:
-            QMessageBox.warning(self, "Error", "No hay partido en curso")
+    def finalizar_partido(self, partido_id=None):
+        """
+        Finaliza un partido en juego y registra el resultado.
+        Sin id, el seleccionado en el calendario si está en juego o, si no, el del panel.
+        """
+        if not partido_id:
+            partido_id = self.tabla_partidos.valor_actual(0)
+            if not partidos_en_vivo.en_juego(partido_id):
+                partido_id = self.panel_en_vivo.partido_seleccionado()
+        en_vivo = partidos_en_vivo.obtener(partido_id) if partido_id is not None else None
+        if en_vivo is None:
+            notificar(self, "No hay partido en curso", "Error", notificaciones.AVISO)
             return
         
-        # Obtener el minuto actual del partido
-        minuto_actual = self.reloj.get_elapsed_minutes()
+        # Ya se está pidiendo confirmación para este partido
+        confirmacion = self._confirmaciones_fin.get(partido_id)
+        if confirmacion is not None:
+            confirmacion.raise_()
+            confirmacion.activateWindow()
+            return
+        
+        # Confirmación no modal: mientras está abierta los demás partidos siguen en juego
+        confirmacion = QMessageBox(
+            QMessageBox.Question,
+            "Finalizar Partido",
+            f"¿Está seguro de finalizar el partido?\n\n{en_vivo.local} vs {en_vivo.visitante}\n\n"
+            "Se detendrá el cronómetro y se registrará el resultado final.",
+            QMessageBox.Yes | QMessageBox.No,
+            self
+        )
+        confirmacion.setWindowModality(Qt.NonModal)
+        confirmacion.setAttribute(Qt.WA_DeleteOnClose)
+        confirmacion.finished.connect(
+            lambda _, caja=confirmacion: self._confirmar_fin(
+                partido_id, caja.clickedButton() is caja.button(QMessageBox.Yes)))
+        self._confirmaciones_fin[partido_id] = confirmacion
+        confirmacion.show()
+        
+    def _confirmar_fin(self, partido_id, aceptado):
+        """Respuesta a la confirmación de finalizar un partido."""
+        self._confirmaciones_fin.pop(partido_id, None)
+        # El partido pudo terminar por otra vía mientras se preguntaba
+        en_vivo = partidos_en_vivo.obtener(partido_id)
+        if not aceptado or en_vivo is None:
+            return
         
+        # Se finaliza con los goles registrados; el panel quita el partido
+        # y las tablas se actualizan con el cambio que publica el modelo
+        resultado = partidos_en_vivo.finalizar(partido_id)
+        if resultado:
+            notificar(
+                self,
+                f"{en_vivo.local} vs {en_vivo.visitante}\nResultado final: {resultado[0]}-{resultado[1]}",
+                "Partido Finalizado",
+                notificaciones.EXITO
+            )
+        else:
+            notificar(self, "No se pudo finalizar el partido", "Error", notificaciones.ERROR)
+    
+    def registrar_gol_en_partido(self, partido_id, equipo, minuto):
+        """
+        Registra un gol en un partido en juego.
+        El minuto es el que marcaba su reloj al pulsar el botón, no el de después del diálogo.
+        """
         # Mostrar diálogo para seleccionar goleador
-        dialog = GoleadorDialog(self, self.partido_actual_id, equipo, minuto_actual)
+        dialog = GoleadorDialog(self, partido_id, equipo, minuto)
         if dialog.exec() == QDialog.Accepted:
             participante_id = dialog.get_participante_id()
             if participante_id:
-                # Registrar el gol usando el controlador
-                if PartidosController.registrar_gol(self.partido_actual_id, participante_id, minuto_actual):
-                    QMessageBox.information(self, "Gol Registrado", 
-                                          f"Gol registrado para el participante seleccionado al minuto {minuto_actual}")
+                # Registrar el gol con el equipo elegido en el diálogo
+                marcador = partidos_en_vivo.registrar_gol(partido_id, participante_id, minuto,
+                                                          dialog.equipo_id, dialog.get_nombre_participante())
+                if marcador:
+                    en_vivo = partidos_en_vivo.obtener(partido_id)
+                    notificar(self,
+                              f"{dialog.get_nombre_participante()} ({minuto}')\n"
+                              f"{en_vivo.local} {marcador[0]} - {marcador[1]} {en_vivo.visitante}",
+                              "Gol Registrado", notificaciones.EXITO)
                 else:
-                    QMessageBox.warning(self, "Error", "No se pudo registrar el gol")
+                    notificar(self, "No se pudo registrar el gol", "Error", notificaciones.ERROR)
             else:
-                QMessageBox.warning(self, "Selección requerida", 
-                                  "Por favor, seleccione un participante de la lista para registrar el gol.")
+                notificar(self, "Por favor, seleccione un participante de la lista para registrar el gol.",
+                          "Selección requerida", notificaciones.AVISO)
     
-    def actualizar_minuto_partido(self, minuto):
-        """Se ejecuta cada minuto del partido."""
-        # Notificaciones cada 15 minutos
-        if minuto > 0 and minuto % 15 == 0:
-            QMessageBox.information(
-                self,
-                f"Minuto {minuto}",
-                f"Han transcurrido {minuto} minutos de partido"
-            )
+    def registrar_tarjeta_en_partido(self, partido_id, equipo, minuto):
+        """Registra una tarjeta en un partido en juego, con el minuto del momento en que se pidió."""
+        dialog = TarjetaDialog(self, partido_id, equipo, minuto)
+        if dialog.exec() == QDialog.Accepted:
+            if not partidos_en_vivo.registrar_tarjeta(partido_id, dialog.get_participante_id(),
+                                                      dialog.get_tipo(), minuto, dialog.equipo_id,
+                                                      dialog.get_nombre_participante()):
+                notificar(self, "No se pudo registrar la tarjeta", "Error", notificaciones.ERROR)
+    
+    def actualizar_minuto_partido(self, partido_id, minuto):
+        """
+        Se ejecuta cada vez que cambia el minuto de un partido en juego.
+        Los avisos no son modales: con varios partidos a la vez se agrupan por
+        partido (un aviso por partido, que se actualiza) en vez de apilarse.
+        """
+        en_vivo = partidos_en_vivo.obtener(partido_id)
+        if en_vivo is None:
+            return
+        partido = f"{en_vivo.local} vs {en_vivo.visitante}"
         
         # Medio tiempo a los 45 minutos
         if minuto == 45:
-            QMessageBox.information(
-                self,
-                "¡Medio Tiempo!",
-                "Primer tiempo completado. ¡Descanso!"
-            )
+            notificar(self, f"{partido}\nPrimer tiempo completado. ¡Descanso!",
+                      "¡Medio Tiempo!", notificaciones.AVISO, clave=f"minuto-{partido_id}")
+        
+        # Notificaciones cada 15 minutos
+        elif minuto > 0 and minuto % 15 == 0:
+            notificar(self, f"{partido}\nHan transcurrido {minuto} minutos de partido",
+                      f"Minuto {minuto}", clave=f"minuto-{partido_id}")
     
 
     def cargar_partidos(self):
-        """Carga los partidos desde la base de datos."""
-        self.tabla_partidos.setRowCount(0)
-        
-        filtro = self.combo_filtro_eliminatoria.currentText()
-        # Comparar con el valor traducido
-        all_text = translate("All")
-        
-        query = QSqlQuery()
-        sql = """
-            SELECT p.id, p.fecha_hora, 
-                   el.nombre as local, ev.nombre as visitante,
-                   COALESCE(a.nombre, 'Sin asignar') as arbitro,
-                   p.eliminatoria, p.finalizado,
-                   p.goles_local, p.goles_visitante
-            FROM partidos p
-            INNER JOIN equipos el ON p.equipo_local_id = el.id
-            INNER JOIN equipos ev ON p.equipo_visitante_id = ev.id
-            LEFT JOIN participantes a ON p.arbitro_id = a.id
-            WHERE 1=1
         """
-        
-        if filtro != all_text:
-            sql += f" AND p.eliminatoria = '{filtro}'"
-            
-        sql += " ORDER BY p.fecha_hora ASC"
-        
-        query.exec(sql)
-        
-        row = 0
-        while query.next():
-            self.tabla_partidos.insertRow(row)
-            
-            # ID
-            self.tabla_partidos.setItem(row, 0, QTableWidgetItem(str(query.value(0))))
-            
-            # Fecha/Hora
-            fecha_hora = QDateTime.fromString(query.value(1), "yyyy-MM-dd HH:mm")
-            fecha_texto = fecha_hora.toString("dd/MM/yyyy HH:mm")
-            self.tabla_partidos.setItem(row, 1, QTableWidgetItem(fecha_texto))
-            
-            # Equipos
-            self.tabla_partidos.setItem(row, 2, QTableWidgetItem(query.value(2)))
-            self.tabla_partidos.setItem(row, 3, QTableWidgetItem(query.value(3)))
-            
-            # Árbitro
-            self.tabla_partidos.setItem(row, 4, QTableWidgetItem(query.value(4)))
-            
-            # Eliminatoria
-            self.tabla_partidos.setItem(row, 5, QTableWidgetItem(query.value(5)))
+        Carga los partidos desde la base de datos.
+        Las consultas se hacen en el trabajador de BD; las tablas se rellenan al llegar los datos.
+        """
+        self._cambios_durante_carga['partidos'] = set()
+        PartidosController.obtener_listado_partidos_async(self.eliminatoria_filtrada(), self.mostrar_partidos)
+        self.cargar_eliminatorias()
+        self.cargar_resultados()
+    
+    def eliminatoria_filtrada(self):
+        """Eliminatoria elegida en el filtro del calendario ('' para todas)."""
+        return self.combo_filtro_eliminatoria.currentData() or ""
+        
+    def mostrar_partidos(self, partidos):
+        """Rellena la tabla de partidos con el resultado del trabajador de BD."""
+        columnas = [[partido[clave] for partido in partidos] for clave in self.COLUMNAS_PARTIDOS]
+        self.tabla_partidos.modelo.establecer_columnas(columnas)
+        self._reaplicar_cambios('partidos')
             
-            # Estado
-            finalizado = query.value(6)
-            if finalizado:
-                goles_local = query.value(7)
-                goles_visitante = query.value(8)
-                estado_texto = f"✅ Finalizado ({goles_local}-{goles_visitante})"
-            else:
-                estado_texto = "⏳ Pendiente"
-            self.tabla_partidos.setItem(row, 6, QTableWidgetItem(estado_texto))
+    def formato_fecha_hora(self, fecha_hora, fila):
+        """Texto de la columna Fecha/Hora; se ordena por el valor de la BD (yyyy-MM-dd HH:mm)."""
+        return QDateTime.fromString(fecha_hora, "yyyy-MM-dd HH:mm").toString("dd/MM/yyyy HH:mm")
             
-            row += 1
+    def formato_estado(self, finalizado, fila):
+        """Texto de la columna Estado, con el resultado si el partido está finalizado."""
+        if finalizado:
+            modelo = self.tabla_partidos.modelo
+            return f"✅ {translate('Finished')} ({modelo.valor(fila, 7)}-{modelo.valor(fila, 8)})"
+        return f"⏳ {translate('Pending')}"
+    
+    def formato_arbitro(self, arbitro, fila):
+        """Texto de la columna Árbitro; los partidos sin árbitro guardan None."""
+        return arbitro or translate("Without assignment")
+    
+    def formato_traducido(self, clave, fila):
+        """Texto de una columna que guarda claves de traducción (p. ej. la eliminatoria)."""
+        return translate(clave) if clave else ""
             
-        self.cargar_eliminatorias()
-        self.cargar_resultados()
-        
     def cargar_eliminatorias(self):
-        """Carga el árbol de eliminatorias."""
+        """Carga el árbol de eliminatorias (consulta en el trabajador de BD)."""
+        self._cambios_durante_carga['eliminatorias'] = set()
+        PartidosController.obtener_partidos_por_eliminatoria_async(self.mostrar_eliminatorias)
+            
+    def mostrar_eliminatorias(self, por_eliminatoria):
+        """Rellena el árbol de eliminatorias con los partidos agrupados por fase."""
         self.tree_eliminatorias.clear()
+        self._items_eliminatoria = {}
         
-        eliminatorias = ["Octavos", "Cuartos", "Semifinal", "Final"]
-        
-        for eliminatoria in eliminatorias:
-            item_elim = QTreeWidgetItem(self.tree_eliminatorias, [eliminatoria])
+        for eliminatoria in self.ELIMINATORIAS:
+            item_elim = QTreeWidgetItem(self.tree_eliminatorias, [self._texto_eliminatoria(eliminatoria)])
+            item_elim.setData(0, Qt.UserRole, eliminatoria)
             item_elim.setExpanded(True)
+            self._items_eliminatoria[eliminatoria] = item_elim
             
-            # Icono según eliminatoria
-            if eliminatoria == "Final":
-                item_elim.setText(0, "🏆 " + eliminatoria)
-            elif eliminatoria == "Semifinal":
-                item_elim.setText(0, "🥈 " + eliminatoria)
-            else:
-                item_elim.setText(0, "⚽ " + eliminatoria)
-            
-            # Cargar partidos de esta eliminatoria
-            query = QSqlQuery()
-            query.prepare("""
-                SELECT el.nombre, ev.nombre, p.goles_local, p.goles_visitante, p.finalizado
-                FROM partidos p
-                INNER JOIN equipos el ON p.equipo_local_id = el.id
-                INNER JOIN equipos ev ON p.equipo_visitante_id = ev.id
-                WHERE p.eliminatoria = ?
-                ORDER BY p.fecha_hora
-            """)
-            query.addBindValue(eliminatoria)
-            query.exec()
-            
-            contador = 0
-            while query.next():
-                contador += 1
-                local = query.value(0)
-                visitante = query.value(1)
-                goles_l = query.value(2)
-                goles_v = query.value(3)
-                finalizado = query.value(4)
+            # Partidos de esta eliminatoria
+            for partido in por_eliminatoria.get(eliminatoria, []):
+                self._item_enfrentamiento(item_elim, partido)
                 
-                if finalizado:
-                    ganador = local if goles_l > goles_v else visitante
-                    partido_texto = f"{local} {goles_l} - {goles_v} {visitante} (Gana: {ganador})"
-                else:
-                    partido_texto = f"{local} vs {visitante}"
+            if item_elim.childCount() == 0:
+                QTreeWidgetItem(item_elim, [translate("No matches scheduled")])
                     
-                QTreeWidgetItem(item_elim, [partido_texto])
+        self._reaplicar_cambios('eliminatorias')
             
-            if contador == 0:
-                QTreeWidgetItem(item_elim, ["No hay partidos programados"])
+    def traducir_eliminatorias(self):
+        """Vuelve a escribir los textos del árbol en el idioma actual con los datos que ya tiene."""
+        for eliminatoria, item_elim in getattr(self, '_items_eliminatoria', {}).items():
+            item_elim.setText(0, self._texto_eliminatoria(eliminatoria))
+            for i in range(item_elim.childCount()):
+                item = item_elim.child(i)
+                partido = item.data(0, Qt.UserRole + 2)
+                item.setText(0, self._texto_enfrentamiento(partido) if partido
+                             else translate("No matches scheduled"))
+    
+    def _texto_eliminatoria(self, eliminatoria):
+        """Texto de la fase en el árbol, con su icono."""
+        if eliminatoria == "Final":
+            icono = "🏆"
+        elif eliminatoria == "Semifinal":
+            icono = "🥈"
+        else:
+            icono = "⚽"
+        return f"{icono} {translate(eliminatoria)}"
+    
+    def _texto_enfrentamiento(self, partido):
+        """Texto de un partido en el árbol (con el resultado y el ganador si está finalizado)."""
+        local = partido['local']
+        visitante = partido['visitante']
+        goles_l = partido['goles_local']
+        goles_v = partido['goles_visitante']
+        
+        if partido['finalizado']:
+            ganador = local if goles_l > goles_v else visitante
+            return f"{local} {goles_l} - {goles_v} {visitante} ({translate('Winner')}: {ganador})"
+        return f"{local} {translate('vs')} {visitante}"
+        
+    def _item_enfrentamiento(self, item_elim, partido, posicion=None):
+        """
+        Crea el elemento del árbol de un partido, con su id y fecha para
+        localizarlo y sus datos para volver a escribir el texto al cambiar de idioma.
+        """
+        item = QTreeWidgetItem([self._texto_enfrentamiento(partido)])
+        item.setData(0, Qt.UserRole, partido['id'])
+        item.setData(0, Qt.UserRole + 1, partido['fecha_hora'])
+        item.setData(0, Qt.UserRole + 2, partido)
+        if posicion is None:
+            item_elim.addChild(item)
+        else:
+            item_elim.insertChild(posicion, item)
+        return item
                 
     def cargar_resultados(self):
-        """Carga la tabla de resultados."""
-        self.tabla_resultados.setRowCount(0)
-        
-        query = QSqlQuery()
-        query.exec("""
-            SELECT p.fecha_hora, el.nombre, p.goles_local, p.goles_visitante,
-                   ev.nombre, p.eliminatoria, COALESCE(a.nombre, 'Sin asignar')
-            FROM partidos p
-            INNER JOIN equipos el ON p.equipo_local_id = el.id
-            INNER JOIN equipos ev ON p.equipo_visitante_id = ev.id
-            LEFT JOIN participantes a ON p.arbitro_id = a.id
-            WHERE p.finalizado = 1
-            ORDER BY p.fecha_hora DESC
-        """)
-        
-        row = 0
-        while query.next():
-            self.tabla_resultados.insertRow(row)
-            
-            # Fecha
-            fecha_hora = QDateTime.fromString(query.value(0), "yyyy-MM-dd HH:mm")
-            fecha_texto = fecha_hora.toString("dd/MM/yyyy")
-            self.tabla_resultados.setItem(row, 0, QTableWidgetItem(fecha_texto))
+        """Carga la tabla de resultados (consulta en el trabajador de BD)."""
+        self._cambios_durante_carga['resultados'] = set()
+        PartidosController.obtener_resultados_async(self.mostrar_resultados)
+    
+    def mostrar_resultados(self, resultados):
+        """Rellena la tabla de resultados con los partidos finalizados."""
+        columnas = [[partido[clave] for partido in resultados] for clave in self.COLUMNAS_RESULTADOS]
+        self.tabla_resultados.modelo.establecer_columnas(columnas)
+        self._reaplicar_cambios('resultados')
+        
+    def formato_fecha(self, fecha_hora, fila):
+        """Texto de la columna Fecha de resultados."""
+        return QDateTime.fromString(fecha_hora, "yyyy-MM-dd HH:mm").toString("dd/MM/yyyy")
             
-            # Local
-            self.tabla_resultados.setItem(row, 1, QTableWidgetItem(query.value(1)))
+    def formato_resultado(self, goles_local, fila):
+        """Texto de la columna Resultado; se ordena por los goles del local."""
+        return f"{goles_local} - {self.tabla_resultados.modelo.valor(fila, 6)}"
             
-            # Resultado
-            resultado = f"{query.value(2)} - {query.value(3)}"
-            self.tabla_resultados.setItem(row, 2, QTableWidgetItem(resultado))
+    # ============ CAMBIOS DE DATOS ============
+    def aplicar_cambio(self, cambio):
+        """
+        Actualiza solo los partidos afectados por un cambio publicado en el bus.
             
-            # Visitante
-            self.tabla_resultados.setItem(row, 3, QTableWidgetItem(query.value(4)))
+        Args:
+            cambio: eventos.Cambio
+        """
+        if cambio.entidad == eventos.PARTIDO:
+            ids = cambio.ids
+        elif cambio.en_lote and cambio.entidad in (eventos.EQUIPO, eventos.PARTICIPANTE):
+            # Los equipos y árbitros dados de alta en lote aún no están en ningún partido
+            if cambio.tipo != eventos.CREADO:
+                self.cargar_partidos()
+            return
+        elif cambio.entidad == eventos.EQUIPO:
+            ids = PartidosController.obtener_ids_partidos(equipo_id=cambio.id)
+        elif cambio.entidad == eventos.PARTICIPANTE:
+            ids = PartidosController.obtener_ids_partidos(arbitro_id=cambio.id)
+        else:
+            return
             
-            # Eliminatoria
-            self.tabla_resultados.setItem(row, 4, QTableWidgetItem(query.value(5)))
+        for partido_id in ids:
+            self.actualizar_partido(partido_id)
             
-            # Árbitro
-            self.tabla_resultados.setItem(row, 5, QTableWidgetItem(query.value(6)))
+    def actualizar_partido(self, partido_id):
+        """Vuelve a leer un partido y actualiza (o quita) su fila en las tablas y el árbol."""
+        for pendientes in self._cambios_durante_carga.values():
+            pendientes.add(partido_id)
             
-            row += 1
+        filas = PartidosController.obtener_listado_partidos(partido_id=partido_id)
+        partido = filas[0] if filas else None
+        
+        # Calendario (respetando el filtro de eliminatoria)
+        modelo = self.tabla_partidos.modelo
+        eliminatoria = self.eliminatoria_filtrada()
+        if partido and (not eliminatoria or partido['eliminatoria'] == eliminatoria):
+            modelo.actualizar_fila(partido_id, tuple(partido[c] for c in self.COLUMNAS_PARTIDOS))
+        else:
+            modelo.eliminar_fila(partido_id)
+        
+        # Resultados (solo finalizados)
+        modelo = self.tabla_resultados.modelo
+        if partido and partido['finalizado']:
+            modelo.actualizar_fila(partido_id, tuple(partido[c] for c in self.COLUMNAS_RESULTADOS))
+        else:
+            modelo.eliminar_fila(partido_id)
+        
+        self._actualizar_enfrentamiento(partido_id, partido)
+    
+    def _actualizar_enfrentamiento(self, partido_id, partido):
+        """Sustituye, mueve o quita el elemento de un partido en el árbol de eliminatorias."""
+        items = getattr(self, '_items_eliminatoria', None)
+        if not items:
+            return
+        
+        # Quitar el elemento anterior del partido, esté en la fase que esté
+        for item_elim in items.values():
+            hijos = [item_elim.child(i).data(0, Qt.UserRole) for i in range(item_elim.childCount())]
+            if partido_id in hijos:
+                item_elim.takeChild(hijos.index(partido_id))
+                if item_elim.childCount() == 0:
+                    QTreeWidgetItem(item_elim, [translate("No matches scheduled")])
+                break
+        
+        item_elim = items.get(partido['eliminatoria']) if partido else None
+        if item_elim is None:
+            return
+        
+        # Quitar el aviso de fase vacía y colocar el partido por fecha
+        if item_elim.childCount() == 1 and item_elim.child(0).data(0, Qt.UserRole) is None:
+            item_elim.takeChild(0)
+        posicion = item_elim.childCount()
+        for i in range(item_elim.childCount()):
+            if (item_elim.child(i).data(0, Qt.UserRole + 1) or "") > partido['fecha_hora']:
+                posicion = i
+                break
+        self._item_enfrentamiento(item_elim, partido, posicion)
+    
+    def _reaplicar_cambios(self, tabla):
+        """Refresca los partidos que cambiaron mientras se cargaba una tabla."""
+        pendientes = self._cambios_durante_carga.pop(tabla, None)
+        for partido_id in pendientes or ():
+            self.actualizar_partido(partido_id)
             
     def partido_seleccionado(self):
         """Maneja la selección de un partido."""
-        has_selection = self.tabla_partidos.currentRow() >= 0
+        has_selection = self.tabla_partidos.fila_actual() >= 0
         self.btn_eliminar.setEnabled(has_selection)
-        self.btn_iniciar.setEnabled(has_selection and self.partido_actual_id is None)  # Solo si no hay partido en curso
-        self.btn_finalizar.setEnabled(self.partido_actual_id is not None)  # Solo si hay partido en curso
+        # Se puede iniciar cualquier partido que no esté ya en juego
+        en_juego = has_selection and partidos_en_vivo.en_juego(self.tabla_partidos.valor_actual(0))
+        self.btn_iniciar.setEnabled(has_selection and not en_juego)
+        self.btn_finalizar.setEnabled(bool(partidos_en_vivo.partidos()))  # Solo si hay partidos en curso
         
     def nuevo_partido(self):
         """Abre el diálogo para crear un nuevo partido."""
         dialog = PartidoDialog(self)
         if dialog.exec() == QDialog.Accepted:
-            self.cargar_partidos()
             QMessageBox.information(self, "Éxito", "Partido creado correctamente")
             
     def registrar_resultado(self):
         """Abre el diálogo para registrar el resultado del partido."""
-        selected_row = self.tabla_partidos.currentRow()
-        if selected_row < 0:
+        partido_id = self.tabla_partidos.valor_actual(0)
+        if partido_id is None:
             return
-            
-        partido_id = int(self.tabla_partidos.item(selected_row, 0).text())
         
         dialog = ResultadoDialog(self, partido_id)
         if dialog.exec() == QDialog.Accepted:
-            self.cargar_partidos()
             QMessageBox.information(self, "Éxito", "Resultado registrado correctamente")
-            
-            # Ocultar reloj si estaba visible
-            self.reloj.setVisible(False)
-            self.reloj.on_reset()
+            # Si estaba en juego, deja de estarlo al publicarse el partido finalizado
             
     def eliminar_partido(self):
         """Elimina el partido seleccionado."""
-        selected_row = self.tabla_partidos.currentRow()
+        selected_row = self.tabla_partidos.fila_actual()
         if selected_row < 0:
             return
             
-        partido_id = self.tabla_partidos.item(selected_row, 0).text()
-        local = self.tabla_partidos.item(selected_row, 2).text()
-        visitante = self.tabla_partidos.item(selected_row, 3).text()
+        partido_id = self.tabla_partidos.modelo.valor(selected_row, 0)
+        local = self.tabla_partidos.modelo.valor(selected_row, 2)
+        visitante = self.tabla_partidos.modelo.valor(selected_row, 3)
         
         reply = QMessageBox.question(
             self,
@@ -669,15 +722,12 @@ class PartidosView(QWidget):
         )
         
         if reply == QMessageBox.Yes:
-            query = QSqlQuery()
-            query.prepare("DELETE FROM partidos WHERE id = ?")
-            query.addBindValue(partido_id)
-            
-            if query.exec():
-                self.cargar_partidos()
+            # El controlador descuenta el resultado de la clasificación si estaba finalizado
+            from CONTROLLERS.partidos_controller import PartidosController
+            if PartidosController.eliminar_partido(int(partido_id)):
                 QMessageBox.information(self, "Éxito", "Partido eliminado correctamente")
             else:
-                QMessageBox.warning(self, "Error", f"No se pudo eliminar: {query.lastError().text()}")
+                QMessageBox.warning(self, "Error", "No se pudo eliminar el partido")
 
     def exportar_resultados(self):
         """Exporta los resultados de los partidos a un archivo CSV."""
@@ -692,55 +742,26 @@ class PartidosView(QWidget):
         if not file_path:
             return
         
-        try:
-            query = QSqlQuery()
-            query.exec("""
-                SELECT 
-                    p.id,
-                    e1.nombre as equipo_local,
-                    e2.nombre as equipo_visitante,
-                    p.goles_local,
-                    p.goles_visitante,
-                    p.eliminatoria,
-                    p.fecha_hora,
-                    CASE WHEN p.finalizado = 1 THEN 'Finalizado' ELSE 'Pendiente' END as estado
-                FROM partidos p
-                INNER JOIN equipos e1 ON p.equipo_local_id = e1.id
-                INNER JOIN equipos e2 ON p.equipo_visitante_id = e2.id
-                ORDER BY p.fecha_hora DESC
-            """)
-            
-            with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow([
-                    "ID", "Equipo Local", "Equipo Visitante", 
-                    "Goles Local", "Goles Visitante", "Eliminatoria", 
-                    "Fecha/Hora", "Estado"
-                ])
-                
-                while query.next():
-                    writer.writerow([
-                        query.value(0),
-                        query.value(1),
-                        query.value(2),
-                        query.value(3),
-                        query.value(4),
-                        query.value(5),
-                        query.value(6),
-                        query.value(7)
-                    ])
+        # La consulta y la escritura del CSV se hacen en el trabajador de BD
+        self.btn_exportar.setEnabled(False)
             
+        def al_terminar(filas):
+            self.btn_exportar.setEnabled(True)
             QMessageBox.information(
                 self,
                 "Éxito",
                 f"Resultados exportados correctamente a:\n{file_path}"
             )
-        except Exception as e:
+        
+        def al_fallar(mensaje):
+            self.btn_exportar.setEnabled(True)
             QMessageBox.critical(
                 self,
                 "Error",
-                f"No se pudo exportar los resultados:\n{str(e)}"
+                f"No se pudo exportar los resultados:\n{mensaje}"
             )
+        
+        PartidosController.exportar_resultados_csv_async(file_path, al_terminar, al_fallar)
 
 
 # Los diálogos se mantienen igual
@@ -781,7 +802,7 @@ class PartidoDialog(QDialog):
         
         # Eliminatoria
         self.combo_eliminatoria = QComboBox()
-        self.combo_eliminatoria.addItems(["Octavos", "Cuartos", "Semifinal", "Final"])
+        self.combo_eliminatoria.addItems(config.ELIMINATORIAS)
         layout.addRow("Eliminatoria:", self.combo_eliminatoria)
         
         # Botones
@@ -794,7 +815,7 @@ class PartidoDialog(QDialog):
         
     def cargar_equipos(self, combo):
         """Carga los equipos en el combo box."""
-        query = QSqlQuery()
+        query = crear_query()
         query.exec("SELECT id, nombre FROM equipos ORDER BY nombre")
         
         while query.next():
@@ -804,7 +825,7 @@ class PartidoDialog(QDialog):
         """Carga los árbitros en el combo box."""
         self.combo_arbitro.addItem("Sin asignar", None)
         
-        query = QSqlQuery()
+        query = crear_query()
         query.exec("""
             SELECT id, nombre FROM participantes 
             WHERE es_arbitro = 1 AND activo = 1 
@@ -827,21 +848,14 @@ class PartidoDialog(QDialog):
         fecha_hora = self.datetime_partido.dateTime().toString("yyyy-MM-dd HH:mm")
         eliminatoria = self.combo_eliminatoria.currentText()
         
-        query = QSqlQuery()
-        query.prepare("""
-            INSERT INTO partidos (equipo_local_id, equipo_visitante_id, arbitro_id, fecha_hora, eliminatoria)
-            VALUES (?, ?, ?, ?, ?)
-        """)
-        query.addBindValue(local_id)
-        query.addBindValue(visitante_id)
-        query.addBindValue(arbitro_id)
-        query.addBindValue(fecha_hora)
-        query.addBindValue(eliminatoria)
-        
-        if query.exec():
-            self.accept()
-        else:
-            QMessageBox.warning(self, "Error", f"No se pudo guardar: {query.lastError().text()}")
+        # El modelo publica el partido nuevo y las vistas abiertas lo añaden
+        try:
+            PartidosController.crear_partido(local_id, visitante_id, fecha_hora,
+                                             eliminatoria, arbitro_id)
+        except ValueError as e:
+            QMessageBox.warning(self, "Error", f"No se pudo guardar: {e}")
+            return
+        self.accept()
 
 
 class GoleadorDialog(QDialog):
@@ -851,6 +865,7 @@ class GoleadorDialog(QDialog):
         super().__init__(parent)
         self.partido_id = partido_id
         self.equipo = equipo
+        self.equipo_id = None  # ID del equipo (local o visitante) que marca
         self.minuto = minuto
         self.setWindowTitle(f"Seleccionar Goleador - Gol {equipo.title()}")
         self.setModal(True)
@@ -891,13 +906,13 @@ class GoleadorDialog(QDialog):
         
     def cargar_participantes(self):
         """Carga los participantes del equipo correspondiente."""
-        query = QSqlQuery()
+        query = crear_query()
         
         # Determinar si es local o visitante
         equipo_col = "p.equipo_local_id" if self.equipo == "local" else "p.equipo_visitante_id"
         
         query.prepare(f"""
-            SELECT par.id, par.nombre
+            SELECT par.id, par.nombre, ep.equipo_id
             FROM participantes par
             JOIN equipo_participante ep ON ep.participante_id = par.id
             JOIN partidos p ON p.id = ?
@@ -911,6 +926,7 @@ class GoleadorDialog(QDialog):
             while query.next():
                 participante_id = query.value(0)
                 nombre = query.value(1)
+                self.equipo_id = query.value(2)
                 nombre_completo = nombre
                 
                 from PySide6.QtWidgets import QListWidgetItem
@@ -935,16 +951,64 @@ class GoleadorDialog(QDialog):
             return current_item.data(Qt.UserRole)
         return None
 
+    def get_nombre_participante(self):
+        """Retorna el nombre del participante seleccionado."""
+        current_item = self.participantes_list.currentItem()
+        if current_item and current_item.flags() & Qt.ItemIsSelectable:
+            return current_item.text()
+        return ""
 
-def actualizar_minuto_partido(self, minuto):
-    """Se ejecuta cada minuto del partido."""
-    # Notificaciones cada 15 minutos
-    if minuto > 0 and minuto % 15 == 0:
-        QMessageBox.information(
-            self,
-            "Tiempo del Partido",
-            f"Minuto {minuto} del partido"
+
+class TarjetaDialog(GoleadorDialog):
+    """Diálogo para seleccionar el jugador y el tipo de una tarjeta."""
+    
+    def __init__(self, parent=None, partido_id=None, equipo=None, minuto=None):
+        super().__init__(parent, partido_id, equipo, minuto)
+        self.setWindowTitle(f"Registrar Tarjeta - Equipo {equipo.title()}")
+    
+    def init_ui(self):
+        """Inicializa la interfaz del diálogo."""
+        layout = QVBoxLayout(self)
+        
+        # Info de la tarjeta
+        info_label = QLabel(f"Tarjeta al equipo {self.equipo.title()} al minuto {self.minuto}")
+        info_label.setStyleSheet("font-weight: bold; padding: 10px;")
+        layout.addWidget(info_label)
+        
+        # Tipo de tarjeta
+        form = QFormLayout()
+        self.tipo_combo = QComboBox(self)
+        self.tipo_combo.addItem("🟨 " + translate("Yellow"), "amarilla")
+        self.tipo_combo.addItem("🟥 " + translate("Red"), "roja")
+        form.addRow("Tipo:", self.tipo_combo)
+        layout.addLayout(form)
+        
+        # Lista de participantes
+        layout.addWidget(QLabel("Seleccione el jugador:"))
+        self.participantes_list = QListWidget(self)
+        self.participantes_list.setMinimumHeight(150)
+        layout.addWidget(self.participantes_list)
+        
+        # Botones
+        self.buttons = QDialogButtonBox(
+            QDialogButtonBox.Ok | QDialogButtonBox.Cancel,
+            Qt.Horizontal, self
         )
+        self.buttons.accepted.connect(self.validate_and_accept)
+        self.buttons.rejected.connect(self.reject)
+        layout.addWidget(self.buttons)
+    
+    def validate_and_accept(self):
+        """Valida la selección antes de aceptar."""
+        if self.get_participante_id() is None:
+            QMessageBox.warning(self, "Selección requerida", 
+                              "Por favor, seleccione un participante de la lista para registrar la tarjeta.")
+            return
+        self.accept()
+    
+    def get_tipo(self):
+        """Retorna el tipo de tarjeta ('amarilla' o 'roja')."""
+        return self.tipo_combo.currentData()
 
 
 class ResultadoDialog(QDialog):
@@ -993,7 +1057,7 @@ class ResultadoDialog(QDialog):
         
     def cargar_datos_partido(self):
         """Carga los datos del partido y calcula los goles actuales."""
-        query = QSqlQuery()
+        query = crear_query()
         query.prepare("""
             SELECT 
                 p.id,
@@ -1024,22 +1088,10 @@ class ResultadoDialog(QDialog):
                 self.spin_goles_visitante.setValue(goles_visitante)
             else:
                 # Calcular goles desde la tabla de goles
-                query_goles = QSqlQuery()
-                query_goles.prepare("""
-                    SELECT 
-                        COUNT(CASE WHEN ep.equipo_id = p.equipo_local_id THEN 1 END) as goles_local,
-                        COUNT(CASE WHEN ep.equipo_id = p.equipo_visitante_id THEN 1 END) as goles_visitante
-                    FROM partidos p
-                    LEFT JOIN goles g ON g.partido_id = p.id AND g.partido_id IS NOT NULL
-                    LEFT JOIN participantes par ON par.id = g.participante_id
-                    LEFT JOIN equipo_participante ep ON ep.participante_id = par.id
-                    WHERE p.id = ?
-                """)
-                query_goles.addBindValue(self.partido_id)
-                
-                if query_goles.exec() and query_goles.next():
-                    self.spin_goles_local.setValue(query_goles.value(0))
-                    self.spin_goles_visitante.setValue(query_goles.value(1))
+                from CONTROLLERS.partidos_controller import PartidosController
+                goles_local, goles_visitante = PartidosController.obtener_goles_partido(self.partido_id)
+                self.spin_goles_local.setValue(goles_local)
+                self.spin_goles_visitante.setValue(goles_visitante)
     
     def aceptar_resultado(self):
         """Guarda el resultado y finaliza el partido."""
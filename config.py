@@ -31,7 +31,9 @@ COLOR_WARNING = "#FFB300"      # Naranja
 COLOR_INFO = "#0066CC"         # Azul
 
 # Eliminatorias disponibles
-ELIMINATORIAS = ["Octavos", "Cuartos", "Semifinal", "Final"]
+# Fases de un partido, en orden: "Liga" es la fase de todos contra todos y
+# "Previa" agrupa las rondas eliminatorias anteriores a octavos
+ELIMINATORIAS = ["Liga", "Previa", "Octavos", "Cuartos", "Semifinal", "Final"]
 
 # Posiciones en fútbol
 POSICIONES = ["Portero", "Defensa Central", "Lateral", "Centrocampista", "Delantero"]
@@ -65,6 +67,7 @@ ICON_SIZE = 32
 
 # Configuración de tabla
 ITEMS_PER_PAGE = 50
+FILAS_POR_LOTE = 500  # Filas que recibe de golpe una TablaVirtual al desplazarse
 
 # Mensajes de confirmación
 MSG_CONFIRM_DELETE = "¿Está seguro de que desea eliminar este elemento?\nEsta acción no se puede deshacer."
@@ -92,9 +95,20 @@ ENABLE_SOFT_DELETE = True  # Usar soft delete en lugar de hard delete
 REQUIRE_CONFIRMATION = True  # Requerir confirmación para operaciones destructivas
 
 # Configuración de rendimiento
-USAR_CACHE = False  # Usar caché de datos
-TIMEOUT_DB = 5000  # ms
-MAX_RESULTADOS_QUERY = 1000
+USAR_CACHE = True  # Caché de entidades leídas por id (MODELS/cache_entidades.py)
+TIMEOUT_DB = 5000  # ms (busy_timeout: espera máxima cuando otra conexión tiene la BD bloqueada)
+MAX_RESULTADOS_QUERY = 1000  # Máximo de entidades en la caché
+
+# Perfil de rendimiento de SQLite (se aplica a cada conexión al abrirla)
+SQLITE_JOURNAL_MODE = "WAL"  # Los lectores no bloquean al que escribe ni al revés
+SQLITE_SYNCHRONOUS = "NORMAL"  # Con WAL es seguro ante cierres de la aplicación
+SQLITE_CACHE_SIZE = -16000  # Negativo = KiB de caché de páginas (16 MB)
+SQLITE_MMAP_SIZE = 64 * 1024 * 1024  # bytes leídos con memoria mapeada (0 = desactivado)
+SQLITE_TEMP_STORE = "MEMORY"  # Tablas temporales e índices de ORDER BY en memoria
+
+# Instrumentación de consultas (MODELS/instrumentacion.py)
+INSTRUMENTAR_CONSULTAS = True  # Medir cada consulta creada con crear_query()
+UMBRAL_CONSULTA_LENTA_MS = 50  # Las consultas más lentas se registran en LOG_FILE con su plan
 
 # Rutas por defecto
 RUTA_RECURSOS = "RESOURCES"
@@ -0,0 +1,91 @@
+"""
+Script de generación de torneos sintéticos para pruebas de escala.
+Crea una base de datos nueva con el esquema de la aplicación y la rellena
+con equipos, jugadores, árbitros, calendario y eventos generados
+(ver MODELS/generador_torneo.py). Con la misma semilla el resultado es idéntico.
+
+Uso:
+    python generar_torneo.py DATA/torneo_grande.db --equipos 300 --jugadores 18
+    python generar_torneo.py DATA/liga.db --formato liga --equipos 40 --semilla 7
+    python generar_torneo.py DATA/torneo_grande.db --sobrescribir
+
+Para abrir la aplicación con la BD generada:
+    TORNEO_FUTBOL_DB=DATA/torneo_grande.db python main.py
+"""
+
+import argparse
+import os
+import sys
+import time
+from PySide6.QtCore import QCoreApplication
+from MODELS.database import establecer_ruta_db, abrir_conexion, preparar_esquema, VARIABLE_RUTA_DB
+from MODELS.generador_torneo import GeneradorTorneo, FORMATO_ELIMINATORIA, FORMATO_LIGA
+
+
+def generar_torneo(ruta: str, sobrescribir: bool = False, **parametros) -> bool:
+    """
+    Crea la BD en la ruta indicada y genera el torneo.
+    
+    Args:
+        ruta: Fichero SQLite a crear
+        sobrescribir: Si True, borra la BD si ya existe
+        **parametros: Parámetros de GeneradorTorneo
+    
+    Returns:
+        bool: True si se generó correctamente
+    """
+    # QtSql necesita una instancia de aplicación para cargar el driver
+    app = QCoreApplication.instance() or QCoreApplication([])
+    
+    if os.path.exists(ruta):
+        if not sobrescribir:
+            print(f"Error: {ruta} ya existe (use --sobrescribir para reemplazarla)")
+            return False
+        # También los ficheros del modo WAL, o SQLite recuperaría datos de la BD anterior
+        for fichero in (ruta, ruta + "-wal", ruta + "-shm"):
+            if os.path.exists(fichero):
+                os.remove(fichero)
+    
+    try:
+        generador = GeneradorTorneo(**parametros)
+        establecer_ruta_db(ruta)
+        db = abrir_conexion()
+        preparar_esquema(db, datos_ejemplo=False)
+        
+        inicio = time.perf_counter()
+        totales = generador.generar(db)
+        segundos = time.perf_counter() - inicio
+        db.close()
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+    
+    print(f"Torneo generado en {segundos:.2f} s: {os.path.abspath(ruta)}")
+    for clave, valor in totales.items():
+        print(f"  {clave}: {valor}")
+    print(f"Para abrirlo: {VARIABLE_RUTA_DB}={ruta} python main.py")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera un torneo sintético en una BD nueva")
+    parser.add_argument("ruta", help="Fichero de la base de datos a crear")
+    parser.add_argument("--equipos", type=int, default=64, help="Número de equipos (por defecto 64)")
+    parser.add_argument("--jugadores", type=int, default=15, help="Jugadores por equipo (por defecto 15)")
+    parser.add_argument("--arbitros", type=int, default=None,
+                        help="Número de árbitros (por defecto uno por cada 8 equipos)")
+    parser.add_argument("--formato", choices=[FORMATO_ELIMINATORIA, FORMATO_LIGA], default=FORMATO_ELIMINATORIA,
+                        help="Eliminatoria a partido único o liga a una vuelta")
+    parser.add_argument("--jugados", type=float, default=0.8,
+                        help="Fracción de partidos ya jugados, de 0 a 1 (por defecto 0.8)")
+    parser.add_argument("--campos", type=int, default=4, help="Partidos a la vez en cada franja horaria")
+    parser.add_argument("--inicio", default="2025-03-01", help="Fecha del primer partido (AAAA-MM-DD)")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla del generador aleatorio")
+    parser.add_argument("--sobrescribir", action="store_true", help="Reemplaza la BD si ya existe")
+    args = parser.parse_args()
+    
+    ok = generar_torneo(args.ruta, sobrescribir=args.sobrescribir,
+                        equipos=args.equipos, jugadores_por_equipo=args.jugadores,
+                        arbitros=args.arbitros, formato=args.formato, jugados=args.jugados,
+                        campos=args.campos, inicio=args.inicio, semilla=args.semilla)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,82 @@
+"""
+Script de importación de equipos, participantes y plantillas desde CSV.
+Usa la BD de la aplicación (o la de TORNEO_FUTBOL_DB) y el importador de
+CONTROLLERS/importador_csv.py: lectura por streaming, validación, detección
+de duplicados y escritura por lotes. Las filas rechazadas se guardan, con
+su línea y el motivo, en <fichero>.rechazos.csv.
+
+Uso:
+    python importar_csv.py equipos equipos.csv
+    python importar_csv.py participantes alumnos.csv --lote 2000
+    python importar_csv.py plantillas plantillas.csv --codificacion cp1252 --delimitador ";"
+"""
+
+import argparse
+import sys
+import time
+from PySide6.QtCore import QCoreApplication
+from MODELS.database import conectar, obtener_ruta_db
+from CONTROLLERS.importador_csv import ImportadorCSV, TIPOS, TAMANO_LOTE
+
+
+def importar_csv(tipo: str, ruta: str, ruta_rechazos: str = None, **opciones) -> bool:
+    """
+    Importa un CSV en la BD del torneo.
+    
+    Args:
+        tipo: 'equipos', 'participantes' o 'plantillas'
+        ruta: Fichero CSV a importar
+        ruta_rechazos: CSV donde escribir las filas rechazadas
+        **opciones: Parámetros de ImportadorCSV (tamano_lote, codificacion, delimitador)
+    
+    Returns:
+        bool: True si la importación terminó (aunque haya filas rechazadas)
+    """
+    # QtSql necesita una instancia de aplicación para cargar el driver
+    app = QCoreApplication.instance() or QCoreApplication([])
+    
+    def mostrar_progreso(resultado, fraccion):
+        print(f"\r  {fraccion:6.1%}  {resultado.importadas} importadas, "
+              f"{resultado.rechazadas} rechazadas", end="", flush=True)
+    
+    try:
+        db = conectar()
+        print(f"Importando {tipo} de {ruta} en {obtener_ruta_db()}")
+        importador = ImportadorCSV(tipo, progreso=mostrar_progreso, ruta_rechazos=ruta_rechazos, **opciones)
+        inicio = time.perf_counter()
+        resultado = importador.importar(ruta, db)
+        segundos = time.perf_counter() - inicio
+        db.close()
+    except Exception as e:
+        print(f"\nError: {e}")
+        return False
+    
+    print(f"\nImportación terminada en {segundos:.2f} s")
+    print(f"  filas leídas: {resultado.leidas}")
+    print(f"  importadas: {resultado.importadas}")
+    if resultado.asignaciones:
+        print(f"  asignaciones a equipos: {resultado.asignaciones}")
+    print(f"  rechazadas: {resultado.rechazadas} ({resultado.duplicadas} duplicadas)")
+    for linea, motivo in resultado.rechazos[:10]:
+        print(f"    línea {linea}: {motivo}")
+    if resultado.ruta_rechazos:
+        print(f"Filas rechazadas guardadas en {resultado.ruta_rechazos}")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Importa equipos, participantes o plantillas desde CSV")
+    parser.add_argument("tipo", choices=TIPOS, help="Qué contiene el fichero")
+    parser.add_argument("ruta", help="Fichero CSV a importar")
+    parser.add_argument("--rechazos", default=None,
+                        help="CSV de filas rechazadas (por defecto <ruta>.rechazos.csv)")
+    parser.add_argument("--lote", type=int, default=TAMANO_LOTE,
+                        help=f"Filas por transacción (por defecto {TAMANO_LOTE})")
+    parser.add_argument("--codificacion", default="utf-8-sig",
+                        help="Codificación del fichero (por defecto UTF-8; cp1252 para Excel antiguo)")
+    parser.add_argument("--delimitador", default=None, help="Separador de campos (por defecto ',' o ';' según la cabecera)")
+    args = parser.parse_args()
+    
+    ok = importar_csv(args.tipo, args.ruta, ruta_rechazos=args.rechazos or args.ruta + ".rechazos.csv",
+                      tamano_lote=args.lote, codificacion=args.codificacion, delimitador=args.delimitador)
+    sys.exit(0 if ok else 1)
@@ -12,6 +12,7 @@ from PySide6.QtGui import QPixmap
 from PySide6.QtCore import Qt, QTimer
 from VIEWS.main_window import MainWindow
 from MODELS.database import conectar
+from MODELS.instrumentacion import registrar_informe
 from RESOURCES.utilidades import obtener_ruta_recurso
 import config
 
@@ -90,16 +91,15 @@ def main():
             app.setStyleSheet(qss)
             logger.info("Estilos aplicados correctamente")
         
-        # Inicializar base de datos si es necesario
-        logger.info("Verificando base de datos...")
-        import inicializar_db
-        inicializar_db.inicializar_datos()
-        
-        # Conectar a la base de datos
+        # Conectar a la base de datos (crea/migra el esquema si es necesario)
         logger.info("Conectando a la base de datos...")
         db = conectar()
         logger.info("Base de datos conectada correctamente")
         
+        # Al salir, resumen de tiempos por consulta en el log
+        if config.INSTRUMENTAR_CONSULTAS:
+            app.aboutToQuit.connect(registrar_informe)
+        
         # Crear y mostrar ventana principal
         logger.info("Creando ventana principal...")
         window = MainWindow()